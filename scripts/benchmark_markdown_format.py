@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark Storyweaver's block formatting.
+
+Measures, on a synthetic document:
+  - extracting format instructions with the block format pool vs. the
+    previous thread path (4 threads, a fresh executor per 50-block chunk)
+  - memory held by the hashed run-array cache vs. instruction objects plus
+    a text copy per block
+
+Usage: python scripts/benchmark_markdown_format.py [--blocks N]
+"""
+
+import argparse
+import hashlib
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+# Allow running this script directly from the repo without PYTHONPATH set.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from storymaster.view.storyweaver.markdown_format import (
+    BlockFormatPool,
+    extract_format_instructions,
+    format_runs,
+)
+
+SAMPLE_LINES = [
+    "# Chapter One",
+    "The **storm** broke over _Rivertown_ at dawn, and `nobody` was ready.",
+    "- [x] Draft the ~~prologue~~ opening",
+    "> A quote from [the archive](https://example.com) and ![a map](map.png)",
+    "1. First *numbered* item with __underline__",
+    "",
+    "---",
+    "Plain prose with no markup at all, just words and more words.",
+]
+
+
+def make_document(blocks: int) -> list[str]:
+    return [SAMPLE_LINES[i % len(SAMPLE_LINES)] + f" {i}" for i in range(blocks)]
+
+
+def thread_path(texts: list[str]) -> list:
+    """The previous approach: 4 threads, a fresh executor per 50-block chunk."""
+    results = [None] * len(texts)
+    for chunk_start in range(0, len(texts), 50):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                executor.submit(extract_format_instructions, texts[i]): i
+                for i in range(chunk_start, min(chunk_start + 50, len(texts)))
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    return results
+
+
+@dataclass
+class BlockData:
+    """Per-block text copy the highlighter used to keep for cache validation."""
+
+    block_number: int
+    text: str
+    position: int
+
+
+def allocated(build) -> int:
+    """Bytes still allocated by what build() returns."""
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_extraction(texts: list[str]) -> tuple[float, float, int]:
+    """Returns (thread path seconds, pool seconds, pool workers)."""
+    pool = BlockFormatPool()
+    try:
+        pool.start()  # measure steady state, not worker start-up
+
+        start = time.perf_counter()
+        thread_results = thread_path(texts)
+        thread_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pool_results = pool.format_blocks(texts)
+        pool_time = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+
+    if pool_results != thread_results:
+        raise SystemExit("pool and thread path disagree")
+    return thread_time, pool_time, pool.max_workers
+
+
+def bench_cache_memory(texts: list[str]) -> tuple[int, int]:
+    """Returns (instruction cache bytes, run cache bytes)."""
+
+    def instruction_cache():
+        format_cache = {}
+        block_data = []
+        position = 0
+        for block_number, text in enumerate(texts):
+            format_cache[block_number] = extract_format_instructions(text)
+            block_data.append(BlockData(block_number, text.encode().decode(), position))
+            position += len(text) + 1
+        return format_cache, block_data
+
+    def run_cache():
+        return {
+            hashlib.blake2b(text.encode(), digest_size=12).digest(): format_runs(text)
+            for text in texts
+        }
+
+    return allocated(instruction_cache), allocated(run_cache)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=10_000)
+    args = parser.parse_args()
+    texts = make_document(args.blocks)
+
+    thread_time, pool_time, workers = bench_extraction(texts)
+    print(
+        f"{args.blocks} blocks: threads {thread_time * 1000:.0f}ms, "
+        f"{workers} workers {pool_time * 1000:.0f}ms ({thread_time / pool_time:.1f}x)"
+    )
+
+    instruction_bytes, run_bytes = bench_cache_memory(texts)
+    print(
+        f"{args.blocks} blocks: instructions + text copies {instruction_bytes / 1e6:.1f}MB, "
+        f"run arrays {run_bytes / 1e6:.1f}MB ({instruction_bytes / run_bytes:.1f}x smaller)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Compare the SQLite tuning profiles in engine_factory.
+
+For each profile a fresh database is created and timed for:
+  - single-row commits (what the desktop UI does on every edit)
+  - a bulk insert in one transaction (a sync push)
+  - indexed reads while a second thread keeps committing writes
+    (the desktop app and the embedded sync server sharing the file)
+
+Usage: python scripts/benchmark_sqlite_profiles.py [--rows N] [--profiles a,b]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Allow running this script directly from the repo without PYTHONPATH set.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from storymaster.model.database.engine_factory import PROFILES, create_sqlite_engine
+
+
+def _setup(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT, score INTEGER)"))
+        conn.execute(text("CREATE INDEX ix_item_score ON item (score)"))
+
+
+def bench_single_commits(engine, rows: int) -> float:
+    start = time.perf_counter()
+    for i in range(rows):
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO item (name, score) VALUES (:n, :s)"),
+                {"n": f"single {i}", "s": i % 97},
+            )
+    return time.perf_counter() - start
+
+
+def bench_bulk_insert(engine, rows: int) -> float:
+    params = [{"n": f"bulk {i}", "s": i % 97} for i in range(rows)]
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO item (name, score) VALUES (:n, :s)"), params)
+    return time.perf_counter() - start
+
+
+def bench_reads_under_writes(engine, reads: int) -> tuple[float, int]:
+    """Time `reads` queries while another thread commits; returns (seconds, lock errors)."""
+    stop = threading.Event()
+    errors = 0
+
+    def writer():
+        nonlocal errors
+        i = 0
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("UPDATE item SET score = score + 1 WHERE id = :id"),
+                        {"id": i % 100 + 1},
+                    )
+            except OperationalError:
+                errors += 1
+            i += 1
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    start = time.perf_counter()
+    try:
+        for i in range(reads):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        text("SELECT count(*) FROM item WHERE score = :s"), {"s": i % 97}
+                    ).scalar_one()
+            except OperationalError:
+                errors += 1
+    finally:
+        elapsed = time.perf_counter() - start
+        stop.set()
+        thread.join()
+    return elapsed, errors
+
+
+def run(rows: int, profile_names: list[str]) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in profile_names:
+            engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / f'{name}.db'}", profile=name)
+            try:
+                _setup(engine)
+                single = bench_single_commits(engine, rows)
+                bulk = bench_bulk_insert(engine, rows * 10)
+                mixed, errors = bench_reads_under_writes(engine, rows)
+            finally:
+                engine.dispose()
+            results.append(
+                {
+                    "profile": name,
+                    "single_commits": single,
+                    "bulk_insert": bulk,
+                    "reads_under_writes": mixed,
+                    "lock_errors": errors,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--profiles", default="default,tuned")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.profiles.split(","))
+    print(
+        f"{'profile':<10} {'single commits':>15} {'bulk insert':>12} {'reads+writes':>13} {'lock errors':>12}"
+    )
+    for r in results:
+        print(
+            f"{r['profile']:<10} {r['single_commits']:>14.3f}s {r['bulk_insert']:>11.3f}s "
+            f"{r['reads_under_writes']:>12.3f}s {r['lock_errors']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Adds the access-path indexes (setting/storyline scoping, relationship
+lookups, and the updated_at/deleted_at sync scans) to an existing database.
+
+Tables made by create_all after the indexes were declared already have
+them; older tables only had an index on sync_uuid, so those reads scanned
+the whole table.
+
+Idempotent: re-running on a migrated DB is a no-op.
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Allow running this script directly from the repo without PYTHONPATH set.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from storymaster.model.database.schema.base import access_path_index_statements
+
+
+def get_db_path() -> str:
+    env_path = os.getenv("STORYMASTER_DB_PATH")
+    if env_path:
+        return env_path
+    home_dir = os.path.expanduser("~")
+    db_dir = os.path.join(home_dir, ".local", "share", "storymaster")
+    return os.path.join(db_dir, "storymaster.db")
+
+
+def existing_tables(cursor) -> set[str]:
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def existing_indexes(cursor) -> set[str]:
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def backup_database(db_path: str) -> None:
+    if not os.path.exists(db_path):
+        return
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup = db_path.replace(".db", f"_backup_access_indexes_{timestamp}.db")
+    shutil.copy2(db_path, backup)
+    print(f"Backup written to {backup}")
+
+
+def migrate(db_path: str) -> bool:
+    if not os.path.exists(db_path):
+        print(f"Database not found at {db_path}; run init_database.py first.")
+        return False
+
+    print(f"Migrating {db_path}")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        before = existing_indexes(cursor)
+        for statement in access_path_index_statements(existing_tables(cursor)):
+            cursor.execute(statement)
+        added = existing_indexes(cursor) - before
+        if added:
+            print(f"  Created {len(added)} indexes")
+
+        conn.commit()
+        print("Migration complete.")
+        return True
+
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"SQLite error: {e}", file=sys.stderr)
+        return False
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    db_path = get_db_path()
+    backup_database(db_path)
+    ok = migrate(db_path)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Adds the sync_change_log table and its triggers, and sync_device.last_sync_seq.
+
+The change log lets sync pulls and pending-change counts read an indexed
+range of sequence numbers instead of scanning updated_at on every table.
+Every existing row is backfilled into the log (oldest updated_at first) so a
+since_seq=0 full sync still sees the whole database.
+
+Idempotent: re-running on a migrated DB is a no-op.
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Allow running this script directly from the repo without PYTHONPATH set.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from storymaster.model.database.schema.base import (
+    change_log_backfill_statement,
+    change_log_tracked_tables,
+    change_log_trigger_statements,
+)
+
+
+def get_db_path() -> str:
+    env_path = os.getenv("STORYMASTER_DB_PATH")
+    if env_path:
+        return env_path
+    home_dir = os.path.expanduser("~")
+    db_dir = os.path.join(home_dir, ".local", "share", "storymaster")
+    return os.path.join(db_dir, "storymaster.db")
+
+
+def existing_tables(cursor) -> set[str]:
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def column_names(cursor, table: str) -> list[str]:
+    cursor.execute(f'PRAGMA table_info("{table}")')
+    return [row[1] for row in cursor.fetchall()]
+
+
+def backup_database(db_path: str) -> None:
+    if not os.path.exists(db_path):
+        return
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup = db_path.replace(".db", f"_backup_change_log_{timestamp}.db")
+    shutil.copy2(db_path, backup)
+    print(f"Backup written to {backup}")
+
+
+def migrate(db_path: str) -> bool:
+    if not os.path.exists(db_path):
+        print(f"Database not found at {db_path}; run init_database.py first.")
+        return False
+
+    print(f"Migrating {db_path}")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        tables = existing_tables(cursor)
+
+        if "sync_change_log" not in tables:
+            print("  Creating sync_change_log")
+            cursor.execute(
+                """
+                CREATE TABLE sync_change_log (
+                    seq INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+                    table_name VARCHAR(100) NOT NULL,
+                    row_id INTEGER NOT NULL,
+                    CONSTRAINT uq_sync_change_log_row UNIQUE (table_name, row_id)
+                )
+                """
+            )
+            cursor.execute(
+                "CREATE INDEX ix_sync_change_log_table_seq " "ON sync_change_log (table_name, seq)"
+            )
+
+        for table in change_log_tracked_tables():
+            if table not in tables:
+                continue
+            # Backfill before the triggers exist, skipping rows already logged.
+            cursor.execute(change_log_backfill_statement(table))
+            if cursor.rowcount:
+                print(f"  Backfilled {cursor.rowcount} rows from {table}")
+            for statement in change_log_trigger_statements(table):
+                cursor.execute(statement)
+
+        if "sync_device" in tables and "last_sync_seq" not in column_names(cursor, "sync_device"):
+            print("  Adding last_sync_seq to sync_device")
+            cursor.execute("ALTER TABLE sync_device ADD COLUMN last_sync_seq INTEGER")
+
+        conn.commit()
+        print("Migration complete.")
+        return True
+
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"SQLite error: {e}", file=sys.stderr)
+        return False
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    db_path = get_db_path()
+    backup_database(db_path)
+    ok = migrate(db_path)
+    sys.exit(0 if ok else 1)
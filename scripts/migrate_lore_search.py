@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Adds the lore_search full-text index and the triggers that keep it current.
+
+The index lets Lorekeeper and Storyweaver search lore with ranked, prefix
+matches instead of LIKE scans of every table. Each run rebuilds its
+contents from the tables and reinstalls the triggers, so it also repairs an
+index that has drifted (e.g. rows written while the triggers were missing).
+
+The app creates the index itself on startup; this script is for databases
+that are only opened by other tools, and for rebuilding.
+
+Idempotent: re-running leaves the same index.
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Allow running this script directly from the repo without PYTHONPATH set.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from storymaster.model.database.schema.base import (
+    LORE_SEARCH_SOURCES,
+    LORE_SEARCH_TABLE,
+    lore_search_backfill_statement,
+    lore_search_table_statement,
+    lore_search_trigger_statements,
+)
+
+
+def get_db_path() -> str:
+    env_path = os.getenv("STORYMASTER_DB_PATH")
+    if env_path:
+        return env_path
+    home_dir = os.path.expanduser("~")
+    db_dir = os.path.join(home_dir, ".local", "share", "storymaster")
+    return os.path.join(db_dir, "storymaster.db")
+
+
+def existing_tables(cursor) -> set[str]:
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def backup_database(db_path: str) -> None:
+    if not os.path.exists(db_path):
+        return
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup = db_path.replace(".db", f"_backup_lore_search_{timestamp}.db")
+    shutil.copy2(db_path, backup)
+    print(f"Backup written to {backup}")
+
+
+def migrate(db_path: str) -> bool:
+    if not os.path.exists(db_path):
+        print(f"Database not found at {db_path}; run init_database.py first.")
+        return False
+
+    print(f"Migrating {db_path}")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        tables = existing_tables(cursor)
+
+        if LORE_SEARCH_TABLE not in tables:
+            print(f"  Creating {LORE_SEARCH_TABLE}")
+        cursor.execute(lore_search_table_statement())
+        cursor.execute(f"DELETE FROM {LORE_SEARCH_TABLE}")
+
+        for table in LORE_SEARCH_SOURCES:
+            if table not in tables:
+                continue
+            cursor.execute(lore_search_backfill_statement(table))
+            if cursor.rowcount:
+                print(f"  Indexed {cursor.rowcount} rows from {table}")
+            # Recreated so databases get the current trigger definitions
+            for suffix in ("ins", "upd", "del"):
+                cursor.execute(f'DROP TRIGGER IF EXISTS "trg_{table}_lore_search_{suffix}"')
+            for statement in lore_search_trigger_statements(table):
+                cursor.execute(statement)
+
+        conn.commit()
+        print("Migration complete.")
+        return True
+
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"SQLite error: {e}", file=sys.stderr)
+        return False
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    db_path = get_db_path()
+    backup_database(db_path)
+    ok = migrate(db_path)
+    sys.exit(0 if ok else 1)
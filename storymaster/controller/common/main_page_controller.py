@@ -54,6 +54,7 @@ from sqlalchemy.orm import Session
 
 from storymaster.model.common.backup_manager import BackupManager
 from storymaster.model.common.common_model import BaseModel
+from storymaster.model.database import lore_search
 from storymaster.model.database.export_to_json import export_setting_to_json
 from storymaster.model.database.schema.base import (
     Actor,
@@ -120,6 +121,15 @@ from storymaster.view.litographer.node_notes_dialog import NodeNotesDialog
 from storymaster.view.lorekeeper.lorekeeper_page import LorekeeperPage
 from storymaster.view.storyweaver.storyweaver_widget import StoryweaverWidget
 
+# Lore tables offered by Storyweaver autocomplete -> (entity id prefix, entity type)
+STORYWEAVER_ENTITY_TYPES = {
+    "actor": ("actor", "actor"),
+    "location_": ("location", "location"),
+    "faction": ("faction", "faction"),
+    "object_": ("object", "object"),
+    "world_data": ("worlddata", "worlddata"),
+}
+
 
 class ConnectionPoint(QGraphicsEllipseItem):
     """Visual connection point on nodes for creating connections"""
@@ -4287,6 +4297,115 @@ class MainWindowController:
             # Preload entities for faster autocomplete (will fetch fresh data)
             self.storyweaver_widget.preload_entities()
 
+    def _query_storyweaver_entities(self, session, query: str, setting_id: int) -> list:
+        """
+        A setting's entities for Storyweaver, sorted by name.
+
+        Lists every entity when query is empty; otherwise this is the LIKE
+        fallback for databases without the lore search index.
+        """
+        entities = []
+
+        # Query Actors (characters)
+        actors = session.query(Actor).filter(
+            Actor.setting_id == setting_id
+        )
+        if query:
+            # Search across first_name, middle_name, and last_name
+            actors = actors.filter(
+                (Actor.first_name.ilike(f"%{query}%")) |
+                (Actor.middle_name.ilike(f"%{query}%")) |
+                (Actor.last_name.ilike(f"%{query}%"))
+            )
+        actors = actors.all()
+
+        for actor in actors:
+            # Construct full name from name components
+            name_parts = []
+            if actor.first_name:
+                name_parts.append(actor.first_name)
+            if actor.middle_name:
+                name_parts.append(actor.middle_name)
+            if actor.last_name:
+                name_parts.append(actor.last_name)
+
+            full_name = " ".join(name_parts) if name_parts else f"Actor {actor.id}"
+
+            entities.append({
+                "id": f"actor_{actor.id}",
+                "name": full_name,
+                "type": "actor"
+            })
+
+        # Query Locations
+        from storymaster.model.database.schema.base import Location
+        locations = session.query(Location).filter(
+            Location.setting_id == setting_id
+        )
+        if query:
+            locations = locations.filter(Location.name.ilike(f"%{query}%"))
+        locations = locations.all()
+
+        for location in locations:
+            entities.append({
+                "id": f"location_{location.id}",
+                "name": location.name,
+                "type": "location"
+            })
+
+        # Query Factions
+        factions = session.query(Faction).filter(
+            Faction.setting_id == setting_id
+        )
+        if query:
+            factions = factions.filter(Faction.name.ilike(f"%{query}%"))
+        factions = factions.all()
+
+        for faction in factions:
+            entities.append({
+                "id": f"faction_{faction.id}",
+                "name": faction.name,
+                "type": "faction"
+            })
+
+        # Query Objects
+        from storymaster.model.database.schema.base import Object_
+        objects = session.query(Object_).filter(
+            Object_.setting_id == setting_id
+        )
+        if query:
+            objects = objects.filter(Object_.name.ilike(f"%{query}%"))
+        objects = objects.all()
+
+        for obj in objects:
+            if obj.name:  # Only add if name is not None
+                entities.append({
+                    "id": f"object_{obj.id}",
+                    "name": obj.name,
+                    "type": "object"
+                })
+
+        # Query World Data
+        from storymaster.model.database.schema.base import WorldData
+        world_data_list = session.query(WorldData).filter(
+            WorldData.setting_id == setting_id
+        )
+        if query:
+            world_data_list = world_data_list.filter(WorldData.name.ilike(f"%{query}%"))
+        world_data_list = world_data_list.all()
+
+        for world_data in world_data_list:
+            if world_data.name:  # Only add if name is not None
+                entities.append({
+                    "id": f"worlddata_{world_data.id}",
+                    "name": world_data.name,
+                    "type": "worlddata"
+                })
+
+        # Sort by name
+        entities.sort(key=lambda x: x["name"])
+        return entities
+
     def _on_storyweaver_entity_search(self, query: str, storyline_id: int, setting_id: int):
         """
         Handle entity search request from Storyweaver widget.
@@ -4304,106 +4423,20 @@ class MainWindowController:
                 return
 
             with Session(self.model.engine) as session:
-                entities = []
-
-                # Query Actors (characters)
-                actors = session.query(Actor).filter(
-                    Actor.setting_id == setting_id
-                )
-                if query:
-                    # Search across first_name, middle_name, and last_name
-                    actors = actors.filter(
-                        (Actor.first_name.ilike(f"%{query}%")) |
-                        (Actor.middle_name.ilike(f"%{query}%")) |
-                        (Actor.last_name.ilike(f"%{query}%"))
-                    )
-                actors = actors.all()
-
-                for actor in actors:
-                    # Construct full name from name components
-                    name_parts = []
-                    if actor.first_name:
-                        name_parts.append(actor.first_name)
-                    if actor.middle_name:
-                        name_parts.append(actor.middle_name)
-                    if actor.last_name:
-                        name_parts.append(actor.last_name)
-
-                    full_name = " ".join(name_parts) if name_parts else f"Actor {actor.id}"
-
-                    entities.append({
-                        "id": f"actor_{actor.id}",
-                        "name": full_name,
-                        "type": "actor"
-                    })
-
-                # Query Locations
-                from storymaster.model.database.schema.base import Location
-                locations = session.query(Location).filter(
-                    Location.setting_id == setting_id
-                )
-                if query:
-                    locations = locations.filter(Location.name.ilike(f"%{query}%"))
-                locations = locations.all()
-
-                for location in locations:
-                    entities.append({
-                        "id": f"location_{location.id}",
-                        "name": location.name,
-                        "type": "location"
-                    })
-
-                # Query Factions
-                factions = session.query(Faction).filter(
-                    Faction.setting_id == setting_id
-                )
-                if query:
-                    factions = factions.filter(Faction.name.ilike(f"%{query}%"))
-                factions = factions.all()
-
-                for faction in factions:
-                    entities.append({
-                        "id": f"faction_{faction.id}",
-                        "name": faction.name,
-                        "type": "faction"
-                    })
-
-                # Query Objects
-                from storymaster.model.database.schema.base import Object_
-                objects = session.query(Object_).filter(
-                    Object_.setting_id == setting_id
-                )
-                if query:
-                    objects = objects.filter(Object_.name.ilike(f"%{query}%"))
-                objects = objects.all()
-
-                for obj in objects:
-                    if obj.name:  # Only add if name is not None
+                if query and lore_search.lore_search_available(session):
+                    # Ranked prefix search of entity names, best matches first
+                    entities = []
+                    for hit in lore_search.search_lore(
+                        session, query, setting_id, STORYWEAVER_ENTITY_TYPES, names_only=True
+                    ):
+                        id_prefix, entity_type = STORYWEAVER_ENTITY_TYPES[hit.entity_type]
                         entities.append({
-                            "id": f"object_{obj.id}",
-                            "name": obj.name,
-                            "type": "object"
+                            "id": f"{id_prefix}_{hit.entity_id}",
+                            "name": hit.name,
+                            "type": entity_type
                         })
-
-                # Query World Data
-                from storymaster.model.database.schema.base import WorldData
-                world_data_list = session.query(WorldData).filter(
-                    WorldData.setting_id == setting_id
-                )
-                if query:
-                    world_data_list = world_data_list.filter(WorldData.name.ilike(f"%{query}%"))
-                world_data_list = world_data_list.all()
-
-                for world_data in world_data_list:
-                    if world_data.name:  # Only add if name is not None
-                        entities.append({
-                            "id": f"worlddata_{world_data.id}",
-                            "name": world_data.name,
-                            "type": "worlddata"
-                        })
-
-                # Sort by name
-                entities.sort(key=lambda x: x["name"])
+                else:
+                    entities = self._query_storyweaver_entities(session, query, setting_id)
 
                 # Add aliases from the current document if available
                 current_doc = self.storyweaver_widget.get_current_document()
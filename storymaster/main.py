@@ -351,6 +351,35 @@ def check_and_run_migrations():
                 else:
                     print(f"❌ sync_uuid migration failed: {result.stderr}")
 
+        # Check for change log migration (seq-based sync watermarks)
+        # (create_all at startup may already have added the table itself, but
+        # not sync_device.last_sync_seq.)
+        table_names = inspector.get_table_names()
+        needs_change_log_migration = "user" in table_names and (
+            "sync_change_log" not in table_names
+            or (
+                "sync_device" in table_names
+                and "last_sync_seq"
+                not in [col["name"] for col in inspector.get_columns("sync_device")]
+            )
+        )
+        if needs_change_log_migration:
+            print("🔄 Database needs sync change log migration...")
+            print("   (Adding the change log used for incremental sync)")
+            migration_script = Path(__file__).parent.parent / "scripts" / "migrate_change_log.py"
+            if migration_script.exists():
+                import subprocess
+
+                result = subprocess.run(
+                    [sys.executable, str(migration_script)],
+                    capture_output=True,
+                    text=True,
+                )
+                if result.returncode == 0:
+                    print("✅ Change log migration completed.")
+                else:
+                    print(f"❌ Change log migration failed: {result.stderr}")
+
     except Exception as e:
         print(f"⚠️  Migration check failed: {e}")
         # Continue anyway - don't block startup
@@ -415,4 +444,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # Storyweaver formats large documents in worker processes; frozen builds
+    # must hand those workers off before starting the app
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     main()
@@ -9,6 +9,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import Session, joinedload
 
 from storymaster.model.database import base_connection, common_queries, schema
+from storymaster.model.database.schema.base import LORE_SEARCH_TABLE
 
 
 class BaseModel:
@@ -161,7 +162,12 @@ class BaseModel:
             "actor_to_stat",
         }
 
-        return [table for table in all_tables if table not in hidden_tables]
+        # The lore search index is an FTS5 table with shadow tables of its own
+        return [
+            table
+            for table in all_tables
+            if table not in hidden_tables and not table.startswith(LORE_SEARCH_TABLE)
+        ]
 
     def get_table_data(
         self,
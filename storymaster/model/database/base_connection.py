@@ -2,7 +2,9 @@
 
 import os
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine
+
+from storymaster.model.database.engine_factory import create_sqlite_engine
 
 # Use the same database path as initialization
 home_dir = os.path.expanduser("~")
@@ -16,12 +18,14 @@ test_db_path = os.path.join(db_dir, "test_storymaster.db")
 if not os.path.exists(db_path):
     from storymaster.model.database.schema.base import BaseTable
 
-    temp_engine = create_engine(f"sqlite:///{db_path}")
+    temp_engine = create_sqlite_engine(f"sqlite:///{db_path}")
     BaseTable.metadata.create_all(temp_engine)
     temp_engine.dispose()
 
-engine = create_engine(f"sqlite:///{db_path}")
-test_engine = create_engine(f"sqlite:///{test_db_path}")
+# The UI and the embedded sync server share this file; see engine_factory
+# for the WAL / busy_timeout profile that keeps them from blocking each other.
+engine = create_sqlite_engine(f"sqlite:///{db_path}")
+test_engine = create_sqlite_engine(f"sqlite:///{test_db_path}")
 
 # Idempotently create any tables introduced after the DB was first
 # initialized (e.g. SyncConflict). create_all skips existing tables, so this
@@ -0,0 +1,138 @@
+"""Shared engine factory with SQLite tuning profiles.
+
+The desktop app and the embedded sync server open the same SQLite file from
+different threads. With SQLite's defaults (rollback journal, no busy timeout)
+a reader blocks the writer and a second writer fails immediately with
+"database is locked". The "tuned" profile switches the file to WAL, where
+readers never block the writer, and waits for locks instead of failing.
+
+Pick a profile with the STORYMASTER_SQLITE_PROFILE environment variable, or
+pass one to create_sqlite_engine. scripts/benchmark_sqlite_profiles.py
+compares them.
+"""
+
+import os
+from dataclasses import dataclass, replace
+from typing import Any, Optional, Union
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """PRAGMAs applied to every new connection. None leaves SQLite's default."""
+
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    cache_size_kib: Optional[int] = None
+    mmap_size: Optional[int] = None
+    busy_timeout_ms: Optional[int] = None
+    foreign_keys: Optional[bool] = None
+    # QueuePool size for file databases; None keeps SQLAlchemy's default.
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+
+    def pragmas(self) -> list[str]:
+        statements = []
+        if self.journal_mode is not None:
+            statements.append(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.synchronous is not None:
+            statements.append(f"PRAGMA synchronous={self.synchronous}")
+        if self.cache_size_kib is not None:
+            # A negative cache_size is in KiB rather than pages.
+            statements.append(f"PRAGMA cache_size=-{self.cache_size_kib}")
+        if self.mmap_size is not None:
+            statements.append(f"PRAGMA mmap_size={self.mmap_size}")
+        if self.busy_timeout_ms is not None:
+            statements.append(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        if self.foreign_keys is not None:
+            statements.append(f"PRAGMA foreign_keys={'ON' if self.foreign_keys else 'OFF'}")
+        return statements
+
+
+# SQLite's own defaults; kept for comparison.
+DEFAULT_PROFILE = SQLiteProfile()
+
+TUNED_PROFILE = SQLiteProfile(
+    journal_mode="WAL",
+    synchronous="NORMAL",  # durable across app crashes; WAL makes it safe
+    cache_size_kib=32 * 1024,
+    mmap_size=256 * 1024 * 1024,
+    busy_timeout_ms=5000,
+    # Several delete paths remove parents whose children are still present,
+    # so FK enforcement stays opt-in (see "strict").
+    foreign_keys=False,
+    pool_size=5,
+    max_overflow=10,
+)
+
+STRICT_PROFILE = replace(TUNED_PROFILE, foreign_keys=True)
+
+PROFILES: dict[str, SQLiteProfile] = {
+    "default": DEFAULT_PROFILE,
+    "tuned": TUNED_PROFILE,
+    "strict": STRICT_PROFILE,
+}
+
+
+def get_profile(profile: Union[str, SQLiteProfile, None] = None) -> SQLiteProfile:
+    """Resolve a profile name; None reads STORYMASTER_SQLITE_PROFILE (default "tuned")."""
+    if isinstance(profile, SQLiteProfile):
+        return profile
+    name = profile or os.getenv("STORYMASTER_SQLITE_PROFILE", "tuned")
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown SQLite profile {name!r}; expected one of {sorted(PROFILES)}"
+        ) from None
+
+
+def _is_memory_database(database: Optional[str]) -> bool:
+    return not database or database == ":memory:" or database.startswith("file::memory:")
+
+
+def create_sqlite_engine(
+    url: str,
+    profile: Union[str, SQLiteProfile, None] = None,
+    **kwargs: Any,
+) -> Engine:
+    """
+    create_engine() for Storymaster databases.
+
+    SQLite URLs get the profile's PRAGMAs on every connection and, for file
+    databases, a thread-shareable connection pool. Other URLs are passed to
+    create_engine unchanged. Extra keyword arguments go to create_engine.
+    """
+    sa_url = make_url(url)
+    if sa_url.get_backend_name() != "sqlite":
+        return create_engine(url, **kwargs)
+
+    profile = get_profile(profile)
+    connect_args = {"check_same_thread": False, **kwargs.pop("connect_args", {})}
+    if profile.busy_timeout_ms is not None:
+        # pysqlite's own lock wait, which also covers BEGIN.
+        connect_args.setdefault("timeout", profile.busy_timeout_ms / 1000)
+
+    if not _is_memory_database(sa_url.database):
+        if profile.pool_size is not None:
+            kwargs.setdefault("pool_size", profile.pool_size)
+        if profile.max_overflow is not None:
+            kwargs.setdefault("max_overflow", profile.max_overflow)
+
+    engine = create_engine(url, connect_args=connect_args, **kwargs)
+
+    statements = profile.pragmas()
+    if statements:
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, _connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for statement in statements:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+
+    return engine
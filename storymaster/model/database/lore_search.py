@@ -0,0 +1,138 @@
+"""Ranked full-text queries over the lore search index (see schema.base)"""
+
+import re
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import Integer, bindparam, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from storymaster.model.database.schema.base import LORE_SEARCH_SOURCES, LORE_SEARCH_TABLE
+
+# Matches in the name count this much more than matches in the body
+NAME_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class LoreSearchHit(NamedTuple):
+    """One matching entity, best matches first (lower rank is better)"""
+
+    entity_type: str
+    entity_id: int
+    name: str
+    rank: float
+
+
+def build_match_query(search_text: str, names_only: bool = False) -> str:
+    """
+    FTS5 query for what a user typed: every word must match, each as a prefix.
+
+    Returns an empty string if the text has no words to search for.
+    """
+    words = _WORD_PATTERN.findall(search_text)
+    if not words:
+        return ""
+    # Quoted, so words like AND/NEAR are searched for rather than parsed
+    terms = " ".join(f'"{word}"*' for word in words)
+    return f"name : ({terms})" if names_only else terms
+
+
+def lore_search_available(session: Session) -> bool:
+    """Whether the database has the lore search index (SQLite with FTS5)"""
+    bind = session.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    return bool(
+        session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": LORE_SEARCH_TABLE},
+        ).first()
+    )
+
+
+def _scope_clause(entity_types: Optional[Iterable[str]]) -> tuple[str, dict]:
+    clause = """
+        (setting_id = :setting_id OR storyline_id IN (
+            SELECT storyline_id FROM storyline_to_setting WHERE setting_id = :setting_id
+        ))"""
+    params = {}
+    if entity_types is not None:
+        clause += " AND entity_type IN :entity_types"
+        params["entity_types"] = [name for name in entity_types if name in LORE_SEARCH_SOURCES]
+    return clause, params
+
+
+def _with_types(statement: TextClause, params: dict) -> TextClause:
+    if "entity_types" in params:
+        statement = statement.bindparams(bindparam("entity_types", expanding=True))
+    return statement
+
+
+def search_lore(
+    session: Session,
+    search_text: str,
+    setting_id: int,
+    entity_types: Optional[Iterable[str]] = None,
+    names_only: bool = False,
+    limit: Optional[int] = None,
+) -> list[LoreSearchHit]:
+    """
+    Search a setting's lore, best matches first.
+
+    Args:
+        session: Session on a database with the lore search index
+        search_text: What the user typed; words are matched as prefixes
+        setting_id: The setting searched (its storylines' notes included)
+        entity_types: Only these tables (see LORE_SEARCH_SOURCES); None for all
+        names_only: Match names only, not descriptions and other text
+        limit: At most this many hits
+    """
+    match = build_match_query(search_text, names_only)
+    if not match:
+        return []
+    scope, params = _scope_clause(entity_types)
+    statement = text(
+        f"""
+        SELECT entity_type, entity_id, name,
+               bm25({LORE_SEARCH_TABLE}, {NAME_WEIGHT}, {BODY_WEIGHT}) AS rank
+        FROM {LORE_SEARCH_TABLE}
+        WHERE {LORE_SEARCH_TABLE} MATCH :match AND {scope}
+        ORDER BY rank, entity_id
+        LIMIT :limit
+        """
+    )
+    rows = session.execute(
+        _with_types(statement, params),
+        {
+            "match": match,
+            "setting_id": setting_id,
+            "limit": -1 if limit is None else limit,
+            **params,
+        },
+    )
+    return [LoreSearchHit(*row) for row in rows]
+
+
+def lore_search_ids(search_text: str, setting_id: int, entity_type: str, names_only: bool = False):
+    """
+    Select of the ids of a table's matching entities, for use in an IN filter.
+
+    Returns None if the text has no words to search for.
+    """
+    match = build_match_query(search_text, names_only)
+    if not match:
+        return None
+    scope, params = _scope_clause([entity_type])
+    statement = text(
+        f"""
+        SELECT entity_id FROM {LORE_SEARCH_TABLE}
+        WHERE {LORE_SEARCH_TABLE} MATCH :match AND {scope}
+        """
+    )
+    return (
+        _with_types(statement, params)
+        .bindparams(match=match, setting_id=setting_id, **params)
+        .columns(entity_id=Integer)
+    )
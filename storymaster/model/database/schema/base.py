@@ -2,6 +2,7 @@
 
 import enum
 import uuid
+from typing import NamedTuple
 
 from datetime import datetime
 
@@ -14,11 +15,18 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
+    Table,
     Text,
     UniqueConstraint,
+    event,
+    inspect,
 )
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.sql import func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -1682,6 +1690,10 @@ class SyncDevice(BaseTable):
     last_sync_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True, name="last_sync_at"
     )
+    # sync_change_log.seq high-water mark of the last completed pull
+    last_sync_seq: Mapped[int | None] = mapped_column(
+        Integer, nullable=True, default=None, name="last_sync_seq"
+    )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, name="is_active")
 
     sync_logs: Mapped[list["SyncLog"]] = relationship(back_populates="device")
@@ -1706,6 +1718,38 @@ class SyncLog(BaseTable):
     device: Mapped["SyncDevice"] = relationship(back_populates="sync_logs")
 
 
+class SyncPushReceipt(BaseTable):
+    """One accepted row of a client push batch, so a retried batch can skip it.
+
+    Keyed by (device, client-generated batch_id, per-change seq). Records the
+    row state the client sent and the state the server left behind: a retry
+    matching either one is a resend of an already-applied change.
+    """
+
+    __tablename__ = "sync_push_receipt"
+    __table_args__ = (
+        UniqueConstraint("device_id", "batch_id", "seq", name="uq_sync_push_receipt_seq"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    device_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("sync_device.id"), nullable=False
+    )
+    batch_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    target_sync_uuid: Mapped[str] = mapped_column(String(36), nullable=False)
+    pushed_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    pushed_updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # None when the change needed no write (delete of an already-missing row)
+    applied_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    applied_updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
 class SyncPairingToken(BaseTable):
     """Represents temporary pairing tokens for device registration"""
 
@@ -1747,5 +1791,347 @@ class SyncConflict(BaseTable):
     )  # 'mine' | 'theirs' | 'merged' | 'discarded'
 
 
+# === Change log ===
+#
+# One row per changed entity row, keyed by a monotonically increasing `seq`.
+# SQLite triggers on every tracked table delete the row's previous entry and
+# append a new one on INSERT and UPDATE (soft deletes are updates), so the
+# log always holds each existing row once, at the seq of its latest change. Sync pulls
+# and pending-change counts are then a range read on (table_name, seq)
+# instead of an updated_at scan of every table.
+#
+# This is a plain Table rather than a BaseTable model: it carries none of the
+# sync metadata columns and is only ever written by the triggers.
+
+CHANGE_LOG_UNTRACKED_TABLES = frozenset(
+    {
+        "sync_device",
+        "sync_log",
+        "sync_pairing_tokens",
+        "sync_push_receipt",
+        "sync_conflict",
+        "sync_change_log",
+        "sync_field_state",
+    }
+)
+
+sync_change_log = Table(
+    "sync_change_log",
+    BaseTable.metadata,
+    Column("seq", Integer, primary_key=True, autoincrement=True),
+    Column("table_name", String(100), nullable=False),
+    Column("row_id", Integer, nullable=False),
+    UniqueConstraint("table_name", "row_id", name="uq_sync_change_log_row"),
+    Index("ix_sync_change_log_table_seq", "table_name", "seq"),
+    # AUTOINCREMENT: seq values are never reused, even after the entry with
+    # the highest seq is replaced.
+    sqlite_autoincrement=True,
+)
+
+# Per-row shadow of the synced columns, used to send field-level deltas.
+# `fields` is JSON: {column: [value_hash, seq, version]}, where seq is the
+# change-log seq and version the row version at which the column last
+# changed (seq is null until the row is next read for a pull or push).
+sync_field_state = Table(
+    "sync_field_state",
+    BaseTable.metadata,
+    Column("table_name", String(100), primary_key=True),
+    Column("row_id", Integer, primary_key=True),
+    Column("fields", Text, nullable=False),
+)
+
+
+def change_log_trigger_statements(table_name: str) -> list[str]:
+    """CREATE TRIGGER statements that keep sync_change_log current for a table"""
+    forget = f"""
+                DELETE FROM sync_change_log
+                WHERE table_name = '{table_name}' AND row_id = {{row}}.id;"""
+    append = f"""
+                INSERT INTO sync_change_log (table_name, row_id)
+                VALUES ('{table_name}', NEW.id);"""
+    statements = []
+    for suffix, action, body in (
+        ("ins", "INSERT", forget.format(row="NEW") + append),
+        ("upd", "UPDATE", forget.format(row="NEW") + append),
+        # Hard deletes are not synced; just drop the entry so every logged
+        # row_id points at an existing row.
+        ("del", "DELETE", forget.format(row="OLD")),
+    ):
+        statements.append(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS "trg_{table_name}_change_log_{suffix}"
+            AFTER {action} ON "{table_name}"
+            BEGIN{body}
+            END
+            """
+        )
+    return statements
+
+
+def change_log_backfill_statement(table_name: str) -> str:
+    """INSERT that logs every row of a table not already in sync_change_log"""
+    return f"""
+        INSERT INTO sync_change_log (table_name, row_id)
+        SELECT '{table_name}', id FROM "{table_name}"
+        WHERE id NOT IN (
+            SELECT row_id FROM sync_change_log WHERE table_name = '{table_name}'
+        )
+        ORDER BY updated_at, id
+        """
+
+
+def change_log_tracked_tables() -> list[str]:
+    """Names of all tables whose changes are recorded in sync_change_log"""
+    return [
+        table.name
+        for table in BaseTable.metadata.sorted_tables
+        if table.name not in CHANGE_LOG_UNTRACKED_TABLES
+    ]
+
+
+@event.listens_for(BaseTable.metadata, "after_create")
+def _install_change_log_triggers(target, connection, **kw):
+    """Install the change-log triggers whenever the schema is created"""
+    if connection.dialect.name != "sqlite":
+        return
+    # create_all may have been limited to a subset of tables.
+    existing = set(inspect(connection).get_table_names())
+    if sync_change_log.name not in existing:
+        return
+    # A log created just now next to pre-existing tables (create_all on an
+    # older database) must start out holding their rows.
+    log_is_new = sync_change_log in kw.get("tables", ())
+    for table_name in change_log_tracked_tables():
+        if table_name not in existing:
+            continue
+        if log_is_new:
+            connection.exec_driver_sql(change_log_backfill_statement(table_name))
+        for statement in change_log_trigger_statements(table_name):
+            connection.exec_driver_sql(statement)
+
+
+# === Lore search index ===
+#
+# An FTS5 table holding one row per lore entity: `name` is its name columns
+# and `body` the rest of its text. The id columns are stored unindexed so
+# matches can be filtered by setting and mapped back to their entities. As
+# with the change log, SQLite triggers keep it current, so rows written
+# outside the ORM (sync, imports, migrations) are indexed too.
+#
+# A row's rowid is entity_id * LORE_SEARCH_TYPE_SLOTS + the position of its
+# table in LORE_SEARCH_SOURCES, which lets the triggers replace it directly.
+
+LORE_SEARCH_TABLE = "lore_search"
+LORE_SEARCH_TYPE_SLOTS = 8
+
+# table -> (name columns, body columns)
+LORE_SEARCH_SOURCES: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "actor": (
+        ("first_name", "middle_name", "last_name"),
+        (
+            "title",
+            "job",
+            "actor_role",
+            "ideal",
+            "bond",
+            "flaw",
+            "appearance",
+            "strengths",
+            "weaknesses",
+            "notes",
+        ),
+    ),
+    "faction": (
+        ("name",),
+        (
+            "description",
+            "goals",
+            "faction_values",
+            "faction_income_sources",
+            "faction_expenses",
+        ),
+    ),
+    "location_": (
+        ("name",),
+        ("location_type", "description", "sights", "smells", "sounds", "feels", "tastes"),
+    ),
+    "object_": (("name",), ("description", "rarity")),
+    "history": (("name",), ("description",)),
+    "world_data": (("name",), ("description",)),
+    "litography_notes": (("title",), ("description",)),
+}
+
+_LORE_SEARCH_COLUMNS = "rowid, name, body, entity_type, entity_id, setting_id, storyline_id"
+
+
+def lore_search_table_statement() -> str:
+    """CREATE VIRTUAL TABLE statement for the lore search index"""
+    return f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {LORE_SEARCH_TABLE} USING fts5(
+            name,
+            body,
+            entity_type UNINDEXED,
+            entity_id UNINDEXED,
+            setting_id UNINDEXED,
+            storyline_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        """
+
+
+def _lore_search_rowid(table_name: str, row: str) -> str:
+    code = list(LORE_SEARCH_SOURCES).index(table_name)
+    return f"{row}.id * {LORE_SEARCH_TYPE_SLOTS} + {code}"
+
+
+def _lore_search_values(table_name: str, row: str) -> str:
+    """Column values of a table row's index entry, as SQL on `row`"""
+    name_columns, body_columns = LORE_SEARCH_SOURCES[table_name]
+    name = " || ".join(f'coalesce({row}."{column}" || \' \', \'\')' for column in name_columns)
+    body = " || char(10) || ".join(f'coalesce({row}."{column}", \'\')' for column in body_columns)
+    # Notes belong to a storyline; everything else to a setting
+    if table_name == "litography_notes":
+        scope = f"NULL, {row}.storyline_id"
+    else:
+        scope = f"{row}.setting_id, NULL"
+    return (
+        f"{_lore_search_rowid(table_name, row)}, trim({name}), {body}, "
+        f"'{table_name}', {row}.id, {scope}"
+    )
+
+
+def lore_search_trigger_statements(table_name: str) -> list[str]:
+    """CREATE TRIGGER statements that keep the lore search index current for a table"""
+    name_columns, body_columns = LORE_SEARCH_SOURCES[table_name]
+    scope_column = "storyline_id" if table_name == "litography_notes" else "setting_id"
+    watched = ", ".join(f'"{column}"' for column in (*name_columns, *body_columns, scope_column))
+    forget = f"""
+                DELETE FROM {LORE_SEARCH_TABLE}
+                WHERE rowid = {_lore_search_rowid(table_name, "OLD")};"""
+    add = f"""
+                INSERT INTO {LORE_SEARCH_TABLE} ({_LORE_SEARCH_COLUMNS})
+                VALUES ({_lore_search_values(table_name, "NEW")});"""
+    statements = []
+    for suffix, action, body in (
+        ("ins", "INSERT", add),
+        # Only edits to indexed columns; sync metadata updates don't reindex
+        ("upd", f"UPDATE OF {watched}", forget + add),
+        ("del", "DELETE", forget),
+    ):
+        statements.append(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS "trg_{table_name}_lore_search_{suffix}"
+            AFTER {action} ON "{table_name}"
+            BEGIN{body}
+            END
+            """
+        )
+    return statements
+
+
+def lore_search_backfill_statement(table_name: str) -> str:
+    """INSERT that indexes every row of a table (the index must not hold them yet)"""
+    return f"""
+        INSERT INTO {LORE_SEARCH_TABLE} ({_LORE_SEARCH_COLUMNS})
+        SELECT {_lore_search_values(table_name, f'"{table_name}"')} FROM "{table_name}"
+        """
+
+
+@event.listens_for(BaseTable.metadata, "after_create")
+def _install_lore_search_index(target, connection, **kw):
+    """Create (and fill) the lore search index and its triggers if missing"""
+    if connection.dialect.name != "sqlite":
+        return
+    existing = set(inspect(connection).get_table_names())
+    index_is_new = LORE_SEARCH_TABLE not in existing
+    if index_is_new:
+        try:
+            connection.exec_driver_sql(lore_search_table_statement())
+        except OperationalError:
+            # SQLite built without FTS5; searches fall back to LIKE scans
+            return
+    for table_name in LORE_SEARCH_SOURCES:
+        if table_name not in existing:
+            continue
+        if index_is_new:
+            connection.exec_driver_sql(lore_search_backfill_statement(table_name))
+        for statement in lore_search_trigger_statements(table_name):
+            connection.exec_driver_sql(statement)
+
+
+# === Access-path indexes ===
+#
+# Indexes for the columns reads filter on, declared once by column name and
+# applied to every table that has those columns: setting/storyline scoping,
+# both directions of the relationship tables, and the sync scans. SQLite
+# appends the rowid to every index, so ("setting_id",) also serves the
+# `setting_id = ? AND id > ? ORDER BY id` pages, and ("updated_at",) the
+# `ORDER BY updated_at, id` sync pulls. An OR over both columns of a pair
+# (actor_a_id = ? OR actor_b_id = ?) needs an index led by each of them.
+#
+# create_all only builds indexes with their tables, so the after_create hook
+# below adds missing ones to existing databases (as does
+# scripts/migrate_access_indexes.py).
+
+
+class AccessPathIndex(NamedTuple):
+    """Columns to index together, optionally only for rows where they are set"""
+
+    columns: tuple[str, ...]
+    # Index only rows whose first column is not NULL
+    partial: bool = False
+
+
+ACCESS_PATH_INDEXES: tuple[AccessPathIndex, ...] = (
+    AccessPathIndex(("setting_id",)),
+    AccessPathIndex(("storyline_id",)),
+    AccessPathIndex(("actor_a_id", "actor_b_id")),
+    AccessPathIndex(("actor_b_id",)),
+    AccessPathIndex(("faction_id", "actor_id")),
+    AccessPathIndex(("actor_id",)),
+    AccessPathIndex(("output_node_id", "input_node_id")),
+    AccessPathIndex(("input_node_id",)),
+    AccessPathIndex(("updated_at",)),
+    # Soft-deleted rows are few; tombstone scans only need those
+    AccessPathIndex(("deleted_at",), partial=True),
+)
 
 
+def _declare_access_path_indexes() -> list[Index]:
+    indexes = []
+    for table in BaseTable.metadata.sorted_tables:
+        for spec in ACCESS_PATH_INDEXES:
+            if not all(column in table.c for column in spec.columns):
+                continue
+            name = f"ix_{table.name}_{'_'.join(spec.columns)}"
+            options = {}
+            if spec.partial:
+                options["sqlite_where"] = table.c[spec.columns[0]].isnot(None)
+            indexes.append(
+                Index(name, *(table.c[column] for column in spec.columns), **options)
+            )
+    return indexes
+
+
+ACCESS_PATH_INDEX_OBJECTS = _declare_access_path_indexes()
+
+
+def access_path_index_statements(table_names: set[str] | None = None) -> list[str]:
+    """CREATE INDEX IF NOT EXISTS statements for the access-path indexes"""
+    dialect = sqlite.dialect()
+    return [
+        str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+        for index in ACCESS_PATH_INDEX_OBJECTS
+        if table_names is None or index.table.name in table_names
+    ]
+
+
+@event.listens_for(BaseTable.metadata, "after_create")
+def _install_access_path_indexes(target, connection, **kw):
+    """Add access-path indexes missing from tables that already existed"""
+    if connection.dialect.name != "sqlite":
+        return
+    existing = set(inspect(connection).get_table_names())
+    for statement in access_path_index_statements(existing):
+        connection.exec_driver_sql(statement)
@@ -1,17 +1,34 @@
 """
 Document model and file handling for .storyweaver format.
 """
-import json
+import copy
 import os
-import zipfile
-import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from storymaster.models.document_archive import pack_document, read_archive, write_archive
+from storymaster.models.entity_index import EntityLink, EntityLinkIndex
+
+# One thread for every document, so saves never overlap or reorder
+_save_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_save_executor() -> ThreadPoolExecutor:
+    global _save_executor
+    if _save_executor is None:
+        _save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storyweaver-save")
+    return _save_executor
 
 
 class StoryDocument:
-    """Represents a StoryWeaver document (.storyweaver ZIP file)."""
+    """
+    Represents a StoryWeaver document (.storyweaver ZIP file).
+
+    The text is stored as content-addressed segments (see document_archive),
+    so saving after a small edit only compresses the segments that changed.
+    """
 
     def __init__(self, path: Optional[str] = None):
         self.path = path
@@ -23,7 +40,14 @@ class StoryDocument:
             "storyline_id": None,
             "setting_id": None
         }
+        # Highlighter format cache (block hash -> format instructions / entity spans),
+        # saved in format_cache/ buckets so reopening only re-parses changed blocks
+        self.format_cache: Dict[str, Any] = {}
         self._is_modified = False
+        # Entity links in content, re-indexed lazily (and incrementally) after edits
+        self._link_index = EntityLinkIndex()
+        # Case-folded name/alias -> entity ids, rebuilt after entity_map changes
+        self._name_index: Optional[Dict[str, List[str]]] = None
 
         if path and os.path.isfile(path):
             self.load()
@@ -57,7 +81,8 @@ class StoryDocument:
     @property
     def cache_db_path(self) -> Optional[Path]:
         """
-        [Deprecated] Cache DB would be stored inside the ZIP file.
+        [Deprecated] The highlight cache is stored inside the ZIP file
+        (format_cache/ buckets, see format_cache).
         Returns None as there is no direct file path.
         """
         return None
@@ -68,6 +93,10 @@ class StoryDocument:
             self.content = content
             self._is_modified = True
 
+    def mark_modified(self) -> None:
+        """Mark as modified without copying content (it is set before saving)."""
+        self._is_modified = True
+
     def update_entity(self, entity_id: str, name: str, entity_type: str) -> None:
         """Update or add an entity to the entity map."""
         # Preserve existing aliases if entity already exists
@@ -81,6 +110,7 @@ class StoryDocument:
             "last_seen": datetime.now().isoformat(),
             "aliases": existing_aliases
         }
+        self._name_index = None
         self._is_modified = True
 
     def get_entity_name(self, entity_id: str) -> Optional[str]:
@@ -103,19 +133,13 @@ class StoryDocument:
         if entity_id not in self.metadata["entity_map"]:
             return None  # Signal that entity needs to be registered first
 
-        entity = self.metadata["entity_map"][entity_id]
-        if "aliases" not in entity:
-            entity["aliases"] = []
-
-        # Don't add duplicates (case-insensitive check)
-        if any(existing.lower() == alias.lower() for existing in entity["aliases"]):
-            return False
-
-        # Don't add the canonical name as an alias (case-insensitive check)
-        if alias.lower() == entity["name"].lower():
+        # Don't add duplicates or the canonical name (case-insensitive check)
+        if entity_id in self._names().get(alias.casefold(), ()):
             return False
 
-        entity["aliases"].append(alias)
+        entity = self.metadata["entity_map"][entity_id]
+        entity.setdefault("aliases", []).append(alias)
+        self._name_index = None
         self._is_modified = True
         return True
 
@@ -138,6 +162,7 @@ class StoryDocument:
             return False
 
         entity["aliases"].remove(alias)
+        self._name_index = None
         self._is_modified = True
         return True
 
@@ -175,6 +200,30 @@ class StoryDocument:
         names.extend(entity.get("aliases", []))
         return names
 
+    def find_entity_ids(self, name: str) -> List[str]:
+        """
+        Get the entities whose canonical name or an alias matches name.
+
+        Args:
+            name: Name or alias, matched case-insensitively
+
+        Returns:
+            Entity IDs in entity_map order (empty if none)
+        """
+        return list(self._names().get(name.casefold(), ()))
+
+    def _names(self) -> Dict[str, List[str]]:
+        """Case-folded name/alias -> entity ids, built on first use after a change."""
+        if self._name_index is None:
+            index: Dict[str, List[str]] = {}
+            for entity_id, entity in self.metadata["entity_map"].items():
+                for name in [entity["name"], *entity.get("aliases", [])]:
+                    ids = index.setdefault(name.casefold(), [])
+                    if entity_id not in ids:
+                        ids.append(entity_id)
+            self._name_index = index
+        return self._name_index
+
     def set_storymaster_db(self, db_path: str) -> None:
         """Set the path to the Storymaster database."""
         self.metadata["storymaster_db"] = db_path
@@ -192,6 +241,23 @@ class StoryDocument:
         self.metadata["setting_id"] = setting_id
         self._is_modified = True
 
+    def set_view_state(self, view_state: Dict[str, int]) -> bool:
+        """
+        Remember the editor's cursor/scroll position. Not a content change, so the
+        document is not marked modified; it is written with the next save.
+
+        Returns:
+            True if the stored position changed
+        """
+        if self.metadata.get("view_state") == view_state:
+            return False
+        self.metadata["view_state"] = dict(view_state)
+        return True
+
+    def get_view_state(self) -> Dict[str, int]:
+        """Get the last saved cursor/scroll position (empty if none)."""
+        return self.metadata.get("view_state") or {}
+
     def get_storyline_id(self) -> Optional[int]:
         """Get the associated storyline ID."""
         return self.metadata.get("storyline_id")
@@ -211,80 +277,72 @@ class StoryDocument:
             "storyline_id": None,
             "setting_id": None
         }
+        self.format_cache = {}
+        self._name_index = None
         self._is_modified = True
         self.save()
 
     def save(self) -> bool:
-        """Save the document to disk as a ZIP file."""
-        if not self.path:
-            return False
-
-        try:
-            # Update last sync time
-            self.metadata["last_sync"] = datetime.now().isoformat()
-
-            # Create a temporary file for atomic save
-            temp_fd, temp_path = tempfile.mkstemp(suffix='.storyweaver')
-            os.close(temp_fd)  # Close the file descriptor
+        """Save the document to disk, waiting until it has been written."""
+        return self.save_async().result()
 
-            try:
-                # Write to ZIP file
-                with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    # Write markdown content
-                    zf.writestr('document.md', self.content.encode('utf-8'))
-
-                    # Write metadata as JSON
-                    metadata_json = json.dumps(self.metadata, indent=2)
-                    zf.writestr('metadata.json', metadata_json.encode('utf-8'))
-
-                # Atomic move: replace old file with new one
-                import shutil
-                shutil.move(temp_path, self.path)
-
-                self._is_modified = False
-                return True
+    def save_async(self) -> Future:
+        """
+        Save the document on the background save thread.
 
-            except Exception:
-                # Clean up temp file if something went wrong
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                raise
+        Content and metadata are captured before this returns, so editing can
+        carry on while the file is written. Saves run one at a time, in the
+        order they were requested. The future's result is True on success.
+        """
+        if not self.path:
+            future = Future()
+            future.set_result(False)
+            return future
+
+        # Update last sync time
+        self.metadata["last_sync"] = datetime.now().isoformat()
+        path = self.path
+        content = self.content
+        metadata = copy.deepcopy(self.metadata)
+        format_cache = self.format_cache  # replaced, never mutated, by the editor
+        self._is_modified = False
+        return _get_save_executor().submit(self._write, path, content, metadata, format_cache)
 
+    def _write(
+        self, path: str, content: str, metadata: Dict[str, Any], format_cache: Dict[str, Any]
+    ) -> bool:
+        """Write a captured document (runs on the save thread)."""
+        try:
+            manifest, members = pack_document(content, metadata, format_cache)
+            write_archive(path, manifest, members)
+            return True
         except Exception as e:
             print(f"Error saving document: {e}")
+            self._is_modified = True
             return False
 
     def load(self) -> bool:
-        """Load the document from disk (ZIP file)."""
+        """Load the document from disk (chunked or single-file ZIP)."""
         if not self.path or not os.path.isfile(self.path):
             return False
 
         try:
-            with zipfile.ZipFile(self.path, 'r') as zf:
-                # Load markdown content
-                try:
-                    content_bytes = zf.read('document.md')
-                    self.content = content_bytes.decode('utf-8')
-                except KeyError:
-                    self.content = ""
-
-                # Load metadata
-                try:
-                    metadata_bytes = zf.read('metadata.json')
-                    self.metadata = json.loads(metadata_bytes.decode('utf-8'))
-                    # Ensure storyline_id and setting_id exist (for backwards compatibility)
-                    if "storyline_id" not in self.metadata:
-                        self.metadata["storyline_id"] = None
-                    if "setting_id" not in self.metadata:
-                        self.metadata["setting_id"] = None
-                except KeyError:
-                    self.metadata = {
-                        "storymaster_db": "",
-                        "last_sync": datetime.now().isoformat(),
-                        "entity_map": {},
-                        "storyline_id": None,
-                        "setting_id": None
-                    }
+            self.content, metadata, self.format_cache = read_archive(self.path)
+            if metadata is None:
+                metadata = {
+                    "storymaster_db": "",
+                    "last_sync": datetime.now().isoformat(),
+                    "entity_map": {},
+                    "storyline_id": None,
+                    "setting_id": None
+                }
+            # Ensure storyline_id and setting_id exist (for backwards compatibility)
+            if "storyline_id" not in metadata:
+                metadata["storyline_id"] = None
+            if "setting_id" not in metadata:
+                metadata["setting_id"] = None
+            self.metadata = metadata
+            self._name_index = None
 
             self._is_modified = False
             return True
@@ -295,26 +353,41 @@ class StoryDocument:
 
     def get_all_entity_ids(self) -> list:
         """Extract all entity IDs from the document content."""
-        import re
-        pattern = r'\[\[([^\]|]+)\|([^\]]+)\]\]'
-        matches = re.findall(pattern, self.content)
-        return [entity_id for _, entity_id in matches]
+        return [link.entity_id for link in self._links().links()]
 
     def get_entity_references(self) -> Dict[str, Dict[str, Any]]:
         """Get all entity references with their display names from content."""
-        import re
-        pattern = r'\[\[([^\]|]+)\|([^\]]+)\]\]'
-        matches = re.findall(pattern, self.content)
-
+        links = self._links()
         references = {}
-        for display_name, entity_id in matches:
-            if entity_id not in references:
-                # Check if we have cached info
-                cached = self.metadata["entity_map"].get(entity_id, {})
-                references[entity_id] = {
-                    "display_name": display_name,
-                    "type": cached.get("type", "unknown"),
-                    "cached_name": cached.get("name", display_name)
-                }
+        for entity_id in links.entity_ids():
+            display_name = links.occurrences(entity_id)[0].display_text
+            # Check if we have cached info
+            cached = self.metadata["entity_map"].get(entity_id, {})
+            references[entity_id] = {
+                "display_name": display_name,
+                "type": cached.get("type", "unknown"),
+                "cached_name": cached.get("name", display_name)
+            }
 
         return references
+
+    def get_entity_links(self) -> List[EntityLink]:
+        """Get every entity link in the content, in order."""
+        return self._links().links()
+
+    def get_entity_occurrences(self, entity_id: str) -> List[EntityLink]:
+        """Get every link to an entity, in order."""
+        return self._links().occurrences(entity_id)
+
+    def get_entity_links_in_range(self, start: int, end: int) -> List[EntityLink]:
+        """Get the links overlapping content[start:end]."""
+        return self._links().links_in_range(start, end)
+
+    def get_entity_link_at(self, position: int) -> Optional[EntityLink]:
+        """Get the link containing a content position, if any."""
+        return self._links().link_at(position)
+
+    def _links(self) -> EntityLinkIndex:
+        """The link index, brought up to date with content."""
+        self._link_index.update(self.content)
+        return self._link_index
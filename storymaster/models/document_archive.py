@@ -0,0 +1,364 @@
+"""
+Chunked container layout for .storyweaver files.
+
+A .storyweaver file is a ZIP. Older files hold the whole document in three
+members (document.md, metadata.json, format_cache.json) that are rewritten
+in full on every save. The chunked layout stores it as content-addressed
+members listed by a manifest:
+
+    manifest.json               member order and the save time
+    segments/<hash>.md          a run of lines of the manuscript
+    metadata/<hash>.json        document metadata (without last_sync)
+    format_cache/<hash>.json    one bucket of the highlighter cache
+
+Members are named after the hash of their content, so a save compresses
+only the members that are not in the file yet. The others are copied into
+the new file exactly as stored.
+"""
+
+import hashlib
+import json
+import os
+import re
+import stat
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+MANIFEST_NAME = "manifest.json"
+ARCHIVE_FORMAT = 2
+
+# Segments end before headings, or at a blank line picked by content once they
+# reach SEGMENT_MIN_SIZE characters, and are never longer than SEGMENT_MAX_SIZE
+SEGMENT_MIN_SIZE = 16 * 1024
+SEGMENT_MAX_SIZE = 128 * 1024
+
+# The format cache has an entry per distinct block, so it is split into buckets
+FORMAT_CACHE_BUCKETS = 32
+
+HEADING_PATTERN = re.compile(r"#{1,6}\s")
+BLANK_LINE_PATTERN = re.compile(r"\s*")
+
+# ZIP records (no ZIP64: documents stay far below 4 GiB)
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_UTF8_FLAG = 0x800
+
+
+class _StoredMember(NamedTuple):
+    """A member ready to write: deflated data plus what the headers need."""
+
+    data: bytes
+    crc: int
+    size: int
+    date_time: Tuple[int, int]  # DOS (date, time)
+
+
+def split_segments(content: str) -> List[str]:
+    """
+    Split text into segments that join back into it exactly.
+
+    Boundaries depend only on the lines around them (headings, and blank
+    lines after a line whose hash picks them), not on their offset, so an
+    edit changes the segment it falls in and leaves the others alone.
+    """
+    segments = []
+    start = position = previous = 0
+    length = len(content)
+    while position < length:
+        newline = content.find("\n", position)
+        end = length if newline < 0 else newline + 1
+        end = min(end, start + SEGMENT_MAX_SIZE)  # very long lines are cut as well
+        if position > start and HEADING_PATTERN.match(content, position):
+            segments.append(content[start:position])
+            start = position
+
+        size = end - start
+        if size >= SEGMENT_MAX_SIZE or (
+            size >= SEGMENT_MIN_SIZE
+            and BLANK_LINE_PATTERN.fullmatch(content, position, end)
+            and zlib.crc32(content[previous:position].encode("utf-8")) % 4 == 0
+        ):
+            segments.append(content[start:end])
+            start = end
+        previous = position
+        position = end
+
+    if start < length:
+        segments.append(content[start:])
+    return segments
+
+
+def _member_name(folder: str, data: bytes, extension: str) -> str:
+    return f"{folder}/{hashlib.blake2b(data, digest_size=12).hexdigest()}{extension}"
+
+
+def _pack_format_cache(
+    format_cache: Dict[str, Any], members: Dict[str, bytes]
+) -> Optional[Dict[str, Any]]:
+    """Split dict-valued fields into hash buckets; the other fields form the header."""
+    if not format_cache:
+        return None
+    header = {}
+    buckets: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(FORMAT_CACHE_BUCKETS)]
+    for field, value in format_cache.items():
+        if not isinstance(value, dict):
+            header[field] = value
+            continue
+        for key, entry in value.items():
+            bucket = buckets[zlib.crc32(key.encode("utf-8")) % FORMAT_CACHE_BUCKETS]
+            bucket.setdefault(field, {})[key] = entry
+
+    parts = []
+    for bucket in buckets:
+        if not bucket:
+            continue
+        # Sorted so a bucket with the same entries always hashes the same
+        data = json.dumps(bucket, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        name = _member_name("format_cache", data, ".json")
+        members[name] = data
+        parts.append(name)
+    return {"header": header, "parts": parts}
+
+
+def pack_document(
+    content: str, metadata: Dict[str, Any], format_cache: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """
+    Build the manifest and the content-addressed members for a document.
+
+    Returns:
+        (manifest, {member name: bytes}); the manifest itself is not a member
+    """
+    members: Dict[str, bytes] = {}
+    segments = []
+    for segment in split_segments(content):
+        data = segment.encode("utf-8")
+        name = _member_name("segments", data, ".md")
+        members[name] = data
+        segments.append(name)
+
+    # last_sync changes on every save; keeping it in the manifest means the
+    # metadata member is only rewritten when the metadata really changes
+    metadata = dict(metadata)
+    last_sync = metadata.pop("last_sync", None)
+    metadata_data = json.dumps(metadata, indent=2).encode("utf-8")
+    metadata_name = _member_name("metadata", metadata_data, ".json")
+    members[metadata_name] = metadata_data
+
+    manifest = {
+        "format": ARCHIVE_FORMAT,
+        "last_sync": last_sync,
+        "segments": segments,
+        "metadata": metadata_name,
+    }
+    cache = _pack_format_cache(format_cache, members)
+    if cache:
+        manifest["format_cache"] = cache
+    return manifest, members
+
+
+def _same_manifest(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    return {k: v for k, v in old.items() if k != "last_sync"} == {
+        k: v for k, v in new.items() if k != "last_sync"
+    }
+
+
+def _deflate(data: bytes) -> bytes:
+    """Raw deflate stream, as zipfile writes for ZIP_DEFLATED members."""
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _dos_date_time(date_time: Tuple[int, ...]) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time[:6]
+    return (year - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+
+def _stored_data(fp: BinaryIO, info: zipfile.ZipInfo) -> Optional[bytes]:
+    """A member's compressed bytes as stored, or None if they can't be copied as-is."""
+    if info.compress_type != zipfile.ZIP_DEFLATED or info.flag_bits & 0x1:
+        return None
+    fp.seek(info.header_offset)
+    header = fp.read(_LOCAL_HEADER.size)
+    if len(header) != _LOCAL_HEADER.size or header[:4] != b"PK\x03\x04":
+        return None
+    name_size, extra_size = struct.unpack("<HH", header[26:30])
+    fp.seek(info.header_offset + _LOCAL_HEADER.size + name_size + extra_size)
+    data = fp.read(info.compress_size)
+    return data if len(data) == info.compress_size else None
+
+
+def _reusable_members(
+    fp: BinaryIO, manifest: Dict[str, Any], members: Dict[str, bytes]
+) -> Optional[Dict[str, _StoredMember]]:
+    """
+    Members of the current file that can be copied into the new one.
+
+    Returns:
+        None if the file already holds exactly this document
+    """
+    try:
+        zf = zipfile.ZipFile(fp)
+    except zipfile.BadZipFile:
+        return {}
+    with zf:
+        if MANIFEST_NAME not in zf.NameToInfo:
+            return {}
+        try:
+            old_manifest = json.loads(zf.read(MANIFEST_NAME).decode("utf-8"))
+        except (ValueError, zipfile.BadZipFile, zlib.error):
+            old_manifest = {}
+        if _same_manifest(old_manifest, manifest) and all(
+            name in zf.NameToInfo for name in members
+        ):
+            return None
+
+        reusable = {}
+        for name in members:
+            info = zf.NameToInfo.get(name)
+            data = _stored_data(fp, info) if info else None
+            if data is not None:
+                reusable[name] = _StoredMember(
+                    data, info.CRC, info.file_size, _dos_date_time(info.date_time)
+                )
+        return reusable
+
+
+def write_archive(path: str, manifest: Dict[str, Any], members: Dict[str, bytes]) -> bool:
+    """
+    Save a packed document to path.
+
+    The archive is written to a temp file next to path, flushed to disk and
+    swapped in with os.replace, so path always holds a complete archive.
+    Members the current file already has are copied as stored, so only the
+    changed ones are compressed again. Older single-file archives and
+    unreadable files are written from scratch.
+
+    Returns:
+        False if the file already held exactly this document (nothing written)
+    """
+    try:
+        with open(path, "rb") as fp:
+            reusable = _reusable_members(fp, manifest, members)
+            mode = stat.S_IMODE(os.fstat(fp.fileno()).st_mode)
+    except FileNotFoundError:
+        reusable = {}
+        mode = None
+    if reusable is None:
+        return False
+
+    date_time = _dos_date_time(time.localtime()[:6])
+    stored = dict(reusable)
+    for name, data in members.items():
+        if name not in stored:
+            stored[name] = _StoredMember(_deflate(data), zlib.crc32(data), len(data), date_time)
+    manifest_data = json.dumps(manifest, indent=2).encode("utf-8")
+    stored[MANIFEST_NAME] = _StoredMember(
+        _deflate(manifest_data), zlib.crc32(manifest_data), len(manifest_data), date_time
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".storyweaver", dir=directory)
+    try:
+        with os.fdopen(temp_fd, "wb") as out:
+            if mode is not None:
+                os.chmod(temp_path, mode)  # mkstemp files are private to the user
+            _write_members(out, stored)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    _fsync_directory(directory)
+    return True
+
+
+def _write_members(out: BinaryIO, stored: Dict[str, _StoredMember]) -> None:
+    """Write members as a ZIP: local headers and data, then the central directory."""
+    directory = []
+    offset = 0
+    for name, member in stored.items():
+        name_data = name.encode("utf-8")
+        flags = 0 if name.isascii() else _UTF8_FLAG
+        date, dos_time = member.date_time
+        # Shared by the local header and the central directory entry
+        fields = (flags, zipfile.ZIP_DEFLATED, dos_time, date, member.crc)
+        fields += (len(member.data), member.size, len(name_data))
+        out.write(_LOCAL_HEADER.pack(0x04034B50, 20, *fields, 0))
+        out.write(name_data)
+        out.write(member.data)
+        directory.append(
+            _CENTRAL_HEADER.pack(0x02014B50, 20, 20, *fields, 0, 0, 0, 0, 0, offset) + name_data
+        )
+        offset += _LOCAL_HEADER.size + len(name_data) + len(member.data)
+
+    directory_data = b"".join(directory)
+    out.write(directory_data)
+    out.write(
+        _END_RECORD.pack(0x06054B50, 0, 0, len(stored), len(stored), len(directory_data), offset, 0)
+    )
+
+
+def _fsync_directory(directory: str) -> None:
+    """Make a rename in directory durable (not possible on Windows)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_archive(path: str) -> Tuple[str, Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Read a .storyweaver file in either layout.
+
+    Returns:
+        (content, metadata or None if the file has none, format cache or {})
+    """
+    with zipfile.ZipFile(path, "r") as zf:
+        if MANIFEST_NAME not in zf.NameToInfo:
+            return _read_single_file(zf)
+
+        manifest = json.loads(zf.read(MANIFEST_NAME).decode("utf-8"))
+        content = "".join(zf.read(name).decode("utf-8") for name in manifest["segments"])
+        metadata = json.loads(zf.read(manifest["metadata"]).decode("utf-8"))
+        metadata["last_sync"] = manifest.get("last_sync")
+
+        # The highlight cache is derived data; a bad one is just rebuilt
+        format_cache: Dict[str, Any] = {}
+        cache = manifest.get("format_cache")
+        if cache:
+            try:
+                format_cache.update(cache["header"])
+                for name in cache["parts"]:
+                    for field, entries in json.loads(zf.read(name).decode("utf-8")).items():
+                        format_cache.setdefault(field, {}).update(entries)
+            except (KeyError, ValueError):
+                format_cache = {}
+        return content, metadata, format_cache
+
+
+def _read_single_file(zf: zipfile.ZipFile) -> Tuple[str, Optional[Dict[str, Any]], Dict[str, Any]]:
+    """Read the original layout: document.md, metadata.json, format_cache.json."""
+    try:
+        content = zf.read("document.md").decode("utf-8")
+    except KeyError:
+        content = ""
+    try:
+        metadata = json.loads(zf.read("metadata.json").decode("utf-8"))
+    except KeyError:
+        metadata = None
+    try:
+        format_cache = json.loads(zf.read("format_cache.json").decode("utf-8"))
+    except (KeyError, ValueError):
+        format_cache = {}
+    return content, metadata, format_cache
@@ -0,0 +1,139 @@
+"""
+Index of the [[display text|entity_id]] links in a StoryDocument.
+"""
+
+import bisect
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# [[display text|entity_id]]
+ENTITY_LINK_PATTERN = re.compile(r"\[\[([^\]|]+)\|([^\]]+)\]\]")
+
+# Texts are compared this many characters at a time to find the edited range
+_COMPARE_CHUNK = 4096
+
+
+class EntityLink(NamedTuple):
+    """One link: its span in the text, what it shows and what it points to."""
+
+    start: int
+    end: int
+    display_text: str
+    entity_id: str
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    limit = min(len(a), len(b))
+    position = 0
+    while position < limit:
+        chunk = a[position : position + _COMPARE_CHUNK]
+        if b.startswith(chunk, position):
+            position += len(chunk)
+            continue
+        while position < limit and a[position] == b[position]:
+            position += 1
+        return position
+    return limit
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    length = 0
+    while length < limit:
+        size = min(_COMPARE_CHUNK, limit - length)
+        chunk = a[len(a) - length - size : len(a) - length]
+        if b.endswith(chunk, 0, len(b) - length):
+            length += size
+            continue
+        while length < limit and a[-1 - length] == b[-1 - length]:
+            length += 1
+        return length
+    return limit
+
+
+class EntityLinkIndex:
+    """
+    Every entity link in a text, in order and grouped by entity id.
+
+    update() rescans only the edited part of the text: the regex scan resumes
+    after the last link that ends before the first changed character, and
+    stops as soon as it finds a link that was already there (shifted) after
+    the last changed one, since everything from there on scans the same.
+    """
+
+    def __init__(self, text: str = ""):
+        self._text = ""
+        self._links: List[EntityLink] = []
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._by_entity: Optional[Dict[str, List[EntityLink]]] = None
+        self.update(text)
+
+    def update(self, text: str) -> None:
+        """Re-index for the new text."""
+        old = self._text
+        if text is old:
+            return
+        prefix = _common_prefix_length(old, text)
+        if prefix == len(old) == len(text):
+            self._text = text
+            return
+        suffix = _common_suffix_length(old, text, min(len(old), len(text)) - prefix)
+        delta = len(text) - len(old)
+        suffix_start = len(text) - suffix
+
+        keep = bisect.bisect_right(self._ends, prefix)
+        links = self._links[:keep]
+        resume = self._ends[keep - 1] if keep else 0
+        for match in ENTITY_LINK_PATTERN.finditer(text, resume):
+            if match.start() >= suffix_start:
+                old_index = bisect.bisect_left(self._starts, match.start() - delta)
+                if (
+                    old_index < len(self._starts)
+                    and self._starts[old_index] == match.start() - delta
+                ):
+                    links.extend(
+                        EntityLink(
+                            link.start + delta, link.end + delta, link.display_text, link.entity_id
+                        )
+                        for link in self._links[old_index:]
+                    )
+                    break
+            links.append(EntityLink(match.start(), match.end(), match.group(1), match.group(2)))
+
+        self._text = text
+        self._links = links
+        self._starts = [link.start for link in links]
+        self._ends = [link.end for link in links]
+        self._by_entity = None
+
+    def links(self) -> List[EntityLink]:
+        """All links, in text order."""
+        return list(self._links)
+
+    def occurrences(self, entity_id: str) -> List[EntityLink]:
+        """Links to entity_id, in text order."""
+        if self._by_entity is None:
+            by_entity: Dict[str, List[EntityLink]] = {}
+            for link in self._links:
+                by_entity.setdefault(link.entity_id, []).append(link)
+            self._by_entity = by_entity
+        return list(self._by_entity.get(entity_id, ()))
+
+    def entity_ids(self) -> List[str]:
+        """Distinct linked entity ids, in order of first appearance."""
+        if self._by_entity is None:
+            self.occurrences("")
+        return list(self._by_entity)
+
+    def links_in_range(self, start: int, end: int) -> List[EntityLink]:
+        """Links overlapping the text range [start, end)."""
+        first = bisect.bisect_right(self._ends, start)
+        last = bisect.bisect_left(self._starts, end)
+        return self._links[first:last]
+
+    def link_at(self, position: int) -> Optional[EntityLink]:
+        """The link containing position, if any."""
+        index = bisect.bisect_right(self._starts, position) - 1
+        if index >= 0 and position < self._ends[index]:
+            return self._links[index]
+        return None
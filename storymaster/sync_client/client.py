@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import uuid
 from datetime import datetime, timezone
 from typing import Callable, Optional
 
@@ -23,6 +25,9 @@ from storymaster.sync_server.models import (
     ConflictInfo,
     EntityChange,
 )
+from storymaster.sync_server.columnar import pack_changes, unpack_changes
+from storymaster.sync_server.compression import choose_encoding, compress, compress_stream
+from storymaster.sync_server.ndjson import NDJSON_MEDIA_TYPE
 from storymaster.sync_server.sync_engine import ENTITY_TYPE_MAP, SyncEngine
 
 logger = logging.getLogger(__name__)
@@ -43,17 +48,41 @@ class SyncClient:
 
     PULL_PATH = "/api/sync/pull"
     PUSH_PATH = "/api/sync/push"
+    PULL_STREAM_PATH = "/api/sync/pull/stream"
+    PUSH_STREAM_PATH = "/api/sync/push/stream"
     REGISTER_PATH = "/api/pair/register"
 
+    # Streamed pull changes are applied (and committed) this many at a time.
+    STREAM_APPLY_BATCH_SIZE = 500
+    # Non-streamed pushes are sent this many changes per request; each
+    # acknowledged request is a point an interrupted push can resume from.
+    PUSH_CHUNK_SIZE = 500
+
     def __init__(
         self,
         config: Optional[SyncClientConfig] = None,
         timeout: int = 30,
         engine: Optional[Engine] = None,
         persist: Optional[PersistFn] = None,
+        stream: bool = False,
+        columnar: bool = False,
+        deltas: bool = False,
     ):
         self.config = config or load_config()
         self.timeout = timeout
+        # `stream` selects the NDJSON transport: changes are produced,
+        # sent and applied incrementally instead of as one JSON document.
+        self.stream = stream
+        # `columnar` packs change batches as key tables + value arrays on the
+        # JSON transport. Requires a server that understands columnar_changes.
+        self.columnar = columnar
+        # `deltas` sends and asks for field-level deltas: updates carry only
+        # the columns that changed since the peer last had the row. Requires
+        # a server that understands EntityChange.fields.
+        self.deltas = deltas
+        # Request encodings the server advertised in its last response's
+        # Accept-Encoding header; None until we've heard from it.
+        self._server_accept_encoding: Optional[str] = None
         # `persist` lets tests pass a no-op so they don't write the user's
         # ~/.config/storymaster/sync.json. Default writes the real file.
         self._persist: PersistFn = persist if persist is not None else save_config
@@ -101,42 +130,57 @@ class SyncClient:
         return {"push": push_summary, "pull": pull_summary}
 
     def pull(self) -> dict:
-        """Pull changes from the server and apply them to the local DB."""
+        """Pull changes from the server page by page, applying each page as it arrives."""
         if not self.config.is_paired:
             raise SyncError("Not paired with a server")
+        if self.stream:
+            return self._pull_stream()
 
-        body = {
-            "since_timestamp": self.config.last_pulled_at,
-            "entity_types": None,
-        }
         url = self.config.server_url + self.PULL_PATH
-        r = self._post(url, json=body)
-        payload = r.json()
-
-        # Re-parse changes through the Pydantic model so types align.
-        changes = [EntityChange.model_validate(c) for c in payload.get("changes", [])]
-
         applied = {"accepted": 0, "rejected": 0, "conflicts": 0}
-        if changes:
-            with self._session() as session:
-                local = SyncEngine(session)
-                result = local.apply_changes(
-                    device=None,  # client side: no SyncLog row
-                    changes=changes,
-                    bump_versions=False,  # mirror server's authoritative versions
-                )
-                for conflict in result["conflicts"]:
-                    record_conflict(session, conflict, source="pull")
-                applied = {
-                    "accepted": result["accepted"],
-                    "rejected": result["rejected"],
-                    "conflicts": len(result["conflicts"]),
-                }
-
-        # Use the server's sync_timestamp as the new high-water mark.
-        server_ts = payload.get("sync_timestamp")
-        if server_ts:
-            self.config.last_pulled_at = server_ts
+        # The first page's server timestamp/seq is the new high-water mark:
+        # rows changed while we were paging will be picked up by the next pull.
+        first_sync_ts = None
+        first_sync_seq = None
+        cursor = None
+
+        while True:
+            body = {
+                "since_timestamp": self.config.last_pulled_at,
+                "since_seq": self._pull_since_seq(),
+                "entity_types": None,
+                "cursor": cursor,
+            }
+            if self.columnar:
+                body["columnar"] = True
+            if self.deltas:
+                body["deltas"] = True
+            r = self._post(url, json=body)
+            payload = r.json()
+            if first_sync_ts is None:
+                first_sync_ts = payload.get("sync_timestamp")
+                first_sync_seq = payload.get("sync_seq")
+
+            # Re-parse changes through the Pydantic model so types align.
+            changes = [EntityChange.model_validate(c) for c in payload.get("changes", [])]
+            if payload.get("columnar_changes"):
+                changes.extend(unpack_changes(payload["columnar_changes"]))
+            if changes:
+                page = self._apply_pulled_page(changes)
+                for key in applied:
+                    applied[key] += page[key]
+
+            next_cursor = payload.get("next_cursor")
+            if not payload.get("has_more"):
+                break
+            if not next_cursor or next_cursor == cursor:
+                raise SyncError("Server reported more changes but sent no new cursor")
+            cursor = next_cursor
+
+        # Use the server's sync_timestamp/sync_seq as the new high-water mark.
+        if first_sync_ts:
+            self.config.last_pulled_at = first_sync_ts
+            self.config.last_pulled_seq = first_sync_seq
             self._persist(self.config)
 
         logger.info("Pull: %s", applied)
@@ -146,28 +190,214 @@ class SyncClient:
         """Send local changes since last push to the server."""
         if not self.config.is_paired:
             raise SyncError("Not paired with a server")
+        if self.stream:
+            return self._push_stream()
 
         with self._session() as session:
             local = SyncEngine(session)
+            # Read before the changes: edits made while we read get a later
+            # seq, so they are still newer than the watermark next time.
+            push_seq = local.current_change_seq()
             since = self.config.last_pushed_at_dt
             changes = local.get_changes_since(since_timestamp=since)
+            if self.deltas:
+                # Without a watermark every column qualifies, but the rows'
+                # field state is still recorded for the next push.
+                changes = local.make_deltas(changes, self.config.last_pushed_seq or 0)
+        local_seq = push_seq
 
         if not changes:
+            self.config.pending_push = None
             self.config.last_pushed_at = datetime.now(timezone.utc).isoformat()
+            self.config.last_pushed_seq = push_seq
             self._persist(self.config)
-            return {"sent": 0, "accepted": 0, "rejected": 0, "conflicts": 0}
+            return {"sent": 0, "accepted": 0, "rejected": 0, "conflicts": 0, "skipped": 0}
+
+        # Batch seqs are list positions, so order the list by something that
+        # mirroring accepted states (which rewrites updated_at) can't change.
+        type_order = {entity_type: i for i, entity_type in enumerate(ENTITY_TYPE_MAP)}
+        changes.sort(key=lambda c: (type_order.get(c.entity_type, len(type_order)), c.entity_id))
+
+        pending = self.config.pending_push or {}
+        batch_id = pending.get("batch_id") or uuid.uuid4().hex
+        start = 0
+        failed = 0
+        if (
+            pending
+            and local_seq is not None
+            and pending.get("local_seq") == local_seq
+            and pending.get("size") == len(changes)
+        ):
+            # Nothing was written locally since the last acknowledged request,
+            # so this is the same list: carry on after what the server has.
+            start = pending["acked_seq"] + 1
+            failed = pending.get("failed", 0)
 
         url = self.config.server_url + self.PUSH_PATH
-        # Pydantic .model_dump() with mode='json' produces JSON-serializable types.
-        body = {"changes": [c.model_dump(mode="json", by_alias=False) for c in changes]}
-        # Index sent changes by sync_uuid so we can match accepted_states back
-        # to the entity_type (the response only carries sync_uuid).
-        type_by_uuid: dict[str, str] = {
-            c.sync_uuid: c.entity_type for c in changes if c.sync_uuid
+        summary = {"sent": 0, "accepted": 0, "rejected": 0, "conflicts": 0, "skipped": 0}
+        for base_seq in range(start, len(changes), self.PUSH_CHUNK_SIZE):
+            chunk = changes[base_seq:base_seq + self.PUSH_CHUNK_SIZE]
+            if self.columnar:
+                body = {"columnar_changes": pack_changes(chunk)}
+            else:
+                # Pydantic .model_dump() with mode='json' produces JSON-serializable types.
+                body = {"changes": [c.model_dump(mode="json", by_alias=False) for c in chunk]}
+            body["batch_id"] = batch_id
+            body["base_seq"] = base_seq
+            # Index sent changes by sync_uuid so we can match accepted_states back
+            # to the entity_type (older servers' responses only carry sync_uuid).
+            type_by_uuid: dict[str, str] = {
+                c.sync_uuid: c.entity_type for c in chunk if c.sync_uuid
+            }
+            r = self._post(url, json=body)
+            result = self._apply_push_response(r.json(), type_by_uuid)
+            summary["sent"] += len(chunk)
+            for key in ("accepted", "rejected", "conflicts", "skipped"):
+                summary[key] += result[key]
+            failed += result["rejected"] + result["conflicts"]
+
+            with self._session() as session:
+                local_seq = SyncEngine(session).current_change_seq()
+            self.config.pending_push = {
+                "batch_id": batch_id,
+                "acked_seq": base_seq + len(chunk) - 1,
+                "local_seq": local_seq,
+                "size": len(changes),
+                "failed": failed,
+            }
+            self._persist(self.config)
+
+        # Only advance the watermark if everything was accepted, otherwise we
+        # need the rejected rows to be considered again next push.
+        self.config.pending_push = None
+        if failed == 0:
+            self.config.last_pushed_at = datetime.now(timezone.utc).isoformat()
+            self.config.last_pushed_seq = push_seq
+        self._persist(self.config)
+
+        logger.info("Push: %s", summary)
+        return summary
+
+    # ---- internals ----
+
+    def _pull_since_seq(self) -> Optional[int]:
+        """
+        Change-log watermark to pull from. A first sync starts at 0; a config
+        that only has a timestamp watermark (from before the server had a
+        change log) pulls by timestamp once and picks up sync_seq from that.
+        """
+        if self.config.last_pulled_seq is not None:
+            return self.config.last_pulled_seq
+        if self.config.last_pulled_at is None:
+            return 0
+        return None
+
+    def _pull_stream(self) -> dict:
+        """Pull over the NDJSON transport, applying changes in small batches as they arrive."""
+        url = self.config.server_url + self.PULL_STREAM_PATH
+        body = {
+            "since_timestamp": self.config.last_pulled_at,
+            "since_seq": self._pull_since_seq(),
+            "entity_types": None,
         }
-        r = self._post(url, json=body)
-        payload = r.json()
+        applied = {"accepted": 0, "rejected": 0, "conflicts": 0}
+        sync_ts = None
+        sync_seq = None
+        complete = False
+        batch: list[EntityChange] = []
+
+        def flush_batch():
+            page = self._apply_pulled_page(batch)
+            for key in applied:
+                applied[key] += page[key]
+            batch.clear()
+
+        r = self._post(url, json=body, stream=True)
+        try:
+            for raw in r.iter_lines():
+                if not raw:
+                    continue
+                line = json.loads(raw)
+                kind = line.get("type")
+                if kind == "header":
+                    sync_ts = line.get("sync_timestamp")
+                    sync_seq = line.get("sync_seq")
+                elif kind == "change":
+                    batch.append(EntityChange.model_validate(line["change"]))
+                    if len(batch) >= self.STREAM_APPLY_BATCH_SIZE:
+                        flush_batch()
+                elif kind == "end":
+                    complete = True
+            if batch:
+                flush_batch()
+        except requests.RequestException as e:
+            raise SyncError(f"Network error during streamed pull: {e}") from e
+        finally:
+            r.close()
+
+        # Whatever arrived has been applied (upserts are idempotent), but only
+        # a complete stream may advance the watermark.
+        if not complete:
+            raise SyncError("Pull stream ended before the server finished sending")
+        if sync_ts:
+            self.config.last_pulled_at = sync_ts
+            self.config.last_pulled_seq = sync_seq
+            self._persist(self.config)
+
+        logger.info("Pull (stream): %s", applied)
+        return applied
 
+    def _push_stream(self) -> dict:
+        """Push over the NDJSON transport, generating the request body lazily."""
+        url = self.config.server_url + self.PUSH_STREAM_PATH
+        sent = 0
+        # Reuse the batch id of an interrupted push so the server skips the
+        # rows it already applied; the stream itself always restarts at seq 0.
+        pending = self.config.pending_push or {}
+        batch_id = pending.get("batch_id") or uuid.uuid4().hex
+        self.config.pending_push = {"batch_id": batch_id, "acked_seq": -1}
+        self._persist(self.config)
+
+        with self._session() as session:
+            local = SyncEngine(session)
+            since = self.config.last_pushed_at_dt
+
+            def body():
+                nonlocal sent
+                for change in local.iter_changes_since(since_timestamp=since):
+                    sent += 1
+                    yield change.model_dump_json(by_alias=False).encode("utf-8") + b"\n"
+
+            r = self._post(
+                url,
+                data=body(),
+                headers={
+                    "Content-Type": NDJSON_MEDIA_TYPE,
+                    "X-Sync-Batch-Id": batch_id,
+                    "X-Sync-Base-Seq": "0",
+                },
+            )
+        self.config.pending_push = None
+
+        # The server reports each accepted row's entity_type, so no
+        # sync_uuid → entity_type index has to be kept for the whole push.
+        return self._finish_push(r.json(), sent, {})
+
+    def _finish_push(self, payload: dict, sent: int, type_by_uuid: dict[str, str]) -> dict:
+        """Mirror accepted states, record conflicts and advance the push watermark."""
+        summary = {"sent": sent, **self._apply_push_response(payload, type_by_uuid)}
+
+        # Only advance the watermark if everything was accepted, otherwise we
+        # need the rejected rows to be considered again next push.
+        if summary["rejected"] == 0 and summary["conflicts"] == 0:
+            self.config.last_pushed_at = datetime.now(timezone.utc).isoformat()
+        self._persist(self.config)
+
+        logger.info("Push: %s", summary)
+        return summary
+
+    def _apply_push_response(self, payload: dict, type_by_uuid: dict[str, str]) -> dict:
+        """Mirror accepted states and record conflicts from one push response."""
         raw_conflicts = payload.get("conflicts", [])
         raw_states = payload.get("accepted_states", [])
 
@@ -181,7 +411,7 @@ class SyncClient:
                     except Exception:
                         logger.exception("Bad accepted_state in response: %r", raw)
                         continue
-                    entity_type = type_by_uuid.get(state.sync_uuid)
+                    entity_type = state.entity_type or type_by_uuid.get(state.sync_uuid)
                     if entity_type is None:
                         continue
                     self._apply_accepted_state(session, entity_type, state)
@@ -198,23 +428,30 @@ class SyncClient:
                             "Failed to record push conflict: %r", raw
                         )
 
-        summary = {
-            "sent": len(changes),
+        return {
             "accepted": payload.get("accepted", 0),
             "rejected": payload.get("rejected", 0),
             "conflicts": len(raw_conflicts),
+            "skipped": payload.get("skipped", 0),
         }
 
-        # Only advance the watermark if everything was accepted, otherwise we
-        # need the rejected rows to be considered again next push.
-        if summary["rejected"] == 0 and summary["conflicts"] == 0:
-            self.config.last_pushed_at = datetime.now(timezone.utc).isoformat()
-            self._persist(self.config)
-
-        logger.info("Push: %s", summary)
-        return summary
-
-    # ---- internals ----
+    def _apply_pulled_page(self, changes: list[EntityChange]) -> dict:
+        """Apply one page of pulled changes in its own session/transaction."""
+        with self._session() as session:
+            local = SyncEngine(session)
+            result = local.apply_changes(
+                device=None,  # client side: no SyncLog row
+                changes=changes,
+                bump_versions=False,  # mirror server's authoritative versions
+                batched=True,
+            )
+            for conflict in result["conflicts"]:
+                record_conflict(session, conflict, source="pull")
+            return {
+                "accepted": result["accepted"],
+                "rejected": result["rejected"],
+                "conflicts": len(result["conflicts"]),
+            }
 
     def _apply_accepted_state(
         self, session: Session, entity_type: str, state: AcceptedState
@@ -235,12 +472,47 @@ class SyncClient:
         row.version = state.version
         row.updated_at = state.updated_at
 
-    def _post(self, url: str, *, json: dict) -> requests.Response:
-        headers = {"Authorization": f"Bearer {self.config.auth_token}"}
+    def _post(
+        self,
+        url: str,
+        *,
+        json: Optional[dict] = None,
+        data=None,
+        headers: Optional[dict] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        headers = {"Authorization": f"Bearer {self.config.auth_token}", **(headers or {})}
+        if json is not None:
+            data = _encode_json(json)
+            headers["Content-Type"] = "application/json"
+
+        # Compress the request body if the server has told us it can take it.
+        # Response compression is negotiated by requests' own Accept-Encoding.
+        encoding = choose_encoding(self._server_accept_encoding)
+        body = data
+        if encoding and data is not None:
+            if isinstance(data, bytes):
+                body = compress(data, encoding)
+            else:
+                body = compress_stream(data, encoding)
+            headers["Content-Encoding"] = encoding
+
         try:
-            r = requests.post(url, json=json, headers=headers, timeout=self.timeout)
+            r = requests.post(url, data=body, headers=headers, timeout=self.timeout, stream=stream)
         except requests.RequestException as e:
             raise SyncError(f"Network error: {e}") from e
+        self._server_accept_encoding = r.headers.get("Accept-Encoding")
+
+        if r.status_code == 415 and encoding:
+            # Server no longer takes that encoding. Byte bodies can simply be
+            # resent as identity; a consumed generator cannot.
+            if not isinstance(data, bytes):
+                raise SyncError("Server rejected the compressed request body")
+            self._server_accept_encoding = None
+            retry_headers = {
+                k: v for k, v in headers.items() if k not in ("Authorization", "Content-Encoding")
+            }
+            return self._post(url, data=data, headers=retry_headers, stream=stream)
         if r.status_code == 401:
             raise SyncError("Unauthorized — auth token may have been revoked")
         if r.status_code >= 400:
@@ -251,6 +523,11 @@ class SyncClient:
         return _SessionContext(self._session_factory)
 
 
+def _encode_json(obj: dict) -> bytes:
+    """Serialize a request body the same way requests' `json=` would."""
+    return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+
 class _SessionContext:
     """Context-managed SQLAlchemy session for the local DB."""
 
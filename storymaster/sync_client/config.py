@@ -32,7 +32,12 @@ class SyncClientConfig:
     device_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     device_name: str = field(default_factory=lambda: os.uname().nodename if hasattr(os, "uname") else "desktop")
     last_pulled_at: Optional[str] = None  # ISO8601 string from server
+    last_pulled_seq: Optional[int] = None  # server change-log seq (preferred over last_pulled_at)
     last_pushed_at: Optional[str] = None  # ISO8601 string
+    last_pushed_seq: Optional[int] = None  # local change-log seq; push delta watermark
+    # Push batch in progress: {"batch_id", "acked_seq", "local_seq", "size", "failed"}.
+    # Lets an interrupted push resume after the last acknowledged change.
+    pending_push: Optional[dict] = None
 
     @property
     def is_paired(self) -> bool:
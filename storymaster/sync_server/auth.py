@@ -11,6 +11,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from storymaster.model.database.schema.base import SyncDevice, SyncPairingToken
+from storymaster.sync_server.concurrency import run_db
 from storymaster.sync_server.database import get_db
 
 # Security scheme
@@ -35,13 +36,7 @@ async def get_current_device(
     Validate auth token and return the authenticated device.
     Used as a FastAPI dependency for protected endpoints.
     """
-    token = credentials.credentials
-
-    # Query for device with this token
-    stmt = select(SyncDevice).where(
-        SyncDevice.auth_token == token, SyncDevice.is_active == True
-    )
-    device = db.execute(stmt).scalar_one_or_none()
+    device = await run_db(get_device_by_token, db, credentials.credentials)
 
     if not device:
         raise HTTPException(
@@ -68,15 +63,25 @@ def create_device(db: Session, device_id: str, device_name: str) -> SyncDevice:
     return device
 
 
+def get_device_by_token(db: Session, token: str) -> Optional[SyncDevice]:
+    """Get the active device holding this auth token"""
+    stmt = select(SyncDevice).where(
+        SyncDevice.auth_token == token, SyncDevice.is_active == True
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
 def get_device_by_id(db: Session, device_id: str) -> Optional[SyncDevice]:
     """Get device by device_id"""
     stmt = select(SyncDevice).where(SyncDevice.device_id == device_id)
     return db.execute(stmt).scalar_one_or_none()
 
 
-def update_last_sync(db: Session, device: SyncDevice) -> None:
-    """Update the last_sync_at timestamp for a device"""
+def update_last_sync(db: Session, device: SyncDevice, sync_seq: Optional[int] = None) -> None:
+    """Update the last_sync_at timestamp (and, after a pull, last_sync_seq) for a device"""
     device.last_sync_at = datetime.now()
+    if sync_seq is not None:
+        device.last_sync_seq = sync_seq
     db.commit()
 
 def create_pairing_token(db: Session, expires_in_minutes: int = 15) -> SyncPairingToken:
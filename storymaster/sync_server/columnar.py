@@ -0,0 +1,94 @@
+"""Columnar packing of EntityChange batches.
+
+The row-per-object JSON form repeats every key (`created_at`, `updated_at`,
+`sync_uuid`, every `*_sync_uuid` sibling...) on every change. The packed form
+stores each key once per group and each change as a plain value array:
+
+    {
+      "format": "storymaster-columnar/1",
+      "row_fields": ["entity_id", "sync_uuid", "operation", "version", "updated_at"],
+      "groups": [
+        {"entity_type": "actor", "data_keys": ["id", "first_name", ...],
+         "rows": [[12, "9f..", "update", 3, "2024-..", 12, "Ann", ...], ...]},
+        ...
+      ]
+    }
+
+A group is a run of consecutive changes with the same entity_type and the
+same data keys, so change order (parents before children) is preserved.
+Deletes have `data_keys: null` and rows holding only the row fields. Groups
+of field-level deltas also carry their `fields` list (absent = full rows).
+"""
+
+from typing import Any, Optional
+
+from storymaster.sync_server.models import EntityChange
+
+COLUMNAR_FORMAT = "storymaster-columnar/1"
+ROW_FIELDS = ["entity_id", "sync_uuid", "operation", "version", "updated_at"]
+
+
+def pack_changes(changes: list[EntityChange]) -> dict[str, Any]:
+    """Pack changes into the columnar form described in the module docstring."""
+    groups: list[dict[str, Any]] = []
+    current: Optional[dict[str, Any]] = None
+    current_key = None
+
+    for change in changes:
+        dumped = change.model_dump(mode="json", by_alias=False)
+        data = dumped["data"]
+        keys = tuple(data.keys()) if data is not None else None
+        group_key = (change.entity_type, keys, change.fields)
+        if current is None or group_key != current_key:
+            current = {
+                "entity_type": change.entity_type,
+                "data_keys": list(keys) if keys is not None else None,
+                "rows": [],
+            }
+            if change.fields is not None:
+                current["fields"] = list(change.fields)
+            current_key = group_key
+            groups.append(current)
+
+        row = [dumped[field] for field in ROW_FIELDS]
+        if keys is not None:
+            row.extend(data[key] for key in keys)
+        current["rows"].append(row)
+
+    return {"format": COLUMNAR_FORMAT, "row_fields": ROW_FIELDS, "groups": groups}
+
+
+def unpack_changes(packed: dict[str, Any]) -> list[EntityChange]:
+    """Inverse of pack_changes. Raises ValueError on malformed input."""
+    if not isinstance(packed, dict) or packed.get("format") != COLUMNAR_FORMAT:
+        raise ValueError("Unsupported or missing columnar format marker")
+    if packed.get("row_fields", ROW_FIELDS) != ROW_FIELDS:
+        raise ValueError(f"Unexpected columnar row fields: {packed.get('row_fields')!r}")
+
+    width = len(ROW_FIELDS)
+    changes: list[EntityChange] = []
+    for group in packed.get("groups", []):
+        entity_type = group["entity_type"]
+        keys = group.get("data_keys")
+        fields = group.get("fields")
+        expected = width + (len(keys) if keys is not None else 0)
+        for row in group["rows"]:
+            if len(row) != expected:
+                raise ValueError(
+                    f"Columnar row for {entity_type} has {len(row)} values, expected {expected}"
+                )
+            entity_id, sync_uuid, operation, version, updated_at = row[:width]
+            data = dict(zip(keys, row[width:])) if keys is not None else None
+            changes.append(
+                EntityChange(
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    sync_uuid=sync_uuid,
+                    operation=operation,
+                    entity_data=data,
+                    version=version,
+                    updated_at=updated_at,
+                    fields=fields,
+                )
+            )
+    return changes
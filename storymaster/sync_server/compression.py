@@ -0,0 +1,261 @@
+"""Content-Encoding negotiation for sync traffic.
+
+gzip is always available. zstd is offered (and preferred) when the optional
+`zstandard` package is installed. The server advertises what it can decode in
+an `Accept-Encoding` response header so clients can compress request bodies.
+"""
+
+import zlib
+from typing import Iterable, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Response content types worth compressing. Images etc. are already compressed.
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "application/x-ndjson")
+
+_GZIP_WBITS = 16 + zlib.MAX_WBITS  # gzip container, not raw deflate
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+
+def available_encodings() -> list[str]:
+    """Encodings this process can produce and consume, most preferred first."""
+    encodings = ["gzip"]
+    if zstandard is not None:
+        encodings.insert(0, "zstd")
+    return encodings
+
+
+def choose_encoding(
+    accept_encoding: Optional[str], supported: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    """
+    Pick the first of our `supported` encodings (default: available_encodings())
+    that the peer's Accept-Encoding header allows. None means send identity.
+    """
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    for encoding in supported if supported is not None else available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class StreamCompressor:
+    """Incremental compressor with the same API for gzip and zstd."""
+
+    def __init__(self, encoding: str):
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+            self._sync_flush = zlib.Z_SYNC_FLUSH
+        elif encoding == "zstd" and zstandard is not None:
+            self._obj = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compressobj()
+            self._sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    def compress(self, data: bytes, sync: bool = False) -> bytes:
+        """Compress a chunk. sync=True flushes so the peer can decode it immediately."""
+        out = self._obj.compress(data)
+        if sync:
+            out += self._obj.flush(self._sync_flush)
+        return out
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class StreamDecompressor:
+    """Incremental decompressor with the same API for gzip and zstd."""
+
+    def __init__(self, encoding: str):
+        if encoding == "gzip":
+            self._obj = zlib.decompressobj(_GZIP_WBITS)
+        elif encoding == "zstd" and zstandard is not None:
+            self._obj = zstandard.ZstdDecompressor().decompressobj()
+        else:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._obj.decompress(data)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """One-shot compress."""
+    compressor = StreamCompressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """One-shot decompress."""
+    return StreamDecompressor(encoding).decompress(data)
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress an iterable of chunks lazily, flushing after each one."""
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        out = compressor.compress(chunk, sync=True)
+        if out:
+            yield out
+    yield compressor.finish()
+
+
+class SyncCompressionMiddleware:
+    """
+    ASGI middleware that negotiates Content-Encoding in both directions.
+
+    - Request bodies with `Content-Encoding: gzip|zstd` are decompressed
+      incrementally before the app sees them; unknown encodings get a 415.
+    - JSON / NDJSON responses are compressed with the best encoding from the
+      request's Accept-Encoding. Bodies under `minimum_size` are sent as-is;
+      streamed bodies are flushed per chunk so NDJSON lines arrive promptly.
+    - Every response advertises `Accept-Encoding` so clients know which
+      request encodings the server takes.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        advertised = (b"accept-encoding", ", ".join(available_encodings()).encode("latin-1"))
+
+        request_encoding = headers.get("content-encoding", "").strip().lower()
+        if request_encoding and request_encoding != "identity":
+            if request_encoding not in available_encodings():
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 415,
+                        "headers": [(b"content-type", b"text/plain"), advertised],
+                    }
+                )
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": f"Unsupported Content-Encoding: {request_encoding}".encode(),
+                    }
+                )
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (k, v)
+                for k, v in scope["headers"]
+                if k.lower() not in (b"content-encoding", b"content-length")
+            ]
+            receive = self._decompressing_receive(receive, request_encoding)
+
+        response_encoding = choose_encoding(headers.get("accept-encoding"))
+        send = self._compressing_send(send, response_encoding, advertised)
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _decompressing_receive(receive, encoding: str):
+        decompressor = StreamDecompressor(encoding)
+
+        async def wrapped():
+            message = await receive()
+            if message["type"] == "http.request" and message.get("body"):
+                # Skip empty chunks: a zstd decompressobj refuses any call
+                # after its frame has ended.
+                message = dict(message)
+                message["body"] = decompressor.decompress(message["body"])
+            return message
+
+        return wrapped
+
+    def _compressing_send(self, send, encoding: Optional[str], advertised):
+        start_message = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = encoding is None
+
+        async def wrapped(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [advertised]
+                response_headers = {k.lower(): v for k, v in message["headers"]}
+                content_type = response_headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in response_headers or not content_type.startswith(
+                    COMPRESSIBLE_MEDIA_TYPES
+                ):
+                    passthrough = True
+                if passthrough:
+                    await send(message)
+                else:
+                    # Hold the start until we see the body: small bodies go out
+                    # uncompressed and need their original Content-Length.
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                start = start_message
+                start_message = None
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                start["headers"] = [
+                    (k, v) for k, v in start["headers"] if k.lower() != b"content-length"
+                ] + [
+                    (b"content-encoding", encoding.encode("latin-1")),
+                    (b"vary", b"Accept-Encoding"),
+                ]
+                compressor = StreamCompressor(encoding)
+                if not more_body:
+                    compressed = compressor.compress(body) + compressor.finish()
+                    start["headers"].append((b"content-length", str(len(compressed)).encode()))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send(start)
+
+            if more_body:
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": compressor.compress(body, sync=True),
+                        "more_body": True,
+                    }
+                )
+            else:
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": compressor.compress(body) + compressor.finish(),
+                    }
+                )
+
+        return wrapped
@@ -0,0 +1,117 @@
+"""Keeps synchronous database work off the sync server's event loop.
+
+The sync endpoints use the regular (blocking) SQLAlchemy Session. Handlers
+hand that work to `run_db`, which runs it on a bounded pool of worker threads
+so a long push never stalls health checks or pairing. On top of the pool:
+
+- `device_lock` serializes requests from one device, so a client that retries
+  while its previous request is still running waits for it.
+- Writes (`run_db(..., write=True)`) are limited to DB_WRITE_CONCURRENCY at a
+  time. SQLite has a single writer, and pushes from different devices that
+  queue here do not have to wait on each other's database locks.
+"""
+
+import asyncio
+import functools
+import weakref
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+import anyio.to_thread
+from anyio import CapacityLimiter
+
+from storymaster.sync_server.config import config
+
+T = TypeVar("T")
+
+# How many items a streamed iterator produces per trip to the worker pool.
+STREAM_CHUNK_SIZE = 100
+
+
+class DBWorkerPool:
+    """
+    Worker-thread limits and per-device locks for one server process.
+
+    asyncio primitives belong to the loop they were first used on, and each
+    uvicorn server (tests start several) runs its own loop, so the state is
+    kept per loop.
+    """
+
+    def __init__(self, workers: Optional[int] = None, write_concurrency: Optional[int] = None):
+        self.workers = workers
+        self.write_concurrency = write_concurrency
+        self._state: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _loop_state(self) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        state = self._state.get(loop)
+        if state is None:
+            state = {
+                "limiter": CapacityLimiter(self.workers or config.DB_WORKER_THREADS),
+                "writes": asyncio.Semaphore(self.write_concurrency or config.DB_WRITE_CONCURRENCY),
+                "devices": {},
+            }
+            self._state[loop] = state
+        return state
+
+    async def run(
+        self, func: Callable[..., T], *args: Any, write: bool = False, **kwargs: Any
+    ) -> T:
+        """Run func(*args, **kwargs) on a worker thread and return its result."""
+        state = self._loop_state()
+        call = functools.partial(func, *args, **kwargs)
+        if not write:
+            return await anyio.to_thread.run_sync(call, limiter=state["limiter"])
+        async with state["writes"]:
+            return await anyio.to_thread.run_sync(call, limiter=state["limiter"])
+
+    @asynccontextmanager
+    async def device_lock(self, key: Hashable):
+        """Hold the lock of one device; other requests from it wait their turn."""
+        devices = self._loop_state()["devices"]
+        entry = devices.get(key)
+        if entry is None:
+            entry = devices[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del devices[key]
+
+    async def iterate(
+        self, iterable: Iterable[T], chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[T]:
+        """Drive a blocking iterator from the pool, `chunk_size` items per trip."""
+        iterator = iter(iterable)
+
+        def next_chunk() -> list[T]:
+            chunk = []
+            for item in iterator:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    break
+            return chunk
+
+        while True:
+            chunk = await self.run(next_chunk)
+            if not chunk:
+                return
+            for item in chunk:
+                yield item
+
+
+db_pool = DBWorkerPool()
+
+
+async def run_db(func: Callable[..., T], *args: Any, write: bool = False, **kwargs: Any) -> T:
+    """Run blocking database work on the shared worker pool."""
+    return await db_pool.run(func, *args, write=write, **kwargs)
+
+
+def device_lock(key: Hashable):
+    """Serialize requests from the device identified by `key`."""
+    return db_pool.device_lock(key)
@@ -50,7 +50,13 @@ class SyncServerConfig:
 
     # Sync settings
     MAX_SYNC_BATCH_SIZE: int = 1000  # Maximum entities per sync batch
+    BATCHED_PUSH_APPLY: bool = True  # Apply each push in one transaction (savepoint per row)
     CONFLICT_RESOLUTION_MODE: str = "version"  # "version" or "timestamp"
+    COMPRESSION_MIN_SIZE: int = 1024  # Responses smaller than this (bytes) go uncompressed
+
+    # Concurrency settings (see concurrency.py)
+    DB_WORKER_THREADS: int = int(os.getenv("SYNC_DB_WORKER_THREADS", "4"))  # Threads for DB work
+    DB_WRITE_CONCURRENCY: int = int(os.getenv("SYNC_DB_WRITE_CONCURRENCY", "1"))  # Pushes applied at once
 
 
 # Global config instance
@@ -2,18 +2,15 @@
 
 from typing import Generator
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from storymaster.model.database.engine_factory import create_sqlite_engine
 from storymaster.sync_server.config import config
 
-# `check_same_thread=False` is SQLite-only; skip it for other dialects.
-_db_url = config.get_database_url()
-_connect_args = {"check_same_thread": False} if _db_url.startswith("sqlite") else {}
-
-engine = create_engine(
-    _db_url,
-    connect_args=_connect_args,
+# SQLite URLs get the shared tuning profile (WAL, busy_timeout, pooling) so the
+# server's worker threads and the desktop UI don't serialize on writer locks.
+engine = create_sqlite_engine(
+    config.get_database_url(),
     echo=False,  # Set to True for SQL query logging
 )
 
@@ -28,11 +28,17 @@ from storymaster.sync_server.auth import (
     get_device_by_id,
     update_last_sync,
 )
+from storymaster.sync_server.columnar import pack_changes, unpack_changes
+from storymaster.sync_server.compression import SyncCompressionMiddleware
+from storymaster.sync_server.concurrency import db_pool, device_lock, run_db
 from storymaster.sync_server.config import config
 from storymaster.sync_server.database import get_db
 from storymaster.sync_server.models import (
+    AcceptedState,
+    ConflictInfo,
     DevicePairRequest,
     DevicePairResponse,
+    EntityChange,
     HealthResponse,
     QRCodeResponse,
     SyncPullRequest,
@@ -41,6 +47,12 @@ from storymaster.sync_server.models import (
     SyncPushResponse,
     SyncStatusResponse,
 )
+from storymaster.sync_server.ndjson import (
+    NDJSON_MEDIA_TYPE,
+    encode_change_line,
+    encode_line,
+    iter_lines,
+)
 from storymaster.sync_server.sync_engine import SyncEngine
 
 # Create FastAPI app
@@ -59,6 +71,9 @@ app.add_middleware(
     allow_headers=config.CORS_HEADERS,
 )
 
+# Negotiate gzip/zstd for request and response bodies
+app.add_middleware(SyncCompressionMiddleware, minimum_size=config.COMPRESSION_MIN_SIZE)
+
 
 # === Exception Handlers ===
 
@@ -135,7 +150,7 @@ async def health_check(db: Session = Depends(get_db)):
 
 
 @app.get("/api/pair/qr-data", response_model=QRCodeResponse)
-async def get_qr_data(db: Session = Depends(get_db)):
+def get_qr_data(db: Session = Depends(get_db)):
     """
     Get QR code data for device pairing.
     Returns JSON with server IP, port, and a temporary pairing token.
@@ -148,7 +163,7 @@ async def get_qr_data(db: Session = Depends(get_db)):
 
 
 @app.get("/api/pair/qr-image")
-async def get_qr_image(db: Session = Depends(get_db)):
+def get_qr_image(db: Session = Depends(get_db)):
     """
     Generate a QR code image for device pairing.
     Returns a PNG image that can be scanned by the mobile app.
@@ -176,7 +191,7 @@ async def get_qr_image(db: Session = Depends(get_db)):
 
 
 @app.post("/api/pair/register", response_model=DevicePairResponse)
-async def register_device(request: DevicePairRequest, db: Session = Depends(get_db)):
+def register_device(request: DevicePairRequest, db: Session = Depends(get_db)):
     """
     Register a new device for syncing.
     Mobile app calls this after scanning QR code.
@@ -221,21 +236,63 @@ async def sync_pull(
 ):
     """
     Pull changes from desktop to mobile.
-    Returns all entities that have been modified since the given timestamp.
+    Returns one page of the entities modified since the given change-log seq
+    (or timestamp); when has_more is set, repeat the request with
+    cursor=next_cursor.
     """
+    async with device_lock(device.id):
+        return await run_db(_pull_page, db, device, request)
+
+
+def _pull_page(db: Session, device: SyncDevice, request: SyncPullRequest) -> SyncPullResponse:
+    """Body of /api/sync/pull; runs on the DB worker pool."""
     sync_engine = SyncEngine(db)
 
-    # Get changes since last sync
-    changes = sync_engine.get_changes_since(
-        since_timestamp=request.since_timestamp,
-        entity_types=request.entity_types,
-    )
+    page_size = min(request.limit or config.MAX_SYNC_BATCH_SIZE, config.MAX_SYNC_BATCH_SIZE)
 
-    # Update device's last sync time
-    update_last_sync(db, device)
+    # Every page of one pull reads up to the high-water mark of its first page.
+    if request.cursor is not None and request.cursor.until_seq is not None:
+        sync_seq = request.cursor.until_seq
+    else:
+        sync_seq = sync_engine.current_change_seq()
+
+    # Get this page of changes since last sync
+    try:
+        changes, next_cursor, has_more = sync_engine.get_changes_page(
+            since_timestamp=request.since_timestamp,
+            entity_types=request.entity_types,
+            cursor=request.cursor,
+            limit=page_size,
+            since_seq=request.since_seq,
+            until_seq=sync_seq,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Field-level deltas need a seq watermark to know what the device has.
+    if request.deltas and request.since_seq is not None:
+        changes = sync_engine.make_deltas(changes, request.since_seq)
+
+    # Update device's last sync time once the final page has been served
+    if not has_more:
+        update_last_sync(db, device, sync_seq=sync_seq)
+
+    if request.columnar:
+        return SyncPullResponse(
+            changes=[],
+            columnar_changes=pack_changes(changes),
+            sync_timestamp=datetime.now(),
+            sync_seq=sync_seq,
+            has_more=has_more,
+            next_cursor=next_cursor,
+        )
 
     return SyncPullResponse(
-        changes=changes, sync_timestamp=datetime.now(), has_more=False
+        changes=changes,
+        sync_timestamp=datetime.now(),
+        sync_seq=sync_seq,
+        has_more=has_more,
+        next_cursor=next_cursor,
     )
 
 
@@ -247,22 +304,191 @@ async def sync_push(
 ):
     """
     Push changes from mobile to desktop.
-    Applies changes with conflict detection and resolution.
+    Applies changes with conflict detection and resolution. With a batch_id,
+    changes already applied under the same batch and seq (an earlier attempt
+    whose response was lost) are skipped.
     """
+    async with device_lock(device.id):
+        return await run_db(_apply_push, db, device, request, write=True)
+
+
+def _apply_push(db: Session, device: SyncDevice, request: SyncPushRequest) -> SyncPushResponse:
+    """Body of /api/sync/push; runs on the DB worker pool."""
     sync_engine = SyncEngine(db)
 
-    # Apply changes with conflict detection
-    result = sync_engine.apply_changes(device, request.changes)
+    changes = list(request.changes)
+    if request.columnar_changes is not None:
+        try:
+            changes.extend(unpack_changes(request.columnar_changes))
+        except (KeyError, TypeError, ValueError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid columnar_changes: {e}",
+            )
+
+    # Apply changes with conflict detection. Batched mode commits the whole
+    # push once instead of once per row, so large pushes hold the SQLite
+    # write lock for far less time.
+    result = sync_engine.apply_changes(
+        device,
+        changes,
+        batched=config.BATCHED_PUSH_APPLY,
+        batch_id=request.batch_id,
+        seqs=range(request.base_seq, request.base_seq + len(changes)),
+    )
 
     # Update device's last sync time
     update_last_sync(db, device)
 
+    acked_seq = None
+    if request.batch_id is not None and changes:
+        acked_seq = request.base_seq + len(changes) - 1
+
     return SyncPushResponse(
         accepted=result["accepted"],
         accepted_states=result.get("accepted_states", []),
         conflicts=result["conflicts"],
         rejected=result["rejected"],
-        message=f"Processed {len(request.changes)} changes",
+        skipped=result["skipped"],
+        acked_seq=acked_seq,
+        message=f"Processed {len(changes)} changes",
+    )
+
+
+@app.post("/api/sync/pull/stream")
+async def sync_pull_stream(
+    request: SyncPullRequest,
+    device: SyncDevice = Depends(get_current_device),
+    db: Session = Depends(get_db),
+):
+    """
+    Streaming variant of /api/sync/pull.
+    Returns NDJSON (see ndjson.py): a header line, one line per change as the
+    query cursor produces it, then an end line. Not paginated; `cursor` and
+    `limit` are ignored.
+    """
+    sync_engine = SyncEngine(db)
+    sync_timestamp = datetime.now()
+    sync_seq = await run_db(sync_engine.current_change_seq)
+
+    def finish():
+        update_last_sync(db, db.merge(device), sync_seq=sync_seq)
+
+    async def generate():
+        # The stream outlives the request dependencies, so it owns the
+        # session from here on and closes it when done. Rows are read on the
+        # DB worker pool, a chunk at a time.
+        try:
+            async with device_lock(device.id):
+                yield encode_line(
+                    {
+                        "type": "header",
+                        "sync_timestamp": sync_timestamp.isoformat(),
+                        "sync_seq": sync_seq,
+                    }
+                )
+                count = 0
+                changes = sync_engine.iter_changes_since(
+                    since_timestamp=request.since_timestamp,
+                    entity_types=request.entity_types,
+                    since_seq=request.since_seq,
+                    until_seq=sync_seq,
+                )
+                async for change in db_pool.iterate(changes):
+                    yield encode_change_line(change.model_dump_json(by_alias=True))
+                    count += 1
+                await run_db(finish)
+                yield encode_line({"type": "end", "count": count})
+        finally:
+            # A worker still reading has finished by now: thread calls are
+            # not abandoned on cancellation.
+            db.close()
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@app.post("/api/sync/push/stream", response_model=SyncPushResponse)
+async def sync_push_stream(
+    request: Request,
+    device: SyncDevice = Depends(get_current_device),
+    db: Session = Depends(get_db),
+):
+    """
+    Streaming variant of /api/sync/push.
+    Accepts an NDJSON body (one EntityChange per line, may be chunked) and
+    applies it in batches of MAX_SYNC_BATCH_SIZE as lines arrive, so the
+    full push is never held in memory.
+
+    The optional X-Sync-Batch-Id / X-Sync-Base-Seq headers play the role of
+    batch_id / base_seq in /api/sync/push; each line takes the next seq.
+    """
+    sync_engine = SyncEngine(db)
+
+    batch_id = request.headers.get("X-Sync-Batch-Id") or None
+    try:
+        base_seq = int(request.headers.get("X-Sync-Base-Seq", "0"))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid X-Sync-Base-Seq"
+        )
+    if batch_id is not None and len(batch_id) > 64:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="X-Sync-Batch-Id is too long"
+        )
+
+    accepted = 0
+    rejected = 0
+    skipped = 0
+    received = 0
+    accepted_states: list[AcceptedState] = []
+    conflicts: list[ConflictInfo] = []
+    batch: list[EntityChange] = []
+    batch_seqs: list[int] = []
+
+    def apply_batch():
+        nonlocal accepted, rejected, skipped
+        result = sync_engine.apply_changes(
+            device,
+            batch,
+            batched=config.BATCHED_PUSH_APPLY,
+            batch_id=batch_id,
+            seqs=batch_seqs,
+        )
+        accepted += result["accepted"]
+        rejected += result["rejected"]
+        skipped += result["skipped"]
+        accepted_states.extend(result["accepted_states"])
+        conflicts.extend(result["conflicts"])
+        batch.clear()
+        batch_seqs.clear()
+
+    async with device_lock(device.id):
+        async for line in iter_lines(request.stream()):
+            seq = base_seq + received
+            received += 1
+            try:
+                batch.append(EntityChange.model_validate_json(line))
+                batch_seqs.append(seq)
+            except ValueError:
+                logger.warning("Rejecting unparseable change line in streamed push")
+                rejected += 1
+                continue
+            if len(batch) >= config.MAX_SYNC_BATCH_SIZE:
+                await run_db(apply_batch, write=True)
+        if batch:
+            await run_db(apply_batch, write=True)
+
+        # Update device's last sync time
+        await run_db(update_last_sync, db, device)
+
+    return SyncPushResponse(
+        accepted=accepted,
+        accepted_states=accepted_states,
+        conflicts=conflicts,
+        rejected=rejected,
+        skipped=skipped,
+        acked_seq=base_seq + received - 1 if batch_id is not None and received else None,
+        message=f"Processed {received} changes",
     )
 
 
@@ -274,7 +500,9 @@ async def sync_status(
     sync_engine = SyncEngine(db)
 
     # Count pending changes (changes since last sync)
-    pending_count = sync_engine.count_changes_since(device.last_sync_at)
+    pending_count = await run_db(
+        sync_engine.count_changes_since, device.last_sync_at, since_seq=device.last_sync_seq
+    )
 
     return SyncStatusResponse(
         device_id=device.device_id,
@@ -289,7 +517,7 @@ async def sync_status(
 
 
 @app.get("/api/devices")
-async def list_devices(db: Session = Depends(get_db)):
+def list_devices(db: Session = Depends(get_db)):
     """List all registered devices (for debugging/admin)"""
     stmt = select(SyncDevice).where(SyncDevice.is_active == True)
     devices = db.execute(stmt).scalars().all()
@@ -309,7 +537,7 @@ async def list_devices(db: Session = Depends(get_db)):
 
 
 @app.delete("/api/devices/{device_id}")
-async def remove_device(device_id: str, db: Session = Depends(get_db)):
+def remove_device(device_id: str, db: Session = Depends(get_db)):
     """Remove/deactivate a synced device"""
     # Find the device by device_id
     stmt = select(SyncDevice).where(SyncDevice.device_id == device_id)
@@ -60,6 +60,12 @@ class EntityChange(BaseModel):
     )
     version: Optional[int] = Field(None, description="Entity version for conflict detection")
     updated_at: Optional[datetime] = Field(None, description="Timestamp of the change")
+    fields: Optional[list[str]] = Field(
+        None,
+        description="Delta update: the only columns `data` carries (plus their FK "
+        "`_sync_uuid` siblings). null = the full row. On a push, `version` is the "
+        "version the delta was made against.",
+    )
 
     @model_validator(mode='before')
     @classmethod
@@ -114,15 +120,49 @@ class EntityChange(BaseModel):
             return str(obj)
 
 
+class SyncCursor(BaseModel):
+    """Continuation point of a paginated pull: the last change already sent"""
+
+    updated_at: datetime = Field(..., description="updated_at of the last change sent")
+    entity_type: str = Field(..., description="Entity type of the last change sent")
+    id: int = Field(..., description="Server-local id of the last change sent")
+    seq: Optional[int] = Field(
+        None, description="Change-log seq of the last change sent (since_seq pulls only)"
+    )
+    until_seq: Optional[int] = Field(
+        None, description="Change-log high-water mark this pull was started at"
+    )
+
+
 class SyncPullRequest(BaseModel):
     """Request to pull changes from desktop"""
 
     since_timestamp: Optional[datetime] = Field(
         None, description="Only get changes after this time (null = full sync)"
     )
+    since_seq: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Only get changes after this change-log seq (0 = full sync); "
+        "takes precedence over since_timestamp",
+    )
     entity_types: Optional[list[str]] = Field(
         None, description="Filter by entity types (null = all types)"
     )
+    cursor: Optional[SyncCursor] = Field(
+        None, description="next_cursor from the previous page (null = first page)"
+    )
+    limit: Optional[int] = Field(
+        None, ge=1, description="Page size; capped at the server's MAX_SYNC_BATCH_SIZE"
+    )
+    columnar: bool = Field(
+        False, description="Return changes packed in columnar_changes (see columnar.py)"
+    )
+    deltas: bool = Field(
+        False,
+        description="Send updates as field-level deltas (EntityChange.fields); "
+        "only honoured together with since_seq",
+    )
 
 
 class SyncPullResponse(BaseModel):
@@ -130,13 +170,38 @@ class SyncPullResponse(BaseModel):
 
     changes: list[EntityChange] = Field(..., description="List of entity changes")
     sync_timestamp: datetime = Field(..., description="Server timestamp of this sync")
+    sync_seq: Optional[int] = Field(
+        None,
+        description="Change-log high-water mark of this sync; pass as since_seq next time "
+        "(null if the server has no change log)",
+    )
     has_more: bool = Field(False, description="True if more changes exist (pagination)")
+    next_cursor: Optional[SyncCursor] = Field(
+        None, description="Pass back as `cursor` to fetch the next page (null when done)"
+    )
+    columnar_changes: Optional[dict[str, Any]] = Field(
+        None, description="Packed changes when the request asked for columnar (changes is then empty)"
+    )
 
 
 class SyncPushRequest(BaseModel):
     """Request to push changes to desktop"""
 
-    changes: list[EntityChange] = Field(..., description="Changes from mobile device")
+    changes: list[EntityChange] = Field(
+        default_factory=list, description="Changes from mobile device"
+    )
+    columnar_changes: Optional[dict[str, Any]] = Field(
+        None, description="Changes packed in columnar form (applied after `changes`)"
+    )
+    batch_id: Optional[str] = Field(
+        None,
+        max_length=64,
+        description="Client-generated id of the push batch this request belongs to. "
+        "Changes already applied under the same batch_id and seq are skipped.",
+    )
+    base_seq: int = Field(
+        0, ge=0, description="Batch seq of the first change; the rest follow consecutively"
+    )
 
 
 class ConflictInfo(BaseModel):
@@ -188,6 +253,7 @@ class AcceptedState(BaseModel):
     conflict.
     """
 
+    entity_type: Optional[str] = None
     sync_uuid: str
     version: int
     updated_at: datetime
@@ -203,6 +269,12 @@ class SyncPushResponse(BaseModel):
     )
     conflicts: list[ConflictInfo] = Field([], description="Conflicts that need resolution")
     rejected: int = Field(0, description="Number of changes rejected")
+    skipped: int = Field(
+        0, description="Accepted changes that were already applied earlier in this batch"
+    )
+    acked_seq: Optional[int] = Field(
+        None, description="Highest batch seq processed by this request (batched pushes only)"
+    )
     message: str = "Sync completed"
 
 
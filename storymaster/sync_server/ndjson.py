@@ -0,0 +1,39 @@
+"""Newline-delimited JSON framing for the streaming sync transport.
+
+Every line is one JSON object with a "type" key:
+
+  {"type": "header", "sync_timestamp": "...",  first line of a pull stream
+   "sync_seq": 42}
+  {"type": "change", "change": {...}}           one EntityChange
+  {"type": "end", "count": 123}                 last line; absent if truncated
+
+Push request bodies are plain EntityChange objects, one per line.
+"""
+
+import json
+from typing import Any, AsyncIterator
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def encode_line(obj: Any) -> bytes:
+    """Serialize a JSON-compatible object as one NDJSON line."""
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def encode_change_line(change_json: str) -> bytes:
+    """Wrap an already-serialized EntityChange in a "change" line."""
+    return b'{"type":"change","change":' + change_json.encode("utf-8") + b"}\n"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Re-split an async stream of arbitrary byte chunks into non-empty lines."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
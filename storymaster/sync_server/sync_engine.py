@@ -1,10 +1,12 @@
 """Core sync engine for conflict detection and resolution"""
 
+import hashlib
+import json
 import logging
-from datetime import datetime, timezone
-from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional, Sequence
 
-from sqlalchemy import DateTime, func, inspect, select, text
+from sqlalchemy import DateTime, delete, func, insert, inspect, select, text
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -55,9 +57,17 @@ from storymaster.model.database.schema.base import (
     SubRace,
     SyncDevice,
     SyncLog,
+    SyncPushReceipt,
     WorldData,
+    sync_change_log,
+    sync_field_state,
+)
+from storymaster.sync_server.models import (
+    AcceptedState,
+    ConflictInfo,
+    EntityChange,
+    SyncCursor,
 )
-from storymaster.sync_server.models import AcceptedState, ConflictInfo, EntityChange
 
 from storymaster.model.database.schema.base import User
 
@@ -127,6 +137,94 @@ TABLE_TO_MODEL = {
 # Sync metadata is handled explicitly.
 _FIELDS_NOT_DIRECTLY_COPIED = {"id"}
 
+# Identity and sync bookkeeping: never part of a field-level delta. Deltas
+# carry version/updated_at at the top level of the EntityChange instead.
+_DELTA_EXCLUDED_FIELDS = {"id", "sync_uuid", "created_at", "updated_at", "deleted_at", "version"}
+
+# Max bound parameters per `IN (...)` lookup. Stays well under SQLite's
+# historical 999-variable limit.
+_IN_CLAUSE_CHUNK_SIZE = 500
+
+# Rows fetched from the DB cursor at a time while building changes.
+_ROW_FETCH_CHUNK_SIZE = 500
+
+
+def _field_hash(value: Any) -> str:
+    """Short, stable digest of one as_dict() column value."""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def _chunked(values: list, size: int = _IN_CLAUSE_CHUNK_SIZE):
+    """Yield successive `size`-length slices of `values`."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class _SyncUuidMap:
+    """
+    Per-request translation table between local ids and sync_uuids.
+
+    Keyed by SQL table name. Lookups are filled in bulk with one
+    `IN (...)` query per table (see prefetch_ids / prefetch_uuids); misses
+    are cached too, so a row referenced by thousands of children is only
+    looked up once. Rows the engine itself reads or inserts are recorded via
+    `remember`, which lets later rows in the same request resolve against
+    them without touching the database.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._uuid_by_id: dict[str, dict[int, Optional[str]]] = {}
+        self._id_by_uuid: dict[str, dict[str, Optional[int]]] = {}
+
+    def remember(self, table_name: str, local_id: int, sync_uuid: str) -> None:
+        """Record a known (id, sync_uuid) pair for `table_name`."""
+        self._uuid_by_id.setdefault(table_name, {})[local_id] = sync_uuid
+        self._id_by_uuid.setdefault(table_name, {})[sync_uuid] = local_id
+
+    def prefetch_ids(self, table_name: str, local_ids) -> None:
+        """Resolve every not-yet-known local id in `local_ids` in bulk."""
+        model = TABLE_TO_MODEL.get(table_name)
+        if model is None:
+            return
+        known = self._uuid_by_id.setdefault(table_name, {})
+        wanted = sorted({i for i in local_ids if i is not None and i not in known})
+        for chunk in _chunked(wanted):
+            stmt = select(model.id, model.sync_uuid).where(model.id.in_(chunk))
+            for local_id, sync_uuid in self.db.execute(stmt):
+                self.remember(table_name, local_id, sync_uuid)
+        for local_id in wanted:
+            known.setdefault(local_id, None)
+
+    def prefetch_uuids(self, table_name: str, sync_uuids) -> None:
+        """Resolve every not-yet-known sync_uuid in `sync_uuids` in bulk."""
+        model = TABLE_TO_MODEL.get(table_name)
+        if model is None:
+            return
+        known = self._id_by_uuid.setdefault(table_name, {})
+        wanted = sorted({u for u in sync_uuids if u is not None and u not in known})
+        for chunk in _chunked(wanted):
+            stmt = select(model.id, model.sync_uuid).where(model.sync_uuid.in_(chunk))
+            for local_id, sync_uuid in self.db.execute(stmt):
+                self.remember(table_name, local_id, sync_uuid)
+        for sync_uuid in wanted:
+            known.setdefault(sync_uuid, None)
+
+    def sync_uuid_for(self, table_name: str, local_id: Optional[int]) -> Optional[str]:
+        if local_id is None:
+            return None
+        if local_id not in self._uuid_by_id.get(table_name, {}):
+            self.prefetch_ids(table_name, [local_id])
+        return self._uuid_by_id.get(table_name, {}).get(local_id)
+
+    def local_id_for(self, table_name: str, sync_uuid: Optional[str]) -> Optional[int]:
+        if sync_uuid is None:
+            return None
+        if sync_uuid not in self._id_by_uuid.get(table_name, {}):
+            self.prefetch_uuids(table_name, [sync_uuid])
+        return self._id_by_uuid.get(table_name, {}).get(sync_uuid)
+
 
 class SyncEngine:
     """Handles synchronization logic and conflict resolution"""
@@ -135,6 +233,23 @@ class SyncEngine:
         self.db = db
         # Cache of model_class → {column_name: target_table_name} for FK columns.
         self._fk_cache: dict[type, dict[str, str]] = {}
+        # True while apply_changes runs in batched mode: per-row writes only
+        # flush, and the whole batch is committed once at the end.
+        self._batched = False
+        # id ↔ sync_uuid translations shared by get_changes_since and
+        # apply_changes for the lifetime of this engine (one request).
+        self._uuid_map = _SyncUuidMap(db)
+        # Whether the DB has sync_change_log; checked lazily, once.
+        self._has_change_log: Optional[bool] = None
+        # Same for sync_field_state (field-level deltas).
+        self._has_field_state: Optional[bool] = None
+
+    def _commit(self) -> None:
+        """Commit the current unit of work, or just flush inside a batch."""
+        if self._batched:
+            self.db.flush()
+        else:
+            self.db.commit()
 
     def _fk_columns(self, model_class) -> dict[str, str]:
         """Return {column_name: target_table_name} for every FK on this model."""
@@ -154,23 +269,37 @@ class SyncEngine:
         self, table_name: str, sync_uuid: str
     ) -> Optional[int]:
         """Find the local integer id of a row in `table_name` with the given sync_uuid."""
-        model = TABLE_TO_MODEL.get(table_name)
-        if model is None or sync_uuid is None:
-            return None
-        stmt = select(model.id).where(model.sync_uuid == sync_uuid)
-        return self.db.execute(stmt).scalar_one_or_none()
+        return self._uuid_map.local_id_for(table_name, sync_uuid)
 
     def _lookup_sync_uuid_by_local_id(
         self, table_name: str, local_id: Optional[int]
     ) -> Optional[str]:
         """Find the sync_uuid of a row in `table_name` by its local integer id."""
-        if local_id is None:
-            return None
-        model = TABLE_TO_MODEL.get(table_name)
-        if model is None:
-            return None
-        stmt = select(model.sync_uuid).where(model.id == local_id)
-        return self.db.execute(stmt).scalar_one_or_none()
+        return self._uuid_map.sync_uuid_for(table_name, local_id)
+
+    def _prefetch_fk_targets_of_entities(self, model_class, entities) -> None:
+        """Bulk-resolve the sync_uuids of every FK target referenced by `entities`."""
+        ids_by_table: dict[str, set[int]] = {}
+        for col_name, target_table in self._fk_columns(model_class).items():
+            ids = ids_by_table.setdefault(target_table, set())
+            for entity in entities:
+                ids.add(getattr(entity, col_name))
+        for target_table, ids in ids_by_table.items():
+            self._uuid_map.prefetch_ids(target_table, ids)
+
+    def _prefetch_fk_targets_of_changes(self, changes: list[EntityChange]) -> None:
+        """Bulk-resolve the local ids of every `<col>_sync_uuid` in incoming changes."""
+        uuids_by_table: dict[str, set[str]] = {}
+        for change in changes:
+            model_class = ENTITY_TYPE_MAP.get(change.entity_type)
+            if model_class is None or not change.data:
+                continue
+            for col_name, target_table in self._fk_columns(model_class).items():
+                target_uuid = change.data.get(f"{col_name}_sync_uuid")
+                if target_uuid is not None:
+                    uuids_by_table.setdefault(target_table, set()).add(target_uuid)
+        for target_table, uuids in uuids_by_table.items():
+            self._uuid_map.prefetch_uuids(target_table, uuids)
 
     def _augment_with_fk_uuids(self, model_class, data: dict) -> dict:
         """For each FK column, add a sibling `<col>_sync_uuid` resolving the target row."""
@@ -256,19 +385,58 @@ class SyncEngine:
             # Column doesn't exist or can't get type, return value as-is
             return value
 
+    def has_change_log(self) -> bool:
+        """True if the database has the sync_change_log table."""
+        if self._has_change_log is None:
+            self._has_change_log = inspect(self.db.connection()).has_table(
+                sync_change_log.name
+            )
+        return self._has_change_log
+
+    def has_field_state(self) -> bool:
+        """True if the database has the sync_field_state table."""
+        if self._has_field_state is None:
+            self._has_field_state = inspect(self.db.connection()).has_table(
+                sync_field_state.name
+            )
+        return self._has_field_state
+
+    def current_change_seq(self) -> Optional[int]:
+        """Highest change-log seq (0 for an empty log), or None without a change log."""
+        if not self.has_change_log():
+            return None
+        return self.db.execute(select(func.max(sync_change_log.c.seq))).scalar() or 0
+
+    def _usable_since_seq(self, since_seq: Optional[int]) -> Optional[int]:
+        """since_seq, or None (timestamp fallback) if the DB predates the change log."""
+        if since_seq is not None and not self.has_change_log():
+            logger.warning(
+                "since_seq requested but the database has no sync_change_log "
+                "(run scripts/migrate_change_log.py); falling back to since_timestamp"
+            )
+            return None
+        return since_seq
+
     def get_changes_since(
         self,
         since_timestamp: Optional[datetime] = None,
         entity_types: Optional[list[str]] = None,
+        since_seq: Optional[int] = None,
+        until_seq: Optional[int] = None,
     ) -> list[EntityChange]:
         """
         Get all entity changes since the given timestamp.
         If since_timestamp is None, returns all entities (full sync).
+
+        With since_seq, rows are read from the change log instead (seq >
+        since_seq, and <= until_seq if given); since_timestamp then only
+        decides whether a change is reported as "create" or "update".
         """
         changes = []
 
         # Ensure since_timestamp is timezone-aware for comparisons
         since_timestamp = self._ensure_timezone_aware(since_timestamp)
+        since_seq = self._usable_since_seq(since_seq)
 
         # Determine which entity types to sync
         types_to_sync = entity_types if entity_types else ENTITY_TYPE_MAP.keys()
@@ -277,55 +445,503 @@ class SyncEngine:
             model_class = ENTITY_TYPE_MAP.get(entity_type)
             if model_class is None:
                 continue  # Skip unsupported types
+            if since_seq is not None:
+                changes.extend(
+                    change
+                    for _, change in self._logged_changes_for_type(
+                        entity_type, model_class, since_timestamp, since_seq, until_seq
+                    )
+                )
+            else:
+                changes.extend(
+                    self._changes_for_type(entity_type, model_class, since_timestamp)
+                )
+
+        return changes
 
-            # Build query
-            stmt = select(model_class)
+    def get_changes_page(
+        self,
+        since_timestamp: Optional[datetime] = None,
+        entity_types: Optional[list[str]] = None,
+        cursor: Optional[SyncCursor] = None,
+        limit: int = 1000,
+        since_seq: Optional[int] = None,
+        until_seq: Optional[int] = None,
+    ) -> tuple[list[EntityChange], Optional[SyncCursor], bool]:
+        """
+        Get one page of changes since the given timestamp.
 
-            # Filter by timestamp if provided (incremental sync)
+        Pages walk entity types in ENTITY_TYPE_MAP order (parents before
+        children, same as a full sync) and, within a type, rows in
+        (updated_at, id) order. `cursor` is the position of the last change
+        of the previous page; pass None for the first page.
+
+        With since_seq (see get_changes_since), rows within a type come from
+        the change log in seq order. Pass the high-water mark the pull started
+        at as until_seq so later pages see the same snapshot; it is carried in
+        the cursor.
+
+        Returns (changes, next_cursor, has_more).
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+
+        since_timestamp = self._ensure_timezone_aware(since_timestamp)
+        since_seq = self._usable_since_seq(since_seq)
+        if until_seq is None and cursor is not None:
+            until_seq = cursor.until_seq
+        types_to_sync = [
+            t for t in (entity_types if entity_types else ENTITY_TYPE_MAP.keys())
+            if ENTITY_TYPE_MAP.get(t) is not None
+        ]
+
+        start = 0
+        if cursor is not None:
+            if cursor.entity_type not in types_to_sync:
+                raise ValueError(f"Cursor entity type {cursor.entity_type!r} is not being synced")
+            start = types_to_sync.index(cursor.entity_type)
+            if since_seq is not None and cursor.seq is None:
+                raise ValueError("Cursor has no seq; it does not belong to a since_seq pull")
+
+        # Fetch one row past the page so we know whether another page exists.
+        changes: list[EntityChange] = []
+        seqs: list[int] = []
+        for entity_type in types_to_sync[start:]:
+            after = cursor if cursor is not None and entity_type == cursor.entity_type else None
+            if since_seq is not None:
+                logged = self._logged_changes_for_type(
+                    entity_type,
+                    ENTITY_TYPE_MAP[entity_type],
+                    since_timestamp,
+                    since_seq,
+                    until_seq,
+                    after_seq=after.seq if after is not None else None,
+                    limit=limit + 1 - len(changes),
+                )
+                seqs.extend(seq for seq, _ in logged)
+                changes.extend(change for _, change in logged)
+            else:
+                changes.extend(
+                    self._changes_for_type(
+                        entity_type,
+                        ENTITY_TYPE_MAP[entity_type],
+                        since_timestamp,
+                        after=after,
+                        limit=limit + 1 - len(changes),
+                    )
+                )
+            if len(changes) > limit:
+                break
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        next_cursor = None
+        if has_more:
+            last = changes[-1]
+            next_cursor = SyncCursor(
+                updated_at=last.updated_at,
+                entity_type=last.entity_type,
+                id=last.entity_id,
+                seq=seqs[limit - 1] if since_seq is not None else None,
+                until_seq=until_seq,
+            )
+        return changes, next_cursor, has_more
+
+    def _changes_for_type(
+        self,
+        entity_type: str,
+        model_class,
+        since_timestamp: Optional[datetime],
+        after: Optional[SyncCursor] = None,
+        limit: Optional[int] = None,
+    ) -> list[EntityChange]:
+        """
+        Build EntityChanges for one entity type, in (updated_at, id) order.
+
+        `after` skips rows at or before that cursor position; `limit` caps the
+        number of rows returned.
+        """
+        # Build query
+        stmt = select(model_class).order_by(model_class.updated_at, model_class.id)
+
+        # Filter by timestamp if provided (incremental sync)
+        if since_timestamp:
+            stmt = stmt.where(model_class.updated_at > since_timestamp)
+
+        after_key = None
+        if after is not None:
+            after_key = (
+                self._ensure_timezone_aware(after.updated_at).astimezone(timezone.utc),
+                after.id,
+            )
+            # SQLite keeps timestamps as text, with or without fractional
+            # seconds depending on who wrote them, so exact equality on
+            # updated_at is unreliable in SQL. Narrow to a window that is
+            # guaranteed to contain everything after the cursor and do the
+            # exact (updated_at, id) tie-break below.
+            stmt = stmt.where(model_class.updated_at > after_key[0] - timedelta(seconds=1))
+
+        # Execute query. Rows are fetched in chunks so a small `limit` stops
+        # the scan early instead of loading the whole table.
+        entities = []
+        result = self.db.execute(stmt.execution_options(yield_per=_ROW_FETCH_CHUNK_SIZE))
+        try:
+            for entity in result.scalars():
+                if after_key is not None:
+                    entity_key = (self._ensure_timezone_aware(entity.updated_at), entity.id)
+                    if entity_key <= after_key:
+                        continue
+                entities.append(entity)
+                if limit is not None and len(entities) >= limit:
+                    break
+        finally:
+            result.close()
+
+        return self._entities_to_changes(entity_type, model_class, entities, since_timestamp)
+
+    def _change_log_stmt(
+        self,
+        model_class,
+        since_seq: int,
+        until_seq: Optional[int] = None,
+        after_seq: Optional[int] = None,
+    ):
+        """(seq, row_id) of a table's change-log entries in the given range, in seq order."""
+        log = sync_change_log.c
+        lower = since_seq if after_seq is None else max(since_seq, after_seq)
+        stmt = (
+            select(log.seq, log.row_id)
+            .where(log.table_name == model_class.__tablename__, log.seq > lower)
+            .order_by(log.seq)
+        )
+        if until_seq is not None:
+            stmt = stmt.where(log.seq <= until_seq)
+        return stmt
+
+    def _logged_changes_for_type(
+        self,
+        entity_type: str,
+        model_class,
+        since_timestamp: Optional[datetime],
+        since_seq: int,
+        until_seq: Optional[int] = None,
+        after_seq: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[tuple[int, EntityChange]]:
+        """
+        Build (seq, EntityChange) pairs for one entity type from the change
+        log, in seq order: one indexed range read of the log, then the rows
+        themselves by id.
+        """
+        stmt = self._change_log_stmt(model_class, since_seq, until_seq, after_seq)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        log_rows = self.db.execute(stmt).all()
+        return self._logged_rows_to_changes(entity_type, model_class, log_rows, since_timestamp)
+
+    def _logged_rows_to_changes(
+        self,
+        entity_type: str,
+        model_class,
+        log_rows,
+        since_timestamp: Optional[datetime],
+    ) -> list[tuple[int, EntityChange]]:
+        """Load the rows behind a batch of (seq, row_id) log entries and convert them."""
+        by_id = {}
+        for chunk in _chunked([row_id for _, row_id in log_rows]):
+            stmt = select(model_class).where(model_class.id.in_(chunk))
+            by_id.update((entity.id, entity) for entity in self.db.execute(stmt).scalars())
+
+        logged = [(seq, by_id[row_id]) for seq, row_id in log_rows if row_id in by_id]
+        changes = self._entities_to_changes(
+            entity_type, model_class, [entity for _, entity in logged], since_timestamp
+        )
+        return [(seq, change) for (seq, _), change in zip(logged, changes)]
+
+    def iter_changes_since(
+        self,
+        since_timestamp: Optional[datetime] = None,
+        entity_types: Optional[list[str]] = None,
+        since_seq: Optional[int] = None,
+        until_seq: Optional[int] = None,
+    ) -> Iterator[EntityChange]:
+        """
+        Yield the same changes as get_changes_since, one DB fetch chunk at a
+        time, so callers can stream them without holding the full list.
+        """
+        since_timestamp = self._ensure_timezone_aware(since_timestamp)
+        since_seq = self._usable_since_seq(since_seq)
+        types_to_sync = entity_types if entity_types else ENTITY_TYPE_MAP.keys()
+
+        for entity_type in types_to_sync:
+            model_class = ENTITY_TYPE_MAP.get(entity_type)
+            if model_class is None:
+                continue  # Skip unsupported types
+
+            if since_seq is not None:
+                stmt = self._change_log_stmt(model_class, since_seq, until_seq)
+                result = self.db.execute(stmt.execution_options(yield_per=_ROW_FETCH_CHUNK_SIZE))
+                try:
+                    for log_rows in result.partitions():
+                        for _, change in self._logged_rows_to_changes(
+                            entity_type, model_class, log_rows, since_timestamp
+                        ):
+                            yield change
+                finally:
+                    result.close()
+                continue
+
+            stmt = select(model_class).order_by(model_class.updated_at, model_class.id)
             if since_timestamp:
                 stmt = stmt.where(model_class.updated_at > since_timestamp)
 
-            # Execute query
-            entities = self.db.execute(stmt).scalars().all()
-
-            # Convert to EntityChange objects
-            for entity in entities:
-                # Ensure entity datetimes are timezone-aware (SQLite returns naive datetimes)
-                entity_created_at = self._ensure_timezone_aware(entity.created_at)
-                entity_updated_at = self._ensure_timezone_aware(entity.updated_at)
-
-                # Determine operation type
-                if entity.deleted_at is not None:
-                    operation = "delete"
-                    data = None
+            result = self.db.execute(stmt.execution_options(yield_per=_ROW_FETCH_CHUNK_SIZE))
+            try:
+                for entities in result.scalars().partitions():
+                    yield from self._entities_to_changes(
+                        entity_type, model_class, entities, since_timestamp
+                    )
+            finally:
+                result.close()
+
+    def _entities_to_changes(
+        self,
+        entity_type: str,
+        model_class,
+        entities,
+        since_timestamp: Optional[datetime],
+    ) -> list[EntityChange]:
+        """Convert one batch of ORM rows of a single type to EntityChanges."""
+        # Record this batch's own identities (children of these rows, later
+        # in ENTITY_TYPE_MAP order, resolve against them for free) and
+        # resolve all FK targets with one IN query per target table.
+        table_name = model_class.__tablename__
+        for entity in entities:
+            self._uuid_map.remember(table_name, entity.id, entity.sync_uuid)
+        self._prefetch_fk_targets_of_entities(model_class, entities)
+
+        # Convert to EntityChange objects
+        changes = []
+        for entity in entities:
+            # Ensure entity datetimes are timezone-aware (SQLite returns naive datetimes)
+            entity_created_at = self._ensure_timezone_aware(entity.created_at)
+            entity_updated_at = self._ensure_timezone_aware(entity.updated_at)
+
+            # Determine operation type
+            if entity.deleted_at is not None:
+                operation = "delete"
+                data = None
+            else:
+                # Check if created after since_timestamp
+                if since_timestamp and entity_created_at > since_timestamp:
+                    operation = "create"
                 else:
-                    # Check if created after since_timestamp
-                    if since_timestamp and entity_created_at > since_timestamp:
-                        operation = "create"
-                    else:
-                        operation = "update"
-                    # Get dict representation (already JSON-serializable from as_dict())
-                    data = entity.as_dict()
-                    # Translate FK target ids → sync_uuids so the receiver can map
-                    # them to its own local ids.
-                    data = self._augment_with_fk_uuids(model_class, data)
-
-                # Create EntityChange with explicit conversion of all fields
-                change = EntityChange(
-                    entity_type=entity_type,
-                    entity_id=int(entity.id),
-                    sync_uuid=entity.sync_uuid,
-                    operation=operation,
-                    entity_data=data,
-                    version=int(entity.version),
-                    updated_at=entity_updated_at,
-                )
-                changes.append(change)
+                    operation = "update"
+                # Get dict representation (already JSON-serializable from as_dict())
+                data = entity.as_dict()
+                # Translate FK target ids → sync_uuids so the receiver can map
+                # them to its own local ids.
+                data = self._augment_with_fk_uuids(model_class, data)
+
+            # Create EntityChange with explicit conversion of all fields
+            change = EntityChange(
+                entity_type=entity_type,
+                entity_id=int(entity.id),
+                sync_uuid=entity.sync_uuid,
+                operation=operation,
+                entity_data=data,
+                version=int(entity.version),
+                updated_at=entity_updated_at,
+            )
+            changes.append(change)
 
         return changes
 
-    def count_changes_since(self, since_timestamp: Optional[datetime] = None) -> int:
-        """Count total changes since timestamp"""
+    # ---- field-level deltas ----
+
+    def make_deltas(self, changes: list[EntityChange], since_seq: int) -> list[EntityChange]:
+        """
+        Trim "update" changes down to the columns that changed after
+        `since_seq`, the change-log seq up to which the receiver already has
+        this database's changes (a pull's since_seq, or the push watermark).
+
+        Which columns changed when is kept in sync_field_state: each column's
+        value hash plus the seq and version at which it last changed. A
+        column is only known to have changed once its row is read here or
+        applied by apply_changes, so it is stamped with the row's current seq
+        then, never earlier than the actual edit. Creates, deletes and rows
+        whose every column qualifies are returned unchanged.
+        """
+        if not (self.has_change_log() and self.has_field_state()):
+            return changes
+
+        indices_by_type: dict[str, list[int]] = {}
+        for i, change in enumerate(changes):
+            if change.operation == "update" and change.data is not None and change.fields is None:
+                indices_by_type.setdefault(change.entity_type, []).append(i)
+
+        result = list(changes)
+        for entity_type, indices in indices_by_type.items():
+            model_class = ENTITY_TYPE_MAP[entity_type]
+            table_name = model_class.__tablename__
+            row_ids = [changes[i].entity_id for i in indices]
+            row_seqs = self._logged_seqs(table_name, row_ids)
+            states = self._load_field_states(table_name, row_ids)
+            dirty: dict[int, dict] = {}
+
+            for i in indices:
+                change = changes[i]
+                seq = row_seqs.get(change.entity_id)
+                if seq is None:
+                    continue  # not in the change log; send the full row
+                values = self._field_values(model_class, change.data)
+                state, changed = self._updated_field_state(
+                    states.get(change.entity_id, {}), values, seq, change.version
+                )
+                if changed:
+                    dirty[change.entity_id] = state
+                fields = [column for column in values if state[column][1] > since_seq]
+                if len(fields) < len(values):
+                    result[i] = self._delta_change(model_class, change, fields)
+
+            if dirty:
+                self._save_field_states(table_name, dirty)
+        self._commit()
+        return result
+
+    def _field_values(self, model_class, data: dict) -> dict[str, Any]:
+        """The delta-eligible column values of an as_dict()-style mapping."""
+        return {
+            column.name: data[column.name]
+            for column in model_class.__table__.columns
+            if column.name in data and column.name not in _DELTA_EXCLUDED_FIELDS
+        }
+
+    @staticmethod
+    def _updated_field_state(
+        state: dict, values: dict[str, Any], seq: Optional[int], version: int
+    ) -> tuple[dict, bool]:
+        """
+        Fold the current column values into a field state. Columns whose hash
+        changed are stamped (seq, version); a null seq (stamped without a
+        change log) is filled in once the row's seq is known. Returns
+        (state, changed).
+        """
+        updated = dict(state)
+        changed = False
+        for column, value in values.items():
+            value_hash = _field_hash(value)
+            entry = state.get(column)
+            if entry is None or entry[0] != value_hash:
+                updated[column] = [value_hash, seq, version]
+                changed = True
+            elif entry[1] is None and seq is not None:
+                updated[column] = [value_hash, seq, entry[2]]
+                changed = True
+        return updated, changed
+
+    def _delta_change(self, model_class, change: EntityChange, fields: list[str]) -> EntityChange:
+        """Copy of `change` carrying only `fields` (and their FK sync_uuid siblings)."""
+        fks = self._fk_columns(model_class)
+        data = {}
+        for column in fields:
+            data[column] = change.data[column]
+            if column in fks:
+                sibling = f"{column}_sync_uuid"
+                data[sibling] = change.data.get(sibling)
+        return change.model_copy(update={"data": data, "fields": fields})
+
+    def _logged_seqs(self, table_name: str, row_ids: list[int]) -> dict[int, int]:
+        """{row_id: change-log seq} for the given rows of one table."""
+        log = sync_change_log.c
+        seqs: dict[int, int] = {}
+        for chunk in _chunked(row_ids):
+            stmt = select(log.row_id, log.seq).where(
+                log.table_name == table_name, log.row_id.in_(chunk)
+            )
+            seqs.update((row_id, seq) for row_id, seq in self.db.execute(stmt))
+        return seqs
+
+    def _load_field_states(self, table_name: str, row_ids: list[int]) -> dict[int, dict]:
+        fs = sync_field_state.c
+        states: dict[int, dict] = {}
+        for chunk in _chunked(row_ids):
+            stmt = select(fs.row_id, fs.fields).where(
+                fs.table_name == table_name, fs.row_id.in_(chunk)
+            )
+            states.update((row_id, json.loads(fields)) for row_id, fields in self.db.execute(stmt))
+        return states
+
+    def _save_field_states(self, table_name: str, states: dict[int, dict]) -> None:
+        fs = sync_field_state.c
+        for chunk in _chunked(list(states)):
+            self.db.execute(
+                delete(sync_field_state).where(fs.table_name == table_name, fs.row_id.in_(chunk))
+            )
+        self.db.execute(
+            insert(sync_field_state),
+            [
+                {"table_name": table_name, "row_id": row_id, "fields": json.dumps(state)}
+                for row_id, state in states.items()
+            ],
+        )
+
+    def _record_field_changes(self, model_class, entity) -> None:
+        """After applying a change: stamp the columns it changed with the row's new seq and version."""
+        if not self.has_field_state():
+            return
+        table_name = model_class.__tablename__
+        seq = None
+        if self.has_change_log():
+            self.db.flush()  # let the change-log trigger assign the row's seq
+            seq = self._logged_seqs(table_name, [entity.id]).get(entity.id)
+        state = self._load_field_states(table_name, [entity.id]).get(entity.id, {})
+        state, changed = self._updated_field_state(
+            state, self._field_values(model_class, entity.as_dict()), seq, entity.version
+        )
+        if changed:
+            self._save_field_states(table_name, {entity.id: state})
+
+    def _can_merge_fields(self, model_class, change: EntityChange, existing) -> bool:
+        """
+        True if a delta made against an older version touches no column that
+        changed here after that version, so it can be applied as it is.
+        A column edited here without a recorded version counts as changed.
+        """
+        if change.fields is None or change.version is None or not self.has_field_state():
+            return False
+        if existing.version < change.version:
+            return False
+        state = self._load_field_states(model_class.__tablename__, [existing.id]).get(
+            existing.id, {}
+        )
+        current = self._field_values(model_class, existing.as_dict())
+        for column in change.fields:
+            entry = state.get(column)
+            if column not in current or entry is None:
+                return False
+            if entry[0] != _field_hash(current[column]) or entry[2] > change.version:
+                return False
+        return True
+
+    def count_changes_since(
+        self, since_timestamp: Optional[datetime] = None, since_seq: Optional[int] = None
+    ) -> int:
+        """Count total changes since timestamp, or since a change-log seq"""
+        since_seq = self._usable_since_seq(since_seq)
+        if since_seq is not None:
+            # One range read of the log instead of a COUNT on every table.
+            tables = [model.__tablename__ for model in ENTITY_TYPE_MAP.values() if model]
+            stmt = (
+                select(func.count())
+                .select_from(sync_change_log)
+                .where(
+                    sync_change_log.c.seq > since_seq,
+                    sync_change_log.c.table_name.in_(tables),
+                )
+            )
+            return self.db.execute(stmt).scalar() or 0
+
         # Ensure since_timestamp is timezone-aware for comparisons
         since_timestamp = self._ensure_timezone_aware(since_timestamp)
 
@@ -351,6 +967,9 @@ class SyncEngine:
         device: Optional[SyncDevice],
         changes: list[EntityChange],
         bump_versions: bool = True,
+        batched: bool = False,
+        batch_id: Optional[str] = None,
+        seqs: Optional[Sequence[int]] = None,
     ) -> dict[str, Any]:
         """
         Apply incoming changes against the local DB. Identifies rows by sync_uuid,
@@ -366,58 +985,179 @@ class SyncEngine:
 
         device may be None on the client side (no SyncLog row written).
 
-        Returns dict with accepted, conflicts, and rejected counts.
+        batched=True applies the whole list in a single transaction: each
+        change runs inside its own SAVEPOINT so a bad row is rolled back on its
+        own, and the batch is committed once at the end. Per-row results are
+        identical to the unbatched path; only the number of commits differs.
+
+        batch_id (with a device) makes a push resumable: `seqs` gives each
+        change's sequence number within the client's batch (default 0..n-1).
+        Every accepted change is recorded as a SyncPushReceipt, and a change
+        whose seq already has a matching receipt is skipped and reported with
+        the recorded state. Receipts of the device's other batches are dropped.
+
+        Returns dict with accepted, conflicts, rejected and skipped counts.
         """
         accepted = 0
         rejected = 0
+        skipped = 0
         conflicts: list[ConflictInfo] = []
         accepted_states: list[AcceptedState] = []
 
-        for change in changes:
-            model_class = ENTITY_TYPE_MAP.get(change.entity_type)
-            if model_class is None:
-                rejected += 1
-                continue
+        tracked = batch_id is not None and device is not None
+        if seqs is None:
+            seqs = range(len(changes))
+        receipts = self._push_receipts(device, batch_id) if tracked else {}
 
-            try:
-                if change.operation == "delete":
-                    result = self._apply_delete(device, model_class, change, bump_versions)
-                elif change.operation in ("create", "update"):
-                    result = self._apply_upsert(device, model_class, change, bump_versions)
-                else:
-                    rejected += 1
+        self._prefetch_fk_targets_of_changes(changes)
+
+        self._batched = batched
+        try:
+            for seq, change in zip(seqs, changes):
+                receipt = receipts.get(seq)
+                if receipt is not None and self._receipt_matches(receipt, change):
+                    accepted += 1
+                    skipped += 1
+                    if receipt.applied_version is not None:
+                        accepted_states.append(self._receipt_state(receipt))
                     continue
 
-                if result["status"] == "accepted":
+                status, result = self._apply_one(device, change, bump_versions)
+                if status == "accepted":
                     accepted += 1
                     state = result.get("state")
                     if state is not None:
                         accepted_states.append(state)
-                elif result["status"] == "conflict":
+                    if tracked:
+                        self._record_push_receipt(
+                            device, batch_id, seq, change, state, existing=receipt
+                        )
+                elif status == "conflict":
                     conflicts.append(result["conflict"])
                 else:
                     rejected += 1
-
-            except Exception as e:
-                logger.exception(
-                    "Error applying %s change for %s sync_uuid=%s: %s",
-                    change.operation, change.entity_type, change.sync_uuid, e,
-                )
-                # Roll back so subsequent changes (and the caller's commit, e.g.
-                # update_last_sync) can run on a clean session.
-                try:
-                    self.db.rollback()
-                except Exception:
-                    logger.exception("Rollback after apply error also failed")
-                rejected += 1
+            if batched and accepted:
+                # Rejections and conflicts write nothing, so only commit when
+                # at least one row actually landed.
+                self.db.commit()
+        finally:
+            self._batched = False
 
         return {
             "accepted": accepted,
             "accepted_states": accepted_states,
             "conflicts": conflicts,
             "rejected": rejected,
+            "skipped": skipped,
         }
 
+    def _push_receipts(self, device: SyncDevice, batch_id: str) -> dict[int, SyncPushReceipt]:
+        """Receipts of this batch by seq; forgets the device's older batches."""
+        self.db.execute(
+            delete(SyncPushReceipt).where(
+                SyncPushReceipt.device_id == device.id,
+                SyncPushReceipt.batch_id != batch_id,
+            )
+        )
+        stmt = select(SyncPushReceipt).where(
+            SyncPushReceipt.device_id == device.id,
+            SyncPushReceipt.batch_id == batch_id,
+        )
+        return {receipt.seq: receipt for receipt in self.db.execute(stmt).scalars()}
+
+    def _utc(self, dt: Optional[datetime]) -> Optional[datetime]:
+        dt = self._ensure_timezone_aware(dt)
+        return dt.astimezone(timezone.utc) if dt is not None else None
+
+    def _receipt_matches(self, receipt: SyncPushReceipt, change: EntityChange) -> bool:
+        """
+        True if `change` is a resend of the change this receipt recorded: the
+        same row, carrying either the state the client sent the first time
+        (the response was lost) or the state the server returned (the client
+        already mirrored it). A local edit since then matches neither.
+        """
+        if receipt.target_sync_uuid != change.sync_uuid:
+            return False
+        sent = (change.version, self._utc(change.updated_at))
+        return sent in (
+            (receipt.pushed_version, self._utc(receipt.pushed_updated_at)),
+            (receipt.applied_version, self._utc(receipt.applied_updated_at)),
+        )
+
+    def _receipt_state(self, receipt: SyncPushReceipt) -> AcceptedState:
+        return AcceptedState(
+            entity_type=receipt.entity_type,
+            sync_uuid=receipt.target_sync_uuid,
+            version=receipt.applied_version,
+            updated_at=self._utc(receipt.applied_updated_at),
+        )
+
+    def _record_push_receipt(
+        self,
+        device: SyncDevice,
+        batch_id: str,
+        seq: int,
+        change: EntityChange,
+        state: Optional[AcceptedState],
+        existing: Optional[SyncPushReceipt] = None,
+    ) -> None:
+        """Record an accepted change; committed with it in batched mode."""
+        receipt = existing
+        if receipt is None:
+            receipt = SyncPushReceipt(device_id=device.id, batch_id=batch_id, seq=seq)
+            self.db.add(receipt)
+        receipt.entity_type = change.entity_type
+        receipt.target_sync_uuid = change.sync_uuid
+        receipt.pushed_version = change.version
+        receipt.pushed_updated_at = self._utc(change.updated_at)
+        receipt.applied_version = state.version if state is not None else None
+        receipt.applied_updated_at = self._utc(state.updated_at) if state is not None else None
+        self._commit()
+
+    def _apply_one(
+        self,
+        device: Optional[SyncDevice],
+        change: EntityChange,
+        bump_versions: bool,
+    ) -> tuple[str, dict[str, Any]]:
+        """Apply a single change, returning (status, result).
+
+        In batched mode the change is wrapped in a SAVEPOINT; on error only
+        that savepoint is rolled back and the rest of the batch survives.
+        """
+        model_class = ENTITY_TYPE_MAP.get(change.entity_type)
+        if model_class is None:
+            return "rejected", {}
+        if change.operation not in ("create", "update", "delete"):
+            return "rejected", {}
+
+        savepoint = self.db.begin_nested() if self._batched else None
+        try:
+            if change.operation == "delete":
+                result = self._apply_delete(device, model_class, change, bump_versions)
+            else:
+                result = self._apply_upsert(device, model_class, change, bump_versions)
+            if savepoint is not None:
+                savepoint.commit()
+            return result["status"], result
+
+        except Exception as e:
+            logger.exception(
+                "Error applying %s change for %s sync_uuid=%s: %s",
+                change.operation, change.entity_type, change.sync_uuid, e,
+            )
+            # Roll back so subsequent changes (and the caller's commit, e.g.
+            # update_last_sync) can run on a clean session. In batched mode
+            # only this change's savepoint is discarded.
+            try:
+                if savepoint is not None:
+                    savepoint.rollback()
+                else:
+                    self.db.rollback()
+            except Exception:
+                logger.exception("Rollback after apply error also failed")
+            return "rejected", {}
+
     def _find_by_sync_uuid(self, model_class, sync_uuid: str):
         """Look up a single row by sync_uuid, or None."""
         if not sync_uuid:
@@ -453,6 +1193,13 @@ class SyncEngine:
         existing = self._find_by_sync_uuid(model_class, change.sync_uuid)
 
         if existing is None:
+            if change.fields is not None:
+                # A delta can't create a row: the other columns are missing.
+                logger.warning(
+                    "Rejecting delta for %s sync_uuid=%s: no such row",
+                    change.entity_type, change.sync_uuid,
+                )
+                return {"status": "rejected"}
             return self._insert_new(device, model_class, change, translated)
 
         return self._update_existing(
@@ -478,12 +1225,19 @@ class SyncEngine:
 
         new_entity = model_class(**clean)
         self.db.add(new_entity)
-        self.db.commit()
+        self.db.flush()
+        self._record_field_changes(model_class, new_entity)
+        self._commit()
 
         self._log_sync(device, change.entity_type, new_entity.id, "create")
+        # Later changes in this batch may reference the row we just created.
+        self._uuid_map.remember(
+            model_class.__tablename__, new_entity.id, new_entity.sync_uuid
+        )
         return {
             "status": "accepted",
             "state": AcceptedState(
+                entity_type=change.entity_type,
                 sync_uuid=new_entity.sync_uuid,
                 version=new_entity.version,
                 updated_at=self._ensure_timezone_aware(new_entity.updated_at)
@@ -500,11 +1254,17 @@ class SyncEngine:
         existing,
         bump_versions: bool,
     ) -> dict[str, Any]:
-        """Update an existing row with optimistic version checking."""
+        """
+        Update an existing row with optimistic version checking. A delta
+        (change.fields) made against an older version is merged column by
+        column when none of its columns changed here since that version.
+        """
         if change.version is None:
             return {"status": "rejected"}
 
-        if existing.version != change.version:
+        if existing.version != change.version and not self._can_merge_fields(
+            model_class, change, existing
+        ):
             return {
                 "status": "conflict",
                 "conflict": ConflictInfo(
@@ -534,12 +1294,20 @@ class SyncEngine:
         if bump_versions:
             existing.version += 1
             existing.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
+        elif change.fields is not None:
+            # A delta's data holds only its own columns; mirror the row's
+            # version and timestamp from the change itself.
+            existing.version = change.version
+            if change.updated_at is not None:
+                existing.updated_at = change.updated_at
+        self._record_field_changes(model_class, existing)
+        self._commit()
 
         self._log_sync(device, change.entity_type, existing.id, "update")
         return {
             "status": "accepted",
             "state": AcceptedState(
+                entity_type=change.entity_type,
                 sync_uuid=existing.sync_uuid,
                 version=existing.version,
                 updated_at=self._ensure_timezone_aware(existing.updated_at)
@@ -565,12 +1333,13 @@ class SyncEngine:
         existing.deleted_at = datetime.now(timezone.utc)
         if bump_versions:
             existing.version += 1
-        self.db.commit()
+        self._commit()
 
         self._log_sync(device, change.entity_type, existing.id, "delete")
         return {
             "status": "accepted",
             "state": AcceptedState(
+                entity_type=change.entity_type,
                 sync_uuid=existing.sync_uuid,
                 version=existing.version,
                 updated_at=self._ensure_timezone_aware(existing.updated_at)
@@ -595,4 +1364,4 @@ class SyncEngine:
             operation=operation,
         )
         self.db.add(log_entry)
-        self.db.commit()
+        self._commit()
@@ -363,8 +363,7 @@ class SpellCheckConfigDialog(QDialog):
             )
 
             if reply == QMessageBox.StandardButton.Yes:
-                self.spell_checker.custom_words.discard(word.lower())
-                self.spell_checker.save_custom_dictionary()
+                self.spell_checker.remove_word(word)
                 self.load_custom_words()
 
     def on_word_double_clicked(self, item):
@@ -400,8 +399,7 @@ class SpellCheckConfigDialog(QDialog):
         internal_language = language_map.get(display_language, "en_US")
 
         if internal_language != self.spell_checker.language:
-            self.spell_checker.language = internal_language
-            # Would need to reload backend with new language
+            self.spell_checker.set_language(internal_language)
 
     def accept(self):
         """Accept dialog and save settings"""
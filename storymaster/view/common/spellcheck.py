@@ -5,8 +5,11 @@ Provides real-time spell checking with visual feedback and suggestions
 
 import re
 import os
-from typing import List
-from PySide6.QtCore import Qt, QTimer
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Set, Tuple
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
 from PySide6.QtGui import (
     QTextCursor,
     QTextCharFormat,
@@ -17,21 +20,56 @@ from PySide6.QtGui import (
 )
 from PySide6.QtWidgets import QTextEdit, QLineEdit, QMenu, QApplication
 
+# Words as the spell checker sees them (compiled once, not per block)
+WORD_PATTERN = re.compile(r"\b[a-zA-Z]+\b")
+
 
 class SpellChecker:
     """
     Core spell checking functionality using multiple backends
+
+    Verdicts are memoized in a bounded LRU cache, so common words only reach
+    the backend once. The cache is cleared whenever the custom or ignored
+    words, the backend or the language change; generation counts those
+    resets so callers can drop results they derived from old verdicts.
+    Checks are safe to run from a worker thread (see BackgroundSpellChecker).
     """
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 20000):
         self.enabled = True
         self.custom_words = set()
         self.ignored_words = set()
-        self.backend = None
+        self.cache_size = cache_size
+        self.generation = 0
+        self._verdicts = OrderedDict()
+        self._lock = threading.RLock()
+        self._backend = None
         self.language = "en_US"
         self._load_backend()
         self._load_custom_dictionary()
 
+    @property
+    def backend(self):
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend):
+        self._backend = backend
+        self.clear_cache()
+
+    def clear_cache(self):
+        """Forget cached verdicts (call after changing custom_words/ignored_words directly)"""
+        with self._lock:
+            self._verdicts.clear()
+            self.generation += 1
+
+    def set_language(self, language: str):
+        """Switch dictionaries, reloading the backend for the new language"""
+        if language == self.language:
+            return
+        self.language = language
+        self._load_backend()
+
     def _load_backend(self):
         """Load the best available spell checking backend"""
         # Try different backends in order of preference
@@ -180,6 +218,38 @@ class SpellChecker:
         if not self.enabled or not word or not word.isalpha():
             return True
 
+        with self._lock:
+            verdict = self._verdicts.get(word)
+            if verdict is not None:
+                self._verdicts.move_to_end(word)
+                return verdict
+
+            verdict = self._check_word(word)
+            self._verdicts[word] = verdict
+            if len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+            return verdict
+
+    def check_words(self, words: Iterable[str]) -> Set[str]:
+        """Return the misspelled words among words, checking each distinct word once"""
+        if not self.enabled:
+            return set()
+        return {word for word in set(words) if not self.is_word_correct(word)}
+
+    def misspelled_spans(self, text: str) -> List[Tuple[int, int]]:
+        """(start, end) of every misspelled word in text"""
+        if not self.enabled or not text:
+            return []
+        matches = list(WORD_PATTERN.finditer(text))
+        if not matches:
+            return []
+        misspelled = self.check_words(match.group() for match in matches)
+        if not misspelled:
+            return []
+        return [(match.start(), match.end()) for match in matches if match.group() in misspelled]
+
+    def _check_word(self, word: str) -> bool:
+        """Uncached check against the ignored/custom words and the backend"""
         word_lower = word.lower()
 
         # Check ignored words
@@ -222,12 +292,70 @@ class SpellChecker:
         """Add word to custom dictionary"""
         if word and word.isalpha():
             self.custom_words.add(word.lower())
+            self.clear_cache()
+            self.save_custom_dictionary()
+
+    def remove_word(self, word: str):
+        """Remove word from custom dictionary"""
+        if word.lower() in self.custom_words:
+            self.custom_words.discard(word.lower())
+            self.clear_cache()
             self.save_custom_dictionary()
 
     def ignore_word(self, word: str):
         """Ignore word for this session"""
         if word and word.isalpha():
             self.ignored_words.add(word.lower())
+            self.clear_cache()
+
+
+class BackgroundSpellChecker(QObject):
+    """
+    Finds misspelled words off the GUI thread
+
+    request() queues a block of text; spans_ready(key, spans, generation) is
+    emitted on the GUI thread when it has been checked. Requests for a key
+    already in flight are dropped, and results from before a dictionary
+    change carry the old generation so the receiver can ignore them.
+    """
+
+    spans_ready = Signal(object, object, int)  # (key, [(start, end)], generation)
+
+    def __init__(self, spell_checker: SpellChecker, parent=None):
+        super().__init__(parent)
+        self.spell_checker = spell_checker
+        self._executor = None
+        self._pending = set()
+
+    def request(self, key, text: str):
+        """Check text in the background; key identifies it in spans_ready"""
+        if key in self._pending:
+            return
+        if self._executor is None:
+            # One worker: backends are not all thread-safe, and checks hold a lock anyway
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spellcheck")
+        self._pending.add(key)
+        self._executor.submit(self._check, key, text)
+
+    def _check(self, key, text: str):
+        generation = self.spell_checker.generation
+        try:
+            spans = self.spell_checker.misspelled_spans(text)
+        except Exception as e:
+            print(f"Background spell check failed: {e}")
+            spans = []
+        self.spans_ready.emit(key, spans, generation)
+
+    def finish(self, key):
+        """Mark a request as handled (call from the spans_ready slot)"""
+        self._pending.discard(key)
+
+    def shutdown(self):
+        """Drop queued requests and wait for a running check, so nothing is emitted later"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
 
 
 class BasicWordList:
@@ -327,16 +455,8 @@ class SpellCheckHighlighter(QSyntaxHighlighter):
         if not self.spell_checker.enabled:
             return
 
-        # Find all words in the text
-        word_pattern = re.compile(r"\b[a-zA-Z]+\b")
-
-        for match in word_pattern.finditer(text):
-            word = match.group()
-            start = match.start()
-            length = match.end() - match.start()
-
-            if not self.spell_checker.is_word_correct(word):
-                self.setFormat(start, length, self.misspelled_format)
+        for start, end in self.spell_checker.misspelled_spans(text):
+            self.setFormat(start, end - start, self.misspelled_format)
 
 
 class SpellCheckLineEdit(QLineEdit):
@@ -346,7 +466,7 @@ class SpellCheckLineEdit(QLineEdit):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.spell_checker = SpellChecker()
+        self.spell_checker = get_spell_checker()
         self.misspelled_words = set()
 
         # Timer for delayed spell checking (avoid checking while typing)
@@ -364,12 +484,7 @@ class SpellCheckLineEdit(QLineEdit):
     def _check_spelling(self):
         """Check spelling and update styling"""
         text = self.text()
-        words = re.findall(r"\b[a-zA-Z]+\b", text)
-
-        self.misspelled_words.clear()
-        for word in words:
-            if not self.spell_checker.is_word_correct(word):
-                self.misspelled_words.add(word)
+        self.misspelled_words = self.spell_checker.check_words(WORD_PATTERN.findall(text))
 
         # Update visual feedback (could implement red underline styling)
         self._update_spelling_style()
@@ -457,7 +572,7 @@ class SpellCheckTextEdit(QTextEdit):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.spell_checker = SpellChecker()
+        self.spell_checker = get_spell_checker()
         self.highlighter = SpellCheckHighlighter(self.document(), self.spell_checker)
 
         # Enable spell checking by default
@@ -558,7 +673,7 @@ def enable_spell_check(widget):
     """
     if isinstance(widget, QTextEdit):
         # Convert to spell checking text edit
-        spell_checker = SpellChecker()
+        spell_checker = get_spell_checker()
         highlighter = SpellCheckHighlighter(widget.document(), spell_checker)
 
         # Store references so they don't get garbage collected
@@ -601,14 +716,13 @@ def enable_spell_check(widget):
 
     elif isinstance(widget, QLineEdit):
         # Add basic spell checking to line edit
-        spell_checker = SpellChecker()
+        spell_checker = get_spell_checker()
         widget._spell_checker = spell_checker
 
         # Add tooltip with misspelled words
         def check_spelling():
             text = widget.text()
-            words = re.findall(r"\b[a-zA-Z]+\b", text)
-            misspelled = [w for w in words if not spell_checker.is_word_correct(w)]
+            misspelled = sorted(spell_checker.check_words(WORD_PATTERN.findall(text)))
 
             if misspelled:
                 widget.setToolTip(f"Possible misspellings: {', '.join(misspelled)}")
@@ -641,7 +755,7 @@ _global_spell_checker = None
 
 
 def get_spell_checker() -> SpellChecker:
-    """Get the global spell checker instance"""
+    """Get the global spell checker instance (shared by every spell-checked widget)"""
     global _global_spell_checker
     if _global_spell_checker is None:
         _global_spell_checker = SpellChecker()
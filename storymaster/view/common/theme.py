@@ -172,10 +172,10 @@ def get_input_style():
     """
 
 
-def get_list_style():
-    """Get unified list widget styling"""
+def get_list_style(selector: str = "QListWidget"):
+    """Get unified list widget styling (selector: QListWidget, or QListView for model views)"""
     return f"""
-        QListWidget {{
+        {selector} {{
             background-color: {COLORS['bg_secondary']};
             border: 1px solid {COLORS['border_main']};
             border-radius: {DIMENSIONS['border_radius']};
@@ -183,16 +183,16 @@ def get_list_style():
             font-size: {FONTS['size_normal']};
             alternate-background-color: {COLORS['bg_main']};
         }}
-        QListWidget::item {{
+        {selector}::item {{
             padding: {DIMENSIONS['padding_medium']} {DIMENSIONS['padding_medium']};
             border-bottom: 1px solid {COLORS['border_dark']};
             min-height: 24px;
         }}
-        QListWidget::item:selected {{
+        {selector}::item:selected {{
             background-color: {COLORS['primary']};
             color: {COLORS['text_primary']};
         }}
-        QListWidget::item:hover {{
+        {selector}::item:hover {{
             background-color: {COLORS['bg_tertiary']};
         }}
     """
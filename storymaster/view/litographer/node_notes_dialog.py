@@ -362,11 +362,14 @@ class NodeNotesDialog(QDialog):
                 ("litography_note_to_faction", "Faction"),
             ]
 
+            # One session for every association type
+            related = adapter.get_all_relationships(
+                note_entity, [name for name, _ in relationship_types]
+            )
+
             for relationship_name, display_type in relationship_types:
                 try:
-                    related_entities = adapter.get_relationship_entities(
-                        note_entity, relationship_name
-                    )
+                    related_entities = related[relationship_name]
                     for entity in related_entities:
                         if entity:
                             # Create display name based on entity type
@@ -658,24 +661,10 @@ class LoreSelectionDialog(QDialog):
             table_name = type_mapping.get(current_type)
 
             if table_name:
-                entities = adapter.get_entities(table_name)
-                for entity in entities:
-                    # Create display name based on entity type
-                    if hasattr(entity, "name") and entity.name:
-                        display_name = entity.name
-                    elif hasattr(entity, "first_name") and entity.first_name:
-                        name_parts = [entity.first_name]
-                        if hasattr(entity, "last_name") and entity.last_name:
-                            name_parts.append(entity.last_name)
-                        display_name = " ".join(name_parts)
-                    elif hasattr(entity, "title") and entity.title:
-                        display_name = entity.title
-                    else:
-                        display_name = f"ID: {entity.id}"
-
-                    item = QListWidgetItem(display_name)
+                for row in adapter.get_entity_rows(table_name):
+                    item = QListWidgetItem(row.name)
                     # Store entity type and ID for selection
-                    item.setData(Qt.ItemDataRole.UserRole, (table_name, entity.id))
+                    item.setData(Qt.ItemDataRole.UserRole, (table_name, row.id))
                     self.entity_list.addItem(item)
 
         except Exception as e:
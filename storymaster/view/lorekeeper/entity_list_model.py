@@ -0,0 +1,165 @@
+"""List model for the Lorekeeper entity browser"""
+
+import bisect
+from typing import List, Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from storymaster.model.lorekeeper.entity_mappings import get_entity_mapping
+from storymaster.view.lorekeeper.lorekeeper_model_adapter import (
+    ENTITY_PAGE_SIZE,
+    EntityRow,
+    LorekeeperModelAdapter,
+)
+
+# Longest name shown in the list before it is cut with "..."
+MAX_NAME_LENGTH = 40
+
+
+def truncate_text(text: str, max_length: int = MAX_NAME_LENGTH) -> str:
+    """Truncate text if it's too long"""
+    if len(text) <= max_length:
+        return text
+    return text[: max_length - 3] + "..."
+
+
+class EntityListModel(QAbstractListModel):
+    """
+    Entity rows for one category, fetched from the adapter a page at a time
+
+    Rows are projections (id, display name, icon key) kept in id order. The
+    first page is fetched when the source is set; views fetch the rest as
+    they scroll (canFetchMore/fetchMore). Saves and deletes update single
+    rows instead of resetting the model.
+    """
+
+    EntityIdRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None, page_size: int = ENTITY_PAGE_SIZE):
+        super().__init__(parent)
+        self.page_size = page_size
+        self._adapter: Optional[LorekeeperModelAdapter] = None
+        self._table_name = ""
+        self._search_text = ""
+        self._rows: List[EntityRow] = []
+        self._ids: List[int] = []
+        self._exhausted = True
+
+    @property
+    def table_name(self) -> str:
+        return self._table_name
+
+    def set_source(self, adapter: LorekeeperModelAdapter, table_name: str, search_text: str = ""):
+        """Show a table's entities (optionally filtered), starting with the first page"""
+        self.beginResetModel()
+        self._adapter = adapter
+        self._table_name = table_name
+        self._search_text = search_text
+        self._rows = []
+        self._ids = []
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def set_search_text(self, search_text: str):
+        """Filter the current table by search text"""
+        if self._adapter is not None and search_text != self._search_text:
+            self.set_source(self._adapter, self._table_name, search_text)
+
+    def set_rows(self, rows: List[EntityRow], table_name: str):
+        """Show a fixed list of rows (nothing is fetched)"""
+        self.beginResetModel()
+        self._adapter = None
+        self._table_name = table_name
+        self._search_text = ""
+        self._rows = sorted(rows, key=lambda row: row.id)
+        self._ids = [row.id for row in self._rows]
+        self._exhausted = True
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            mapping = get_entity_mapping(row.icon_key)
+            name = truncate_text(row.name)
+            return f"{mapping.icon} {name}" if mapping else name
+        if role == self.EntityIdRole:
+            return row.id
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        after_id = self._ids[-1] if self._ids else 0
+        rows = self._adapter.get_entity_rows(
+            self._table_name, self._search_text, after_id=after_id, limit=self.page_size
+        )
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self._ids.extend(row.id for row in rows)
+            self.endInsertRows()
+
+    def row_of(self, entity_id: int) -> Optional[int]:
+        """Row number of a loaded entity, or None"""
+        position = bisect.bisect_left(self._ids, entity_id)
+        if position < len(self._ids) and self._ids[position] == entity_id:
+            return position
+        return None
+
+    def entity_id(self, row: int) -> int:
+        return self._rows[row].id
+
+    def fetch_until(self, entity_id: int) -> Optional[int]:
+        """Fetch pages until the entity is loaded (or can't be); returns its row"""
+        while self.row_of(entity_id) is None and self.canFetchMore():
+            if self._ids and self._ids[-1] > entity_id:
+                break
+            self.fetchMore()
+        return self.row_of(entity_id)
+
+    def refresh_entity(self, entity_id: int):
+        """Re-read one entity's row after it was saved: update, insert or remove it"""
+        if self._adapter is None:
+            return
+        rows = self._adapter.get_entity_rows(
+            self._table_name, self._search_text, entity_ids=[entity_id]
+        )
+        position = self.row_of(entity_id)
+        if not rows:
+            # Deleted, or no longer matches the search
+            self.remove_entity(entity_id)
+        elif position is not None:
+            self._rows[position] = rows[0]
+            index = self.index(position)
+            self.dataChanged.emit(index, index)
+        elif self._exhausted or (self._ids and entity_id < self._ids[-1]):
+            # Within the loaded range; rows past it arrive with later pages
+            position = bisect.bisect_left(self._ids, entity_id)
+            self.beginInsertRows(QModelIndex(), position, position)
+            self._rows.insert(position, rows[0])
+            self._ids.insert(position, entity_id)
+            self.endInsertRows()
+
+    def remove_entity(self, entity_id: int):
+        """Drop an entity's row"""
+        position = self.row_of(entity_id)
+        if position is None:
+            return
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self._rows[position]
+        del self._ids[position]
+        self.endRemoveRows()
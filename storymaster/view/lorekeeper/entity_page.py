@@ -48,6 +48,10 @@ from storymaster.view.common.tooltips import (
 )
 
 
+# Relationship panels that start expanded; the rest are loaded when opened
+EXPANDED_RELATIONSHIP_PANELS = 3
+
+
 class SectionWidget(QGroupBox):
     """Widget for displaying a logical section of entity fields"""
 
@@ -372,17 +376,34 @@ class RelationshipWidget(QGroupBox):
     add_relationship_requested = Signal(str)  # relationship_type
     remove_relationship_requested = Signal(str, object)  # relationship_type, entity
     edit_relationship_requested = Signal(str, object)  # relationship_type, entity
+    load_requested = Signal(str)  # relationship_type, expanded while stale
 
     def __init__(
-        self, relationship_name: str, relationship_display_name: str, parent=None
+        self,
+        relationship_name: str,
+        relationship_display_name: str,
+        expanded: bool = True,
+        parent=None,
     ):
         super().__init__(relationship_display_name, parent)
         self.relationship_name = relationship_name
         self.related_entities = []
+        # False until entities are set for the current entity
+        self.loaded = False
         self.setup_ui()
 
+        # The title checkbox collapses the panel
+        self.setCheckable(True)
+        self.setChecked(expanded)
+        self.body.setVisible(expanded)
+        self.toggled.connect(self.on_toggled)
+
     def setup_ui(self):
-        layout = QVBoxLayout()
+        outer_layout = QVBoxLayout()
+        self.body = QWidget()
+        layout = QVBoxLayout(self.body)
+        layout.setContentsMargins(0, 0, 0, 0)
+        outer_layout.addWidget(self.body)
 
         # List of related entities
         self.entity_list = QListWidget()
@@ -406,12 +427,28 @@ class RelationshipWidget(QGroupBox):
         button_layout.addStretch()
 
         layout.addLayout(button_layout)
-        self.setLayout(layout)
+        self.setLayout(outer_layout)
 
         # Enable/disable buttons based on selection
         self.entity_list.itemSelectionChanged.connect(self.update_button_states)
         self.update_button_states()
 
+    def is_expanded(self) -> bool:
+        """Whether the panel is expanded"""
+        return self.isChecked()
+
+    def on_toggled(self, expanded: bool):
+        """Show or hide the panel body, asking for entities if they are stale"""
+        self.body.setVisible(expanded)
+        if expanded and not self.loaded:
+            self.load_requested.emit(self.relationship_name)
+
+    def mark_stale(self):
+        """Drop the shown entities; they are loaded again when needed"""
+        self.related_entities = []
+        self.entity_list.clear()
+        self.loaded = False
+
     def update_button_states(self):
         """Enable/disable buttons based on selection"""
         has_selection = bool(self.entity_list.currentItem())
@@ -426,6 +463,7 @@ class RelationshipWidget(QGroupBox):
     def set_related_entities(self, entities: list):
         """Set the list of related entities"""
         self.related_entities = entities
+        self.loaded = True
         self.entity_list.clear()
 
         for entity in entities:
@@ -614,8 +652,15 @@ class EntityDetailPage(QWidget):
 
         # Create relationship widgets
         if self.entity_mapping:
-            for rel_table, rel_display in self.entity_mapping.relationships.items():
-                rel_widget = RelationshipWidget(rel_table, rel_display)
+            for index, (rel_table, rel_display) in enumerate(
+                self.entity_mapping.relationships.items()
+            ):
+                rel_widget = RelationshipWidget(
+                    rel_table,
+                    rel_display,
+                    expanded=index < EXPANDED_RELATIONSHIP_PANELS,
+                )
+                rel_widget.load_requested.connect(self.refresh_relationship_display)
                 rel_widget.relationship_selected.connect(self.on_relationship_selected)
                 rel_widget.add_relationship_requested.connect(self.on_add_relationship)
                 rel_widget.remove_relationship_requested.connect(
@@ -864,36 +909,38 @@ class EntityDetailPage(QWidget):
             return f"ID: {getattr(entity, 'id', 'Unknown')}"
 
     def refresh_relationship_display(self, relationship_type: str = None):
-        """Refresh the display of relationships"""
+        """Refresh the display of relationships
+
+        The relationships are read together in one session. Without a type,
+        only expanded panels are refreshed; collapsed ones load when expanded.
+        """
         if not self.current_entity or not self.model_adapter:
             return
 
-        # Refresh specific relationship type or all relationships
-        relationship_types = (
-            [relationship_type]
-            if relationship_type
-            else self.relationship_widgets.keys()
-        )
+        # Refresh specific relationship type or all expanded relationships
+        if relationship_type:
+            relationship_types = [relationship_type]
+        else:
+            relationship_types = []
+            for rel_type, rel_widget in self.relationship_widgets.items():
+                if rel_widget.is_expanded():
+                    relationship_types.append(rel_type)
+                else:
+                    rel_widget.mark_stale()
+
+        relationship_types = [
+            rel_type for rel_type in relationship_types if rel_type in self.relationship_widgets
+        ]
+        if not relationship_types:
+            return
 
+        related = self.model_adapter.get_all_relationships(self.current_entity, relationship_types)
         for rel_type in relationship_types:
-            if rel_type in self.relationship_widgets:
-                related_entities = self.model_adapter.get_relationship_entities(
-                    self.current_entity, rel_type
-                )
-                self.relationship_widgets[rel_type].set_related_entities(
-                    related_entities
-                )
+            self.relationship_widgets[rel_type].set_related_entities(related.get(rel_type, []))
 
     def load_relationships(self):
         """Load and display all relationships for the current entity"""
-        if not self.current_entity or not self.model_adapter:
-            return
-
-        for rel_type, rel_widget in self.relationship_widgets.items():
-            related_entities = self.model_adapter.get_relationship_entities(
-                self.current_entity, rel_type
-            )
-            rel_widget.set_related_entities(related_entities)
+        self.refresh_relationship_display()
 
     def on_checkbox_changed(self, field_name: str, checked: bool):
         """Handle checkbox changes for conditional sections"""
@@ -35,6 +35,7 @@ class EntitySelectionDialog(QDialog):
         self.model_adapter = model_adapter
         self.current_entity = current_entity
         self.selected_entity = None
+        self.selected_row = None
         self.entities = []
         self.setup_ui()
         self.load_entities()
@@ -98,13 +99,10 @@ class EntitySelectionDialog(QDialog):
         # Determine which entity types can be added based on relationship type
         target_tables = self.get_target_tables_for_relationship()
 
+        # Rows hold just the id, name and table; the chosen entity is loaded on accept
         self.entities = []
         for table_name in target_tables:
-            entities = self.model_adapter.get_entities(table_name)
-            for entity in entities:
-                # Add table info for display
-                entity._table_name = table_name
-                self.entities.append(entity)
+            self.entities.extend(self.model_adapter.get_entity_rows(table_name))
 
         self.populate_list(self.entities)
 
@@ -241,7 +239,7 @@ class EntitySelectionDialog(QDialog):
             display_text = self.get_entity_display_text(entity)
 
             # Add entity type info
-            table_name = getattr(entity, "_table_name", "unknown")
+            table_name = entity.icon_key
             mapping = get_entity_mapping(table_name)
             if mapping:
                 display_text = f"{mapping.icon} {display_text} ({mapping.display_name})"
@@ -253,24 +251,8 @@ class EntitySelectionDialog(QDialog):
             self.entity_list.addItem(item)
 
     def get_entity_display_text(self, entity) -> str:
-        """Generate display text for an entity"""
-        # Character names
-        if hasattr(entity, "first_name") and entity.first_name:
-            name_parts = [entity.first_name]
-            if hasattr(entity, "last_name") and entity.last_name:
-                name_parts.append(entity.last_name)
-            return " ".join(name_parts)
-
-        # Generic name field
-        if hasattr(entity, "name") and entity.name:
-            return entity.name
-
-        # Title field
-        if hasattr(entity, "title") and entity.title:
-            return entity.title
-
-        # Fallback to ID
-        return f"ID: {entity.id}"
+        """Generate display text for an entity row"""
+        return entity.name
 
     def filter_entities(self, search_text: str):
         """Filter entities based on search text"""
@@ -294,13 +276,16 @@ class EntitySelectionDialog(QDialog):
         self.select_button.setEnabled(current_item is not None)
 
         if current_item:
-            self.selected_entity = current_item.data(Qt.ItemDataRole.UserRole)
+            self.selected_row = current_item.data(Qt.ItemDataRole.UserRole)
 
     def on_entity_double_clicked(self, item: QListWidgetItem):
         """Handle entity double-click"""
-        self.selected_entity = item.data(Qt.ItemDataRole.UserRole)
+        self.selected_row = item.data(Qt.ItemDataRole.UserRole)
         self.accept()
 
     def get_selected_entity(self):
-        """Get the selected entity"""
+        """Get the selected entity, loaded in full"""
+        row = self.selected_row
+        if row is not None:
+            self.selected_entity = self.model_adapter.get_entity_by_id(row.icon_key, row.id)
         return self.selected_entity
@@ -1,31 +1,206 @@
 """Adapter to connect new Lorekeeper interface to existing model"""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from storymaster.model.common.common_model import BaseModel
+from storymaster.model.database import lore_search
 from storymaster.model.database.schema.base import (
     Actor,
+    ActorAOnBRelations,
+    ActorToClass,
+    ActorToRace,
+    ActorToSkills,
+    ActorToStat,
     Alignment,
     Background,
     Class_,
     Faction,
+    FactionAOnBRelations,
+    FactionMembers,
     History,
+    HistoryActor,
+    HistoryFaction,
     LitographyNotes,
+    LitographyNoteToActor,
+    LitographyNoteToFaction,
+    LitographyNoteToLocation,
+    LitographyNoteToObject,
+    LitographyNoteToWorldData,
+    LORE_SEARCH_SOURCES,
     Location,
+    LocationAOnBRelations,
     LocationCity,
     LocationCityDistricts,
     LocationDungeon,
+    LocationEconomicRelations,
     LocationFloraFauna,
+    LocationGeographicRelations,
+    LocationHierarchy,
+    LocationPoliticalRelations,
+    LocationToFaction,
     Object_,
+    ObjectToOwner,
     Race,
+    Resident,
     Skills,
     Stat,
     SubRace,
+    StorylineToSetting,
     WorldData,
 )
 
+# Rows per page for lazily loaded entity lists
+ENTITY_PAGE_SIZE = 200
+
+# Columns an entity's display name can come from, in the order they are tried
+NAME_COLUMNS = ("title", "first_name", "last_name", "name")
+
+
+def entity_display_name(table_name: str, values: Mapping[str, Any]) -> str:
+    """
+    Display name for an entity from its name columns.
+
+    Args:
+        table_name: The entity's table
+        values: id plus whichever NAME_COLUMNS the table has (missing ones are None)
+    """
+    # Character names
+    if table_name == "actor":
+        name_parts = [part for part in (values.get("first_name"), values.get("last_name")) if part]
+        if name_parts:
+            name = " ".join(name_parts)
+            if values.get("title"):
+                return f"{values['title']} {name}"
+            return name
+
+    # Generic name field, then title (for plots, arcs, etc.)
+    if values.get("name"):
+        return values["name"]
+    if values.get("title"):
+        return values["title"]
+
+    # Fallback to ID
+    return f"ID: {values['id']}"
+
+
+class EntityRow:
+    """One entity in a list: its id, display name and icon key (its table name)"""
+
+    __slots__ = ("id", "name", "icon_key")
+
+    def __init__(self, id: int, name: str, icon_key: str):
+        self.id = id
+        self.name = name
+        self.icon_key = icon_key
+
+    def __eq__(self, other):
+        return isinstance(other, EntityRow) and (self.id, self.name, self.icon_key) == (
+            other.id,
+            other.name,
+            other.icon_key,
+        )
+
+    def __repr__(self):
+        return f"EntityRow({self.id!r}, {self.name!r}, {self.icon_key!r})"
+
+
+class RelationshipLink(NamedTuple):
+    """How a relationship reaches related rows through one link table"""
+
+    link_model: type
+    own_column: str  # Link column holding the entity's id
+    target_column: Optional[str] = None  # None: the link rows are the related rows
+    target_model: Optional[type] = None
+    symmetric: bool = False  # A-on-B tables: the entity may be on either side
+
+
+def _between(link_model, a_column: str, a_model: type, b_column: str, b_model: type):
+    """Links for a table joining two entity types, read from either type"""
+    return {
+        a_model: (RelationshipLink(link_model, a_column, b_column, b_model),),
+        b_model: (RelationshipLink(link_model, b_column, a_column, a_model),),
+    }
+
+
+def _among(link_model, a_column: str, b_column: str, model: type):
+    """Links for an A-on-B table relating entities of one type"""
+    return {model: (RelationshipLink(link_model, a_column, b_column, model, True),)}
+
+
+# Relationship name -> entity class -> links, in display order
+RELATIONSHIP_LINKS: Dict[str, Dict[Optional[type], Tuple[RelationshipLink, ...]]] = {
+    "actor_a_on_b_relations": _among(ActorAOnBRelations, "actor_a_id", "actor_b_id", Actor),
+    "faction_members": _between(FactionMembers, "faction_id", Faction, "actor_id", Actor),
+    "residents": _between(Resident, "location_id", Location, "actor_id", Actor),
+    "object_to_owner": _between(ObjectToOwner, "object_id", Object_, "actor_id", Actor),
+    "location_to_faction": _between(
+        LocationToFaction, "location_id", Location, "faction_id", Faction
+    ),
+    "actor_to_skills": _between(ActorToSkills, "actor_id", Actor, "skill_id", Skills),
+    "actor_to_race": _between(ActorToRace, "actor_id", Actor, "race_id", Race),
+    "actor_to_class": _between(ActorToClass, "actor_id", Actor, "class_id", Class_),
+    "actor_to_stat": _between(ActorToStat, "actor_id", Actor, "stat_id", Stat),
+    "history_actor": _between(HistoryActor, "actor_id", Actor, "history_id", History),
+    "faction_a_on_b_relations": _among(
+        FactionAOnBRelations, "faction_a_id", "faction_b_id", Faction
+    ),
+    "history_faction": _between(HistoryFaction, "faction_id", Faction, "history_id", History),
+    "location_a_on_b_relations": _among(
+        LocationAOnBRelations, "location_a_id", "location_b_id", Location
+    ),
+    "location_geographic_relations": _among(
+        LocationGeographicRelations, "location_a_id", "location_b_id", Location
+    ),
+    "location_political_relations": _among(
+        LocationPoliticalRelations, "location_a_id", "location_b_id", Location
+    ),
+    "location_economic_relations": _among(
+        LocationEconomicRelations, "location_a_id", "location_b_id", Location
+    ),
+    "location_hierarchy": {
+        # Parents first, then children
+        Location: (
+            RelationshipLink(
+                LocationHierarchy, "child_location_id", "parent_location_id", Location
+            ),
+            RelationshipLink(
+                LocationHierarchy, "parent_location_id", "child_location_id", Location
+            ),
+        ),
+    },
+    "location_city_districts": {
+        # Districts of this city, then cities this location is a district of
+        Location: (
+            RelationshipLink(LocationCityDistricts, "location_id", "district_id", Location),
+            RelationshipLink(LocationCityDistricts, "district_id", "location_id", Location),
+        ),
+    },
+    "location_flora_fauna": {Location: (RelationshipLink(LocationFloraFauna, "location_id"),)},
+    "litography_note_to_world_data": _between(
+        LitographyNoteToWorldData, "note_id", LitographyNotes, "world_data_id", WorldData
+    ),
+    "litography_note_to_actor": _between(
+        LitographyNoteToActor, "note_id", LitographyNotes, "actor_id", Actor
+    ),
+    "litography_note_to_location": _between(
+        LitographyNoteToLocation, "note_id", LitographyNotes, "location_id", Location
+    ),
+    "litography_note_to_object": _between(
+        LitographyNoteToObject, "note_id", LitographyNotes, "object_id", Object_
+    ),
+    "litography_note_to_faction": _between(
+        LitographyNoteToFaction, "note_id", LitographyNotes, "faction_id", Faction
+    ),
+}
+
+
+def relationship_links(relationship_name: str, entity: Any) -> Tuple[RelationshipLink, ...]:
+    """Links that load a relationship for an entity (empty if it has none)"""
+    return RELATIONSHIP_LINKS.get(relationship_name, {}).get(type(entity), ())
+
 
 class LorekeeperModelAdapter:
     """Adapter class to connect the new Lorekeeper UI to the existing model"""
@@ -52,69 +227,83 @@ class LorekeeperModelAdapter:
             "litography_notes": LitographyNotes,
         }
 
-    def get_entities(self, table_name: str) -> List[Any]:
-        """Get all entities for a given table type"""
+    def get_entity_rows(
+        self,
+        table_name: str,
+        search_text: str = "",
+        after_id: int = 0,
+        limit: Optional[int] = None,
+        entity_ids: Optional[Iterable[int]] = None,
+    ) -> List[EntityRow]:
+        """
+        List rows for a table, in id order, without loading full entities.
+
+        Only the id and name columns are selected. Pages are keyed by id, so
+        rows added or removed between pages don't shift the ones after them.
+
+        Args:
+            table_name: The entity table
+            search_text: Words to search for. Lore tables use the lore search index
+                (each word a prefix of a word in the name or text); other tables,
+                and text without words, match it as a substring of a name column
+                or the description
+            after_id: Only rows with a greater id
+            limit: At most this many rows
+            entity_ids: Only these ids
+        """
         table_class = self.table_classes.get(table_name)
         if not table_class:
             return []
 
+        columns = table_class.__table__.c
+        name_columns = [getattr(table_class, name) for name in NAME_COLUMNS if name in columns]
+
         try:
             with Session(self.model.engine) as session:
+                query = session.query(table_class.id, *name_columns)
+
                 # Notes use storyline_id instead of setting_id
                 if table_name == "litography_notes":
-                    # For now, get all storylines for this setting and get notes for all of them
-                    from sqlalchemy.orm import joinedload
-
-                    from storymaster.model.database.schema.base import (
-                        Storyline,
+                    query = query.join(
                         StorylineToSetting,
-                    )
-
-                    storylines = (
-                        session.query(Storyline)
-                        .join(StorylineToSetting)
-                        .filter(StorylineToSetting.setting_id == self.setting_id)
-                        .all()
-                    )
-
-                    all_notes = []
-                    for storyline in storylines:
-                        notes = (
-                            session.query(table_class)
-                            .options(joinedload(table_class.linked_node))
-                            .filter_by(storyline_id=storyline.id)
-                            .all()
-                        )
-                        all_notes.extend(notes)
-                    return all_notes
+                        StorylineToSetting.storyline_id == table_class.storyline_id,
+                    ).filter(StorylineToSetting.setting_id == self.setting_id)
                 else:
-                    from sqlalchemy.orm import joinedload
-
-                    query = session.query(table_class).filter_by(
-                        setting_id=self.setting_id
+                    query = query.filter(table_class.setting_id == self.setting_id)
+
+                matching_ids = None
+                indexed = table_name in LORE_SEARCH_SOURCES
+                if search_text and indexed and lore_search.lore_search_available(session):
+                    # None when the text has no words (only punctuation, say)
+                    matching_ids = lore_search.lore_search_ids(
+                        search_text, self.setting_id, table_name
+                    )
+                if matching_ids is not None:
+                    query = query.filter(table_class.id.in_(matching_ids))
+                elif search_text:
+                    escaped = (
+                        search_text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                    )
+                    searched = list(name_columns)
+                    if "description" in columns:
+                        searched.append(table_class.description)
+                    query = query.filter(
+                        or_(*(column.ilike(f"%{escaped}%", escape="\\") for column in searched))
                     )
 
-                    # Add eager loading for commonly accessed relationships
-                    if table_name == "actor":
-                        query = query.options(
-                            joinedload(table_class.background),
-                            joinedload(table_class.alignment),
-                            joinedload(table_class.setting),
-                        )
-                    elif table_name == "faction":
-                        query = query.options(joinedload(table_class.setting))
-                    elif table_name == "location_":
-                        query = query.options(joinedload(table_class.setting))
-                    elif table_name == "object_":
-                        query = query.options(joinedload(table_class.setting))
-                    elif table_name == "history":
-                        query = query.options(joinedload(table_class.setting))
-                    elif table_name == "world_data":
-                        query = query.options(joinedload(table_class.setting))
+                if entity_ids is not None:
+                    query = query.filter(table_class.id.in_(list(entity_ids)))
 
-                    return query.all()
+                query = query.filter(table_class.id > after_id).order_by(table_class.id)
+                if limit:
+                    query = query.limit(limit)
+
+                return [
+                    EntityRow(row.id, entity_display_name(table_name, row._mapping), table_name)
+                    for row in query
+                ]
         except Exception as e:
-            print(f"Error loading entities for {table_name}: {e}")
+            print(f"Error loading entity rows for {table_name}: {e}")
             return []
 
     def get_entity_by_id(self, table_name: str, entity_id: int) -> Optional[Any]:
@@ -207,8 +396,8 @@ class LorekeeperModelAdapter:
         """Delete an entity"""
         try:
             with Session(self.model.engine) as session:
-                # Re-attach the entity to the session and delete
-                entity_to_delete = session.merge(entity)
+                # Load it by id; merging would first copy the detached state in
+                entity_to_delete = session.get(type(entity), entity.id)
                 session.delete(entity_to_delete)
                 session.commit()
                 return True
@@ -219,799 +408,105 @@ class LorekeeperModelAdapter:
     def get_foreign_key_options(self, table_name: str, field_name: str) -> List[tuple]:
         """Get options for foreign key dropdowns"""
         # Map foreign key fields to their target tables
-        fk_mappings = {
-            "background_id": ("background", Background, "name"),
-            "alignment_id": ("alignment", Alignment, "name"),
-            "race_id": ("race", Race, "name"),
-            "class_id": ("class", Class_, "name"),
-            "faction_id": ("faction", Faction, "name"),
-            "location_id": ("location_", Location, "name"),
-            "actor_id": ("actor", Actor, "first_name"),  # Could combine first/last name
-            "skill_id": ("skills", Skills, "name"),
-            "object_id": ("object_", Object_, "name"),
+        fk_tables = {
+            "background_id": "background",
+            "alignment_id": "alignment",
+            "race_id": "race",
+            "class_id": "class",
+            "faction_id": "faction",
+            "location_id": "location_",
+            "actor_id": "actor",
+            "skill_id": "skills",
+            "object_id": "object_",
         }
 
-        if field_name not in fk_mappings:
+        target_table = fk_tables.get(field_name)
+        if not target_table:
             return []
 
-        target_table, target_class, display_field = fk_mappings[field_name]
-
-        try:
-            with Session(self.model.engine) as session:
-                entities = (
-                    session.query(target_class)
-                    .filter_by(setting_id=self.setting_id)
-                    .all()
-                )
+        # Only the id and name columns are loaded
+        return [(row.id, row.name) for row in self.get_entity_rows(target_table)]
 
-                options = []
-                for entity in entities:
-                    display_value = getattr(entity, display_field, "")
-
-                    # Special handling for actor names
-                    if target_table == "actor" and hasattr(entity, "last_name"):
-                        if entity.last_name:
-                            display_value = f"{entity.first_name} {entity.last_name}"
-
-                    options.append((entity.id, display_value or f"ID: {entity.id}"))
-
-                return options
-        except Exception as e:
-            print(f"Error loading foreign key options for {field_name}: {e}")
-            return []
-
-    def get_relationship_entities(
-        self, entity: Any, relationship_name: str
-    ) -> List[Any]:
+    def get_relationship_entities(self, entity: Any, relationship_name: str) -> List[Any]:
         """Get related entities for a given relationship"""
+        return self.get_all_relationships(entity, [relationship_name])[relationship_name]
+
+    def get_all_relationships(
+        self, entity: Any, relationship_names: Optional[Iterable[str]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Get related entities for many relationships of one entity at once.
+
+        Everything is read in one session: one query per link table for the
+        link rows, then one IN query per related entity type.
+
+        Args:
+            entity: The entity whose relationships to load (only its id is used)
+            relationship_names: Relationships to load; all of the entity's by default
+
+        Returns:
+            Related entities per relationship name, in link order. Relationships
+            the entity doesn't have map to an empty list.
+        """
+        if relationship_names is None:
+            relationship_names = [
+                name for name in RELATIONSHIP_LINKS if relationship_links(name, entity)
+            ]
+        related = {name: [] for name in relationship_names}
+
         try:
             with Session(self.model.engine) as session:
-                # Re-attach entity to session
-                entity = session.merge(entity)
-
-                # Get relationships based on type
-                if relationship_name == "actor_a_on_b_relations":
-                    from storymaster.model.database.schema.base import (
-                        ActorAOnBRelations,
-                    )
-
-                    relations = (
-                        session.query(ActorAOnBRelations)
-                        .filter(
-                            (ActorAOnBRelations.actor_a_id == entity.id)
-                            | (ActorAOnBRelations.actor_b_id == entity.id)
-                        )
-                        .all()
-                    )
-
-                    related_entities = []
-                    for rel in relations:
-                        if rel.actor_a_id == entity.id:
-                            related_entities.append(rel.actor_b)
-                        else:
-                            related_entities.append(rel.actor_a)
-                    return related_entities
-
-                elif relationship_name == "faction_members":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        Faction,
-                        FactionMembers,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Faction":
-                        # Get actors who are members of this faction
-                        memberships = (
-                            session.query(FactionMembers)
-                            .filter(FactionMembers.faction_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, membership.actor_id)
-                            for membership in memberships
-                            if membership.actor_id
-                        ]
-                    elif entity.__class__.__name__ == "Actor":
-                        # Get factions this actor is a member of
-                        memberships = (
-                            session.query(FactionMembers)
-                            .filter(FactionMembers.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Faction, membership.faction_id)
-                            for membership in memberships
-                            if membership.faction_id
-                        ]
-
-                elif relationship_name == "residents":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        Location,
-                        Resident,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Location":
-                        # Get actors who live in this location
-                        residencies = (
-                            session.query(Resident)
-                            .filter(Resident.location_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, residency.actor_id)
-                            for residency in residencies
-                            if residency.actor_id
-                        ]
-                    elif entity.__class__.__name__ == "Actor":
-                        # Get locations where this actor lives
-                        residencies = (
-                            session.query(Resident)
-                            .filter(Resident.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Location, residency.location_id)
-                            for residency in residencies
-                            if residency.location_id
-                        ]
-                elif relationship_name == "object_to_owner":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        Object_,
-                        ObjectToOwner,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Object_":
-                        # Get actors who own this object
-                        ownerships = (
-                            session.query(ObjectToOwner)
-                            .filter(ObjectToOwner.object_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, ownership.actor_id)
-                            for ownership in ownerships
-                            if ownership.actor_id
-                        ]
-                    elif entity.__class__.__name__ == "Actor":
-                        # Get objects this actor owns
-                        ownerships = (
-                            session.query(ObjectToOwner)
-                            .filter(ObjectToOwner.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Object_, ownership.object_id)
-                            for ownership in ownerships
-                            if ownership.object_id
-                        ]
-
-                elif relationship_name == "location_to_faction":
-                    from storymaster.model.database.schema.base import (
-                        Faction,
-                        Location,
-                        LocationToFaction,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Location":
-                        # Get factions that control this location
-                        controls = (
-                            session.query(LocationToFaction)
-                            .filter(LocationToFaction.location_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Faction, control.faction_id)
-                            for control in controls
-                            if control.faction_id
-                        ]
-                    elif entity.__class__.__name__ == "Faction":
-                        # Get locations this faction controls
-                        controls = (
-                            session.query(LocationToFaction)
-                            .filter(LocationToFaction.faction_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Location, control.location_id)
-                            for control in controls
-                            if control.location_id
-                        ]
-
-                elif relationship_name == "actor_to_skills":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        ActorToSkills,
-                        Skills,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Actor":
-                        # Get skills this actor has
-                        skill_relations = (
-                            session.query(ActorToSkills)
-                            .filter(ActorToSkills.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Skills, skill_rel.skill_id)
-                            for skill_rel in skill_relations
-                            if skill_rel.skill_id
-                        ]
-                    elif entity.__class__.__name__ == "Skills":
-                        # Get actors who have this skill
-                        skill_relations = (
-                            session.query(ActorToSkills)
-                            .filter(ActorToSkills.skill_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, skill_rel.actor_id)
-                            for skill_rel in skill_relations
-                            if skill_rel.actor_id
-                        ]
-
-                elif relationship_name == "actor_to_race":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        ActorToRace,
-                        Race,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Actor":
-                        # Get races this actor belongs to
-                        race_relations = (
-                            session.query(ActorToRace)
-                            .filter(ActorToRace.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Race, race_rel.race_id)
-                            for race_rel in race_relations
-                            if race_rel.race_id
-                        ]
-                    elif entity.__class__.__name__ == "Race":
-                        # Get actors of this race
-                        race_relations = (
-                            session.query(ActorToRace)
-                            .filter(ActorToRace.race_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, race_rel.actor_id)
-                            for race_rel in race_relations
-                            if race_rel.actor_id
-                        ]
-
-                elif relationship_name == "actor_to_class":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        ActorToClass,
-                        Class_,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Actor":
-                        # Get classes this actor has
-                        class_relations = (
-                            session.query(ActorToClass)
-                            .filter(ActorToClass.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Class_, class_rel.class_id)
-                            for class_rel in class_relations
-                            if class_rel.class_id
-                        ]
-                    elif entity.__class__.__name__ == "Class_":
-                        # Get actors who have this class
-                        class_relations = (
-                            session.query(ActorToClass)
-                            .filter(ActorToClass.class_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, class_rel.actor_id)
-                            for class_rel in class_relations
-                            if class_rel.actor_id
-                        ]
-
-                elif relationship_name == "actor_to_stat":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        ActorToStat,
-                        Stat,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Actor":
-                        # Get stats this actor has
-                        stat_relations = (
-                            session.query(ActorToStat)
-                            .filter(ActorToStat.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Stat, stat_rel.stat_id)
-                            for stat_rel in stat_relations
-                            if stat_rel.stat_id
-                        ]
-                    elif entity.__class__.__name__ == "Stat":
-                        # Get actors who have this stat
-                        stat_relations = (
-                            session.query(ActorToStat)
-                            .filter(ActorToStat.stat_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, stat_rel.actor_id)
-                            for stat_rel in stat_relations
-                            if stat_rel.actor_id
-                        ]
-
-                elif relationship_name == "history_actor":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        History,
-                        HistoryActor,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Actor":
-                        # Get historical events this actor was involved in
-                        history_relations = (
-                            session.query(HistoryActor)
-                            .filter(HistoryActor.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(History, hist_rel.history_id)
-                            for hist_rel in history_relations
-                            if hist_rel.history_id
-                        ]
-                    elif entity.__class__.__name__ == "History":
-                        # Get actors involved in this historical event
-                        history_relations = (
-                            session.query(HistoryActor)
-                            .filter(HistoryActor.history_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, hist_rel.actor_id)
-                            for hist_rel in history_relations
-                            if hist_rel.actor_id
-                        ]
-
-                elif relationship_name == "faction_a_on_b_relations":
-                    from storymaster.model.database.schema.base import (
-                        Faction,
-                        FactionAOnBRelations,
-                    )
-
-                    # Query database directly for fresh data
-                    relations = (
-                        session.query(FactionAOnBRelations)
-                        .filter(
-                            (FactionAOnBRelations.faction_a_id == entity.id)
-                            | (FactionAOnBRelations.faction_b_id == entity.id)
-                        )
-                        .all()
-                    )
-
-                    related_entities = []
-                    for rel in relations:
-                        if rel.faction_a_id == entity.id:
-                            related_entities.append(
-                                session.get(Faction, rel.faction_b_id)
-                            )
-                        else:
-                            related_entities.append(
-                                session.get(Faction, rel.faction_a_id)
-                            )
-                    return [entity for entity in related_entities if entity is not None]
-
-                elif relationship_name == "history_faction":
-                    from storymaster.model.database.schema.base import (
-                        Faction,
-                        History,
-                        HistoryFaction,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Faction":
-                        # Get historical events this faction was involved in
-                        history_relations = (
-                            session.query(HistoryFaction)
-                            .filter(HistoryFaction.faction_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(History, hist_rel.history_id)
-                            for hist_rel in history_relations
-                            if hist_rel.history_id
-                        ]
-                    elif entity.__class__.__name__ == "History":
-                        # Get factions involved in this historical event
-                        history_relations = (
-                            session.query(HistoryFaction)
-                            .filter(HistoryFaction.history_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Faction, hist_rel.faction_id)
-                            for hist_rel in history_relations
-                            if hist_rel.faction_id
-                        ]
-
-                elif relationship_name == "location_a_on_b_relations":
-                    from storymaster.model.database.schema.base import (
-                        Location,
-                        LocationAOnBRelations,
-                    )
-
-                    # Query database directly for fresh data
-                    relations = (
-                        session.query(LocationAOnBRelations)
-                        .filter(
-                            (LocationAOnBRelations.location_a_id == entity.id)
-                            | (LocationAOnBRelations.location_b_id == entity.id)
-                        )
-                        .all()
-                    )
-
-                    related_entities = []
-                    for rel in relations:
-                        if rel.location_a_id == entity.id:
-                            related_entities.append(
-                                session.get(Location, rel.location_b_id)
-                            )
-                        else:
-                            related_entities.append(
-                                session.get(Location, rel.location_a_id)
-                            )
-                    return [entity for entity in related_entities if entity is not None]
-
-                elif relationship_name == "location_geographic_relations":
-                    from storymaster.model.database.schema.base import (
-                        Location,
-                        LocationGeographicRelations,
-                    )
-
-                    # Query database directly for fresh data
-                    relations = (
-                        session.query(LocationGeographicRelations)
-                        .filter(
-                            (LocationGeographicRelations.location_a_id == entity.id)
-                            | (LocationGeographicRelations.location_b_id == entity.id)
-                        )
-                        .all()
-                    )
-
-                    related_entities = []
-                    for rel in relations:
-                        if rel.location_a_id == entity.id:
-                            related_entities.append(
-                                session.get(Location, rel.location_b_id)
-                            )
-                        else:
-                            related_entities.append(
-                                session.get(Location, rel.location_a_id)
-                            )
-                    return [entity for entity in related_entities if entity is not None]
-
-                elif relationship_name == "location_political_relations":
-                    from storymaster.model.database.schema.base import (
-                        Location,
-                        LocationPoliticalRelations,
-                    )
-
-                    # Query database directly for fresh data
-                    relations = (
-                        session.query(LocationPoliticalRelations)
-                        .filter(
-                            (LocationPoliticalRelations.location_a_id == entity.id)
-                            | (LocationPoliticalRelations.location_b_id == entity.id)
-                        )
-                        .all()
-                    )
-
-                    related_entities = []
-                    for rel in relations:
-                        if rel.location_a_id == entity.id:
-                            related_entities.append(
-                                session.get(Location, rel.location_b_id)
-                            )
-                        else:
-                            related_entities.append(
-                                session.get(Location, rel.location_a_id)
-                            )
-                    return [entity for entity in related_entities if entity is not None]
-
-                elif relationship_name == "location_economic_relations":
-                    from storymaster.model.database.schema.base import (
-                        Location,
-                        LocationEconomicRelations,
-                    )
-
-                    # Query database directly for fresh data
-                    relations = (
-                        session.query(LocationEconomicRelations)
-                        .filter(
-                            (LocationEconomicRelations.location_a_id == entity.id)
-                            | (LocationEconomicRelations.location_b_id == entity.id)
-                        )
-                        .all()
-                    )
-
-                    related_entities = []
-                    for rel in relations:
-                        if rel.location_a_id == entity.id:
-                            related_entities.append(
-                                session.get(Location, rel.location_b_id)
-                            )
-                        else:
-                            related_entities.append(
-                                session.get(Location, rel.location_a_id)
-                            )
-                    return [entity for entity in related_entities if entity is not None]
-
-                elif relationship_name == "location_hierarchy":
-                    from storymaster.model.database.schema.base import (
-                        Location,
-                        LocationHierarchy,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Location":
-                        # Get both parent and child locations
-                        parent_relations = (
-                            session.query(LocationHierarchy)
-                            .filter(LocationHierarchy.child_location_id == entity.id)
-                            .all()
-                        )
-                        child_relations = (
-                            session.query(LocationHierarchy)
-                            .filter(LocationHierarchy.parent_location_id == entity.id)
-                            .all()
-                        )
-
-                        related_entities = []
-                        # Add parent locations
-                        for rel in parent_relations:
-                            related_entities.append(
-                                session.get(Location, rel.parent_location_id)
-                            )
-                        # Add child locations
-                        for rel in child_relations:
-                            related_entities.append(
-                                session.get(Location, rel.child_location_id)
-                            )
-
-                        return [
-                            entity for entity in related_entities if entity is not None
-                        ]
-
-                elif relationship_name == "location_city_districts":
-                    from storymaster.model.database.schema.base import (
-                        Location,
-                        LocationCityDistricts,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Location":
-                        # Get districts in this city or cities this location is a district of
-                        city_relations = (
-                            session.query(LocationCityDistricts)
-                            .filter(LocationCityDistricts.location_id == entity.id)
-                            .all()
-                        )
-                        district_relations = (
-                            session.query(LocationCityDistricts)
-                            .filter(LocationCityDistricts.district_id == entity.id)
-                            .all()
-                        )
-
-                        related_entities = []
-                        # Add districts of this city
-                        for rel in city_relations:
-                            if rel.district_id:
-                                related_entities.append(
-                                    session.get(Location, rel.district_id)
-                                )
-                        # Add cities this location is a district of
-                        for rel in district_relations:
-                            if rel.location_id:
-                                related_entities.append(
-                                    session.get(Location, rel.location_id)
-                                )
-
-                        return [
-                            entity for entity in related_entities if entity is not None
-                        ]
-
-                elif relationship_name == "location_flora_fauna":
-                    from storymaster.model.database.schema.base import (
-                        LocationFloraFauna,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "Location":
-                        # Get flora/fauna entries for this location
-                        flora_fauna_entries = (
-                            session.query(LocationFloraFauna)
-                            .filter(LocationFloraFauna.location_id == entity.id)
-                            .all()
-                        )
-
-                        return flora_fauna_entries
-
-                elif relationship_name == "litography_note_to_world_data":
-                    from storymaster.model.database.schema.base import (
-                        LitographyNotes,
-                        LitographyNoteToWorldData,
-                        WorldData,
-                    )
-
-                    # Query database directly for fresh data
-                    if entity.__class__.__name__ == "LitographyNotes":
-                        # Get lore entries associated with this note
-                        note_relations = (
-                            session.query(LitographyNoteToWorldData)
-                            .filter(LitographyNoteToWorldData.note_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(WorldData, rel.world_data_id)
-                            for rel in note_relations
-                            if rel.world_data_id
-                        ]
-                    elif entity.__class__.__name__ == "WorldData":
-                        # Get notes associated with this lore entry
-                        note_relations = (
-                            session.query(LitographyNoteToWorldData)
-                            .filter(
-                                LitographyNoteToWorldData.world_data_id == entity.id
-                            )
-                            .all()
-                        )
-                        return [
-                            session.get(LitographyNotes, rel.note_id)
-                            for rel in note_relations
-                            if rel.note_id
-                        ]
-
-                elif relationship_name == "litography_note_to_actor":
-                    from storymaster.model.database.schema.base import (
-                        Actor,
-                        LitographyNotes,
-                        LitographyNoteToActor,
-                    )
-
-                    if entity.__class__.__name__ == "LitographyNotes":
-                        note_relations = (
-                            session.query(LitographyNoteToActor)
-                            .filter(LitographyNoteToActor.note_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Actor, rel.actor_id)
-                            for rel in note_relations
-                            if rel.actor_id
-                        ]
-                    elif entity.__class__.__name__ == "Actor":
-                        note_relations = (
-                            session.query(LitographyNoteToActor)
-                            .filter(LitographyNoteToActor.actor_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(LitographyNotes, rel.note_id)
-                            for rel in note_relations
-                            if rel.note_id
-                        ]
-
-                elif relationship_name == "litography_note_to_location":
-                    from storymaster.model.database.schema.base import (
-                        LitographyNotes,
-                        LitographyNoteToLocation,
-                        Location,
-                    )
-
-                    if entity.__class__.__name__ == "LitographyNotes":
-                        note_relations = (
-                            session.query(LitographyNoteToLocation)
-                            .filter(LitographyNoteToLocation.note_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Location, rel.location_id)
-                            for rel in note_relations
-                            if rel.location_id
-                        ]
-                    elif entity.__class__.__name__ == "Location":
-                        note_relations = (
-                            session.query(LitographyNoteToLocation)
-                            .filter(LitographyNoteToLocation.location_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(LitographyNotes, rel.note_id)
-                            for rel in note_relations
-                            if rel.note_id
-                        ]
-
-                elif relationship_name == "litography_note_to_object":
-                    from storymaster.model.database.schema.base import (
-                        LitographyNotes,
-                        LitographyNoteToObject,
-                        Object_,
-                    )
-
-                    if entity.__class__.__name__ == "LitographyNotes":
-                        note_relations = (
-                            session.query(LitographyNoteToObject)
-                            .filter(LitographyNoteToObject.note_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Object_, rel.object_id)
-                            for rel in note_relations
-                            if rel.object_id
-                        ]
-                    elif entity.__class__.__name__ == "Object_":
-                        note_relations = (
-                            session.query(LitographyNoteToObject)
-                            .filter(LitographyNoteToObject.object_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(LitographyNotes, rel.note_id)
-                            for rel in note_relations
-                            if rel.note_id
-                        ]
-
-                elif relationship_name == "litography_note_to_faction":
-                    from storymaster.model.database.schema.base import (
-                        Faction,
-                        LitographyNotes,
-                        LitographyNoteToFaction,
-                    )
-
-                    if entity.__class__.__name__ == "LitographyNotes":
-                        note_relations = (
-                            session.query(LitographyNoteToFaction)
-                            .filter(LitographyNoteToFaction.note_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(Faction, rel.faction_id)
-                            for rel in note_relations
-                            if rel.faction_id
-                        ]
-                    elif entity.__class__.__name__ == "Faction":
-                        note_relations = (
-                            session.query(LitographyNoteToFaction)
-                            .filter(LitographyNoteToFaction.faction_id == entity.id)
-                            .all()
-                        )
-                        return [
-                            session.get(LitographyNotes, rel.note_id)
-                            for rel in note_relations
-                            if rel.note_id
-                        ]
-
-                # Add more relationship types as needed
-                return []
+                # (target model, target id) per link row, or (None, row) for
+                # relationships whose link rows are the related rows
+                references = {name: [] for name in related}
+                target_ids: Dict[type, set] = {}
+
+                for name in related:
+                    for link in relationship_links(name, entity):
+                        own_column = getattr(link.link_model, link.own_column)
+                        if link.target_model is None:
+                            references[name].extend(
+                                (None, row)
+                                for row in session.query(link.link_model)
+                                .filter(own_column == entity.id)
+                                .order_by(link.link_model.id)
+                            )
+                            continue
+
+                        target_column = getattr(link.link_model, link.target_column)
+                        condition = own_column == entity.id
+                        if link.symmetric:
+                            condition = or_(condition, target_column == entity.id)
+                        link_rows = (
+                            session.query(own_column, target_column)
+                            .filter(condition)
+                            .order_by(link.link_model.id)
+                        )
+                        for own_id, target_id in link_rows:
+                            # A-on-B rows may name the entity on either side
+                            if link.symmetric and own_id != entity.id:
+                                target_id = own_id
+                            if target_id:
+                                references[name].append((link.target_model, target_id))
+                                target_ids.setdefault(link.target_model, set()).add(target_id)
+
+                loaded = {}
+                for model, ids in target_ids.items():
+                    for target in session.query(model).filter(model.id.in_(ids)):
+                        loaded[(model, target.id)] = target
+
+                for name, refs in references.items():
+                    targets = (
+                        target if model is None else loaded.get((model, target))
+                        for model, target in refs
+                    )
+                    related[name] = [target for target in targets if target is not None]
 
         except Exception as e:
-            print(f"Error getting relationship entities for {relationship_name}: {e}")
-            return []
+            print(f"Error getting relationships for {type(entity).__name__}: {e}")
+            return {name: [] for name in related}
+
+        return related
 
     def add_relationship(
         self,
@@ -1023,10 +518,6 @@ class LorekeeperModelAdapter:
         """Add a relationship between entities"""
         try:
             with Session(self.model.engine) as session:
-                # Re-attach entities to session
-                entity = session.merge(entity)
-                related_entity = session.merge(related_entity)
-
                 # Create relationship based on type
                 if relationship_name == "actor_a_on_b_relations":
                     from storymaster.model.database.schema.base import (
@@ -3297,37 +2788,40 @@ class LorekeeperModelAdapter:
             print(f"Error getting relationship data for {relationship_name}: {e}")
             return {}
 
-    def search_entities(self, table_name: str, search_term: str) -> List[Any]:
-        """Search entities by text content"""
-        table_class = self.table_classes.get(table_name)
-        if not table_class:
-            return []
+    def search_entities(self, table_name: str, search_term: str) -> List[EntityRow]:
+        """Search a table's names and descriptions; returns rows, not full entities"""
+        return self.get_entity_rows(table_name, search_term)
 
+    def search_lore(
+        self,
+        search_text: str,
+        table_names: Optional[Iterable[str]] = None,
+        names_only: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[EntityRow]:
+        """
+        Search the setting's lore across tables, best matches first.
+
+        Args:
+            search_text: Words to search for, each matched as a prefix
+            table_names: Only these lore tables; None for all of them
+            names_only: Match names only
+            limit: At most this many rows
+        """
         try:
             with Session(self.model.engine) as session:
-                query = session.query(table_class).filter_by(setting_id=self.setting_id)
-
-                # Add search filters based on common text fields
-                if hasattr(table_class, "name"):
-                    query = query.filter(table_class.name.ilike(f"%{search_term}%"))
-                elif hasattr(table_class, "first_name"):
-                    query = query.filter(
-                        table_class.first_name.ilike(f"%{search_term}%")
-                        | table_class.last_name.ilike(f"%{search_term}%")
-                    )
-                elif hasattr(table_class, "title"):
-                    query = query.filter(table_class.title.ilike(f"%{search_term}%"))
-
-                # Also search in description if available
-                if hasattr(table_class, "description"):
-                    query = query.filter(
-                        table_class.description.ilike(f"%{search_term}%")
-                    )
-
-                return query.all()
+                if not lore_search.lore_search_available(session):
+                    return []
+                hits = lore_search.search_lore(
+                    session, search_text, self.setting_id, table_names, names_only, limit
+                )
         except Exception as e:
-            print(f"Error searching entities in {table_name}: {e}")
+            print(f"Error searching lore: {e}")
             return []
+        return [
+            EntityRow(hit.entity_id, hit.name or f"ID: {hit.entity_id}", hit.entity_type)
+            for hit in hits
+        ]
 
     def get_location_details(self, location_entity: Any) -> Dict[str, Any]:
         """Get additional location details (dungeon, city, etc.) for a location"""
@@ -1,13 +1,15 @@
 """Navigation interface for user-friendly Lorekeeper"""
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import QModelIndex, Qt, Signal
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QComboBox,
     QFrame,
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QListView,
     QListWidget,
     QListWidgetItem,
     QPushButton,
@@ -34,75 +36,69 @@ from storymaster.view.common.tooltips import (
     apply_general_tooltips,
     apply_lorekeeper_tooltips,
 )
+from storymaster.view.lorekeeper.entity_list_model import EntityListModel, truncate_text
+from storymaster.view.lorekeeper.lorekeeper_model_adapter import (
+    NAME_COLUMNS,
+    EntityRow,
+    LorekeeperModelAdapter,
+    entity_display_name,
+)
 
 
-class EntityListWidget(QListWidget):
-    """Enhanced list widget for displaying entities"""
+class EntityListWidget(QListView):
+    """Virtualized list of the entities in a category (see EntityListModel)"""
 
-    entity_selected = Signal(object)  # entity
+    entity_selected = Signal(object)  # entity id
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.itemClicked.connect(self.on_item_clicked)
-        self.setStyleSheet(get_list_style())
+        self.entity_model = EntityListModel(self)
+        self.setModel(self.entity_model)
+        # Every row has the same height, so only visible rows are ever laid out
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.clicked.connect(self.on_item_clicked)
+        self.setStyleSheet(get_list_style("QListView"))
+
+    def set_source(
+        self, adapter: LorekeeperModelAdapter, table_name: str, search_text: str = ""
+    ):
+        """Show a table's entities, loading rows as they are scrolled into view"""
+        self.entity_model.set_source(adapter, table_name, search_text)
 
     def set_entities(self, entities: list, table_name: str):
-        """Set the list of entities to display"""
-        self.clear()
-        mapping = get_entity_mapping(table_name)
-
-        for entity in entities:
-            # Create display text
-            display_text = self.get_entity_display_text(entity, table_name)
-
-            # Create item
-            item = QListWidgetItem(display_text)
-            item.setData(Qt.ItemDataRole.UserRole, entity)
-
-            # Add icon if available
-            if mapping:
-                item.setText(f"{mapping.icon} {display_text}")
-
-            self.addItem(item)
+        """Set a fixed list of (already loaded) entities to display"""
+        rows = [
+            EntityRow(entity.id, self.get_entity_display_text(entity, table_name), table_name)
+            for entity in entities
+        ]
+        self.entity_model.set_rows(rows, table_name)
 
     def get_entity_display_text(self, entity, table_name: str) -> str:
         """Generate display text for an entity"""
-        # Character names
-        if table_name == "actor":
-            name_parts = []
-            if hasattr(entity, "first_name") and entity.first_name:
-                name_parts.append(entity.first_name)
-            if hasattr(entity, "last_name") and entity.last_name:
-                name_parts.append(entity.last_name)
-            if name_parts:
-                name = " ".join(name_parts)
-                if hasattr(entity, "title") and entity.title:
-                    full_name = f"{entity.title} {name}"
-                    return self.truncate_text(full_name, 40)
-                return self.truncate_text(name, 40)
-
-        # Generic name field
-        if hasattr(entity, "name") and entity.name:
-            return self.truncate_text(entity.name, 40)
-
-        # Title field (for plots, arcs, etc.)
-        if hasattr(entity, "title") and entity.title:
-            return self.truncate_text(entity.title, 40)
-
-        # Fallback to ID
-        return f"ID: {entity.id}"
+        values = {name: getattr(entity, name, None) for name in NAME_COLUMNS}
+        values["id"] = entity.id
+        return entity_display_name(table_name, values)
 
     def truncate_text(self, text: str, max_length: int) -> str:
         """Truncate text if it's too long"""
-        if len(text) <= max_length:
-            return text
-        return text[: max_length - 3] + "..."
-
-    def on_item_clicked(self, item: QListWidgetItem):
+        return truncate_text(text, max_length)
+
+    def select_entity_by_id(self, entity_id: int) -> bool:
+        """Select and scroll to an entity, fetching pages up to it if needed"""
+        row = self.entity_model.fetch_until(entity_id)
+        if row is None:
+            return False
+        index = self.entity_model.index(row)
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+        return True
+
+    def on_item_clicked(self, index: QModelIndex):
         """Handle item click"""
-        entity = item.data(Qt.ItemDataRole.UserRole)
-        if entity:
-            self.entity_selected.emit(entity)
+        entity_id = index.data(EntityListModel.EntityIdRole)
+        if entity_id is not None:
+            self.entity_selected.emit(entity_id)
 
 
 class SearchBar(QWidget):
@@ -297,7 +293,7 @@ class LorekeeperNavigation(QWidget):
 class LorekeeperBrowser(QWidget):
     """Entity browser with list and search"""
 
-    entity_selected = Signal(object)  # entity
+    entity_selected = Signal(object)  # entity id
     new_entity_requested = Signal()
 
     def __init__(self, parent=None):
@@ -42,7 +42,6 @@ class LorekeeperPage(QWidget):
         self.model_adapter = LorekeeperModelAdapter(model, setting_id)
         self.current_table_name = ""
         self.current_entity = None
-        self.current_entities = []  # Store current entities for filtering
         self.detail_pages = {}  # Cache detail pages by table name
         self.setup_ui()
 
@@ -174,7 +173,7 @@ class LorekeeperPage(QWidget):
         from storymaster.view.lorekeeper.lorekeeper_navigation import EntityListWidget
 
         self.entity_list_widget = EntityListWidget()
-        self.entity_list_widget.entity_selected.connect(self.on_entity_selected)
+        self.entity_list_widget.entity_selected.connect(self.on_entity_id_selected)
         return self.entity_list_widget
 
     def set_category_display(self, table_name: str):
@@ -189,72 +188,9 @@ class LorekeeperPage(QWidget):
             self.title_label.setText(display_name)
             self.new_button.setText(f"New {display_name}")
 
-    def set_entities(self, entities: list):
-        """Set the list of entities to display"""
-        self.current_entities = entities
-        self.entity_list_widget.set_entities(entities, self.current_table_name)
-
     def filter_entities(self, search_text: str):
-        """Filter entities based on search text"""
-        if not hasattr(self, "current_entities"):
-            return
-
-        if not search_text:
-            self.entity_list_widget.set_entities(
-                self.current_entities, self.current_table_name
-            )
-            return
-
-        # Simple text search across entity fields
-        filtered_entities = []
-        search_lower = search_text.lower()
-
-        for entity in self.current_entities:
-            # Search in name fields
-            if (
-                hasattr(entity, "name")
-                and entity.name
-                and search_lower in entity.name.lower()
-            ):
-                filtered_entities.append(entity)
-                continue
-
-            # Search in character names
-            if (
-                hasattr(entity, "first_name")
-                and entity.first_name
-                and search_lower in entity.first_name.lower()
-            ):
-                filtered_entities.append(entity)
-                continue
-
-            if (
-                hasattr(entity, "last_name")
-                and entity.last_name
-                and search_lower in entity.last_name.lower()
-            ):
-                filtered_entities.append(entity)
-                continue
-
-            # Search in title
-            if (
-                hasattr(entity, "title")
-                and entity.title
-                and search_lower in entity.title.lower()
-            ):
-                filtered_entities.append(entity)
-                continue
-
-            # Search in description
-            if (
-                hasattr(entity, "description")
-                and entity.description
-                and search_lower in entity.description.lower()
-            ):
-                filtered_entities.append(entity)
-                continue
-
-        self.entity_list_widget.set_entities(filtered_entities, self.current_table_name)
+        """Filter entities based on search text (matched in the database)"""
+        self.entity_list_widget.entity_model.set_search_text(search_text)
 
     def create_right_panel(self) -> QWidget:
         """Create the right entity details panel"""
@@ -338,6 +274,14 @@ class LorekeeperPage(QWidget):
         self.detail_stack.setCurrentWidget(self.welcome_page)
         self.current_entity = None
 
+    def on_entity_id_selected(self, entity_id: int):
+        """Handle a click in the entity list: load the full entity for its detail page"""
+        if self.current_entity is not None and getattr(self.current_entity, "id", None) == entity_id:
+            return
+        entity = self.model_adapter.get_entity_by_id(self.current_table_name, entity_id)
+        if entity:
+            self.on_entity_selected(entity)
+
     def on_entity_selected(self, entity):
         """Handle entity selection"""
         # Auto-save the currently displayed entity before switching
@@ -372,18 +316,14 @@ class LorekeeperPage(QWidget):
             self.show_entity_details(new_entity)
 
     def load_entities(self, table_name: str):
-        """Load entities for the given table"""
+        """Show the entities of the given table (rows are fetched as they are scrolled to)"""
         try:
-            # Get entities from model
-            entities = self.get_entities_from_model(table_name)
-            self.set_entities(entities)
+            self.entity_list_widget.set_source(
+                self.model_adapter, table_name, self.search_bar.search_field.text()
+            )
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to load {table_name}: {str(e)}")
 
-    def get_entities_from_model(self, table_name: str) -> list:
-        """Get entities from the model"""
-        return self.model_adapter.get_entities(table_name)
-
     def create_new_entity(self, table_name: str):
         """Create a new entity instance"""
         return self.model_adapter.create_entity(table_name)
@@ -412,8 +352,8 @@ class LorekeeperPage(QWidget):
             # Save entity through model
             self.save_entity_to_model(entity)
 
-            # Refresh the entity list
-            self.load_entities(self.current_table_name)
+            # Update (or add) its row in the entity list
+            self.entity_list_widget.entity_model.refresh_entity(entity.id)
 
             # Refresh foreign key dropdowns on all detail pages
             # This ensures that if a new entity was created (like a new background),
@@ -449,8 +389,8 @@ class LorekeeperPage(QWidget):
                 # Delete entity through model
                 self.delete_entity_from_model(entity)
 
-                # Refresh the entity list
-                self.load_entities(self.current_table_name)
+                # Remove its row from the entity list
+                self.entity_list_widget.entity_model.remove_entity(entity.id)
 
                 # Refresh foreign key dropdowns on all detail pages
                 # This ensures that deleted entities are removed from dropdowns
@@ -514,8 +454,8 @@ class LorekeeperPage(QWidget):
         # Save the entity to the database
         self.save_entity_to_model(self.current_entity)
 
-        # Refresh the entity list to show updated names/values
-        self.load_entities(self.current_table_name)
+        # Update the entity's row to show its new name
+        self.entity_list_widget.entity_model.refresh_entity(self.current_entity.id)
 
         # Refresh foreign key dropdowns on all detail pages
         # This ensures that if a new entity was created or updated,
@@ -552,23 +492,15 @@ class LorekeeperPage(QWidget):
             # Switch to the correct category
             self.on_category_changed(table_name)
 
-            # Load entities for this table
-            entities = self.get_entities_from_model(table_name)
-
-            # Find the entity with the matching ID
-            target_entity = None
-            for entity in entities:
-                if hasattr(entity, 'id') and entity.id == entity_id:
-                    target_entity = entity
-                    break
+            # Load just this entity
+            target_entity = self.model_adapter.get_entity_by_id(table_name, entity_id)
 
             if target_entity:
                 # Select the entity
                 self.on_entity_selected(target_entity)
 
-                # Also select it in the browser if available
-                if hasattr(self, 'browser'):
-                    self.browser.select_entity_by_id(entity_id)
+                # Also select it in the entity list
+                self.entity_list_widget.select_entity_by_id(entity_id)
 
             else:
                 QMessageBox.warning(
@@ -0,0 +1,106 @@
+"""Auto-tagging engine for Storyweaver.
+
+Finds untagged entity mentions in a document and turns them into
+[[text|entity_id]] links. Everything is linear in the document size:
+existing links are found with one regex pass, mentions with one
+EntityMatcher pass, and the tagged text is built with a single join.
+
+No Qt here; EntityTextEditor.apply_replacements applies the same
+replacements to the editor as one undoable edit, converting positions
+with utf16_offsets.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from storymaster.models.entity_index import ENTITY_LINK_PATTERN
+from storymaster.view.storyweaver.entity_matcher import EntityMatcher
+
+# Names and aliases shorter than this are too ambiguous to tag automatically
+MIN_NAME_LENGTH = 3
+
+
+class TagCandidate(NamedTuple):
+    """An untagged mention. text is as written (case and alias preserved)."""
+
+    start: int
+    end: int
+    text: str
+    entities: Tuple[Dict[str, Any], ...]  # every entity registered under the name
+
+
+def find_link_spans(text: str) -> List[Tuple[int, int]]:
+    """(start, end) of every existing entity link, in order."""
+    return [match.span() for match in ENTITY_LINK_PATTERN.finditer(text)]
+
+
+def find_tag_candidates(
+    text: str,
+    matcher: EntityMatcher,
+    min_length: int = MIN_NAME_LENGTH,
+    links: Optional[Sequence[Tuple[int, int]]] = None,
+) -> List[TagCandidate]:
+    """
+    Untagged entity mentions in text, leftmost-longest and non-overlapping.
+
+    Mentions that overlap an existing link (including its id part) are
+    dropped before overlaps are resolved, so a link never hides a valid
+    mention next to it. links are the (start, end) link spans, in order,
+    if already known (e.g. from StoryDocument.get_entity_links).
+    """
+    if links is None:
+        links = find_link_spans(text)
+    candidates = []
+    link_index = 0
+    last_end = 0
+    # find_all is ordered by start, longest first at each start
+    for match in matcher.find_all(text, possessive=False, min_length=min_length):
+        if match.start < last_end:
+            continue
+        while link_index < len(links) and links[link_index][1] <= match.start:
+            link_index += 1
+        if link_index < len(links) and links[link_index][0] < match.end:
+            continue
+        candidates.append(
+            TagCandidate(match.start, match.end, text[match.start : match.end], match.values)
+        )
+        last_end = match.end
+    return candidates
+
+
+def tag_text(text: str, replacements: Sequence[Tuple[int, int, str]]) -> str:
+    """
+    Apply (start, end, replacement) edits to text in one pass.
+
+    Replacements must be sorted by start and must not overlap.
+    """
+    parts = []
+    last = 0
+    for start, end, replacement in replacements:
+        parts.append(text[last:start])
+        parts.append(replacement)
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def entity_link(display_text: str, entity_id: str) -> str:
+    """Link markup for one mention."""
+    return f"[[{display_text}|{entity_id}]]"
+
+
+def utf16_offsets(text: str, positions: Iterable[int]) -> Dict[int, int]:
+    """
+    Map str indices in text to UTF-16 code unit offsets.
+
+    Qt counts document positions in UTF-16 units, so every character outside
+    the BMP (emoji, some CJK) before a position shifts it by one. Computed in
+    one pass over the text up to the last position.
+    """
+    offsets = {}
+    units = 0
+    previous = 0
+    for position in sorted(set(positions)):
+        units += len(text[previous:position].encode("utf-16-le")) // 2
+        offsets[position] = units
+        previous = position
+    return offsets
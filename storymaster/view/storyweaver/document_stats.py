@@ -0,0 +1,130 @@
+"""
+Incremental word counts and headings for the Storyweaver editor.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject
+from PySide6.QtGui import QTextDocument
+
+# Markdown headings shown in the outline (# , ## , ### )
+HEADING_PATTERN = re.compile(r"^(#{1,3})\s+(.+)$")
+
+
+def parse_heading(line: str) -> Optional[Tuple[int, str]]:
+    """Return (level, text) if the line is an outline heading, else None."""
+    match = HEADING_PATTERN.match(line)
+    if not match:
+        return None
+    return len(match.group(1)), match.group(2).strip()
+
+
+class DocumentStats(QObject):
+    """
+    Per-block word counts and headings for a QTextDocument.
+
+    Updated from QTextDocument.contentsChange, so an edit only re-reads the
+    blocks it touched. Block numbers are line numbers for plain text.
+
+    is_dirty is set by every text edit (formatting changes from the
+    highlighter don't count) and cleared by mark_clean, so callers can copy
+    the text out of the editor only when it actually changed.
+    """
+
+    def __init__(self, document: QTextDocument, parent=None):
+        super().__init__(parent)
+        self._document = document
+        self._word_counts: List[int] = []
+        self._headings: List[Optional[Tuple[int, str]]] = []
+        self._word_count = 0
+        self._heading_count = 0
+        self.is_dirty = False
+        self.headings_changed = False
+
+        self._rebuild()
+        document.contentsChange.connect(self._on_contents_change)
+
+    @property
+    def word_count(self) -> int:
+        """Total words in the document."""
+        return self._word_count
+
+    def mark_clean(self):
+        """Clear the dirty flag (the caller has the current text)."""
+        self.is_dirty = False
+
+    def headings(self) -> List[Dict]:
+        """
+        All outline headings, in document order.
+
+        Returns:
+            List of heading dictionaries with keys: text, level, line_number, display_text
+        """
+        self.headings_changed = False
+        headings = []
+        if not self._heading_count:
+            return headings
+        for line_number, heading in enumerate(self._headings):
+            if heading is None:
+                continue
+            level, text = heading
+            headings.append(
+                {"text": text, "level": level, "line_number": line_number, "display_text": text}
+            )
+        return headings
+
+    def _rebuild(self):
+        """Recount every block."""
+        self._word_counts = []
+        self._headings = []
+        block = self._document.firstBlock()
+        while block.isValid():
+            text = block.text()
+            self._word_counts.append(len(text.split()))
+            self._headings.append(parse_heading(text))
+            block = block.next()
+        self._word_count = sum(self._word_counts)
+        self._heading_count = sum(1 for h in self._headings if h is not None)
+        self.headings_changed = True
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        """Recount the blocks covered by an edit and splice them in."""
+        self.is_dirty = True
+
+        document = self._document
+        block_delta = document.blockCount() - len(self._word_counts)
+
+        first_block = document.findBlock(position)
+        last_block = document.findBlock(position + added)
+        if not last_block.isValid():
+            last_block = document.lastBlock()
+        first = first_block.blockNumber()
+        last = last_block.blockNumber()
+        old_last = last - block_delta
+
+        if first < 0 or old_last < first or old_last >= len(self._word_counts):
+            # The change doesn't line up with what we have; start over
+            self._rebuild()
+            return
+
+        word_counts = []
+        headings = []
+        block = first_block
+        for _ in range(last - first + 1):
+            text = block.text()
+            word_counts.append(len(text.split()))
+            headings.append(parse_heading(text))
+            block = block.next()
+
+        old_headings = self._headings[first : old_last + 1]
+        self._word_count += sum(word_counts) - sum(self._word_counts[first : old_last + 1])
+        self._heading_count += sum(1 for h in headings if h is not None) - sum(
+            1 for h in old_headings if h is not None
+        )
+        if headings != old_headings or (block_delta and self._heading_count):
+            # Line numbers of later headings shift when blocks are added/removed
+            self.headings_changed = True
+
+        self._word_counts[first : old_last + 1] = word_counts
+        self._headings[first : old_last + 1] = headings
@@ -0,0 +1,238 @@
+"""Single-pass entity name matcher for Storyweaver.
+
+The highlighter, click lookup and auto-tagger all need to find every entity
+name and alias in a piece of text. Running one regex per name costs
+O(names x text); with a couple of thousand actors, locations and aliases that
+makes typing lag. EntityMatcher builds an Aho-Corasick automaton once per
+entity-list change and finds every mention in one linear scan.
+
+Matches follow the rules of the regexes it replaces, \\bName(?:'s)?\\b with
+re.IGNORECASE: case-insensitive, word boundaries at both ends, and an
+optional possessive 's.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+def _fold(text: str) -> str:
+    """Lowercase text one character at a time so offsets stay aligned."""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A few characters (e.g. "İ") lower to more than one code point.
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _is_boundary(text: str, pos: int) -> bool:
+    """Same test as the regex \\b at pos."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+class EntityMatch(NamedTuple):
+    """One entity mention. text[start:end] includes any possessive 's."""
+
+    start: int
+    end: int
+    term: str  # the name or alias as it was registered
+    possessive: bool
+    values: Tuple[Any, ...]  # everything registered under this term
+
+    @property
+    def name_end(self) -> int:
+        """End of the name itself, without the possessive."""
+        return self.end - 2 if self.possessive else self.end
+
+
+class EntityMatcher:
+    """Aho-Corasick automaton over entity names and aliases."""
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Term ending exactly at each state, and all terms reachable from it
+        # via fail links (filled in by build)
+        self._terminal: List[Optional[int]] = [None]
+        self._out: List[List[int]] = [[]]
+        self._terms: List[str] = []
+        self._values: List[List[Any]] = []
+        self._index: Dict[str, int] = {}
+        self._built = True
+        for term in terms:
+            self.add(term)
+
+    @classmethod
+    def from_entities(cls, entities: Iterable[Dict[str, Any]]) -> "EntityMatcher":
+        """Build a matcher for entity dicts, keyed by name and every alias."""
+        matcher = cls()
+        for entity in entities:
+            name = entity.get("name", "")
+            if name:
+                matcher.add(name, entity)
+            for alias in entity.get("aliases", []) or []:
+                if alias:
+                    matcher.add(alias, entity)
+        matcher.build()
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __bool__(self) -> bool:
+        return bool(self._terms)
+
+    @property
+    def terms(self) -> List[str]:
+        """Registered terms, in the order they were added."""
+        return list(self._terms)
+
+    def add(self, term: str, value: Any = None):
+        """Register a term. Terms differing only in case share one entry."""
+        if not term:
+            return
+        key = _fold(term)
+        index = self._index.get(key)
+        if index is None:
+            index = len(self._terms)
+            self._index[key] = index
+            self._terms.append(term)
+            self._values.append([])
+
+            state = 0
+            for c in key:
+                next_state = self._goto[state].get(c)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._terminal.append(None)
+                    self._out.append([])
+                    self._goto[state][c] = next_state
+                state = next_state
+            self._terminal[state] = index
+            self._built = False
+
+        if value is not None and not any(v is value for v in self._values[index]):
+            self._values[index].append(value)
+
+    def build(self):
+        """Compute fail links. Called automatically before the first search."""
+        if self._built:
+            return
+        # Breadth-first, so every state's fail target is finished before it
+        queue = []
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            self._out[state] = self._own_terms(state)
+            queue.append(state)
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for c, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and c not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(c, 0)
+                # Fail targets are shallower, so this lists the longest term first
+                self._out[child] = self._own_terms(child) + self._out[self._fail[child]]
+        self._built = True
+
+    def _own_terms(self, state: int) -> List[int]:
+        terminal = self._terminal[state]
+        return [terminal] if terminal is not None else []
+
+    def lookup(self, term: str) -> List[Any]:
+        """Values registered under term (case-insensitive), or []."""
+        index = self._index.get(_fold(term))
+        return list(self._values[index]) if index is not None else []
+
+    def find_all(
+        self, text: str, possessive: bool = True, min_length: int = 1
+    ) -> List[EntityMatch]:
+        """
+        Find every mention in text, including overlapping ones.
+
+        Args:
+            text: Text to scan
+            possessive: Extend matches over a trailing 's, like (?:'s)? did
+            min_length: Ignore terms shorter than this
+
+        Returns:
+            Matches ordered by start, longest first at each start
+        """
+        if not self._terms or not text:
+            return []
+        self.build()
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        terms = self._terms
+        folded = _fold(text)
+        matches = []
+
+        state = 0
+        for i, c in enumerate(folded):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for index in out[state]:
+                term = terms[index]
+                length = len(term)
+                if length < min_length:
+                    continue
+                start = end - length
+                if not _is_boundary(text, start):
+                    continue
+                # (?:'s)? is greedy, so prefer the possessive form when it fits
+                if possessive and folded[end : end + 2] == "'s" and _is_boundary(text, end + 2):
+                    matches.append(
+                        EntityMatch(start, end + 2, term, True, tuple(self._values[index]))
+                    )
+                elif _is_boundary(text, end):
+                    matches.append(EntityMatch(start, end, term, False, tuple(self._values[index])))
+
+        matches.sort(key=lambda m: (m.start, -m.end))
+        return matches
+
+    def find_longest(
+        self, text: str, possessive: bool = True, min_length: int = 1
+    ) -> List[EntityMatch]:
+        """Leftmost-longest, non-overlapping mentions, ordered by start."""
+        selected = []
+        last_end = 0
+        for match in self.find_all(text, possessive, min_length):
+            if match.start >= last_end:
+                selected.append(match)
+                last_end = match.end
+        return selected
+
+    def match_at(
+        self, text: str, start: int, end: Optional[int] = None, possessive: bool = True
+    ) -> Optional[EntityMatch]:
+        """
+        Longest mention overlapping text[start:end].
+
+        Used for click lookup: start/end is the clicked word within a block.
+        """
+        if end is None:
+            end = start + 1
+        best = None
+        for match in self.find_all(text, possessive):
+            if match.start >= end:
+                break
+            if match.end <= start:
+                continue
+            if best is None or match.name_end - match.start > best.name_end - best.start:
+                best = match
+        return best
@@ -1,7 +1,6 @@
 """
 Navigation widget for markdown headings in StoryWeaver.
 """
-import re
 from typing import List, Dict
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
@@ -10,6 +9,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QTextCursor
 
+from storymaster.view.storyweaver.document_stats import parse_heading
+
 
 class HeadingNavigator(QWidget):
     """
@@ -65,10 +66,16 @@ class HeadingNavigator(QWidget):
         Args:
             text: Full document text
         """
-        self.heading_list.clear()
+        self.set_headings(self._extract_headings(text))
+
+    def set_headings(self, headings: List[Dict]):
+        """
+        Display already-extracted headings.
 
-        # Extract headings with their line numbers
-        headings = self._extract_headings(text)
+        Args:
+            headings: Heading dictionaries as returned by _extract_headings
+        """
+        self.heading_list.clear()
 
         if not headings:
             # Show message if no headings
@@ -121,14 +128,10 @@ class HeadingNavigator(QWidget):
         headings = []
         lines = text.split('\n')
 
-        # Pattern for markdown headings (# , ## , ### )
-        heading_pattern = re.compile(r'^(#{1,3})\s+(.+)$')
-
         for line_num, line in enumerate(lines):
-            match = heading_pattern.match(line)
-            if match:
-                level = len(match.group(1))  # Count # symbols
-                heading_text = match.group(2).strip()
+            heading = parse_heading(line)
+            if heading:
+                level, heading_text = heading
 
                 headings.append({
                     "text": heading_text,
@@ -0,0 +1,216 @@
+"""
+Viewport-first highlighting for the Storyweaver editor.
+"""
+
+import datetime
+from typing import Optional
+
+from PySide6.QtCore import QObject, QPoint, QTimer, Signal
+from PySide6.QtGui import QSyntaxHighlighter
+
+
+class HighlightScheduler(QObject):
+    """
+    Applies a highlighter to a document lazily, nearest the viewport first.
+
+    Attaching a QSyntaxHighlighter normally formats every block before the
+    editor can repaint. Instead, start() formats the visible blocks at once
+    and fills in the rest in small idle-time batches, working outward from
+    the viewport. Scrolling re-centres the pending work on the new viewport.
+
+    Signals:
+        progress_changed: (highlighted_blocks, total_blocks)
+        finished: every block has been highlighted
+    """
+
+    progress_changed = Signal(int, int)
+    finished = Signal()
+
+    def __init__(self, highlighter: QSyntaxHighlighter, editor, blocks_per_tick: int = 100):
+        super().__init__(highlighter)
+        self._highlighter = highlighter
+        self._editor = editor
+        self.blocks_per_tick = blocks_per_tick
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+        # Connected for the scheduler's lifetime: reprioritize() is a no-op when idle
+        editor.verticalScrollBar().valueChanged.connect(self.reprioritize)
+
+        self._document = None
+        self._done = bytearray()  # 1 per block number once highlighted
+        self._done_count = 0
+        self._up = -1  # next candidates above and below the viewport
+        self._down = 0
+        self._active = False
+
+        # While Qt runs the full pass it queues in setDocument(), the highlighter
+        # only formats blocks in gate_allowed (see MarkdownHighlighter.highlightBlock)
+        self.gate_active = False
+        self.gate_allowed = set()
+
+    @property
+    def is_active(self) -> bool:
+        return self._active
+
+    @property
+    def document(self):
+        """The document being highlighted, or None when idle."""
+        return self._document
+
+    def progress(self) -> float:
+        """Fraction of blocks highlighted (1.0 when idle)."""
+        if not self._active or not self._done:
+            return 1.0
+        return self._done_count / len(self._done)
+
+    def start(self):
+        """Highlight the editor's document, visible blocks first."""
+        self.stop()
+        document = self._editor.document()
+        self._document = document
+        self._done = bytearray(document.blockCount())
+        self._done_count = 0
+        self._active = True
+
+        if self._highlighter.document() is not document:
+            # setDocument() queues a full synchronous rehighlight; gate it so it
+            # only touches blocks we've already done, then open the gate after it
+            self.gate_active = True
+            self.gate_allowed = set()
+            self._highlighter.setDocument(document)
+            QTimer.singleShot(0, self._open_gate)
+
+        document.contentsChange.connect(self._on_contents_change)
+        document.destroyed.connect(self._on_document_destroyed)
+
+        self.reprioritize()
+        self._timer.start(0)
+
+    def stop(self):
+        """Abandon any pending work (already highlighted blocks keep their formats)."""
+        self._timer.stop()
+        self.gate_active = False
+        self.gate_allowed = set()
+        if not self._active:
+            return
+        self._document.contentsChange.disconnect(self._on_contents_change)
+        self._document.destroyed.disconnect(self._on_document_destroyed)
+        self._release()
+
+    def _on_document_destroyed(self, _document=None):
+        """
+        The document is gone mid-pass: drop it without touching its signals.
+
+        This can run while the editor itself is being destroyed, so it must
+        not call into the editor either.
+        """
+        self._timer.stop()
+        self.gate_active = False
+        self.gate_allowed = set()
+        self._release()
+
+    def _release(self):
+        self._active = False
+        self._document = None
+
+    def reprioritize(self):
+        """Highlight what is visible now and continue outward from it."""
+        if not self._active:
+            return
+        first, last = self._visible_range()
+        for block_number in range(first, last + 1):
+            self._highlight(block_number)
+        self._up = first - 1
+        self._down = last + 1
+        self._emit_progress()
+
+    def _visible_range(self):
+        viewport = self._editor.viewport()
+        first = self._editor.cursorForPosition(QPoint(0, 0)).blockNumber()
+        last = self._editor.cursorForPosition(QPoint(0, viewport.height() - 1)).blockNumber()
+        last_block = len(self._done) - 1
+        return max(0, min(first, last_block)), max(0, min(last, last_block))
+
+    def _open_gate(self):
+        self.gate_active = False
+        self.gate_allowed = set()
+
+    def _highlight(self, block_number: int) -> bool:
+        if block_number < 0 or block_number >= len(self._done) or self._done[block_number]:
+            return False
+        self._done[block_number] = 1
+        self._done_count += 1
+        if self.gate_active:
+            self.gate_allowed.add(block_number)
+        self._highlighter.rehighlightBlock(self._document.findBlockByNumber(block_number))
+        return True
+
+    def _next_block(self) -> Optional[int]:
+        """Nearest pending block to the viewport, favouring reading direction."""
+        while self._down < len(self._done) and self._done[self._down]:
+            self._down += 1
+        while self._up >= 0 and self._done[self._up]:
+            self._up -= 1
+        has_down = self._down < len(self._done)
+        has_up = self._up >= 0
+        if has_down and (not has_up or self._done_count % 3):
+            return self._down
+        if has_up:
+            return self._up
+        return None
+
+    def _tick(self):
+        if not self._active:
+            return
+        for _ in range(self.blocks_per_tick):
+            block_number = self._next_block()
+            if block_number is None:
+                break
+            self._highlight(block_number)
+
+        self._emit_progress()
+        if self._done_count >= len(self._done):
+            print(
+                f"[{datetime.datetime.now()}]     Background highlighting complete "
+                f"({len(self._done)} blocks)"
+            )
+            self.stop()
+            self.finished.emit()
+        else:
+            self._timer.start(0)
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        """Keep the per-block done flags aligned when lines are added or removed."""
+        delta = self._document.blockCount() - len(self._done)
+        first = max(0, self._document.findBlock(position).blockNumber())
+        if self.gate_active:
+            # Edited blocks must survive Qt's pending full pass, and blocks already
+            # let through move with the edit
+            self.gate_allowed = {
+                n + delta if n > first else n
+                for n in self.gate_allowed
+                if not first < n <= first - delta
+            }
+            self.gate_allowed.update(range(first, first + max(delta, 0) + 1))
+        if not delta:
+            return
+        if not self._done[first]:
+            self._done[first] = 1
+            self._done_count += 1
+        if delta > 0:
+            # New blocks were just highlighted by the edit itself
+            self._done[first + 1 : first + 1] = b"\x01" * delta
+            self._done_count += delta
+        else:
+            removed_flags = self._done[first + 1 : first + 1 - delta]
+            self._done_count -= sum(removed_flags)
+            del self._done[first + 1 : first + 1 - delta]
+        if self._down > first:
+            self._down = max(first + 1, self._down + delta)
+        if self._up > first:
+            self._up = max(first, self._up + delta)
+
+    def _emit_progress(self):
+        self.progress_changed.emit(self._done_count, len(self._done))
@@ -0,0 +1,378 @@
+"""
+Markdown block formatting for the Storyweaver highlighter, without Qt.
+
+extract_format_instructions turns one block of text into FormatInstructions.
+It is pure-Python regex work, so threads serialize on the GIL; BlockFormatPool
+runs it over batches of blocks in worker processes instead (or threads, on a
+free-threaded build) and sends back compact arrays rather than objects.
+
+The highlighter keeps those arrays ("format runs": flat position, length,
+type id triples) as its cache, so a large manuscript costs one small int
+array per distinct block instead of one object per span.
+
+This module must stay importable without PySide6: worker processes import it.
+"""
+
+import atexit
+import multiprocessing
+import os
+import re
+import sys
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+# Compiled regex patterns (compile once at module load for performance)
+CODE_PATTERN = re.compile(r"(`)([^`]+?)(`)")
+BOLD_PATTERN = re.compile(r"(\*\*)([^*]+?)(\*\*)")
+UNDERLINE_PATTERN = re.compile(r"(__)([^_]+?)(__)")
+STRIKETHROUGH_PATTERN = re.compile(r"(~~)([^~]+?)(~~)")
+ITALIC_ASTERISK_PATTERN = re.compile(r"(?<!\*)(\*)(?!\*)([^*]+?)(?<!\*)(\*)(?!\*)")
+ITALIC_UNDERSCORE_PATTERN = re.compile(r"(?<!_)(_)(?!_)([^_]+?)(?<!_)(_)(?!_)")
+LINK_PATTERN = re.compile(r"(\[)([^\]]+?)(\]\()([^\)]+?)(\))")
+IMAGE_PATTERN = re.compile(r"(!\[)([^\]]*?)(\]\()([^\)]+?)(\))")
+
+# Every format_type extract_format_instructions can produce. Position in this
+# tuple is the type id used in encoded instruction arrays - append only.
+FORMAT_TYPES = (
+    "code_block",
+    "hr",
+    "heading_syntax",
+    "heading1",
+    "heading2",
+    "heading3",
+    "heading4",
+    "heading5",
+    "heading6",
+    "blockquote_syntax",
+    "blockquote",
+    "task_checkbox",
+    "list",
+    "code_syntax",
+    "code",
+    "bold_syntax",
+    "bold",
+    "underline_syntax",
+    "underline",
+    "strikethrough_syntax",
+    "strikethrough",
+    "italic_syntax",
+    "italic",
+    "link_syntax",
+    "link",
+    "image_syntax",
+)
+FORMAT_TYPE_IDS = {format_type: type_id for type_id, format_type in enumerate(FORMAT_TYPES)}
+
+
+@dataclass
+class FormatInstruction:
+    """A single formatting instruction (position, length, format_type)."""
+
+    position: int
+    length: int
+    format_type: str  # e.g., 'entity', 'bold', 'italic', 'code', etc.
+
+
+def extract_format_instructions(text: str) -> List[FormatInstruction]:
+    """
+    Extract all format instructions from text using regex (no GUI, safe in any worker).
+
+    Returns:
+        List of FormatInstruction objects describing where to apply formats
+    """
+    instructions = []
+
+    # Track entity link positions to avoid formatting inside them
+    entity_ranges = []
+
+    # Code blocks (```...```) - must be checked before other patterns
+    if text.strip().startswith("```"):
+        instructions.append(FormatInstruction(0, len(text), "code_block"))
+        return instructions
+
+    # Horizontal rules (---, ***, ___)
+    hr_patterns = [r"^---+$", r"^\*\*\*+$", r"^___+$"]
+    for pattern in hr_patterns:
+        if re.match(pattern, text.strip()):
+            instructions.append(FormatInstruction(0, len(text), "hr"))
+            return instructions
+
+    # Headings
+    if text.startswith("###### "):
+        instructions.append(FormatInstruction(0, 7, "heading_syntax"))
+        instructions.append(FormatInstruction(7, len(text) - 7, "heading6"))
+        return instructions
+    elif text.startswith("##### "):
+        instructions.append(FormatInstruction(0, 6, "heading_syntax"))
+        instructions.append(FormatInstruction(6, len(text) - 6, "heading5"))
+        return instructions
+    elif text.startswith("#### "):
+        instructions.append(FormatInstruction(0, 5, "heading_syntax"))
+        instructions.append(FormatInstruction(5, len(text) - 5, "heading4"))
+        return instructions
+    elif text.startswith("### "):
+        instructions.append(FormatInstruction(0, 4, "heading_syntax"))
+        instructions.append(FormatInstruction(4, len(text) - 4, "heading3"))
+        return instructions
+    elif text.startswith("## "):
+        instructions.append(FormatInstruction(0, 3, "heading_syntax"))
+        instructions.append(FormatInstruction(3, len(text) - 3, "heading2"))
+        return instructions
+    elif text.startswith("# "):
+        instructions.append(FormatInstruction(0, 2, "heading_syntax"))
+        instructions.append(FormatInstruction(2, len(text) - 2, "heading1"))
+        return instructions
+
+    # Blockquote
+    if text.startswith("> "):
+        instructions.append(FormatInstruction(0, 2, "blockquote_syntax"))
+        instructions.append(FormatInstruction(2, len(text) - 2, "blockquote"))
+        return instructions
+
+    # Task lists
+    task_unchecked = re.match(r"^(\s*-\s+\[\s\])\s+(.*)$", text)
+    task_checked = re.match(r"^(\s*-\s+\[x\])\s+(.*)$", text, re.IGNORECASE)
+    if task_unchecked:
+        instructions.append(FormatInstruction(0, len(task_unchecked.group(1)), "task_checkbox"))
+        return instructions
+    elif task_checked:
+        instructions.append(FormatInstruction(0, len(task_checked.group(1)), "task_checkbox"))
+        instructions.append(
+            FormatInstruction(
+                len(task_checked.group(1)) + 1, len(task_checked.group(2)), "strikethrough"
+            )
+        )
+        return instructions
+
+    # Unordered lists
+    list_match = re.match(r"^(\s*[-*+]\s+)", text)
+    if list_match:
+        instructions.append(FormatInstruction(0, len(list_match.group(1)), "list"))
+
+    # Ordered lists
+    ordered_list_match = re.match(r"^(\s*\d+\.\s+)", text)
+    if ordered_list_match:
+        instructions.append(FormatInstruction(0, len(ordered_list_match.group(1)), "list"))
+
+    # Helper to check if range overlaps with entity links
+    def is_inside_entity(start: int, end: int) -> bool:
+        for entity_start, entity_end in entity_ranges:
+            if not (end <= entity_start or start >= entity_end):
+                return True
+        return False
+
+    # Inline code
+    for match in CODE_PATTERN.finditer(text):
+        if is_inside_entity(match.start(), match.end()):
+            continue
+        instructions.append(FormatInstruction(match.start(1), 1, "code_syntax"))
+        instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "code"))
+        instructions.append(FormatInstruction(match.start(3), 1, "code_syntax"))
+
+    # Bold
+    for match in BOLD_PATTERN.finditer(text):
+        if is_inside_entity(match.start(), match.end()):
+            continue
+        instructions.append(FormatInstruction(match.start(1), 2, "bold_syntax"))
+        instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "bold"))
+        instructions.append(FormatInstruction(match.start(3), 2, "bold_syntax"))
+
+    # Underline
+    for match in UNDERLINE_PATTERN.finditer(text):
+        if is_inside_entity(match.start(), match.end()):
+            continue
+        instructions.append(FormatInstruction(match.start(1), 2, "underline_syntax"))
+        instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "underline"))
+        instructions.append(FormatInstruction(match.start(3), 2, "underline_syntax"))
+
+    # Strikethrough
+    for match in STRIKETHROUGH_PATTERN.finditer(text):
+        if is_inside_entity(match.start(), match.end()):
+            continue
+        instructions.append(FormatInstruction(match.start(1), 2, "strikethrough_syntax"))
+        instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "strikethrough"))
+        instructions.append(FormatInstruction(match.start(3), 2, "strikethrough_syntax"))
+
+    # Italic (asterisk)
+    for match in ITALIC_ASTERISK_PATTERN.finditer(text):
+        if is_inside_entity(match.start(), match.end()):
+            continue
+        instructions.append(FormatInstruction(match.start(1), 1, "italic_syntax"))
+        instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "italic"))
+        instructions.append(FormatInstruction(match.start(3), 1, "italic_syntax"))
+
+    # Italic (underscore)
+    for match in ITALIC_UNDERSCORE_PATTERN.finditer(text):
+        if is_inside_entity(match.start(), match.end()):
+            continue
+        instructions.append(FormatInstruction(match.start(1), 1, "italic_syntax"))
+        instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "italic"))
+        instructions.append(FormatInstruction(match.start(3), 1, "italic_syntax"))
+
+    # Links
+    for match in LINK_PATTERN.finditer(text):
+        if is_inside_entity(match.start(), match.end()):
+            continue
+        instructions.append(FormatInstruction(match.start(1), 1, "link_syntax"))
+        instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "link"))
+        instructions.append(FormatInstruction(match.start(3), 2, "link_syntax"))
+        instructions.append(FormatInstruction(match.start(4), len(match.group(4)), "link_syntax"))
+        instructions.append(FormatInstruction(match.start(5), 1, "link_syntax"))
+
+    # Images
+    for match in IMAGE_PATTERN.finditer(text):
+        if is_inside_entity(match.start(), match.end()):
+            continue
+        instructions.append(FormatInstruction(match.start(1), 2, "image_syntax"))
+        instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "link"))
+        instructions.append(FormatInstruction(match.start(3), 2, "image_syntax"))
+        instructions.append(FormatInstruction(match.start(4), len(match.group(4)), "image_syntax"))
+        instructions.append(FormatInstruction(match.start(5), 1, "image_syntax"))
+
+    return instructions
+
+
+def encode_instructions(instructions: List[FormatInstruction]) -> array:
+    """Pack instructions into a flat (position, length, type id) int array."""
+    encoded = array("i")
+    for instruction in instructions:
+        encoded.extend(
+            (instruction.position, instruction.length, FORMAT_TYPE_IDS[instruction.format_type])
+        )
+    return encoded
+
+
+def decode_instructions(encoded: array) -> List[FormatInstruction]:
+    """Inverse of encode_instructions."""
+    return [
+        FormatInstruction(encoded[i], encoded[i + 1], FORMAT_TYPES[encoded[i + 2]])
+        for i in range(0, len(encoded), 3)
+    ]
+
+
+# Shared by every block without formatting; format runs are never modified in place
+NO_RUNS = array("i")
+
+
+def format_runs(text: str) -> array:
+    """Encoded instructions (see encode_instructions) for one block of text."""
+    return encode_instructions(extract_format_instructions(text)) or NO_RUNS
+
+
+def format_batch(texts: List[str]) -> List[array]:
+    """Worker entry point: format runs for each text in the batch."""
+    return [format_runs(text) for text in texts]
+
+
+def _gil_enabled() -> bool:
+    # sys._is_gil_enabled only exists on 3.13+; older builds always have the GIL
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled else True
+
+
+def _default_workers() -> int:
+    cpu_count = getattr(os, "process_cpu_count", os.cpu_count)()
+    return max(1, cpu_count or 1)
+
+
+class BlockFormatPool:
+    """
+    Persistent pool that extracts format instructions for many blocks at once.
+
+    The executor is started on first use and reused for every document and chunk.
+    Blocks are sent in batches, and small jobs (or a single core) are handled
+    inline, where worker start-up and pickling would cost more than they save.
+    If the pool can't be started or breaks, extraction falls back to inline.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        batch_size: int = 500,
+        inline_threshold: int = 1000,
+    ):
+        self.max_workers = max_workers or _default_workers()
+        self.batch_size = batch_size
+        self.inline_threshold = inline_threshold
+        self._executor: Optional[Executor] = None
+        self._disabled = False
+
+    @property
+    def uses_processes(self) -> bool:
+        """True if work goes to worker processes rather than threads."""
+        return _gil_enabled()
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self._executor is None and not self._disabled:
+            try:
+                if self.uses_processes:
+                    # spawn: forking a process that runs Qt threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            except (OSError, ValueError, NotImplementedError) as e:
+                print(f"Block format pool unavailable, formatting inline: {e}")
+                self._disabled = True
+        return self._executor
+
+    def start(self):
+        """Start the workers now instead of on the first large job."""
+        executor = self._get_executor()
+        if executor is not None and self.uses_processes:
+            # Make every worker import this module before real work arrives
+            try:
+                list(executor.map(format_batch, [[]] * self.max_workers))
+            except Exception as e:
+                print(f"Block format pool failed to start, formatting inline: {e}")
+                self.shutdown()
+                self._disabled = True
+
+    def format_blocks_encoded(self, texts: Sequence[str]) -> List[array]:
+        """Encoded instructions (see encode_instructions) for each text, in order."""
+        texts = list(texts)
+        if self.max_workers <= 1 or len(texts) < self.inline_threshold:
+            return format_batch(texts)
+
+        executor = self._get_executor()
+        if executor is None:
+            return format_batch(texts)
+
+        # At least one batch per worker so every core gets a share
+        batch_size = min(self.batch_size, -(-len(texts) // self.max_workers))
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        try:
+            results = []
+            for encoded_batch in executor.map(format_batch, batches):
+                results.extend(encoded_batch)
+            return results
+        except Exception as e:  # BrokenProcessPool, pickling errors, ...
+            print(f"Block format pool failed, formatting inline: {e}")
+            self.shutdown()
+            self._disabled = True
+            return format_batch(texts)
+
+    def format_blocks(self, texts: Sequence[str]) -> List[List[FormatInstruction]]:
+        """Format instructions for each text, in order."""
+        return [decode_instructions(encoded) for encoded in self.format_blocks_encoded(texts)]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool: Optional[BlockFormatPool] = None
+
+
+def get_format_pool() -> BlockFormatPool:
+    """The shared pool used by every highlighter."""
+    global _pool
+    if _pool is None:
+        _pool = BlockFormatPool()
+        atexit.register(_pool.shutdown)
+    return _pool
@@ -3,7 +3,6 @@ Main Storyweaver widget - integrated writing interface for Storymaster.
 """
 
 import datetime
-import re
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from PySide6.QtCore import QMarginsF, QObject, QPoint, Qt, QThread, QTimer, Signal
@@ -25,6 +24,12 @@ from PySide6.QtWidgets import (
 
 from storymaster.models.document import StoryDocument
 from storymaster.view.storyweaver.auto_tag_dialog import AutoTagDialog
+from storymaster.view.storyweaver.auto_tagger import (
+    MIN_NAME_LENGTH,
+    entity_link,
+    find_tag_candidates,
+)
+from storymaster.view.storyweaver.document_stats import DocumentStats
 from storymaster.view.storyweaver.document_storyline_dialog import DocumentStorylineDialog
 from storymaster.view.storyweaver.heading_navigator import HeadingNavigator
 from storymaster.view.storyweaver.loading_dialog import LoadingDialog
@@ -115,13 +120,23 @@ class StoryweaverWidget(QWidget):
         self.editor = EntityTextEditor()
         editor_layout.addWidget(self.editor)
 
+        # Word counts and headings, updated per edit instead of per full-text scan
+        self.document_stats = DocumentStats(self.editor.document(), self)
+
         # Formatting toolbar (added after editor is created)
         self.formatting_toolbar = self._create_formatting_toolbar()
         layout.insertWidget(1, self.formatting_toolbar)  # Insert after main toolbar
 
-        # Word count label
+        # Status row: word count and background highlighting progress
+        status_layout = QHBoxLayout()
         self.word_count_label = QLabel("Words: 0")
-        editor_layout.addWidget(self.word_count_label)
+        status_layout.addWidget(self.word_count_label)
+        status_layout.addStretch()
+        self.highlight_progress_label = QLabel()
+        self.highlight_progress_label.setStyleSheet("color: #888888;")
+        self.highlight_progress_label.hide()
+        status_layout.addWidget(self.highlight_progress_label)
+        editor_layout.addLayout(status_layout)
 
         splitter.addWidget(editor_widget)
 
@@ -297,6 +312,7 @@ class StoryweaverWidget(QWidget):
         self.editor.entity_create_requested.connect(self._on_entity_create_requested)
         self.editor.textChanged.connect(self._on_text_changed)
         self.editor.alias_add_requested.connect(self._on_alias_add_requested)
+        self.editor.highlight_progress.connect(self._on_highlight_progress)
 
         # Heading navigator signals
         self.heading_navigator.heading_clicked.connect(self._on_heading_clicked)
@@ -351,12 +367,29 @@ class StoryweaverWidget(QWidget):
 
     def _on_text_changed(self):
         """Handle text changes in the editor."""
-        if self.current_document:
-            self.current_document.set_content(self.editor.get_text())
+        # textChanged also fires for highlighting; only real edits make the stats dirty
+        if self.current_document and self.document_stats.is_dirty:
+            # The text itself is copied into the document lazily (_sync_document_content)
+            self.current_document.mark_modified()
             self.document_modified.emit(True)
             self._update_word_count()
             # Update heading navigation
-            self._update_heading_navigation()
+            if self.document_stats.headings_changed:
+                self._update_heading_navigation()
+
+    def _sync_document_content(self):
+        """Copy the editor text into the current document if it was edited since last time."""
+        if self.current_document and self.document_stats.is_dirty:
+            self.current_document.set_content(self.editor.get_text())
+            self.document_stats.mark_clean()
+
+    def _on_highlight_progress(self, done: int, total: int):
+        """Show background highlighting progress while it runs."""
+        if total and done < total:
+            self.highlight_progress_label.setText(f"Highlighting {done * 100 // total}%")
+            self.highlight_progress_label.show()
+        else:
+            self.highlight_progress_label.hide()
 
     def _on_heading_clicked(self, line_number: int):
         """
@@ -376,9 +409,7 @@ class StoryweaverWidget(QWidget):
 
     def _update_word_count(self):
         """Update the word count label."""
-        text = self.editor.get_text()
-        words = len(text.split())
-        self.word_count_label.setText(f"Words: {words}")
+        self.word_count_label.setText(f"Words: {self.document_stats.word_count}")
 
     def _update_heading_navigation(self):
         """Debounced update for heading navigation."""
@@ -387,17 +418,36 @@ class StoryweaverWidget(QWidget):
 
     def _do_update_heading_navigation(self):
         """Actually update the heading navigation (called after debounce)."""
-        text = self.editor.get_text()
-        self.heading_navigator.update_headings(text)
+        self.heading_navigator.set_headings(self.document_stats.headings())
+
+    def _store_editor_state(self):
+        """Hand the highlighter's format cache and the view position to the document for saving."""
+        if self.current_document:
+            self.current_document.format_cache = self.editor.export_format_cache()
+            self.current_document.set_view_state(self.editor.get_view_state())
+
+    def _save_view_state_if_changed(self):
+        """Save an unmodified document if only its cursor/scroll position changed."""
+        if (
+            self.current_document
+            and self.current_document.path
+            and not self.current_document.is_modified
+            and self.current_document.set_view_state(self.editor.get_view_state())
+        ):
+            self._store_editor_state()
+            self.current_document.save_async()
 
     def _autosave(self):
         """Auto-save the current document if modified."""
+        self._sync_document_content()
         if (
             self.current_document
             and self.current_document.is_modified
             and self.current_document.path
         ):
-            self.current_document.save()
+            self._store_editor_state()
+            # Written on the save thread so autosave never blocks typing
+            self.current_document.save_async()
             self.document_modified.emit(False)
 
     def _refresh_entity_list(self):
@@ -491,6 +541,8 @@ class StoryweaverWidget(QWidget):
                 self.save_document()
             elif reply == QMessageBox.Cancel:
                 return
+        else:
+            self._save_view_state_if_changed()
 
         # Get save location (file path)
         file_path = QFileDialog.getSaveFileName(
@@ -513,6 +565,7 @@ class StoryweaverWidget(QWidget):
 
         # Clear editor (defer_highlight=False for immediate reattachment)
         self.editor.set_text("", defer_highlight=False)
+        self.document_stats.mark_clean()
 
         # Update UI
         self.document_label.setText(f"Document: {file_path.split('/')[-1]}")
@@ -535,6 +588,8 @@ class StoryweaverWidget(QWidget):
                 self.save_document()
             elif reply == QMessageBox.Cancel:
                 return
+        else:
+            self._save_view_state_if_changed()
 
         # Get file to open (.storyweaver ZIP file)
         file_path = QFileDialog.getOpenFileName(
@@ -601,6 +656,10 @@ class StoryweaverWidget(QWidget):
 
             print(f"[{datetime.datetime.now()}] BEFORE set_text()")
             self.editor.set_text(self.current_document.content)
+            self.document_stats.mark_clean()
+            self.editor.load_format_cache(self.current_document.format_cache)
+            # Reopen where the user left off; highlighting starts from there
+            self.editor.restore_view_state(self.current_document.get_view_state())
             print(f"[{datetime.datetime.now()}] AFTER set_text()")
 
             # Trigger syntax highlighting
@@ -668,6 +727,8 @@ class StoryweaverWidget(QWidget):
             self.current_document.path = file_path
 
         # Save
+        self._sync_document_content()
+        self._store_editor_state()
         if self.current_document.save():
             self.document_label.setText(f"Document: {self.current_document.path.split('/')[-1]}")
             self.document_modified.emit(False)
@@ -676,6 +737,7 @@ class StoryweaverWidget(QWidget):
 
     def get_current_document(self) -> Optional[StoryDocument]:
         """Get the currently open document."""
+        self._sync_document_content()
         return self.current_document
 
     def auto_tag_entities(self):
@@ -692,8 +754,9 @@ class StoryweaverWidget(QWidget):
             )
             return
 
-        # Get current document text
-        text = self.editor.get_text()
+        # Get current document text (the document keeps its entity links indexed)
+        self._sync_document_content()
+        text = self.current_document.content
 
         if not text.strip():
             QMessageBox.information(self, "Empty Document", "The document is empty")
@@ -715,86 +778,48 @@ class StoryweaverWidget(QWidget):
 
     def _find_entity_matches(self, text: str) -> List[Dict[str, Any]]:
         """
-        Find all entity name occurrences in the text, including aliases.
+        Find all untagged entity name occurrences in the text, including aliases.
 
         Args:
-            text: Document text to search
+            text: Document text to search (the current document's content)
 
         Returns:
             List of match dictionaries with entity info and positions
         """
-        matches = []
-
-        for entity in self._entity_list:
-            entity_name = entity.get("name", "")
-            entity_id = entity.get("id", "")
-            entity_type = entity.get("type", "")
-            aliases = entity.get("aliases", [])
-
-            if not entity_name or len(entity_name) < 3:  # Skip very short names
-                continue
-
-            # Collect all names to search for (canonical + aliases)
-            names_to_search = [entity_name] + [a for a in aliases if len(a) >= 3]
-
-            # Track all matches for this entity (canonical + aliases)
-            all_found_matches = []
-            match_texts = {}  # Store what text was found at each position
-
-            for name in names_to_search:
-                # Find all occurrences (case-insensitive, word boundaries)
-                pattern = r"\b" + re.escape(name) + r"\b"
-                found = list(re.finditer(pattern, text, re.IGNORECASE))
-
-                for match in found:
-                    # Store the actual text found (preserves case and alias used)
-                    match_texts[match.start()] = text[match.start() : match.end()]
-                    all_found_matches.append(match)
-
-            if all_found_matches:
-                # Check if any occurrence is already tagged
-                already_tagged = any(
-                    self._is_already_tagged(
-                        text, match.start(), match_texts.get(match.start(), entity_name)
-                    )
-                    for match in all_found_matches
-                )
-
-                if not already_tagged:
-                    matches.append(
-                        {
-                            "entity_name": entity_name,
-                            "entity_id": entity_id,
-                            "entity_type": entity_type,
-                            "count": len(all_found_matches),
-                            "positions": [(m.start(), m.end()) for m in all_found_matches],
-                            "match_texts": match_texts,  # Store which text was found at each position
-                        }
-                    )
+        # One pass for every name and alias; longest match wins and mentions
+        # inside existing [[...|...]] links are skipped (see auto_tagger)
+        found_by_entity = {}  # entity id -> (entity, [(start, end)], {start: text})
+        links = [(link.start, link.end) for link in self.current_document.get_entity_links()]
+        for candidate in find_tag_candidates(text, self.editor.entity_matcher, links=links):
+            for entity in candidate.entities:
+                entity_name = entity.get("name", "")
+                if not entity_name or len(entity_name) < MIN_NAME_LENGTH:
+                    continue
+                entity_id = entity.get("id", "")
+                if entity_id not in found_by_entity:
+                    found_by_entity[entity_id] = (entity, [], {})
+                _, positions, match_texts = found_by_entity[entity_id]
+                positions.append((candidate.start, candidate.end))
+                # Store the actual text found (preserves case and alias used)
+                match_texts[candidate.start] = candidate.text
+
+        matches = [
+            {
+                "entity_name": entity.get("name", ""),
+                "entity_id": entity_id,
+                "entity_type": entity.get("type", ""),
+                "count": len(positions),
+                "positions": positions,
+                "match_texts": match_texts,  # Store which text was found at each position
+            }
+            for entity_id, (entity, positions, match_texts) in found_by_entity.items()
+        ]
 
         # Sort by occurrence count (most common first)
         matches.sort(key=lambda x: x["count"], reverse=True)
 
         return matches
 
-    def _is_already_tagged(self, text: str, position: int, entity_name: str) -> bool:
-        """
-        Check if an entity mention is already tagged.
-
-        Args:
-            text: Full document text
-            position: Start position of the entity name
-            entity_name: Name of the entity
-
-        Returns:
-            True if already tagged, False otherwise
-        """
-        # Look backwards for [[ before the entity name
-        search_start = max(0, position - 10)
-        prefix = text[search_start:position]
-
-        return "[[" in prefix
-
     def _apply_entity_tags(
         self, original_text: str, matches: List[Dict[str, Any]], selected_entities: set
     ):
@@ -812,62 +837,45 @@ class StoryweaverWidget(QWidget):
         if not selected_matches:
             return
 
-        # Sort all positions in reverse order to avoid offset issues
-        replacements = []
+        mentions = []
         for match in selected_matches:
             match_texts = match.get("match_texts", {})
             for start, end in match["positions"]:
                 # Get the actual text found at this position (alias or canonical name)
                 actual_text = match_texts.get(start, original_text[start:end])
-                replacements.append(
-                    {
-                        "start": start,
-                        "end": end,
-                        "entity_name": match["entity_name"],
-                        "entity_id": match["entity_id"],
-                        "actual_text": actual_text,
-                    }
-                )
-
-        # Sort by position (reverse) to replace from end to start
-        replacements.sort(key=lambda x: x["start"], reverse=True)
+                mentions.append((start, end, actual_text, match))
+        mentions.sort(key=lambda mention: mention[0])
 
         # Track unique aliases found for each entity
         aliases_to_add = {}  # entity_id -> set of aliases
 
-        # Apply replacements
-        new_text = original_text
-        for repl in replacements:
-            actual_text = repl["actual_text"]
-            entity_name = repl["entity_name"]
-            entity_id = repl["entity_id"]
+        replacements = []
+        last_end = 0
+        for start, end, actual_text, match in mentions:
+            if start < last_end:
+                # A name shared by two selected entities; the first one gets the tag
+                continue
+            entity_name = match["entity_name"]
+            entity_id = match["entity_id"]
 
             # If the actual text differs from canonical name, it's an alias
             if actual_text.lower() != entity_name.lower():
-                if entity_id not in aliases_to_add:
-                    aliases_to_add[entity_id] = set()
-                aliases_to_add[entity_id].add(actual_text)
-
-            tagged_text = f"[[{actual_text}|{entity_id}]]"
-
-            # Replace in the text
-            new_text = new_text[: repl["start"]] + tagged_text + new_text[repl["end"] :]
+                aliases_to_add.setdefault(entity_id, set()).add(actual_text)
 
-        # Update the editor (defer_highlight=False to immediately reattach highlighter)
-        self.editor.set_text(new_text, defer_highlight=False)
+            replacements.append((start, end, entity_link(actual_text, entity_id)))
+            last_end = end
 
-        # Mark document as modified and add discovered aliases to document
-        self.current_document.set_content(new_text)
+        # One undoable edit; the text-changed handler marks the document modified
+        # and updates the word count and outline
+        self.editor.apply_replacements(replacements)
 
         # Add all discovered aliases to the document metadata
         for entity_id, aliases in aliases_to_add.items():
             for alias in aliases:
                 self.current_document.add_alias(entity_id, alias)
 
-        self.document_modified.emit(True)
-
         # Show success message
-        total_tags = sum(len(m["positions"]) for m in selected_matches)
+        total_tags = len(replacements)
         alias_count = sum(len(aliases) for aliases in aliases_to_add.values())
         message = f"Successfully tagged {total_tags} entity mentions"
         if alias_count > 0:
@@ -1074,9 +1082,14 @@ class StoryweaverWidget(QWidget):
     def cleanup(self):
         """Cleanup resources."""
         # Auto-save if needed
+        self._sync_document_content()
         if self.current_document and self.current_document.is_modified:
+            self._store_editor_state()
             self.current_document.save()
+        else:
+            self._save_view_state_if_changed()
 
         # Stop timers
         self.autosave_timer.stop()
         self.heading_update_timer.stop()
+        self.editor.cleanup()
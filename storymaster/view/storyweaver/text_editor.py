@@ -4,10 +4,10 @@ Integrated version for Storymaster - uses direct database access instead of IPC.
 """
 
 import datetime
+import hashlib
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from PySide6.QtCore import QEvent, QPoint, QRect, QStringListModel, Qt, QTimer, Signal
 from PySide6.QtGui import (
@@ -39,35 +39,38 @@ from PySide6.QtWidgets import (
 )
 
 # Import spell checking
-from storymaster.view.common.spellcheck import SpellChecker
-
-# Compiled regex patterns (compile once at module load for performance)
-CODE_PATTERN = re.compile(r"(`)([^`]+?)(`)")
-BOLD_PATTERN = re.compile(r"(\*\*)([^*]+?)(\*\*)")
-UNDERLINE_PATTERN = re.compile(r"(__)([^_]+?)(__)")
-STRIKETHROUGH_PATTERN = re.compile(r"(~~)([^~]+?)(~~)")
-ITALIC_ASTERISK_PATTERN = re.compile(r"(?<!\*)(\*)(?!\*)([^*]+?)(?<!\*)(\*)(?!\*)")
-ITALIC_UNDERSCORE_PATTERN = re.compile(r"(?<!_)(_)(?!_)([^_]+?)(?<!_)(_)(?!_)")
-LINK_PATTERN = re.compile(r"(\[)([^\]]+?)(\]\()([^\)]+?)(\))")
-IMAGE_PATTERN = re.compile(r"(!\[)([^\]]*?)(\]\()([^\)]+?)(\))")
-
+from storymaster.view.common.spellcheck import BackgroundSpellChecker, get_spell_checker
+from storymaster.view.storyweaver.auto_tagger import utf16_offsets
+from storymaster.view.storyweaver.entity_matcher import EntityMatcher
+from storymaster.view.storyweaver.highlight_scheduler import HighlightScheduler
+from storymaster.view.storyweaver.markdown_format import (
+    BOLD_PATTERN,
+    CODE_PATTERN,
+    IMAGE_PATTERN,
+    ITALIC_ASTERISK_PATTERN,
+    ITALIC_UNDERSCORE_PATTERN,
+    LINK_PATTERN,
+    STRIKETHROUGH_PATTERN,
+    UNDERLINE_PATTERN,
+    FORMAT_TYPES,
+    NO_RUNS,
+    format_runs,
+    get_format_pool,
+)
 
-@dataclass
-class BlockData:
-    """Data for a text block to be highlighted in a worker thread."""
+# Bump when extract_format_instructions or the persisted layout changes so stale
+# caches are ignored
+FORMAT_CACHE_VERSION = 2
 
-    block_number: int
-    text: str
-    position: int
 
+def _content_key(text: str) -> bytes:
+    """Stable digest of a block's text; keys the format and entity span caches."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).digest()
 
-@dataclass
-class FormatInstruction:
-    """A single formatting instruction (position, length, format_type)."""
 
-    position: int
-    length: int
-    format_type: str  # e.g., 'entity', 'bold', 'italic', 'code', etc.
+def _content_hash(text: str) -> str:
+    """Hex form of _content_key, as stored in the persisted format cache."""
+    return _content_key(text).hex()
 
 
 class ClickableLabel(QLabel):
@@ -173,19 +176,20 @@ class MarkdownHighlighter(QSyntaxHighlighter):
         self._first_slow_format_logged = False
 
         # Spell checking
-        self.spell_checker = SpellChecker()
+        self.spell_checker = get_spell_checker()
         self.spell_check_enabled = True
-
-        # Progressive highlighting state
-        self._progressive_timer = QTimer()
-        self._progressive_timer.setSingleShot(True)
-        self._progressive_timer.timeout.connect(self._highlight_next_chunk)
-        self._progressive_current_block = 0
-        self._progressive_total_blocks = 0
-        self._progressive_active = False
-
-        # Store format instructions for each block (block_number -> list of FormatInstructions)
-        self._format_cache: Dict[int, List[FormatInstruction]] = {}
+        # Blocks highlighted from the format cache are spell checked off the GUI
+        # thread and rehighlighted when their spans arrive
+        self.background_spell_check = True
+        self._spell_worker = BackgroundSpellChecker(self.spell_checker, self)
+        self._spell_worker.spans_ready.connect(self._on_spell_spans_ready)
+        self._spell_spans_by_hash: Dict[bytes, List[Tuple[int, int]]] = {}
+        self._spell_generation = self.spell_checker.generation
+        self._spell_waiting: Dict[bytes, Set[int]] = {}  # block numbers per text hash
+
+        # Progressive highlighting: visible blocks first, the rest in idle time
+        self.scheduler = HighlightScheduler(self, editor)
+        self.scheduler.finished.connect(self._print_performance_summary)
 
         # Performance profiling counters for FORMATTING (not regex)
         self._format_perf = {
@@ -303,26 +307,163 @@ class MarkdownHighlighter(QSyntaxHighlighter):
             QTextCharFormat.UnderlineStyle.SpellCheckUnderline
         )
 
-        # Entity highlighting for plain text approach (multipass)
+        # Entity highlighting for plain text approach (one automaton pass per block)
         self._entity_names: List[str] = []
-        self._entity_patterns: List[re.Pattern] = []  # One pattern per entity
+        self._entity_matcher = EntityMatcher()
+
+        # Content-addressed caches, persisted in the .storyweaver file between sessions.
+        # Both are keyed by _content_key(block text), so a block whose text changed
+        # simply misses and identical blocks share one entry. Format runs are flat
+        # (position, length, type id) int arrays (see markdown_format); entity spans
+        # are only valid for the entity list whose hash is _entity_hash.
+        self._runs_by_hash: Dict[bytes, array] = {}
+        self._entity_hash = _content_hash("")
+        self._entity_spans_by_hash: Dict[bytes, List[Tuple[int, int]]] = {}
+        # Persisted spans for an entity list that hasn't been set yet (hash, spans)
+        self._pending_entity_spans: Optional[
+            Tuple[str, Dict[bytes, List[Tuple[int, int]]]]
+        ] = None
 
     def set_entity_names(self, entity_names: List[str]):
-        """Set the list of entity names to highlight and compile individual patterns."""
+        """Set the list of entity names to highlight and build the matcher for them."""
+        self._set_matcher(EntityMatcher(entity_names))
         self._entity_names = entity_names
-        if entity_names:
-            # Multipass approach: compile one simple pattern per entity
-            # Much faster than one huge pattern with all entities
-            self._entity_patterns = []
-            for name in entity_names:
-                # Escape special regex characters
-                escaped_name = re.escape(name)
-                # Pattern: \bEntityName('s)?\b (with optional possessive)
-                pattern_str = r"\b" + escaped_name + r"(?:'s)?\b"
-                pattern = re.compile(pattern_str, re.IGNORECASE)
-                self._entity_patterns.append(pattern)
+
+    def set_entity_matcher(self, matcher: EntityMatcher):
+        """Highlight the names in an already-built matcher (shared with the editor)."""
+        self._set_matcher(matcher if matcher is not None else EntityMatcher())
+
+    def _set_matcher(self, matcher: EntityMatcher):
+        self._entity_names = matcher.terms
+        self._entity_matcher = matcher
+
+        entity_hash = _content_hash("\n".join(sorted(term.lower() for term in matcher.terms)))
+        if entity_hash == self._entity_hash:
+            return
+        self._entity_hash = entity_hash
+        self._entity_spans_by_hash = {}
+        if self._pending_entity_spans and self._pending_entity_spans[0] == entity_hash:
+            self._entity_spans_by_hash = self._pending_entity_spans[1]
+            self._pending_entity_spans = None
+
+    def _entity_spans(self, text: str, store: bool = True) -> List[Tuple[int, int]]:
+        """Entity mention spans in a block, from the span cache when possible."""
+        if not self._entity_matcher:
+            return []
+        key = _content_key(text)
+        spans = self._entity_spans_by_hash.get(key)
+        if spans is None:
+            spans = [(match.start, match.end) for match in self._entity_matcher.find_all(text)]
+            if store:
+                self._entity_spans_by_hash[key] = spans
+        return spans
+
+    def _misspelled_spans(self, text: str, store: bool = True) -> List[Tuple[int, int]]:
+        """
+        Misspelled word spans in a block, from the span cache when possible.
+
+        With background_spell_check, a block that isn't cached yet gets no spans
+        now and is rehighlighted once the worker has checked it.
+        """
+        checker = self.spell_checker
+        if not (self.spell_check_enabled and checker and checker.enabled):
+            return []
+        if checker.generation != self._spell_generation:
+            # Dictionary changed; earlier verdicts may be wrong
+            self._spell_spans_by_hash = {}
+            self._spell_generation = checker.generation
+        if not store:
+            return checker.misspelled_spans(text)
+
+        key = _content_key(text)
+        spans = self._spell_spans_by_hash.get(key)
+        if spans is not None:
+            return spans
+        if self.background_spell_check:
+            self._spell_waiting.setdefault(key, set()).add(self.currentBlock().blockNumber())
+            self._spell_worker.request(key, text)
+            return []
+        spans = checker.misspelled_spans(text)
+        self._spell_spans_by_hash[key] = spans
+        return spans
+
+    def _on_spell_spans_ready(self, key: bytes, spans: List[Tuple[int, int]], generation: int):
+        """Store spans from the background checker and redraw the blocks waiting on them."""
+        self._spell_worker.finish(key)
+        block_numbers = self._spell_waiting.pop(key, set())
+        stale = generation != self.spell_checker.generation
+        if not stale:
+            self._spell_spans_by_hash[key] = spans
+        document = self.document()
+        if document is None or (not spans and not stale):
+            return
+        for block_number in sorted(block_numbers):
+            # Rehighlighting a block checked against an old dictionary requests it again
+            block = document.findBlockByNumber(block_number)
+            if block.isValid() and _content_key(block.text()) == key:
+                self.rehighlightBlock(block)
+
+    def load_format_cache(self, data: Dict[str, Any]):
+        """
+        Seed the caches from a persisted format cache (see export_format_cache).
+
+        Blocks whose text hash is found skip regex extraction in _populate_cache.
+        """
+        self._runs_by_hash = {}
+        self._pending_entity_spans = None
+        if not data or data.get("version") != FORMAT_CACHE_VERSION:
+            return
+
+        for key, runs in data.get("blocks", {}).items():
+            self._runs_by_hash[bytes.fromhex(key)] = array("i", runs) if runs else NO_RUNS
+
+        spans = {
+            bytes.fromhex(key): [(start, end) for start, end in block_spans]
+            for key, block_spans in data.get("entity_spans", {}).items()
+        }
+        if data.get("entity_hash") == self._entity_hash:
+            self._entity_spans_by_hash = spans
         else:
-            self._entity_patterns = []
+            # Entity list for this document usually arrives after the text
+            self._pending_entity_spans = (data.get("entity_hash"), spans)
+
+    def export_format_cache(self, document: QTextDocument) -> Dict[str, Any]:
+        """
+        Format runs and entity spans for every block of document, keyed by block
+        text hash, in a JSON-serialisable form. Entries for text that is no longer
+        in the document are dropped.
+        """
+        runs_by_hash = {}
+        spans_by_hash = {}
+        blocks = {}
+        entity_spans = {}
+
+        block = document.firstBlock()
+        while block.isValid():
+            text = block.text()
+            key = _content_key(text)
+            if key not in runs_by_hash:
+                runs = self._runs_by_hash.get(key)
+                if runs is None:
+                    runs = format_runs(text)
+                runs_by_hash[key] = runs
+                hex_key = key.hex()
+                blocks[hex_key] = runs.tolist()
+                if self._entity_matcher:
+                    spans = self._entity_spans(text)
+                    spans_by_hash[key] = spans
+                    entity_spans[hex_key] = [list(span) for span in spans]
+            block = block.next()
+
+        self._runs_by_hash = runs_by_hash
+        self._entity_spans_by_hash = spans_by_hash
+
+        return {
+            "version": FORMAT_CACHE_VERSION,
+            "blocks": blocks,
+            "entity_hash": self._entity_hash,
+            "entity_spans": entity_spans,
+        }
 
     def _is_inside_entity_link(self, start: int, end: int, entity_ranges: list) -> bool:
         """Check if a range overlaps with any entity link."""
@@ -393,171 +534,58 @@ class MarkdownHighlighter(QSyntaxHighlighter):
             self._format_perf[key] = 0
         self._highlight_block_call_count = 0
 
-        # Clear format cache
-        self._format_cache.clear()
-
-        # Extract all block data
-        block_data = []
+        # Runs persisted with the document (or from an earlier pass) are reused; only
+        # text not seen before needs regex work, and repeated lines are done once
+        to_process: Dict[bytes, str] = {}
+        block_count = 0
         block = document.firstBlock()
         while block.isValid():
-            block_data.append(
-                BlockData(
-                    block_number=block.blockNumber(), text=block.text(), position=block.position()
-                )
-            )
+            text = block.text()
+            key = _content_key(text)
+            if key not in self._runs_by_hash and key not in to_process:
+                to_process[key] = text
+            block_count += 1
             block = block.next()
 
-        # Process blocks in parallel
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [executor.submit(self._process_block_in_thread, bd) for bd in block_data]
-            for future in as_completed(futures):
-                block_number, instructions = future.result()
-                self._format_cache[block_number] = instructions
-
-        # Store block data for cache validation
-        self._block_data = block_data
+        # Process remaining blocks in parallel (worker processes, see markdown_format)
+        if to_process:
+            results = get_format_pool().format_blocks_encoded(list(to_process.values()))
+            for key, runs in zip(to_process, results):
+                self._runs_by_hash[key] = runs if runs else NO_RUNS
 
         print(
-            f"[{datetime.datetime.now()}]     Cache populated with {len(self._format_cache)} blocks"
+            f"[{datetime.datetime.now()}]     Cache populated for {block_count} blocks "
+            f"({len(to_process)} distinct blocks formatted, the rest cached)"
         )
 
+    def setDocument(self, document):
+        """Attach to document (None detaches), stopping work on any other one."""
+        if document is not self.scheduler.document:
+            self.scheduler.stop()
+        super().setDocument(document)
+
     def start_progressive_rehighlight(self):
-        """Start progressive multithreaded rehighlighting (non-blocking)."""
+        """Rebuild the format cache and rehighlight progressively (non-blocking)."""
+        doc = self.editor.document()
+        self._populate_cache(doc)
+        self.start_lazy_highlight()
+
+    def start_lazy_highlight(self):
+        """
+        Attach to the editor's document and highlight it viewport-first.
+
+        Uses whatever is in the format cache; blocks not in it are extracted
+        as they are reached.
+        """
         # Reset performance counters
         for key in self._format_perf:
             self._format_perf[key] = 0
         self._highlight_block_call_count = 0
 
         print(
-            f"[{datetime.datetime.now()}]     MarkdownHighlighter: Starting multithreaded progressive rehighlight..."
-        )
-
-        # Cancel any existing progressive highlighting
-        if self._progressive_active:
-            self._progressive_timer.stop()
-
-        # Clear format cache since we're doing a full rehighlight
-        self._format_cache.clear()
-
-        # Disable editor updates during highlighting to prevent expensive repaints
-        # This is the KEY optimization - prevents Qt from recalculating layout on every block
-        self.editor.setUpdatesEnabled(False)
-
-        # Initialize progressive state
-        doc = self.document()
-        if doc:
-            self._progressive_current_block = 0
-            self._progressive_total_blocks = doc.blockCount()
-            self._progressive_active = True
-
-            # Extract all block data (thread-safe copy of text content)
-            print(
-                f"[{datetime.datetime.now()}]     MarkdownHighlighter: Extracting {self._progressive_total_blocks} blocks for multithreaded processing..."
-            )
-            self._block_data = []
-            block = doc.firstBlock()
-            while block.isValid():
-                self._block_data.append(
-                    BlockData(
-                        block_number=block.blockNumber(),
-                        text=block.text(),
-                        position=block.position(),
-                    )
-                )
-                block = block.next()
-
-            print(
-                f"[{datetime.datetime.now()}]     MarkdownHighlighter: Starting multithreaded highlighting..."
-            )
-            # Start highlighting the first chunk
-            self._highlight_next_chunk()
-
-    def _highlight_next_chunk(self):
-        """Highlight the next chunk of blocks using multithreading."""
-        if not self._progressive_active:
-            return
-
-        doc = self.document()
-        if not doc:
-            self._progressive_active = False
-            return
-
-        chunk_start_time = datetime.datetime.now()
-
-        # Use smaller chunks (50 blocks) to yield to event loop more frequently
-        chunk_size = 50
-        end_block = min(
-            self._progressive_current_block + chunk_size, self._progressive_total_blocks
-        )
-
-        # Get block data for this chunk
-        chunk_blocks = self._block_data[self._progressive_current_block : end_block]
-
-        # Process blocks in parallel (CPU-bound regex work in threads)
-        # Use 4 workers for good parallelism without overwhelming the system
-        regex_start = datetime.datetime.now()
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            # Submit all blocks in the chunk to be processed in parallel
-            futures = [
-                executor.submit(self._process_block_in_thread, block_data)
-                for block_data in chunk_blocks
-            ]
-
-            # Collect results and apply formats immediately as they complete
-            # This allows UI to remain responsive
-            completed_count = 0
-            for future in as_completed(futures):
-                block_number, instructions = future.result()
-                # Store format instructions in cache
-                self._format_cache[block_number] = instructions
-                completed_count += 1
-
-        regex_end = datetime.datetime.now()
-        regex_duration = (regex_end - regex_start).total_seconds() * 1000
-
-        # Don't apply formatting during progressive load - just cache the instructions
-        # We'll trigger a single rehighlight at the end which is much faster
-        format_start = datetime.datetime.now()
-        # No-op - formatting will be applied automatically when Qt calls highlightBlock()
-        format_end = datetime.datetime.now()
-        format_duration = (format_end - format_start).total_seconds() * 1000
-
-        self._progressive_current_block = end_block
-
-        chunk_duration = (datetime.datetime.now() - chunk_start_time).total_seconds() * 1000
-        print(
-            f"[{datetime.datetime.now()}]     Chunk {self._progressive_current_block}/{self._progressive_total_blocks}: "
-            f"regex={regex_duration:.1f}ms, format={format_duration:.1f}ms, total={chunk_duration:.1f}ms"
+            f"[{datetime.datetime.now()}]     MarkdownHighlighter: Starting viewport-first highlighting..."
         )
-
-        # Process events to keep UI responsive
-        QApplication.processEvents()
-
-        # Check if we're done
-        if self._progressive_current_block >= self._progressive_total_blocks:
-            self._progressive_active = False
-
-            # Cache is fully populated! Now format the entire document
-            print(
-                f"[{datetime.datetime.now()}]     Cache fully populated. Formatting entire document..."
-            )
-
-            # Format the entire document to get full performance data
-            format_start = datetime.datetime.now()
-            self.rehighlight()
-            format_duration = (datetime.datetime.now() - format_start).total_seconds() * 1000
-
-            # Re-enable editor updates
-            self.editor.setUpdatesEnabled(True)
-
-            print(f"[{datetime.datetime.now()}]     Document formatted in {format_duration:.1f}ms")
-            print(f"[{datetime.datetime.now()}]     Document ready!")
-
-            # Print performance summary AFTER we've formatted all blocks
-            self._print_performance_summary()
-        else:
-            # Schedule next chunk immediately - no delay needed
-            self._progressive_timer.start(0)
+        self.scheduler.start()
 
     def _apply_cached_formatting_direct(self):
         """
@@ -584,24 +612,23 @@ class MarkdownHighlighter(QSyntaxHighlighter):
             # Process each block that has cached instructions
             block = doc.firstBlock()
             while block.isValid():
-                block_number = block.blockNumber()
+                runs = self._runs_by_hash.get(_content_key(block.text()))
 
-                if block_number in self._format_cache:
-                    instructions = self._format_cache[block_number]
+                if runs is not None:
                     block_start_pos = block.position()
 
-                    # Apply each format instruction for this block
-                    for instruction in instructions:
+                    # Apply each (position, length, type id) run for this block
+                    for i in range(0, len(runs), 3):
                         # Convert block-relative position to document-absolute position
-                        abs_position = block_start_pos + instruction.position
+                        abs_position = block_start_pos + runs[i]
 
-                        # Get the format for this instruction
-                        fmt = self._get_format_for_type(instruction.format_type, show_syntax)
+                        # Get the format for this run
+                        fmt = self._get_format_for_type(FORMAT_TYPES[runs[i + 2]], show_syntax)
                         if fmt:
                             # Set cursor to the position and select the text
                             cursor.setPosition(abs_position)
                             cursor.setPosition(
-                                abs_position + instruction.length, QTextCursor.KeepAnchor
+                                abs_position + runs[i + 1], QTextCursor.KeepAnchor
                             )
 
                             # Apply the format
@@ -617,185 +644,6 @@ class MarkdownHighlighter(QSyntaxHighlighter):
             doc.setUndoRedoEnabled(True)
             doc.blockSignals(False)
 
-    def _extract_format_instructions(self, text: str) -> List[FormatInstruction]:
-        """
-        Extract all format instructions from text using regex (thread-safe, no GUI).
-
-        Returns:
-            List of FormatInstruction objects describing where to apply formats
-        """
-        instructions = []
-
-        # Track entity link positions to avoid formatting inside them
-        entity_ranges = []
-
-        # Code blocks (```...```) - must be checked before other patterns
-        if text.strip().startswith("```"):
-            instructions.append(FormatInstruction(0, len(text), "code_block"))
-            return instructions
-
-        # Horizontal rules (---, ***, ___)
-        hr_patterns = [r"^---+$", r"^\*\*\*+$", r"^___+$"]
-        for pattern in hr_patterns:
-            if re.match(pattern, text.strip()):
-                instructions.append(FormatInstruction(0, len(text), "hr"))
-                return instructions
-
-        # Headings
-        if text.startswith("###### "):
-            instructions.append(FormatInstruction(0, 7, "heading_syntax"))
-            instructions.append(FormatInstruction(7, len(text) - 7, "heading6"))
-            return instructions
-        elif text.startswith("##### "):
-            instructions.append(FormatInstruction(0, 6, "heading_syntax"))
-            instructions.append(FormatInstruction(6, len(text) - 6, "heading5"))
-            return instructions
-        elif text.startswith("#### "):
-            instructions.append(FormatInstruction(0, 5, "heading_syntax"))
-            instructions.append(FormatInstruction(5, len(text) - 5, "heading4"))
-            return instructions
-        elif text.startswith("### "):
-            instructions.append(FormatInstruction(0, 4, "heading_syntax"))
-            instructions.append(FormatInstruction(4, len(text) - 4, "heading3"))
-            return instructions
-        elif text.startswith("## "):
-            instructions.append(FormatInstruction(0, 3, "heading_syntax"))
-            instructions.append(FormatInstruction(3, len(text) - 3, "heading2"))
-            return instructions
-        elif text.startswith("# "):
-            instructions.append(FormatInstruction(0, 2, "heading_syntax"))
-            instructions.append(FormatInstruction(2, len(text) - 2, "heading1"))
-            return instructions
-
-        # Blockquote
-        if text.startswith("> "):
-            instructions.append(FormatInstruction(0, 2, "blockquote_syntax"))
-            instructions.append(FormatInstruction(2, len(text) - 2, "blockquote"))
-            return instructions
-
-        # Task lists
-        task_unchecked = re.match(r"^(\s*-\s+\[\s\])\s+(.*)$", text)
-        task_checked = re.match(r"^(\s*-\s+\[x\])\s+(.*)$", text, re.IGNORECASE)
-        if task_unchecked:
-            instructions.append(FormatInstruction(0, len(task_unchecked.group(1)), "task_checkbox"))
-            return instructions
-        elif task_checked:
-            instructions.append(FormatInstruction(0, len(task_checked.group(1)), "task_checkbox"))
-            instructions.append(
-                FormatInstruction(
-                    len(task_checked.group(1)) + 1, len(task_checked.group(2)), "strikethrough"
-                )
-            )
-            return instructions
-
-        # Unordered lists
-        list_match = re.match(r"^(\s*[-*+]\s+)", text)
-        if list_match:
-            instructions.append(FormatInstruction(0, len(list_match.group(1)), "list"))
-
-        # Ordered lists
-        ordered_list_match = re.match(r"^(\s*\d+\.\s+)", text)
-        if ordered_list_match:
-            instructions.append(FormatInstruction(0, len(ordered_list_match.group(1)), "list"))
-
-        # Helper to check if range overlaps with entity links
-        def is_inside_entity(start: int, end: int) -> bool:
-            for entity_start, entity_end in entity_ranges:
-                if not (end <= entity_start or start >= entity_end):
-                    return True
-            return False
-
-        # Inline code
-        for match in CODE_PATTERN.finditer(text):
-            if is_inside_entity(match.start(), match.end()):
-                continue
-            instructions.append(FormatInstruction(match.start(1), 1, "code_syntax"))
-            instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "code"))
-            instructions.append(FormatInstruction(match.start(3), 1, "code_syntax"))
-
-        # Bold
-        for match in BOLD_PATTERN.finditer(text):
-            if is_inside_entity(match.start(), match.end()):
-                continue
-            instructions.append(FormatInstruction(match.start(1), 2, "bold_syntax"))
-            instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "bold"))
-            instructions.append(FormatInstruction(match.start(3), 2, "bold_syntax"))
-
-        # Underline
-        for match in UNDERLINE_PATTERN.finditer(text):
-            if is_inside_entity(match.start(), match.end()):
-                continue
-            instructions.append(FormatInstruction(match.start(1), 2, "underline_syntax"))
-            instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "underline"))
-            instructions.append(FormatInstruction(match.start(3), 2, "underline_syntax"))
-
-        # Strikethrough
-        for match in STRIKETHROUGH_PATTERN.finditer(text):
-            if is_inside_entity(match.start(), match.end()):
-                continue
-            instructions.append(FormatInstruction(match.start(1), 2, "strikethrough_syntax"))
-            instructions.append(
-                FormatInstruction(match.start(2), len(match.group(2)), "strikethrough")
-            )
-            instructions.append(FormatInstruction(match.start(3), 2, "strikethrough_syntax"))
-
-        # Italic (asterisk)
-        for match in ITALIC_ASTERISK_PATTERN.finditer(text):
-            if is_inside_entity(match.start(), match.end()):
-                continue
-            instructions.append(FormatInstruction(match.start(1), 1, "italic_syntax"))
-            instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "italic"))
-            instructions.append(FormatInstruction(match.start(3), 1, "italic_syntax"))
-
-        # Italic (underscore)
-        for match in ITALIC_UNDERSCORE_PATTERN.finditer(text):
-            if is_inside_entity(match.start(), match.end()):
-                continue
-            instructions.append(FormatInstruction(match.start(1), 1, "italic_syntax"))
-            instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "italic"))
-            instructions.append(FormatInstruction(match.start(3), 1, "italic_syntax"))
-
-        # Links
-        for match in LINK_PATTERN.finditer(text):
-            if is_inside_entity(match.start(), match.end()):
-                continue
-            instructions.append(FormatInstruction(match.start(1), 1, "link_syntax"))
-            instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "link"))
-            instructions.append(FormatInstruction(match.start(3), 2, "link_syntax"))
-            instructions.append(
-                FormatInstruction(match.start(4), len(match.group(4)), "link_syntax")
-            )
-            instructions.append(FormatInstruction(match.start(5), 1, "link_syntax"))
-
-        # Images
-        for match in IMAGE_PATTERN.finditer(text):
-            if is_inside_entity(match.start(), match.end()):
-                continue
-            instructions.append(FormatInstruction(match.start(1), 2, "image_syntax"))
-            instructions.append(FormatInstruction(match.start(2), len(match.group(2)), "link"))
-            instructions.append(FormatInstruction(match.start(3), 2, "image_syntax"))
-            instructions.append(
-                FormatInstruction(match.start(4), len(match.group(4)), "image_syntax")
-            )
-            instructions.append(FormatInstruction(match.start(5), 1, "image_syntax"))
-
-        return instructions
-
-    def _process_block_in_thread(
-        self, block_data: BlockData
-    ) -> Tuple[int, List[FormatInstruction]]:
-        """
-        Process a block's text in a worker thread (thread-safe, no GUI access).
-
-        This does the CPU-intensive regex matching. The actual formatting
-        is applied later in the main thread.
-
-        Returns:
-            Tuple of (block_number, list of FormatInstructions)
-        """
-        instructions = self._extract_format_instructions(block_data.text)
-        return (block_data.block_number, instructions)
-
     def _get_format_for_type(
         self, format_type: str, show_syntax: bool
     ) -> Optional[QTextCharFormat]:
@@ -900,6 +748,14 @@ class MarkdownHighlighter(QSyntaxHighlighter):
         if not text:
             return
 
+        # During Qt's automatic full pass after setDocument(), only format blocks the
+        # scheduler has reached; it highlights the rest later
+        if (
+            self.scheduler.gate_active
+            and self.currentBlock().blockNumber() not in self.scheduler.gate_allowed
+        ):
+            return
+
         # Debug: Time this block's highlighting
         block_start = datetime.datetime.now()
 
@@ -911,56 +767,44 @@ class MarkdownHighlighter(QSyntaxHighlighter):
         cursor_block = self.editor.textCursor().block()
         show_syntax = cursor_block == self.currentBlock()
 
+        # Cached format runs are keyed by the block's text, so edited text just misses
+        runs = self._runs_by_hash.get(_content_key(text))
+
         # Debug: track cache usage
-        use_cache = block_number in self._format_cache
         if not hasattr(self, "_cache_hits"):
             self._cache_hits = 0
             self._cache_misses = 0
 
-        if use_cache:
+        if runs is not None:
             self._cache_hits += 1
         else:
             self._cache_misses += 1
 
-        # Check if we have cached format instructions for this block
-        if block_number in self._format_cache:
-            # Check if cached data is still valid by comparing text
-            cached_block_data = None
-            if hasattr(self, "_block_data") and block_number < len(self._block_data):
-                cached_block_data = self._block_data[block_number]
-
-            # If text has changed, invalidate cache and recompute
-            if cached_block_data is None or cached_block_data.text != text:
-                # Text changed, remove from cache and fall through to recompute
-                del self._format_cache[block_number]
-            else:
-                # Use cached format instructions (from parallel processing)
-                # First apply default white text to entire block
-                default_format = QTextCharFormat()
-                default_format.setForeground(QColor("#FFFFFF"))  # White text
-                self.setFormat(0, len(text), default_format)
-
-                # Then apply cached formats on top
-                instructions = self._format_cache[block_number]
-                for instruction in instructions:
-                    fmt = self._get_format_for_type(instruction.format_type, show_syntax)
-                    if fmt:
-                        self._timed_setFormat(
-                            instruction.position, instruction.length, fmt, instruction.format_type
-                        )
+        if runs is not None:
+            # Use cached format runs (from parallel processing)
+            # First apply default white text to entire block
+            default_format = QTextCharFormat()
+            default_format.setForeground(QColor("#FFFFFF"))  # White text
+            self.setFormat(0, len(text), default_format)
+
+            # Then apply cached (position, length, type id) runs on top
+            for i in range(0, len(runs), 3):
+                format_type = FORMAT_TYPES[runs[i + 2]]
+                fmt = self._get_format_for_type(format_type, show_syntax)
+                if fmt:
+                    self._timed_setFormat(runs[i], runs[i + 1], fmt, format_type)
+
+            # Still need to apply entity highlighting (not cached because entity list loads after cache)
+            # Track entity ranges to avoid conflicts
+            entity_ranges = []
+            for start, end in self._entity_spans(text):
+                if self._is_inside_entity_link(start, end, entity_ranges):
+                    continue
+                self.setFormat(start, end - start, self.entity_format)
 
-                # Still need to apply entity highlighting (not cached because entity list loads after cache)
-                # Track entity ranges to avoid conflicts
-                entity_ranges = []
-                if self._entity_patterns:
-                    for pattern in self._entity_patterns:
-                        for match in pattern.finditer(text):
-                            if self._is_inside_entity_link(
-                                match.start(), match.end(), entity_ranges
-                            ):
-                                continue
-                            self.setFormat(match.start(), len(match.group(0)), self.entity_format)
-                return
+            for start, end in self._misspelled_spans(text):
+                self.setFormat(start, end - start, self.spell_check_format)
+            return
 
         # Fall back to original highlighting logic for real-time edits
         # (This path is used when user types, not during initial load)
@@ -1146,26 +990,19 @@ class MarkdownHighlighter(QSyntaxHighlighter):
             # Format alt text with link format
             self.setFormat(match.start(2), len(match.group(2)), self.link_format)
 
-        # Entity name highlighting (multipass approach - entire document)
-        if self._entity_patterns:
-            # Iterate through each entity pattern (multipass)
-            for pattern in self._entity_patterns:
-                for match in pattern.finditer(text):
-                    # Check if this position overlaps with any other formatted region
-                    if self._is_inside_entity_link(match.start(), match.end(), entity_ranges):
-                        continue
-                    # Highlight the entity name
-                    self.setFormat(match.start(), len(match.group(0)), self.entity_format)
-
-        # Spell checking (applies red underline to misspelled words)
-        if self.spell_check_enabled and self.spell_checker:
-            # Find all words in the text
-            word_pattern = re.compile(r"\b[a-zA-Z]+\b")
-            for match in word_pattern.finditer(text):
-                word = match.group()
-                if not self.spell_checker.is_word_correct(word):
-                    # Apply spell check underline (merges with existing formatting)
-                    self.setFormat(match.start(), len(word), self.spell_check_format)
+        # Entity name highlighting (single pass over the block for all names)
+        # Text being typed is not kept in the span cache; export_format_cache fills it on save
+        for start, end in self._entity_spans(text, store=False):
+            # Check if this position overlaps with any other formatted region
+            if self._is_inside_entity_link(start, end, entity_ranges):
+                continue
+            # Highlight the entity name
+            self.setFormat(start, end - start, self.entity_format)
+
+        # Spell checking (applies red underline to misspelled words). Checked here on
+        # the GUI thread: verdicts for known words are cached, so only new words cost
+        for start, end in self._misspelled_spans(text, store=False):
+            self.setFormat(start, end - start, self.spell_check_format)
 
         # Debug: Log if this block took more than 100ms
         block_duration = (datetime.datetime.now() - block_start).total_seconds() * 1000
@@ -1188,6 +1025,7 @@ class EntityTextEditor(QTextEdit):
         str, str, str
     )  # (entity_id, entity_name, current_display_text) - request to add alias
     alias_use_requested = Signal(str)  # (alias) - request to replace current entity link with alias
+    highlight_progress = Signal(int, int)  # (highlighted_blocks, total_blocks)
     entity_create_requested = Signal(
         str, str
     )  # (entity_name, entity_type) - request to create new entity
@@ -1204,6 +1042,8 @@ class EntityTextEditor(QTextEdit):
         # Entity autocomplete
         self._completer: Optional[QCompleter] = None
         self._entity_list: List[Dict[str, Any]] = []
+        # Names and aliases of _entity_list, rebuilt whenever the list changes
+        self._entity_matcher = EntityMatcher()
         self._completion_active = False
         self._trigger_pos = -1
         self._inline_mode = False  # True when completing without [[
@@ -1216,6 +1056,7 @@ class EntityTextEditor(QTextEdit):
 
         # Install markdown syntax highlighter
         self._highlighter = MarkdownHighlighter(self.document(), self)
+        self._highlighter.scheduler.progress_changed.connect(self.highlight_progress)
 
         # Flag for deferred highlighting
         self._pending_highlight = False
@@ -1263,6 +1104,7 @@ class EntityTextEditor(QTextEdit):
                                  filtering for search to avoid unnecessary rehighlighting.
         """
         self._entity_list = entities
+        self._entity_matcher = EntityMatcher.from_entities(entities)
 
         # Create display strings for completer
         display_list = []
@@ -1292,17 +1134,8 @@ class EntityTextEditor(QTextEdit):
 
         # Only update highlighting if requested (skip for search filtering)
         if update_highlighting:
-            # Extract entity names for highlighting (including aliases)
-            entity_names = []
-            for entity in entities:
-                name = entity.get("name", "")
-                if name:
-                    entity_names.append(name)
-                aliases = entity.get("aliases", [])
-                entity_names.extend(aliases)
-
-            # Pass entity names to highlighter for plain-text matching
-            self._highlighter.set_entity_names(entity_names)
+            # Share the matcher (names and aliases) with the highlighter
+            self._highlighter.set_entity_matcher(self._entity_matcher)
 
             # If highlighter is ready but not yet activated, activate it now
             if self._highlighter_ready:
@@ -1313,7 +1146,7 @@ class EntityTextEditor(QTextEdit):
             # Otherwise, if highlighter is already active, trigger rehighlight
             # (This ensures aliases show up immediately when added)
             elif self._highlighter and self._highlighter.document():
-                self._highlighter.rehighlight()
+                self._highlighter.start_lazy_highlight()
 
     # ============================================================================
     # MARKDOWN FORMATTING METHODS
@@ -1478,9 +1311,8 @@ class EntityTextEditor(QTextEdit):
                 f"[{datetime.datetime.now()}]   First user interaction - activating highlighter..."
             )
             activate_start = datetime.datetime.now()
-            self._highlighter.setDocument(self.document())
-            # Explicitly trigger rehighlight to apply cached formatting
-            self._highlighter.rehighlight()
+            # Visible blocks now, the rest in the background
+            self._highlighter.start_lazy_highlight()
             activate_duration = (datetime.datetime.now() - activate_start).total_seconds() * 1000
             print(
                 f"[{datetime.datetime.now()}]   Highlighter activated in {activate_duration:.1f}ms"
@@ -1693,7 +1525,7 @@ class EntityTextEditor(QTextEdit):
         """
         Get entity name at click position, handling multi-word names.
 
-        Expands selection outward from clicked word to find matching entity names.
+        Uses the longest entity name or alias in the block that overlaps the clicked word.
 
         Args:
             cursor: Cursor at click position
@@ -1711,50 +1543,15 @@ class EntityTextEditor(QTextEdit):
         if not clicked_word:
             return None
 
-        # Get the full text of the current block for context
+        # Find the longest name or alias in the block that covers the clicked word
         block_text = cursor.block().text()
         word_start = cursor.selectionStart() - cursor.block().position()
         word_end = cursor.selectionEnd() - cursor.block().position()
 
-        # Try progressively larger selections (up to 5 words in each direction)
-        for expand_left in range(5):
-            for expand_right in range(5):
-                # Calculate start and end positions for expanded selection
-                # Move left by expand_left words
-                start_pos = word_start
-                for _ in range(expand_left):
-                    # Find previous word boundary
-                    while start_pos > 0 and block_text[start_pos - 1].isspace():
-                        start_pos -= 1
-                    while start_pos > 0 and not block_text[start_pos - 1].isspace():
-                        start_pos -= 1
-
-                # Move right by expand_right words
-                end_pos = word_end
-                for _ in range(expand_right):
-                    # Find next word boundary
-                    while end_pos < len(block_text) and block_text[end_pos].isspace():
-                        end_pos += 1
-                    while end_pos < len(block_text) and not block_text[end_pos].isspace():
-                        end_pos += 1
-
-                # Extract the candidate text
-                candidate = block_text[start_pos:end_pos].strip()
-
-                if not candidate:
-                    continue
-
-                # Check if this matches any entity name or alias (case-insensitive)
-                for entity in self._entity_list:
-                    name = entity.get("name", "")
-                    aliases = entity.get("aliases", [])
-
-                    if name.lower() == candidate.lower() or any(
-                        alias.lower() == candidate.lower() for alias in aliases
-                    ):
-                        return candidate
-
-        return None
+        match = self._entity_matcher.match_at(block_text, word_start, word_end)
+        if match is None:
+            return None
+        return block_text[match.start : match.name_end]
 
     def mousePressEvent(self, event: QMouseEvent):
         """Handle mouse press events to detect clicks on entity names."""
@@ -1770,16 +1567,7 @@ class EntityTextEditor(QTextEdit):
 
             if clicked_text and self._entity_list:
                 # Find all entities matching this text (case-insensitive)
-                matching_entities = []
-                for entity in self._entity_list:
-                    name = entity.get("name", "")
-                    aliases = entity.get("aliases", [])
-
-                    # Check if clicked text matches entity name or any alias
-                    if name.lower() == clicked_text.lower() or any(
-                        alias.lower() == clicked_text.lower() for alias in aliases
-                    ):
-                        matching_entities.append(entity)
+                matching_entities = self._entity_matcher.lookup(clicked_text)
 
                 if matching_entities:
                     if len(matching_entities) == 1:
@@ -1899,10 +1687,45 @@ class EntityTextEditor(QTextEdit):
         # The highlighter will automatically apply formatting
         pass
 
+    @property
+    def entity_matcher(self) -> EntityMatcher:
+        """Matcher over the names and aliases of the current entity list."""
+        return self._entity_matcher
+
+    def get_view_state(self) -> Dict[str, int]:
+        """Cursor and scroll position, for restoring the view when the document is reopened."""
+        return {
+            "cursor_position": self.textCursor().position(),
+            "scroll_position": self.verticalScrollBar().value(),
+        }
+
+    def restore_view_state(self, state: Dict[str, int]):
+        """Restore a position saved by get_view_state (out-of-range values are clamped)."""
+        if not state:
+            return
+        cursor = self.textCursor()
+        max_position = max(0, self.document().characterCount() - 1)
+        cursor.setPosition(min(max(0, int(state.get("cursor_position", 0))), max_position))
+        self.setTextCursor(cursor)
+        self.verticalScrollBar().setValue(int(state.get("scroll_position", 0)))
+
     def get_text(self) -> str:
         """Get the plain text content (with entity link syntax intact)."""
         return self.toPlainText()
 
+    def load_format_cache(self, data: Dict[str, Any]):
+        """Seed the highlighter from a format cache saved with the document."""
+        self._highlighter.load_format_cache(data)
+
+    def export_format_cache(self) -> Dict[str, Any]:
+        """Format cache for the current text, to be saved with the document."""
+        return self._highlighter.export_format_cache(self.document())
+
+    def cleanup(self):
+        """Stop background highlighting and spell checking."""
+        self._highlighter.scheduler.stop()
+        self._highlighter._spell_worker.shutdown()
+
     def trigger_deferred_highlight(self):
         """Trigger highlighting if it was deferred during set_text()."""
         if self._pending_highlight and self._highlighter:
@@ -1916,14 +1739,52 @@ class EntityTextEditor(QTextEdit):
             cache_duration = (datetime.datetime.now() - cache_start).total_seconds() * 1000
             print(f"[{datetime.datetime.now()}]   Cache populated in {cache_duration:.1f}ms")
 
-            # DON'T reattach highlighter yet! This would trigger expensive rehighlight.
-            # Instead, mark as ready and reattach on first user interaction.
+            # Reattach once the event loop runs, so a restored scroll position is in
+            # place first: visible blocks are highlighted first, the rest in idle time
             self._highlighter_ready = True
+            QTimer.singleShot(0, self._activate_highlighter_if_ready)
             print(
-                f"[{datetime.datetime.now()}]   Highlighter ready (will activate on first interaction)"
+                f"[{datetime.datetime.now()}]   Highlighter ready (activates viewport-first)"
             )
             print(f"[{datetime.datetime.now()}] *** DOCUMENT IS NOW EDITABLE ***")
 
+    def apply_replacements(self, replacements: Sequence[Tuple[int, int, str]]):
+        """
+        Replace (start, end, text) spans as a single undoable edit.
+
+        Spans are str indices into the current text (as from get_text()) and
+        must not overlap. The highlighter is detached while editing, so the
+        edit doesn't rehighlight every block it touches, and then reattached
+        viewport-first.
+        """
+        if not replacements:
+            return
+
+        # Qt positions count UTF-16 code units, not str characters
+        offsets = utf16_offsets(
+            self.get_text(),
+            (position for start, end, _ in replacements for position in (start, end)),
+        )
+
+        highlighter_attached = self._highlighter and self._highlighter.document() is not None
+        if highlighter_attached:
+            self._highlighter.scheduler.stop()
+            self._highlighter.setDocument(None)
+
+        cursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
+        try:
+            # Back to front, so earlier positions stay valid
+            for start, end, replacement in sorted(replacements, reverse=True):
+                cursor.setPosition(offsets[start])
+                cursor.setPosition(offsets[end], QTextCursor.KeepAnchor)
+                cursor.insertText(replacement)
+        finally:
+            cursor.endEditBlock()
+
+        if highlighter_attached:
+            self._highlighter.start_lazy_highlight()
+
     def set_text(self, text: str, defer_highlight: bool = True):
         """
         Set the text content.
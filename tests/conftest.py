@@ -150,3 +150,12 @@ def mock_message_boxes():
             "critical": mock_critical,
             "question": mock_question,
         }
+
+
+@pytest.fixture(autouse=True)
+def reset_global_spell_checker():
+    """Spell-checked widgets share one checker; give each test a fresh one"""
+    yield
+    spellcheck = sys.modules.get("storymaster.view.common.spellcheck")
+    if QT_AVAILABLE and spellcheck is not None:
+        spellcheck._global_spell_checker = None
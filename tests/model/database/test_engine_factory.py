@@ -0,0 +1,78 @@
+"""Tests for the shared SQLite engine factory and its tuning profiles."""
+
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from storymaster.model.database.engine_factory import (
+    TUNED_PROFILE,
+    create_sqlite_engine,
+    get_profile,
+)
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_tuned_profile_applies_pragmas(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'tuned.db'}", profile="tuned")
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "cache_size") == -TUNED_PROFILE.cache_size_kib
+    assert _pragma(engine, "busy_timeout") == TUNED_PROFILE.busy_timeout_ms
+    assert _pragma(engine, "foreign_keys") == 0
+    assert engine.pool.size() == TUNED_PROFILE.pool_size
+
+
+def test_strict_profile_enforces_foreign_keys(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'strict.db'}", profile="strict")
+    assert _pragma(engine, "foreign_keys") == 1
+
+
+def test_default_profile_leaves_sqlite_defaults(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'plain.db'}", profile="default")
+    assert _pragma(engine, "journal_mode") == "delete"
+
+
+def test_profile_from_environment(monkeypatch):
+    monkeypatch.setenv("STORYMASTER_SQLITE_PROFILE", "strict")
+    assert get_profile().foreign_keys is True
+    monkeypatch.setenv("STORYMASTER_SQLITE_PROFILE", "bogus")
+    with pytest.raises(ValueError):
+        get_profile()
+
+
+def test_memory_database_is_supported():
+    engine = create_sqlite_engine("sqlite://")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_reader_is_not_blocked_by_open_write_transaction(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'wal.db'}", profile="tuned")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+
+    writing = threading.Event()
+    release = threading.Event()
+
+    def writer():
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO t VALUES (2)"))
+            writing.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert writing.wait(5)
+        # Under WAL the reader sees the last committed state without waiting.
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+    finally:
+        release.set()
+        thread.join()
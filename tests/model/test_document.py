@@ -0,0 +1,185 @@
+"""Tests for saving and loading .storyweaver documents."""
+
+import json
+import os
+import zipfile
+
+from storymaster.models import document_archive
+from storymaster.models.document import StoryDocument
+from storymaster.models.document_archive import (
+    MANIFEST_NAME,
+    SEGMENT_MAX_SIZE,
+    split_segments,
+)
+
+CHAPTER = "\n".join(f"Line {i} of the chapter, with some words in it." for i in range(200))
+TEXT = "\n".join(f"# Chapter {n}\n{CHAPTER}\n" for n in range(5))
+
+
+def _document(tmp_path, text=TEXT):
+    path = str(tmp_path / "story.storyweaver")
+    document = StoryDocument()
+    document.create_new(path)
+    document.set_content(text)
+    document.format_cache = {"version": 2, "blocks": {f"{n:024x}": [0, 4, 1] for n in range(100)}}
+    assert document.save()
+    return document
+
+
+def _members(path):
+    with zipfile.ZipFile(path) as zf:
+        return set(zf.namelist())
+
+
+def test_segments_join_back_and_survive_edits():
+    segments = split_segments(TEXT)
+    assert "".join(segments) == TEXT
+    assert len(segments) >= 5
+    assert all(len(segment) <= SEGMENT_MAX_SIZE for segment in split_segments("x" * 200000))
+
+    edited = split_segments(TEXT.replace("Line 50 of", "Line fifty of", 1))
+    assert len(set(edited) - set(segments)) == 1
+
+
+def test_round_trip(tmp_path):
+    document = _document(tmp_path)
+    document.update_entity("7", "Mira", "actor")
+    document.set_view_state({"cursor_position": 12, "scroll_position": 3})
+    assert document.save()
+
+    reopened = StoryDocument(document.path)
+    assert reopened.content == TEXT
+    assert reopened.metadata == document.metadata
+    assert reopened.format_cache == document.format_cache
+    assert reopened.get_view_state() == {"cursor_position": 12, "scroll_position": 3}
+
+
+def test_small_edit_compresses_only_the_changed_segment(tmp_path, monkeypatch):
+    document = _document(tmp_path)
+    before = _members(document.path)
+    compressed = []
+    deflate = document_archive._deflate
+    monkeypatch.setattr(
+        document_archive, "_deflate", lambda data: compressed.append(data) or deflate(data)
+    )
+
+    document.set_content(TEXT.replace("Line 50 of", "Line fifty of", 1))
+    assert document.save()
+
+    after = _members(document.path)
+    assert [name.split("/")[0] for name in after - before] == ["segments"]
+    assert len(compressed) == 2  # the new segment and the manifest
+    with zipfile.ZipFile(document.path) as zf:
+        assert zf.testzip() is None
+    assert StoryDocument(document.path).content == document.content
+
+
+def test_unchanged_save_leaves_the_file_alone(tmp_path):
+    document = _document(tmp_path)
+    with open(document.path, "rb") as f:
+        data = f.read()
+
+    assert document.save()
+
+    with open(document.path, "rb") as f:
+        assert f.read() == data
+
+
+def test_superseded_segments_are_dropped(tmp_path):
+    document = _document(tmp_path)
+    for n in range(5):
+        document.set_content(f"Draft {n}\n" + TEXT.replace("Line", f"Line {n}"))
+        assert document.save()
+
+    with zipfile.ZipFile(document.path) as zf:
+        live = sum(info.compress_size for info in zf.infolist())
+        assert set(zf.namelist()) >= set(json.loads(zf.read(MANIFEST_NAME))["segments"])
+    assert os.path.getsize(document.path) < live + 16 * 1024
+    assert StoryDocument(document.path).content == document.content
+
+
+def test_failed_save_leaves_the_previous_file(tmp_path, monkeypatch):
+    document = _document(tmp_path)
+    with open(document.path, "rb") as f:
+        data = f.read()
+    synced = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or fsync(fd))
+
+    def fail(path, members):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(document_archive, "_write_members", fail)
+    document.set_content("Lost edit")
+    assert not document.save()
+
+    with open(document.path, "rb") as f:
+        assert f.read() == data
+    assert os.listdir(tmp_path) == ["story.storyweaver"]
+    assert synced == []
+
+    monkeypatch.undo()
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or fsync(fd))
+    assert document.save()
+    assert synced  # the new file is on disk before it replaces the old one
+    assert StoryDocument(document.path).content == "Lost edit"
+
+
+def test_single_file_documents_still_load_and_convert(tmp_path):
+    path = str(tmp_path / "old.storyweaver")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("document.md", TEXT)
+        zf.writestr("metadata.json", json.dumps({"storymaster_db": "", "entity_map": {}}))
+
+    document = StoryDocument(path)
+    assert document.content == TEXT
+    assert document.get_storyline_id() is None
+
+    document.set_content(TEXT + "More.")
+    assert document.save()
+    assert MANIFEST_NAME in _members(path)
+    assert "document.md" not in _members(path)
+    assert StoryDocument(path).content == TEXT + "More."
+
+
+def test_background_save_uses_the_content_at_call_time(tmp_path):
+    document = _document(tmp_path)
+    document.set_content("Saved text")
+    future = document.save_async()
+    document.set_content("Typed while saving")
+
+    assert future.result()
+    assert document.is_modified
+    assert StoryDocument(document.path).content == "Saved text"
+
+
+def test_entity_link_queries_follow_edits():
+    document = StoryDocument()
+    document.set_content("[[Mira|1]] met [[Crow|2]].\n[[the witch|1]] laughed.")
+    assert document.get_all_entity_ids() == ["1", "2", "1"]
+    assert [link.display_text for link in document.get_entity_occurrences("1")] == [
+        "Mira",
+        "the witch",
+    ]
+    assert document.get_entity_link_at(17).entity_id == "2"
+    assert document.get_entity_link_at(11) is None
+
+    document.set_content("Later, " + document.content.replace("[[Crow|2]]", "Crow"))
+    assert document.get_all_entity_ids() == ["1", "1"]
+    assert [link.start for link in document.get_entity_links_in_range(0, 40)] == [7, 28]
+    assert document.get_entity_references()["1"]["display_name"] == "Mira"
+
+
+def test_alias_lookup_is_case_insensitive():
+    document = StoryDocument()
+    document.update_entity("1", "Mira", "actor")
+    document.update_entity("2", "Crow", "actor")
+
+    assert document.add_alias("1", "The Witch")
+    assert not document.add_alias("1", "the WITCH")
+    assert not document.add_alias("1", "MIRA")
+    assert document.add_alias("2", "the witch")
+    assert document.find_entity_ids("THE WITCH") == ["1", "2"]
+
+    assert document.remove_alias("1", "The Witch")
+    assert document.find_entity_ids("the witch") == ["2"]
@@ -0,0 +1,153 @@
+"""Tests for the lore_search full-text index and its queries."""
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from storymaster.model.database.lore_search import build_match_query, search_lore
+from storymaster.model.database.schema.base import (
+    Actor,
+    BaseTable,
+    Faction,
+    History,
+    LitographyNotes,
+    NoteType,
+    Setting,
+    Storyline,
+    StorylineToSetting,
+    User,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "lore_search.db"
+
+
+@pytest.fixture
+def db(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    BaseTable.metadata.create_all(engine)
+    session = Session(engine)
+    user = User(username="alice")
+    session.add(user)
+    session.flush()
+    session.add_all(
+        [Setting(name="World", user_id=user.id), Setting(name="Other", user_id=user.id)]
+    )
+    session.add(Storyline(name="Saga", user_id=user.id))
+    session.flush()
+    session.add(StorylineToSetting(storyline_id=1, setting_id=1))
+    session.add_all(
+        [
+            Actor(
+                first_name="Mira", last_name="Vale", appearance="A witch of the marsh", setting_id=1
+            ),
+            Actor(first_name="Marshal", last_name="Crow", job="Guard captain", setting_id=1),
+            Actor(first_name="Mira", last_name="Elsewhere", setting_id=2),
+            Faction(name="Marsh Witches", description="A coven", setting_id=1),
+            History(name="The Flood", description="The marsh rose", setting_id=1),
+            LitographyNotes(
+                title="Mira's secret",
+                description="She drowned the king",
+                note_type=list(NoteType)[0],
+                linked_node_id=1,
+                storyline_id=1,
+            ),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _hits(db, search_text, **kwargs):
+    return [(hit.entity_type, hit.entity_id) for hit in search_lore(db, search_text, 1, **kwargs)]
+
+
+def test_match_query_quotes_words_as_prefixes():
+    assert build_match_query('mira "OR" v') == '"mira"* "OR"* "v"*'
+    assert build_match_query("mi", names_only=True) == 'name : ("mi"*)'
+    assert build_match_query(" %* ") == ""
+
+
+def test_name_matches_rank_above_text_matches(db):
+    hits = _hits(db, "marsh")
+    assert hits[:2] == [("faction", 1), ("actor", 2)]
+    assert sorted(hits[2:]) == [("actor", 1), ("history", 1)]
+    assert _hits(db, "marsh", names_only=True) == [("faction", 1), ("actor", 2)]
+    assert _hits(db, "marsh", entity_types=["actor"]) == [("actor", 2), ("actor", 1)]
+
+
+def test_every_word_must_match_a_prefix(db):
+    assert _hits(db, "mi va") == [("actor", 1)]
+    assert _hits(db, "mira") == [("actor", 1), ("litography_notes", 1)]
+    assert _hits(db, "ira") == []
+
+
+def test_triggers_keep_the_index_current(db):
+    crow = db.get(Actor, 2)
+    crow.last_name = "Raven"
+    db.commit()
+    assert _hits(db, "crow") == []
+    assert _hits(db, "raven") == [("actor", 2)]
+
+    db.delete(crow)
+    db.add(Faction(name="Ravenguard", setting_id=1))
+    db.commit()
+    assert _hits(db, "raven") == [("faction", 2)]
+
+    # Sync metadata updates don't touch the index
+    db.execute(text("UPDATE actor SET version = version + 1"))
+    assert db.execute(text("SELECT count(*) FROM lore_search")).scalar() == 6
+
+
+def _load_migration():
+    path = Path(__file__).resolve().parent.parent / "scripts" / "migrate_lore_search.py"
+    spec = importlib.util.spec_from_file_location("migrate_lore_search", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _drop_index(db_path):
+    conn = sqlite3.connect(db_path)
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_%_lore_search_%'"
+    ).fetchall():
+        conn.execute(f'DROP TRIGGER "{name}"')
+    conn.execute("DROP TABLE lore_search")
+    conn.commit()
+    conn.close()
+
+
+def test_migration_builds_the_index_and_is_idempotent(db, db_path):
+    db.close()
+    _drop_index(db_path)
+
+    migration = _load_migration()
+    assert migration.migrate(str(db_path))
+    assert migration.migrate(str(db_path))
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT count(*) FROM lore_search").fetchone() == (6,)
+    conn.execute("UPDATE faction SET name = 'Bog Witches'")
+    assert conn.execute(
+        "SELECT entity_type FROM lore_search WHERE lore_search MATCH 'bog'"
+    ).fetchall() == [("faction",)]
+    conn.close()
+
+
+def test_create_all_on_older_database_builds_the_index(db, db_path):
+    db.close()
+    _drop_index(db_path)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    BaseTable.metadata.create_all(engine)
+    with Session(engine) as session:
+        assert [hit.name for hit in search_lore(session, "vale", 1)] == ["Mira Vale"]
+    engine.dispose()
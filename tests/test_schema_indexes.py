@@ -0,0 +1,165 @@
+"""Query-plan regression tests for the access-path indexes."""
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, or_, select
+
+from storymaster.model.database import common_queries
+from storymaster.model.database.schema.base import (
+    ACCESS_PATH_INDEX_OBJECTS,
+    Actor,
+    ActorAOnBRelations,
+    BaseTable,
+    FactionMembers,
+    LitographyNotes,
+    NodeConnection,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "indexes.db"
+    engine = create_engine(f"sqlite:///{path}")
+    BaseTable.metadata.create_all(engine)
+    engine.dispose()
+    return path
+
+
+def _plan(db_path, statement):
+    """EXPLAIN QUERY PLAN details for a statement (SQLAlchemy or SQL text)"""
+    if not isinstance(statement, str):
+        statement = str(
+            statement.compile(
+                dialect=create_engine("sqlite://").dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+        )
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")]
+    finally:
+        conn.close()
+
+
+PLANS = [
+    (
+        common_queries.get_lorekeeper_actors_from_setting(1),
+        ["SEARCH actor USING INDEX ix_actor_setting_id (setting_id=?)"],
+    ),
+    (
+        # Keyset page of the Lorekeeper list: no sort step
+        select(Actor.id, Actor.first_name)
+        .where(Actor.setting_id == 1, Actor.id > 200)
+        .order_by(Actor.id)
+        .limit(200),
+        ["SEARCH actor USING INDEX ix_actor_setting_id (setting_id=? AND rowid>?)"],
+    ),
+    (
+        select(LitographyNotes).where(LitographyNotes.storyline_id == 1),
+        ["SEARCH litography_notes USING INDEX ix_litography_notes_storyline_id (storyline_id=?)"],
+    ),
+    (
+        select(ActorAOnBRelations).where(
+            or_(ActorAOnBRelations.actor_a_id == 1, ActorAOnBRelations.actor_b_id == 1)
+        ),
+        [
+            "MULTI-INDEX OR",
+            "INDEX 1",
+            "SEARCH actor_a_on_b_relations USING INDEX "
+            "ix_actor_a_on_b_relations_actor_a_id_actor_b_id (actor_a_id=?)",
+            "INDEX 2",
+            "SEARCH actor_a_on_b_relations USING INDEX "
+            "ix_actor_a_on_b_relations_actor_b_id (actor_b_id=?)",
+        ],
+    ),
+    (
+        select(FactionMembers).where(FactionMembers.faction_id == 1, FactionMembers.actor_id == 2),
+        [
+            "SEARCH faction_members USING INDEX "
+            "ix_faction_members_faction_id_actor_id (faction_id=? AND actor_id=?)"
+        ],
+    ),
+    (
+        select(FactionMembers).where(FactionMembers.actor_id == 2),
+        ["SEARCH faction_members USING INDEX ix_faction_members_actor_id (actor_id=?)"],
+    ),
+    (
+        select(NodeConnection).where(NodeConnection.input_node_id == 3),
+        ["SEARCH node_connection USING INDEX ix_node_connection_input_node_id (input_node_id=?)"],
+    ),
+    (
+        select(NodeConnection).where(
+            NodeConnection.output_node_id == 3, NodeConnection.input_node_id == 4
+        ),
+        [
+            "SEARCH node_connection USING INDEX "
+            "ix_node_connection_output_node_id_input_node_id (output_node_id=? AND input_node_id=?)"
+        ],
+    ),
+    (
+        # Sync pull since a timestamp, in (updated_at, id) order: no sort step
+        "SELECT * FROM faction WHERE updated_at > '2024-01-01' ORDER BY updated_at, id",
+        ["SEARCH faction USING INDEX ix_faction_updated_at (updated_at>?)"],
+    ),
+    (
+        "SELECT * FROM actor WHERE deleted_at > '2024-01-01'",
+        ["SEARCH actor USING INDEX ix_actor_deleted_at (deleted_at>?)"],
+    ),
+]
+
+
+@pytest.mark.parametrize("statement, expected", PLANS)
+def test_reads_use_the_access_path_indexes(db_path, statement, expected):
+    assert _plan(db_path, statement) == expected
+
+
+def _load_migration():
+    path = Path(__file__).resolve().parent.parent / "scripts" / "migrate_access_indexes.py"
+    spec = importlib.util.spec_from_file_location("migrate_access_indexes", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _drop_access_path_indexes(db_path):
+    conn = sqlite3.connect(db_path)
+    for index in ACCESS_PATH_INDEX_OBJECTS:
+        conn.execute(f'DROP INDEX "{index.name}"')
+    conn.commit()
+    conn.close()
+
+
+def _index_names(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+    finally:
+        conn.close()
+
+
+def test_migration_adds_the_indexes_and_is_idempotent(db_path):
+    expected = _index_names(db_path)
+    _drop_access_path_indexes(db_path)
+    assert "ix_actor_setting_id" not in _index_names(db_path)
+
+    migration = _load_migration()
+    assert migration.migrate(str(db_path))
+    assert migration.migrate(str(db_path))
+
+    assert _index_names(db_path) == expected
+
+
+def test_create_all_adds_the_indexes_to_existing_tables(db_path):
+    expected = _index_names(db_path)
+    _drop_access_path_indexes(db_path)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    BaseTable.metadata.create_all(engine)
+    engine.dispose()
+
+    assert _index_names(db_path) == expected
@@ -0,0 +1,144 @@
+"""Tests for the single-transaction (batched) apply path of the sync engine."""
+
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from storymaster.model.database.schema.base import (
+    Actor,
+    BaseTable,
+    Setting,
+    SyncDevice,
+    SyncLog,
+    User,
+)
+from storymaster.sync_server.models import EntityChange
+from storymaster.sync_server.sync_engine import SyncEngine
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'batch.db'}", connect_args={"check_same_thread": False}
+    )
+    BaseTable.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def device(db):
+    d = SyncDevice(device_id="test-device", device_name="Test Device", auth_token="t")
+    db.add(d)
+    db.commit()
+    return d
+
+
+@pytest.fixture
+def setting(db):
+    user = User(username="alice")
+    db.add(user)
+    db.commit()
+    s = Setting(name="World", description="x", user_id=user.id)
+    db.add(s)
+    db.commit()
+    return s
+
+
+def _create_actor_change(setting, first_name, sync_uuid=None):
+    sync_uuid = sync_uuid or str(uuid.uuid4())
+    return EntityChange(
+        entity_type="actor",
+        entity_id=1,
+        sync_uuid=sync_uuid,
+        operation="create",
+        entity_data={
+            "first_name": first_name,
+            "setting_id_sync_uuid": setting.sync_uuid,
+            "sync_uuid": sync_uuid,
+            "version": 1,
+        },
+        version=1,
+    )
+
+
+def _mixed_changes(db, setting):
+    """A push containing an accept, a conflict, a missing-FK reject and a DB error."""
+    existing = Actor(first_name="Existing", setting_id=setting.id, version=3)
+    db.add(existing)
+    db.commit()
+
+    bad_user_uuid = str(uuid.uuid4())
+    return [
+        _create_actor_change(setting, "Fresh"),
+        EntityChange(
+            entity_type="actor",
+            entity_id=2,
+            sync_uuid=existing.sync_uuid,
+            operation="update",
+            entity_data={"first_name": "Stale", "setting_id_sync_uuid": setting.sync_uuid},
+            version=1,
+        ),
+        EntityChange(
+            entity_type="actor",
+            entity_id=3,
+            sync_uuid=str(uuid.uuid4()),
+            operation="create",
+            entity_data={"first_name": "Orphan", "setting_id_sync_uuid": str(uuid.uuid4())},
+            version=1,
+        ),
+        # username is NOT NULL: fails inside the database on flush.
+        EntityChange(
+            entity_type="user",
+            entity_id=4,
+            sync_uuid=bad_user_uuid,
+            operation="create",
+            entity_data={"username": None, "sync_uuid": bad_user_uuid},
+            version=1,
+        ),
+        _create_actor_change(setting, "After-Error"),
+    ]
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_per_row_results_match_unbatched(db, device, setting, batched):
+    changes = _mixed_changes(db, setting)
+    result = SyncEngine(db).apply_changes(device, changes, batched=batched)
+
+    assert result["accepted"] == 2
+    assert result["rejected"] == 2
+    assert len(result["conflicts"]) == 1
+    assert [s.sync_uuid for s in result["accepted_states"]] == [
+        changes[0].sync_uuid,
+        changes[4].sync_uuid,
+    ]
+
+    names = set(db.execute(select(Actor.first_name)).scalars())
+    assert names == {"Existing", "Fresh", "After-Error"}
+    assert db.execute(select(User).where(User.sync_uuid == changes[3].sync_uuid)).first() is None
+
+
+def test_batched_apply_commits_once(db, device, setting):
+    changes = [_create_actor_change(setting, f"Actor {i}") for i in range(20)]
+
+    commits = []
+    # Engine-level "commit" fires for real COMMITs only, not SAVEPOINT releases.
+    event.listen(db.get_bind(), "commit", lambda _conn: commits.append(1))
+    result = SyncEngine(db).apply_changes(device, changes, batched=True)
+
+    assert result["accepted"] == 20
+    assert len(commits) == 1
+    assert len(db.execute(select(SyncLog)).scalars().all()) == 20
+
+
+def test_batched_apply_rolls_back_only_failed_row_log(db, device, setting):
+    """A failed row must not leave a SyncLog entry behind, others must."""
+    changes = _mixed_changes(db, setting)
+    SyncEngine(db).apply_changes(device, changes, batched=True)
+
+    logged = db.execute(select(SyncLog.entity_type, SyncLog.operation)).all()
+    assert sorted(logged) == [("actor", "create"), ("actor", "create")]
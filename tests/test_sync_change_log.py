@@ -0,0 +1,213 @@
+"""Tests for the sync_change_log outbox and seq-based pulls."""
+
+import importlib.util
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from storymaster.model.database.schema.base import (
+    Actor,
+    BaseTable,
+    Setting,
+    User,
+    sync_change_log,
+)
+from storymaster.sync_server.sync_engine import SyncEngine
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "change_log.db"
+
+
+@pytest.fixture
+def db(db_path):
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    BaseTable.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def setting(db):
+    user = User(username="alice")
+    db.add(user)
+    db.commit()
+    s = Setting(name="World", description="x", user_id=user.id)
+    db.add(s)
+    db.commit()
+    return s
+
+
+def _log(db):
+    stmt = select(
+        sync_change_log.c.seq, sync_change_log.c.table_name, sync_change_log.c.row_id
+    ).order_by(sync_change_log.c.seq)
+    return db.execute(stmt).all()
+
+
+def test_triggers_keep_one_entry_per_row_at_latest_seq(db, setting):
+    actor = Actor(first_name="Ann", setting_id=setting.id)
+    db.add(actor)
+    db.commit()
+    inserted_seq = _log(db)[-1].seq
+
+    actor.first_name = "Anne"
+    db.commit()
+    actor.deleted_at = datetime.now(timezone.utc)  # soft delete is an update
+    db.commit()
+
+    actor_entries = [e for e in _log(db) if e.table_name == "actor"]
+    assert len(actor_entries) == 1
+    assert actor_entries[0].row_id == actor.id
+    assert actor_entries[0].seq > inserted_seq + 1
+
+    db.delete(actor)
+    db.commit()
+    assert [e for e in _log(db) if e.table_name == "actor"] == []
+
+
+def test_seq_pull_returns_only_rows_changed_after_watermark(db, setting):
+    engine = SyncEngine(db)
+    old = Actor(first_name="Old", setting_id=setting.id)
+    db.add(old)
+    db.commit()
+    watermark = engine.current_change_seq()
+
+    new = Actor(first_name="New", setting_id=setting.id)
+    db.add(new)
+    setting.description = "edited"
+    db.commit()
+
+    changes = SyncEngine(db).get_changes_since(since_seq=watermark)
+    assert [(c.entity_type, c.sync_uuid) for c in changes] == [
+        ("setting", setting.sync_uuid),
+        ("actor", new.sync_uuid),
+    ]
+    assert SyncEngine(db).count_changes_since(since_seq=watermark) == 2
+    assert SyncEngine(db).count_changes_since(since_seq=0) == 4
+
+
+def test_seq_pull_does_not_scan_updated_at(db, setting):
+    db.add_all([Actor(first_name=f"A{i}", setting_id=setting.id) for i in range(3)])
+    db.commit()
+
+    statements = []
+    bind = db.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        engine = SyncEngine(db)
+        engine.get_changes_page(since_seq=0, limit=2)
+        engine.count_changes_since(since_seq=0)
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    assert statements
+    assert not [s for s in statements if "updated_at >" in s]
+
+
+def test_seq_pages_cover_snapshot_once(db, setting):
+    actors = [Actor(first_name=f"Actor {i}", setting_id=setting.id) for i in range(7)]
+    db.add_all(actors)
+    db.commit()
+
+    engine = SyncEngine(db)
+    until_seq = engine.current_change_seq()
+    seen = []
+    cursor = None
+    first = True
+    while True:
+        changes, cursor, has_more = SyncEngine(db).get_changes_page(
+            cursor=cursor, limit=3, since_seq=0, until_seq=until_seq if first else None
+        )
+        first = False
+        seen.extend(c.sync_uuid for c in changes)
+        if not has_more:
+            break
+        assert cursor.until_seq == until_seq
+
+        # Changed mid-pull: outside the snapshot, so left for the next pull.
+        actors[0].first_name = "Renamed"
+        db.commit()
+
+    user = db.execute(select(User)).scalar_one()
+    expected = [user.sync_uuid, setting.sync_uuid] + [a.sync_uuid for a in actors]
+    assert sorted(seen) == sorted(expected)
+    assert len(seen) == len(expected)
+
+    later = SyncEngine(db).get_changes_since(since_seq=until_seq)
+    assert [c.sync_uuid for c in later] == [actors[0].sync_uuid]
+
+
+def test_seq_cursor_required_for_seq_pull(db, setting):
+    _, cursor, _ = SyncEngine(db).get_changes_page(limit=1)
+    with pytest.raises(ValueError):
+        SyncEngine(db).get_changes_page(cursor=cursor, limit=1, since_seq=0)
+
+
+def _load_migration():
+    path = Path(__file__).resolve().parent.parent / "scripts" / "migrate_change_log.py"
+    spec = importlib.util.spec_from_file_location("migrate_change_log", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_migration_backfills_and_is_idempotent(db, db_path, setting):
+    db.add(Actor(first_name="Ann", setting_id=setting.id))
+    db.commit()
+    db.close()
+
+    # Simulate a database created before the change log existed.
+    conn = sqlite3.connect(db_path)
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_%_change_log_%'"
+    ).fetchall():
+        conn.execute(f'DROP TRIGGER "{name}"')
+    conn.execute("DROP TABLE sync_change_log")
+    conn.execute("ALTER TABLE sync_device DROP COLUMN last_sync_seq")
+    conn.commit()
+    conn.close()
+
+    migration = _load_migration()
+    assert migration.migrate(str(db_path))
+    assert migration.migrate(str(db_path))
+
+    conn = sqlite3.connect(db_path)
+    logged = conn.execute("SELECT table_name FROM sync_change_log ORDER BY seq").fetchall()
+    assert sorted(t for (t,) in logged) == ["actor", "setting", "user"]
+    conn.execute("UPDATE actor SET first_name = 'Anne'")
+    assert conn.execute(
+        "SELECT table_name FROM sync_change_log ORDER BY seq DESC LIMIT 1"
+    ).fetchone() == ("actor",)
+    assert "last_sync_seq" in [row[1] for row in conn.execute("PRAGMA table_info(sync_device)")]
+    conn.close()
+
+
+def test_create_all_on_older_database_backfills_new_log(db, db_path, setting):
+    db.close()
+    conn = sqlite3.connect(db_path)
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_%_change_log_%'"
+    ).fetchall():
+        conn.execute(f'DROP TRIGGER "{name}"')
+    conn.execute("DROP TABLE sync_change_log")
+    conn.commit()
+    conn.close()
+
+    BaseTable.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+    conn = sqlite3.connect(db_path)
+    logged = conn.execute("SELECT table_name FROM sync_change_log ORDER BY seq").fetchall()
+    assert sorted(t for (t,) in logged) == ["setting", "user"]
+    conn.close()
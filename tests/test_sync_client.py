@@ -254,3 +254,262 @@ def test_pull_does_not_bump_version(client, client_engine, server_seed):
         assert actor.version == 1
     finally:
         db.close()
+
+
+def test_pull_pages_through_large_result(
+    client, client_engine, server_session_factory, server_seed, monkeypatch
+):
+    """With a tiny server page size, pull loops pages until has_more is False."""
+    from storymaster.sync_server.config import config as server_config
+
+    db = server_session_factory()
+    try:
+        setting = db.execute(
+            select(Setting).where(Setting.sync_uuid == server_seed["setting_uuid"])
+        ).scalar_one()
+        db.add_all(Actor(first_name=f"Bulk {i}", setting_id=setting.id) for i in range(9))
+        db.commit()
+    finally:
+        db.close()
+
+    monkeypatch.setattr(server_config, "MAX_SYNC_BATCH_SIZE", 4)
+    summary = client.pull()
+    # user + setting + 10 actors, across several pages
+    assert summary["accepted"] == 12
+    assert summary["rejected"] == 0
+
+    local = _client_session(client_engine)
+    try:
+        assert len(local.execute(select(Actor)).scalars().all()) == 10
+    finally:
+        local.close()
+
+
+@pytest.fixture
+def stream_client(running_server, paired_device, client_engine):
+    config = SyncClientConfig(
+        server_url=running_server,
+        auth_token=paired_device,
+        device_id="desktop-A",
+        device_name="Desktop A",
+    )
+    return SyncClient(
+        config=config, engine=client_engine, persist=lambda _cfg: None, stream=True
+    )
+
+
+def test_stream_pull_and_push_round_trip(
+    stream_client, client_engine, server_session_factory, server_seed
+):
+    """The NDJSON transport replicates rows both ways like the JSON one."""
+    stream_client.STREAM_APPLY_BATCH_SIZE = 2  # force several apply batches
+    summary = stream_client.pull()
+    assert summary["accepted"] == 3
+    assert summary["rejected"] == 0
+    assert stream_client.config.last_pulled_at is not None
+
+    db = _client_session(client_engine)
+    try:
+        setting = db.execute(
+            select(Setting).where(Setting.sync_uuid == server_seed["setting_uuid"])
+        ).scalar_one()
+        new_actor = Actor(first_name="Streamed", setting_id=setting.id)
+        db.add(new_actor)
+        db.commit()
+        new_actor_uuid = new_actor.sync_uuid
+    finally:
+        db.close()
+
+    push_summary = stream_client.push()
+    assert push_summary["rejected"] == 0
+    assert push_summary["conflicts"] == 0
+    assert push_summary["accepted"] == push_summary["sent"]
+
+    server_db = server_session_factory()
+    try:
+        on_server = server_db.execute(
+            select(Actor).where(Actor.sync_uuid == new_actor_uuid)
+        ).scalar_one()
+        assert on_server.first_name == "Streamed"
+    finally:
+        server_db.close()
+
+    # Accepted states were mirrored, so pulling again raises no conflicts.
+    assert stream_client.pull()["conflicts"] == 0
+
+
+def test_columnar_compressed_round_trip(
+    running_server, paired_device, client_engine, server_session_factory, server_seed
+):
+    """Columnar batches survive the trip, with request bodies compressed once negotiated."""
+    config = SyncClientConfig(
+        server_url=running_server,
+        auth_token=paired_device,
+        device_id="desktop-A",
+        device_name="Desktop A",
+    )
+    client = SyncClient(
+        config=config, engine=client_engine, persist=lambda _cfg: None, columnar=True
+    )
+    assert client.pull()["accepted"] == 3
+    # The server advertised what request encodings it accepts.
+    assert "gzip" in client._server_accept_encoding
+
+    db = _client_session(client_engine)
+    try:
+        setting = db.execute(
+            select(Setting).where(Setting.sync_uuid == server_seed["setting_uuid"])
+        ).scalar_one()
+        new_actor = Actor(first_name="Packed", setting_id=setting.id)
+        db.add(new_actor)
+        db.commit()
+        new_actor_uuid = new_actor.sync_uuid
+    finally:
+        db.close()
+
+    summary = client.push()
+    assert summary["rejected"] == 0
+    assert summary["conflicts"] == 0
+
+    server_db = server_session_factory()
+    try:
+        on_server = server_db.execute(
+            select(Actor).where(Actor.sync_uuid == new_actor_uuid)
+        ).scalar_one()
+        assert on_server.first_name == "Packed"
+    finally:
+        server_db.close()
+
+
+def test_interrupted_push_resumes_without_reapplying(
+    client, client_engine, server_session_factory, server_seed, monkeypatch
+):
+    """A push whose response is lost resumes after the last acknowledged chunk."""
+    from storymaster.sync_client.client import SyncError
+
+    client.pull()
+    db = _client_session(client_engine)
+    try:
+        setting = db.execute(
+            select(Setting).where(Setting.sync_uuid == server_seed["setting_uuid"])
+        ).scalar_one()
+        db.add_all(Actor(first_name=f"Local {i}", setting_id=setting.id) for i in range(5))
+        db.commit()
+    finally:
+        db.close()
+
+    client.PUSH_CHUNK_SIZE = 2
+    real_post = client._post
+    calls = []
+
+    def flaky_post(url, **kwargs):
+        calls.append(kwargs["json"]["base_seq"])
+        response = real_post(url, **kwargs)
+        if len(calls) == 2:
+            raise SyncError("connection reset")  # server applied it; we never heard
+        return response
+
+    monkeypatch.setattr(client, "_post", flaky_post)
+    with pytest.raises(SyncError):
+        client.push()
+    assert client.config.pending_push["acked_seq"] == 1
+
+    summary = client.push()
+    # Picked up at the unacknowledged chunk, which the server recognised.
+    assert calls[2] == 2
+    assert summary["skipped"] == 2
+    assert summary["conflicts"] == 0
+    assert summary["rejected"] == 0
+    assert client.config.pending_push is None
+
+    server_db = server_session_factory()
+    try:
+        versions = server_db.execute(
+            select(Actor.version).where(Actor.first_name.like("Local %"))
+        ).scalars().all()
+        assert len(versions) == 5
+        assert set(versions) == {1}
+    finally:
+        server_db.close()
+
+    # Everything is mirrored, so nothing comes back as a conflict.
+    monkeypatch.setattr(client, "_post", real_post)
+    assert client.pull()["conflicts"] == 0
+
+
+def test_delta_push_and_pull_send_only_changed_columns(
+    running_server, paired_device, client_engine, server_session_factory, server_seed, monkeypatch
+):
+    """With deltas on, an edit after the first sync travels as just that column."""
+    config = SyncClientConfig(
+        server_url=running_server,
+        auth_token=paired_device,
+        device_id="desktop-A",
+        device_name="Desktop A",
+    )
+    client = SyncClient(
+        config=config, engine=client_engine, persist=lambda _cfg: None, deltas=True
+    )
+    client.pull()
+    client.push()
+    assert client.config.last_pushed_seq is not None
+    # Pushes select rows by updated_at, which SQLite stores to the second.
+    time.sleep(1.1)
+
+    db = _client_session(client_engine)
+    try:
+        actor = db.execute(
+            select(Actor).where(Actor.sync_uuid == server_seed["actor_uuid"])
+        ).scalar_one()
+        actor.notes = "edited on the client"
+        db.commit()
+    finally:
+        db.close()
+
+    sent = []
+    real_post = client._post
+
+    def recording_post(url, **kwargs):
+        sent.append(kwargs.get("json"))
+        return real_post(url, **kwargs)
+
+    monkeypatch.setattr(client, "_post", recording_post)
+    summary = client.push()
+    assert summary["accepted"] == summary["sent"]
+    pushed = {c["sync_uuid"]: c for c in sent[-1]["changes"]}
+    assert pushed[server_seed["actor_uuid"]]["fields"] == ["notes"]
+
+    server_db = server_session_factory()
+    try:
+        on_server = server_db.execute(
+            select(Actor).where(Actor.sync_uuid == server_seed["actor_uuid"])
+        ).scalar_one()
+        assert on_server.notes == "edited on the client"
+        assert on_server.first_name == "Server-Side"
+        on_server.title = "edited on the server"
+        server_db.commit()
+    finally:
+        server_db.close()
+
+    responses = []
+
+    def recording_pull_post(url, **kwargs):
+        response = real_post(url, **kwargs)
+        responses.append(response.json())
+        return response
+
+    monkeypatch.setattr(client, "_post", recording_pull_post)
+    assert client.pull()["conflicts"] == 0
+    pulled = {c["sync_uuid"]: c for c in responses[-1]["changes"]}
+    # Our own pushed column comes back once (the server can't tell whose
+    # edit it was); columns nobody touched stay behind.
+    assert set(pulled[server_seed["actor_uuid"]]["fields"]) == {"title", "notes"}
+
+    db = _client_session(client_engine)
+    try:
+        actor = db.execute(
+            select(Actor).where(Actor.sync_uuid == server_seed["actor_uuid"])
+        ).scalar_one()
+        assert (actor.title, actor.notes) == ("edited on the server", "edited on the client")
+    finally:
+        db.close()
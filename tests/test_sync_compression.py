@@ -0,0 +1,143 @@
+"""Tests for sync payload compression and columnar packing."""
+
+import gzip
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from storymaster.sync_server.columnar import pack_changes, unpack_changes
+from storymaster.sync_server.compression import (
+    SyncCompressionMiddleware,
+    choose_encoding,
+    compress,
+    compress_stream,
+    decompress,
+)
+from storymaster.sync_server.models import EntityChange
+
+
+@pytest.fixture
+def echo_client():
+    app = FastAPI()
+    app.add_middleware(SyncCompressionMiddleware, minimum_size=100)
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.json()
+        return {"received": body, "padding": "x" * 500}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(
+            (json.dumps({"n": i}).encode() + b"\n" for i in range(50)),
+            media_type="application/x-ndjson",
+        )
+
+    return TestClient(app)
+
+
+def test_choose_encoding_respects_preference_and_quality():
+    assert choose_encoding(None) is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, br") is None
+    assert choose_encoding("*", supported=["gzip"]) == "gzip"
+    assert choose_encoding("zstd, gzip", supported=["zstd", "gzip"]) == "zstd"
+
+
+def test_compress_round_trip():
+    payload = b'{"updated_at": "2024-01-01"}' * 100
+    packed = compress(payload, "gzip")
+    assert len(packed) < len(payload)
+    assert decompress(packed, "gzip") == payload
+    assert (
+        gzip.decompress(b"".join(compress_stream([payload[:50], payload[50:]], "gzip"))) == payload
+    )
+    with pytest.raises(ValueError):
+        compress(payload, "br")
+
+
+def test_middleware_compresses_large_json_and_skips_small(echo_client):
+    large = echo_client.post("/echo", json={"a": 1}, headers={"Accept-Encoding": "gzip"})
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.json()["received"] == {"a": 1}
+    assert "gzip" in large.headers["accept-encoding"]
+
+    small = echo_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    plain = echo_client.post("/echo", json={"a": 1}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+
+def test_middleware_compresses_streams_incrementally(echo_client):
+    r = echo_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert [json.loads(line)["n"] for line in r.text.splitlines()] == list(range(50))
+
+
+def test_middleware_decompresses_request_bodies(echo_client):
+    body = gzip.compress(json.dumps({"hello": "world"}).encode())
+    r = echo_client.post(
+        "/echo",
+        content=body,
+        headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+    )
+    assert r.status_code == 200
+    assert r.json()["received"] == {"hello": "world"}
+
+    rejected = echo_client.post("/echo", content=b"??", headers={"Content-Encoding": "br"})
+    assert rejected.status_code == 415
+
+
+def _change(entity_type, operation="update", **data):
+    sync_uuid = str(uuid.uuid4())
+    return EntityChange(
+        entity_type=entity_type,
+        entity_id=len(data),
+        sync_uuid=sync_uuid,
+        operation=operation,
+        entity_data=dict(data, sync_uuid=sync_uuid) if operation != "delete" else None,
+        version=2,
+        updated_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    )
+
+
+def test_columnar_round_trip_preserves_order_and_values():
+    changes = [
+        _change("setting", name="World", user_id_sync_uuid="u-1"),
+        _change("actor", first_name="Ann", setting_id_sync_uuid="s-1"),
+        _change("actor", first_name="Bob", setting_id_sync_uuid=None),
+        _change("actor", "delete"),
+        _change("actor", first_name="Cy", setting_id_sync_uuid="s-1", notes="extra key"),
+    ]
+    packed = pack_changes(changes)
+
+    # One group per run of same type + same keys.
+    assert [g["entity_type"] for g in packed["groups"]] == ["setting", "actor", "actor", "actor"]
+    assert packed["groups"][2]["data_keys"] is None
+    # Keys are stored once per group, not per row.
+    assert "first_name" not in json.dumps(packed["groups"][1]["rows"])
+
+    restored = unpack_changes(json.loads(json.dumps(packed)))
+    assert [c.model_dump(mode="json") for c in restored] == [
+        c.model_dump(mode="json") for c in changes
+    ]
+
+
+def test_columnar_rejects_malformed_payloads():
+    with pytest.raises(ValueError):
+        unpack_changes({"format": "something-else", "groups": []})
+    bad = pack_changes([_change("actor", first_name="Ann")])
+    bad["groups"][0]["rows"][0].pop()
+    with pytest.raises(ValueError):
+        unpack_changes(bad)
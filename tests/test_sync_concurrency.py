@@ -0,0 +1,136 @@
+"""Tests for keeping blocking DB work off the sync server's event loop."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from storymaster.model.database.schema.base import BaseTable, SyncDevice
+from storymaster.sync_server.concurrency import DBWorkerPool
+from storymaster.sync_server.sync_engine import SyncEngine
+
+
+class _Overlap:
+    """Counts how many calls are inside a blocking section at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def blocking(self, seconds=0.05):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(seconds)
+        with self._lock:
+            self.active -= 1
+
+
+def test_device_lock_serializes_one_device_only():
+    pool = DBWorkerPool(workers=4, write_concurrency=4)
+    same, different = _Overlap(), _Overlap()
+
+    async def request(key, overlap):
+        async with pool.device_lock(key):
+            await pool.run(overlap.blocking)
+
+    async def main():
+        await asyncio.gather(*(request("a", same) for _ in range(3)))
+        await asyncio.gather(*(request(key, different) for key in "abc"))
+
+    asyncio.run(main())
+    assert same.peak == 1
+    assert different.peak > 1
+
+
+def test_writes_are_limited_separately_from_reads():
+    pool = DBWorkerPool(workers=4, write_concurrency=1)
+    writes, reads = _Overlap(), _Overlap()
+
+    async def main():
+        await asyncio.gather(*(pool.run(writes.blocking, write=True) for _ in range(3)))
+        await asyncio.gather(*(pool.run(reads.blocking) for _ in range(3)))
+
+    asyncio.run(main())
+    assert writes.peak == 1
+    assert reads.peak > 1
+
+
+def test_iterate_drives_blocking_iterator_in_chunks():
+    pool = DBWorkerPool(workers=1)
+    threads = set()
+
+    def produce():
+        for i in range(7):
+            threads.add(threading.get_ident())
+            yield i
+
+    async def main():
+        return [item async for item in pool.iterate(produce(), chunk_size=3)]
+
+    assert asyncio.run(main()) == list(range(7))
+    assert threading.get_ident() not in threads
+
+
+@pytest.fixture
+def server_app(tmp_path):
+    from storymaster.sync_server.database import get_db
+    from storymaster.sync_server.main import app
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'server.db'}", connect_args={"check_same_thread": False}
+    )
+    BaseTable.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    db.add(SyncDevice(device_id="d", device_name="D", auth_token="tok"))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield app
+    app.dependency_overrides.clear()
+
+
+def test_slow_push_does_not_block_health_check(server_app, monkeypatch):
+    original = SyncEngine.apply_changes
+
+    def slow_apply(self, *args, **kwargs):
+        time.sleep(0.5)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(SyncEngine, "apply_changes", slow_apply)
+
+    async def main():
+        transport = httpx.ASGITransport(app=server_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            push = asyncio.create_task(
+                http.post(
+                    "/api/sync/push",
+                    json={"changes": []},
+                    headers={"Authorization": "Bearer tok"},
+                )
+            )
+            await asyncio.sleep(0.1)  # let the push reach the worker pool
+            started = time.perf_counter()
+            health = await http.get("/")
+            health_time = time.perf_counter() - started
+            assert not push.done()
+            return health, health_time, await push
+
+    health, health_time, push = asyncio.run(main())
+    assert health.status_code == 200
+    assert health_time < 0.3
+    assert push.status_code == 200
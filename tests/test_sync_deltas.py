@@ -0,0 +1,178 @@
+"""Tests for field-level delta updates and column-level merges."""
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from storymaster.model.database.schema.base import (
+    Actor,
+    BaseTable,
+    Setting,
+    SyncDevice,
+    User,
+)
+from storymaster.sync_server.columnar import pack_changes, unpack_changes
+from storymaster.sync_server.models import EntityChange
+from storymaster.sync_server.sync_engine import SyncEngine
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'deltas.db'}", connect_args={"check_same_thread": False}
+    )
+    BaseTable.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def device(db):
+    d = SyncDevice(device_id="test-device", device_name="Test Device", auth_token="t")
+    db.add(d)
+    db.commit()
+    return d
+
+
+@pytest.fixture
+def setting(db):
+    user = User(username="alice")
+    db.add(user)
+    db.commit()
+    s = Setting(name="World", description="x", user_id=user.id)
+    db.add(s)
+    db.commit()
+    return s
+
+
+@pytest.fixture
+def actor(db, setting):
+    a = Actor(first_name="Ann", last_name="Lee", appearance="tall " * 200, setting_id=setting.id)
+    db.add(a)
+    db.commit()
+    return a
+
+
+def _served_watermark(db):
+    """Serve everything once (as a full pull would) and return the watermark."""
+    engine = SyncEngine(db)
+    engine.make_deltas(engine.get_changes_since(since_seq=0), 0)
+    return engine.current_change_seq()
+
+
+def _actor_changes(db, since_seq):
+    engine = SyncEngine(db)
+    changes = engine.make_deltas(engine.get_changes_since(since_seq=since_seq), since_seq)
+    return [c for c in changes if c.entity_type == "actor"]
+
+
+def test_update_sends_only_changed_columns(db, actor):
+    watermark = _served_watermark(db)
+    actor.first_name = "Anne"
+    db.commit()
+
+    [change] = _actor_changes(db, watermark)
+    assert change.fields == ["first_name"]
+    assert change.data == {"first_name": "Anne"}
+    assert change.version == actor.version
+
+
+def test_fk_column_delta_carries_sync_uuid(db, actor, setting):
+    other = Setting(name="Other", description="y", user_id=setting.user_id)
+    db.add(other)
+    db.commit()
+    watermark = _served_watermark(db)
+    actor.setting_id = other.id
+    db.commit()
+
+    [change] = _actor_changes(db, watermark)
+    assert change.fields == ["setting_id"]
+    assert change.data["setting_id_sync_uuid"] == other.sync_uuid
+
+
+def test_version_only_change_sends_no_columns(db, actor):
+    watermark = _served_watermark(db)
+    actor.version += 1
+    db.commit()
+
+    [change] = _actor_changes(db, watermark)
+    assert change.fields == []
+    assert change.data == {}
+
+
+def test_receiver_behind_watermark_gets_full_row(db, actor):
+    _served_watermark(db)
+    actor.first_name = "Anne"
+    db.commit()
+
+    [change] = _actor_changes(db, 0)
+    assert change.fields is None
+    assert change.data["appearance"] == actor.appearance
+
+
+def _delta(actor, version, **values):
+    return EntityChange(
+        entity_type="actor",
+        entity_id=actor.id,
+        sync_uuid=actor.sync_uuid,
+        operation="update",
+        entity_data=values,
+        version=version,
+        fields=list(values),
+    )
+
+
+def test_disjoint_deltas_merge_and_overlapping_conflict(db, device, actor):
+    _served_watermark(db)
+    base = actor.version
+
+    first = SyncEngine(db).apply_changes(device, [_delta(actor, base, first_name="Anne")])
+    assert first["accepted"] == 1
+
+    # Made against the same base version, but touches a different column.
+    second = SyncEngine(db).apply_changes(device, [_delta(actor, base, last_name="Li")])
+    assert second["accepted"] == 1
+    assert second["conflicts"] == []
+
+    db.refresh(actor)
+    assert (actor.first_name, actor.last_name) == ("Anne", "Li")
+    assert actor.version == base + 2
+
+    third = SyncEngine(db).apply_changes(device, [_delta(actor, base, first_name="Annie")])
+    assert third["accepted"] == 0
+    assert len(third["conflicts"]) == 1
+
+
+def test_column_edited_locally_without_version_blocks_merge(db, device, actor):
+    _served_watermark(db)
+    base = actor.version
+    SyncEngine(db).apply_changes(device, [_delta(actor, base, first_name="Anne")])
+    actor.last_name = "Local edit"  # desktop UI edit: no version bump
+    db.commit()
+
+    result = SyncEngine(db).apply_changes(device, [_delta(actor, base, last_name="Li")])
+    assert len(result["conflicts"]) == 1
+
+
+def test_delta_for_missing_row_is_rejected(db, device, actor):
+    change = _delta(actor, 1, first_name="Ghost")
+    change.sync_uuid = "00000000-0000-0000-0000-000000000000"
+    assert SyncEngine(db).apply_changes(device, [change])["rejected"] == 1
+
+
+def test_pulled_delta_mirrors_version(db, actor):
+    change = _delta(actor, actor.version, first_name="Anne")
+    change.version = actor.version
+    SyncEngine(db).apply_changes(None, [change], bump_versions=False)
+    db.refresh(actor)
+    assert actor.first_name == "Anne"
+    assert actor.appearance.startswith("tall")
+
+
+def test_columnar_round_trip_keeps_fields(actor):
+    changes = [_delta(actor, 1, first_name="Anne"), _delta(actor, 1, last_name="Li")]
+    unpacked = unpack_changes(pack_changes(changes))
+    assert [c.fields for c in unpacked] == [["first_name"], ["last_name"]]
+    assert [c.data for c in unpacked] == [{"first_name": "Anne"}, {"last_name": "Li"}]
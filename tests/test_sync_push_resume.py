@@ -0,0 +1,139 @@
+"""Tests for resumable (batch_id / seq) pushes."""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from storymaster.model.database.schema.base import (
+    Actor,
+    BaseTable,
+    Setting,
+    SyncDevice,
+    SyncLog,
+    SyncPushReceipt,
+    User,
+)
+from storymaster.sync_server.models import EntityChange
+from storymaster.sync_server.sync_engine import SyncEngine
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'resume.db'}", connect_args={"check_same_thread": False}
+    )
+    BaseTable.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def device(db):
+    d = SyncDevice(device_id="test-device", device_name="Test Device", auth_token="t")
+    db.add(d)
+    db.commit()
+    return d
+
+
+@pytest.fixture
+def setting(db):
+    user = User(username="alice")
+    db.add(user)
+    db.commit()
+    s = Setting(name="World", description="x", user_id=user.id)
+    db.add(s)
+    db.commit()
+    return s
+
+
+def _actor_change(setting, first_name, sync_uuid=None, version=1, updated_at=None):
+    sync_uuid = sync_uuid or str(uuid.uuid4())
+    updated_at = updated_at or datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return EntityChange(
+        entity_type="actor",
+        entity_id=1,
+        sync_uuid=sync_uuid,
+        operation="create",
+        entity_data={
+            "first_name": first_name,
+            "setting_id_sync_uuid": setting.sync_uuid,
+            "sync_uuid": sync_uuid,
+            "version": version,
+        },
+        version=version,
+        updated_at=updated_at,
+    )
+
+
+def _log_count(db):
+    return db.execute(select(func.count()).select_from(SyncLog)).scalar_one()
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_resent_batch_is_skipped_with_recorded_states(db, device, setting, batched):
+    changes = [_actor_change(setting, f"Actor {i}") for i in range(3)]
+    first = SyncEngine(db).apply_changes(device, changes, batched=batched, batch_id="b1")
+    assert first["accepted"] == 3
+    assert first["skipped"] == 0
+    logged = _log_count(db)
+
+    # The response was lost: the client resends the same rows at the same seqs.
+    again = SyncEngine(db).apply_changes(device, changes, batched=batched, batch_id="b1")
+    assert again["accepted"] == 3
+    assert again["skipped"] == 3
+    assert _log_count(db) == logged
+    assert [(s.sync_uuid, s.version) for s in again["accepted_states"]] == [
+        (s.sync_uuid, s.version) for s in first["accepted_states"]
+    ]
+    assert db.execute(select(func.count()).select_from(Actor)).scalar_one() == 3
+
+
+def test_resend_of_mirrored_state_is_skipped(db, device, setting):
+    change = _actor_change(setting, "Ann")
+    first = SyncEngine(db).apply_changes(device, [change], batch_id="b1")
+    state = first["accepted_states"][0]
+
+    # The client got the response and mirrored the server's state.
+    mirrored = _actor_change(
+        setting, "Ann", change.sync_uuid, version=state.version, updated_at=state.updated_at
+    )
+    again = SyncEngine(db).apply_changes(device, [mirrored], batch_id="b1")
+    assert again["skipped"] == 1
+    assert again["conflicts"] == []
+
+
+def test_local_edit_since_receipt_is_applied(db, device, setting):
+    change = _actor_change(setting, "Ann")
+    SyncEngine(db).apply_changes(device, [change], batch_id="b1")
+
+    edited = _actor_change(
+        setting,
+        "Anne",
+        change.sync_uuid,
+        updated_at=datetime(2024, 6, 1, tzinfo=timezone.utc),
+    )
+    again = SyncEngine(db).apply_changes(device, [edited], batch_id="b1")
+    assert again["skipped"] == 0
+    assert again["accepted"] == 1
+    actor = db.execute(select(Actor).where(Actor.sync_uuid == change.sync_uuid)).scalar_one()
+    db.refresh(actor)
+    assert actor.first_name == "Anne"
+
+
+def test_new_batch_drops_older_receipts(db, device, setting):
+    change = _actor_change(setting, "Ann")
+    SyncEngine(db).apply_changes(device, [change], batch_id="b1")
+    SyncEngine(db).apply_changes(device, [_actor_change(setting, "Bob")], batch_id="b2")
+
+    batches = db.execute(select(SyncPushReceipt.batch_id)).scalars().all()
+    assert batches == ["b2"]
+
+
+def test_no_batch_id_records_nothing(db, device, setting):
+    SyncEngine(db).apply_changes(device, [_actor_change(setting, "Ann")])
+    assert db.execute(select(func.count()).select_from(SyncPushReceipt)).scalar_one() == 0
@@ -1,6 +1,7 @@
 """Tests for sync_uuid-based upsert and FK translation in the sync engine."""
 
 import uuid
+from datetime import datetime, timezone
 
 import pytest
 from sqlalchemy import create_engine, select
@@ -257,3 +258,126 @@ def test_delete_by_sync_uuid(db, device, setting):
     assert result["accepted"] == 1
     db.refresh(actor)
     assert actor.deleted_at is not None
+
+
+def _count_selects_on(db, table_name):
+    """Return a list that collects every SELECT against `table_name`."""
+    from sqlalchemy import event
+
+    seen = []
+
+    def _before(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and (
+            f"FROM {table_name} " in statement + " "
+        ):
+            seen.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _before)
+    return seen
+
+
+def test_pull_resolves_fk_uuids_in_bulk(db, setting):
+    """FK sync_uuids for a batch are resolved without one SELECT per row."""
+    db.add_all(Actor(first_name=f"A{i}", setting_id=setting.id) for i in range(30))
+    db.commit()
+    setting_uuid = setting.sync_uuid
+
+    setting_selects = _count_selects_on(db, "setting")
+    changes = SyncEngine(db).get_changes_since(
+        since_timestamp=None, entity_types=["actor"]
+    )
+    assert len(changes) == 30
+    assert all(c.data["setting_id_sync_uuid"] == setting_uuid for c in changes)
+    assert len(setting_selects) == 1
+
+
+def test_pull_reuses_parent_identities_from_same_request(db, setting):
+    """Parents pulled earlier in the request satisfy their children's FK lookups."""
+    db.add_all(Actor(first_name=f"A{i}", setting_id=setting.id) for i in range(5))
+    db.commit()
+
+    setting_selects = _count_selects_on(db, "setting")
+    SyncEngine(db).get_changes_since(since_timestamp=None, entity_types=["setting", "actor"])
+    # Only the setting table's own row scan; no FK lookups back into it.
+    assert len(setting_selects) == 1
+
+
+def test_push_resolves_fk_uuids_in_bulk_and_within_batch(db, device, setting):
+    """Incoming FK uuids resolve via one IN query, including rows created earlier in the batch."""
+    new_setting_uuid = str(uuid.uuid4())
+    user_uuid = setting.user.sync_uuid
+    changes = [
+        EntityChange(
+            entity_type="setting",
+            entity_id=1,
+            sync_uuid=new_setting_uuid,
+            operation="create",
+            entity_data={"name": "Pushed World", "user_id_sync_uuid": user_uuid},
+            version=1,
+        )
+    ]
+    for i in range(10):
+        target = setting.sync_uuid if i % 2 else new_setting_uuid
+        actor_uuid = str(uuid.uuid4())
+        changes.append(
+            EntityChange(
+                entity_type="actor",
+                entity_id=i + 2,
+                sync_uuid=actor_uuid,
+                operation="create",
+                entity_data={"first_name": f"P{i}", "setting_id_sync_uuid": target},
+                version=1,
+            )
+        )
+
+    setting_fk_selects = _count_selects_on(db, "setting")
+    result = SyncEngine(db).apply_changes(device, changes, batched=True)
+    assert result["accepted"] == 11
+    assert result["rejected"] == 0
+    # One bulk prefetch for all referenced setting uuids.
+    assert len([s for s in setting_fk_selects if "sync_uuid IN" in s]) == 1
+
+    new_setting_id = db.execute(
+        select(Setting.id).where(Setting.sync_uuid == new_setting_uuid)
+    ).scalar_one()
+    pushed = db.execute(select(Actor).where(Actor.first_name.like("P%"))).scalars().all()
+    assert {a.setting_id for a in pushed} == {setting.id, new_setting_id}
+
+
+def test_paged_pull_covers_all_changes_once(db, setting):
+    """Walking get_changes_page with a small limit yields exactly get_changes_since."""
+    # Mix server-default timestamps with Python-set ones sharing a second, so
+    # the cursor has to tie-break on id across both storage formats.
+    db.add_all(Actor(first_name=f"A{i}", setting_id=setting.id) for i in range(7))
+    db.commit()
+    stamp = datetime.now(timezone.utc).replace(microsecond=0)
+    db.add_all(
+        Actor(first_name=f"B{i}", setting_id=setting.id, updated_at=stamp) for i in range(4)
+    )
+    db.commit()
+
+    engine = SyncEngine(db)
+    expected = [c.sync_uuid for c in engine.get_changes_since(None, ["user", "setting", "actor"])]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        changes, cursor, has_more = engine.get_changes_page(
+            None, ["user", "setting", "actor"], cursor=cursor, limit=3
+        )
+        pages += 1
+        assert len(changes) <= 3
+        seen.extend(c.sync_uuid for c in changes)
+        if not has_more:
+            assert cursor is None
+            break
+    assert seen == expected
+    assert pages == -(-len(expected) // 3)
+
+
+def test_paged_pull_rejects_cursor_for_unsynced_type(db, setting):
+    from storymaster.sync_server.models import SyncCursor
+
+    cursor = SyncCursor(updated_at=datetime.now(timezone.utc), entity_type="actor", id=1)
+    with pytest.raises(ValueError):
+        SyncEngine(db).get_changes_page(None, ["setting"], cursor=cursor, limit=10)
+
@@ -2,6 +2,8 @@
 Comprehensive tests for the spell check system
 """
 
+import time
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from tests.test_qt_utils import (
@@ -22,6 +24,7 @@ pytestmark = pytest.mark.skipif(
 # Conditionally import Qt-dependent modules
 if QT_AVAILABLE:
     from storymaster.view.common.spellcheck import (
+        BackgroundSpellChecker,
         SpellChecker,
         SpellCheckTextEdit,
         SpellCheckLineEdit,
@@ -34,6 +37,7 @@ else:
     # Mock for headless environments
     from unittest.mock import MagicMock
 
+    BackgroundSpellChecker = MagicMock()
     SpellChecker = MagicMock()
     SpellCheckTextEdit = MagicMock()
     SpellCheckLineEdit = MagicMock()
@@ -144,6 +148,72 @@ class TestSpellChecker:
         assert len(suggestions) <= 10
 
 
+class TestSpellCheckCache:
+    """Test verdict caching and batch checks"""
+
+    @pytest.fixture
+    def checker(self):
+        checker = SpellChecker(cache_size=3)
+        checker.backend = BasicWordList()
+        checker.save_custom_dictionary = Mock()
+        return checker
+
+    def test_backend_is_asked_once_per_word(self, checker):
+        with patch.object(checker.backend, "contains", return_value=False) as contains:
+            assert checker.is_word_correct("zorp") is False
+            assert checker.is_word_correct("zorp") is False
+
+        contains.assert_called_once_with("zorp")
+
+    def test_cache_is_bounded(self, checker):
+        for word in ["alpha", "beta", "gamma", "delta"]:
+            checker.is_word_correct(word)
+
+        assert list(checker._verdicts) == ["beta", "gamma", "delta"]
+
+    def test_dictionary_changes_invalidate_verdicts(self, checker):
+        assert checker.is_word_correct("zorp") is False
+        generation = checker.generation
+
+        checker.add_word("zorp")
+        assert checker.is_word_correct("zorp") is True
+        checker.remove_word("zorp")
+        assert checker.is_word_correct("zorp") is False
+        checker.ignore_word("Zorp")
+        assert checker.is_word_correct("zorp") is True
+        assert checker.generation == generation + 3
+
+    def test_misspelled_spans_check_each_word_once(self, checker):
+        text = "the zorp and the zorp story"
+        with patch.object(checker, "_check_word", wraps=checker._check_word) as check:
+            spans = checker.misspelled_spans(text)
+
+        assert spans == [(4, 8), (17, 21)]
+        assert sorted(call.args[0] for call in check.call_args_list) == [
+            "and",
+            "story",
+            "the",
+            "zorp",
+        ]
+
+    def test_background_checker_publishes_spans(self, qapp, checker):
+        worker = BackgroundSpellChecker(checker)
+        results = []
+        worker.spans_ready.connect(lambda key, spans, generation: results.append((key, spans)))
+        try:
+            worker.request("block", "the zorp")
+            worker.request("block", "the zorp")  # already in flight
+            for _ in range(200):
+                QApplication.processEvents()
+                if results:
+                    break
+                time.sleep(0.01)
+        finally:
+            worker.shutdown()
+
+        assert results == [("block", [(4, 8)])]
+
+
 class TestBasicWordList:
     """Test the BasicWordList fallback"""
 
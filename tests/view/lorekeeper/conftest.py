@@ -0,0 +1,33 @@
+"""Shared fixtures for the Lorekeeper view tests."""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from storymaster.model.database.schema.base import Actor, BaseTable, Faction, Setting, User
+from storymaster.view.lorekeeper.lorekeeper_model_adapter import LorekeeperModelAdapter
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'lore.db'}")
+    BaseTable.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(username="alice")
+        session.add(user)
+        session.flush()
+        for name in ("World", "Other"):
+            session.add(Setting(name=name, user_id=user.id))
+        session.flush()
+        session.add_all(
+            Actor(first_name=f"Actor{n}", last_name="Lee", appearance="tall " * 100, setting_id=1)
+            for n in range(25)
+        )
+        session.add(Actor(title="Lord", first_name="Ann", setting_id=1))
+        session.add(Actor(setting_id=1))
+        session.add(Actor(first_name="Elsewhere", setting_id=2))
+        session.add(Faction(name="100% Guild", description="Traders of the coast", setting_id=1))
+        session.commit()
+    return LorekeeperModelAdapter(SimpleNamespace(engine=engine), setting_id=1)
@@ -0,0 +1,83 @@
+"""Tests for the lazily paged Lorekeeper entity list."""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from storymaster.model.database.schema.base import Background
+from storymaster.view.lorekeeper.lorekeeper_model_adapter import EntityRow
+from tests.test_qt_utils import QT_AVAILABLE
+
+if QT_AVAILABLE:
+    from storymaster.view.lorekeeper.entity_list_model import EntityListModel
+
+
+def test_rows_are_projected_and_keyset_paged(adapter):
+    first = adapter.get_entity_rows("actor", limit=10)
+    rest = adapter.get_entity_rows("actor", after_id=first[-1].id)
+
+    assert [row.id for row in first + rest] == list(range(1, 28))
+    assert first[0] == EntityRow(1, "Actor0 Lee", "actor")
+    assert rest[-2:] == [EntityRow(26, "Lord Ann", "actor"), EntityRow(27, "ID: 27", "actor")]
+
+
+def test_search_matches_word_prefixes_in_names_and_text(adapter):
+    assert [row.name for row in adapter.get_entity_rows("actor", "ANN")] == ["Lord Ann"]
+    assert [row.name for row in adapter.get_entity_rows("faction", "coa")] == ["100% Guild"]
+    assert [row.name for row in adapter.get_entity_rows("faction", "100 gui")] == ["100% Guild"]
+    assert adapter.get_entity_rows("faction", "uild") == []
+    assert adapter.get_entity_rows("faction", "guild AND") == []
+
+
+def test_tables_outside_the_lore_index_match_substrings_literally(adapter):
+    with Session(adapter.model.engine) as session:
+        session.add(Background(name="50% Noble", setting_id=1))
+        session.commit()
+
+    assert [row.name for row in adapter.get_entity_rows("background", "0%")] == ["50% Noble"]
+    assert adapter.get_entity_rows("background", "5_") == []
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="PySide6 not available in headless environment")
+def test_model_fetches_pages_on_demand(qapp, adapter):
+    model = EntityListModel(page_size=10)
+    model.set_source(adapter, "actor")
+    assert model.rowCount() == 10
+    assert model.canFetchMore()
+    assert model.data(model.index(0)).endswith(" Actor0 Lee")
+
+    assert model.fetch_until(26) == 25
+    assert model.rowCount() == 27
+    model.fetchMore()
+    assert not model.canFetchMore()
+
+    model.set_search_text("actor1")  # Actor1, Actor10..Actor19
+    model.fetchMore()
+    assert [model.entity_id(row) for row in range(model.rowCount())] == [2, *range(11, 21)]
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="PySide6 not available in headless environment")
+def test_saves_and_deletes_update_single_rows(qapp, adapter):
+    model = EntityListModel(page_size=10)
+    model.set_source(adapter, "actor")
+    events = []
+    model.modelReset.connect(lambda: events.append("reset"))
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("insert", first)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(("remove", first)))
+    model.dataChanged.connect(lambda top, bottom: events.append(("change", top.row())))
+
+    actor = adapter.get_entity_by_id("actor", 3)
+    actor.first_name = "Renamed"
+    adapter.update_entity(actor)
+    model.refresh_entity(3)
+    assert model.data(model.index(2)).endswith("Renamed Lee")
+
+    adapter.delete_entity(actor)
+    model.refresh_entity(3)
+    assert model.row_of(3) is None
+
+    # Beyond the loaded page: picked up by a later fetch instead
+    new = adapter.create_entity("actor", first_name="Newcomer")
+    model.refresh_entity(new.id)
+    assert model.row_of(new.id) is None
+
+    assert events == [("change", 2), ("remove", 2)]
@@ -0,0 +1,52 @@
+"""Tests for relationship loading on the Lorekeeper entity detail page."""
+
+import pytest
+
+from tests.test_qt_utils import QT_AVAILABLE
+
+if QT_AVAILABLE:
+    from storymaster.view.lorekeeper.entity_page import EntityDetailPage
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="PySide6 not available in headless environment")
+def test_collapsed_relationship_panels_load_when_expanded(qapp, adapter, monkeypatch):
+    faction = adapter.get_entity_by_id("faction", 1)
+    actor = adapter.get_entity_by_id("actor", 1)
+    assert adapter.add_relationship(faction, "faction_members", actor)
+
+    calls = []
+    get_all_relationships = adapter.get_all_relationships
+    monkeypatch.setattr(
+        adapter,
+        "get_all_relationships",
+        lambda entity, names: calls.append(names) or get_all_relationships(entity, names),
+    )
+
+    page = EntityDetailPage("actor", adapter)
+    page.set_entity(actor)
+
+    widgets = page.relationship_widgets
+    assert calls == [["actor_a_on_b_relations", "faction_members", "residents"]]
+    assert [entity.name for entity in widgets["faction_members"].related_entities] == ["100% Guild"]
+    assert not widgets["actor_to_skills"].is_expanded()
+    assert not widgets["actor_to_skills"].loaded
+
+    widgets["actor_to_skills"].setChecked(True)
+    assert calls[-1] == ["actor_to_skills"]
+    assert widgets["actor_to_skills"].loaded
+
+    # Collapsing and expanding again doesn't reload
+    widgets["actor_to_skills"].setChecked(False)
+    widgets["actor_to_skills"].setChecked(True)
+    assert len(calls) == 2
+
+    # A new entity refreshes every expanded panel in one call
+    page.set_entity(adapter.get_entity_by_id("actor", 2))
+    assert calls[-1] == [
+        "actor_a_on_b_relations",
+        "faction_members",
+        "residents",
+        "actor_to_skills",
+    ]
+    assert widgets["faction_members"].related_entities == []
+    assert not widgets["actor_to_race"].loaded
@@ -0,0 +1,103 @@
+"""Tests for the Lorekeeper model adapter's row and relationship queries."""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from storymaster.model.database.schema.base import Actor
+from storymaster.view.lorekeeper import lorekeeper_model_adapter
+from storymaster.view.lorekeeper.lorekeeper_model_adapter import EntityRow
+
+
+def test_dropdown_options_come_from_rows(adapter):
+    actor_options = adapter.get_foreign_key_options("", "actor_id")
+
+    assert actor_options[0] == (1, "Actor0 Lee")
+    assert (26, "Lord Ann") in actor_options
+    assert "Elsewhere" not in {name for _, name in actor_options}
+    assert adapter.get_foreign_key_options("", "faction_id") == [(1, "100% Guild")]
+    assert adapter.get_foreign_key_options("", "unknown_id") == []
+
+
+def test_search_returns_rows(adapter):
+    assert adapter.search_entities("faction", "traders") == [EntityRow(1, "100% Guild", "faction")]
+
+
+def test_search_without_words_matches_substrings(adapter):
+    assert adapter.search_entities("actor", "!") == []
+    assert adapter.search_entities("actor", "-") == []
+    assert adapter.search_entities("faction", "%") == [EntityRow(1, "100% Guild", "faction")]
+
+
+def test_relationships_need_only_the_entity_ids(adapter):
+    actor = adapter.get_entity_by_id("actor", 2)
+    faction = adapter.get_entity_by_id("faction", 1)
+    actor.appearance = "unsaved edit"
+
+    assert adapter.add_relationship(faction, "faction_members", actor)
+
+    members = adapter.get_relationship_entities(faction, "faction_members")
+    assert [member.first_name for member in members] == ["Actor1"]
+    assert adapter.get_entity_by_id("actor", 2).appearance == "tall " * 100
+
+    assert adapter.delete_entity(actor)
+    assert adapter.get_entity_rows("actor", entity_ids=[2]) == []
+
+
+def test_lore_search_spans_tables(adapter):
+    assert adapter.search_lore("lo") == [EntityRow(26, "Ann", "actor")]
+    assert adapter.search_lore("coast guild", limit=5) == [EntityRow(1, "100% Guild", "faction")]
+    assert adapter.search_lore("lord", names_only=True) == []
+    assert [row.id for row in adapter.search_lore("actor1", table_names=["actor"])] == [
+        2,
+        *range(11, 21),
+    ]
+
+
+def _relate(adapter, entity, relationship_name, *related):
+    for other in related:
+        assert adapter.add_relationship(entity, relationship_name, other)
+
+
+def test_all_relationships_load_in_one_session(adapter, monkeypatch):
+    actor = adapter.get_entity_by_id("actor", 1)
+    faction = adapter.get_entity_by_id("faction", 1)
+    _relate(adapter, faction, "faction_members", actor)
+    _relate(adapter, actor, "actor_a_on_b_relations", *(Actor(id=n) for n in (3, 4)))
+    _relate(adapter, adapter.get_entity_by_id("actor", 5), "actor_a_on_b_relations", actor)
+
+    statements = []
+    event.listen(
+        adapter.model.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    sessions = []
+    monkeypatch.setattr(
+        lorekeeper_model_adapter,
+        "Session",
+        lambda *args: sessions.append(args) or Session(*args),
+    )
+
+    related = adapter.get_all_relationships(actor)
+
+    assert len(sessions) == 1
+    assert [entity.id for entity in related["actor_a_on_b_relations"]] == [3, 4, 5]
+    assert [entity.name for entity in related["faction_members"]] == ["100% Guild"]
+    assert related["residents"] == []
+    # One query per link table, then one IN query per related type
+    assert len(statements) == len(related) + 2
+
+
+def test_relationship_subsets_and_unknown_names(adapter):
+    faction = adapter.get_entity_by_id("faction", 1)
+    _relate(adapter, faction, "faction_members", *(Actor(id=n) for n in (9, 2)))
+
+    related = adapter.get_all_relationships(faction, ["faction_members", "arc_to_actor"])
+
+    assert list(related) == ["faction_members", "arc_to_actor"]
+    assert [actor.first_name for actor in related["faction_members"]] == ["Actor8", "Actor1"]
+    assert related["arc_to_actor"] == []
+    assert [
+        actor.id for actor in adapter.get_relationship_entities(faction, "faction_members")
+    ] == [9, 2]
+    assert adapter.get_relationship_entities(faction, "actor_to_skills") == []
@@ -0,0 +1,20 @@
+"""Shared fixtures for the Storyweaver view tests."""
+
+import pytest
+
+from tests.test_qt_utils import QT_AVAILABLE
+
+if QT_AVAILABLE:
+    from PySide6.QtWidgets import QApplication
+
+    from storymaster.view.storyweaver.text_editor import EntityTextEditor
+
+
+@pytest.fixture(autouse=True)
+def clean_up_editors():
+    """Stop the background work of each test's editors, so none is still running at exit"""
+    yield
+    if QT_AVAILABLE and QApplication.instance() is not None:
+        for widget in QApplication.topLevelWidgets():
+            if isinstance(widget, EntityTextEditor):
+                widget.cleanup()
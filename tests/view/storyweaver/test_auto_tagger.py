@@ -0,0 +1,100 @@
+"""Tests for the Storyweaver auto-tag engine."""
+
+import pytest
+
+from storymaster.view.storyweaver.auto_tagger import (
+    entity_link,
+    find_link_spans,
+    find_tag_candidates,
+    tag_text,
+    utf16_offsets,
+)
+from storymaster.view.storyweaver.entity_matcher import EntityMatcher
+from tests.test_qt_utils import QT_AVAILABLE
+
+if QT_AVAILABLE:
+    from storymaster.view.storyweaver.text_editor import EntityTextEditor
+
+JOHN = {"id": "1", "name": "John", "type": "actor"}
+JOHN_SMITH = {"id": "2", "name": "John Smith", "type": "actor"}
+RIVERTOWN = {"id": "3", "name": "Rivertown", "type": "location", "aliases": ["the Town"]}
+MATCHER = EntityMatcher.from_entities([JOHN, JOHN_SMITH, RIVERTOWN])
+
+
+def _replacements(text):
+    return [
+        (c.start, c.end, entity_link(c.text, c.entities[0]["id"]))
+        for c in find_tag_candidates(text, MATCHER)
+    ]
+
+
+def test_longest_mention_wins():
+    candidates = find_tag_candidates("John Smith met John.", MATCHER)
+
+    assert [(c.text, c.entities) for c in candidates] == [
+        ("John Smith", (JOHN_SMITH,)),
+        ("John", (JOHN,)),
+    ]
+
+
+def test_existing_links_are_skipped_exactly():
+    text = "[[John Smith|2]] saw John in [[the town|3]], then Rivertown[[x|y]]."
+
+    assert find_link_spans(text) == [(0, 16), (29, 43), (59, 66)]
+    assert [c.text for c in find_tag_candidates(text, MATCHER)] == ["John", "Rivertown"]
+
+
+def test_link_does_not_hide_a_shorter_mention_beside_it():
+    # "John Smith" overlaps the link, but "John" before it is still a mention
+    text = "John [[Smith|9]]"
+
+    assert [(c.start, c.end) for c in find_tag_candidates(text, MATCHER)] == [(0, 4)]
+
+
+def test_tag_text_preserves_case_and_aliases():
+    text = "THE TOWN slept; john woke in Rivertown."
+
+    assert tag_text(text, _replacements(text)) == (
+        "[[THE TOWN|3]] slept; [[john|1]] woke in [[Rivertown|3]]."
+    )
+
+
+def test_tagging_twice_changes_nothing():
+    tagged = tag_text("John Smith and John", _replacements("John Smith and John"))
+
+    assert _replacements(tagged) == []
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="PySide6 not available in headless environment")
+def test_editor_applies_tags_as_one_undo_step(qapp):
+    text = "John Smith met John.\nRivertown was quiet."
+    editor = EntityTextEditor()
+    editor.set_text(text)
+    editor.document().setUndoRedoEnabled(True)
+
+    editor.apply_replacements(_replacements(text))
+
+    assert editor.get_text() == tag_text(text, _replacements(text))
+    editor.document().undo()
+    assert editor.get_text() == text
+
+
+def test_known_link_spans_are_used_as_given():
+    text = "John met John."
+
+    assert [c.start for c in find_tag_candidates(text, MATCHER, links=[(0, 4)])] == [9]
+
+
+def test_utf16_offsets_count_surrogate_pairs():
+    assert utf16_offsets("😀 ab😀c", [0, 1, 2, 5, 6]) == {0: 0, 1: 2, 2: 3, 5: 7, 6: 8}
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="PySide6 not available in headless environment")
+def test_editor_tags_after_characters_outside_the_bmp(qapp):
+    text = "😀 John Smith met 🐉 John in Rivertown."
+    editor = EntityTextEditor()
+    editor.set_text(text)
+
+    editor.apply_replacements(_replacements(text))
+
+    assert editor.get_text() == ("😀 [[John Smith|2]] met 🐉 [[John|1]] in [[Rivertown|3]].")
@@ -0,0 +1,87 @@
+"""Tests for incremental Storyweaver document statistics."""
+
+import random
+
+import pytest
+
+from tests.test_qt_utils import QT_AVAILABLE
+
+pytestmark = pytest.mark.skipif(
+    not QT_AVAILABLE, reason="PySide6 not available in headless environment"
+)
+
+if QT_AVAILABLE:
+    from PySide6.QtGui import QTextCursor, QTextDocument
+
+    from storymaster.view.storyweaver.document_stats import DocumentStats
+    from storymaster.view.storyweaver.heading_navigator import HeadingNavigator
+
+
+def _document(text):
+    document = QTextDocument()
+    # contentsChange is only emitted once the document has a layout (as in an editor)
+    document.documentLayout()
+    document.setPlainText(text)
+    return document
+
+
+def _full_scan(text):
+    headings = HeadingNavigator._extract_headings(None, text)
+    return len(text.split()), headings
+
+
+def test_initial_counts(qapp):
+    document = _document("# Part One\nThe quick fox.\n\n## Chapter 1\nIt ran.")
+    stats = DocumentStats(document)
+
+    assert stats.word_count == 11
+    assert [(h["level"], h["text"], h["line_number"]) for h in stats.headings()] == [
+        (1, "Part One", 0),
+        (2, "Chapter 1", 3),
+    ]
+    assert not stats.is_dirty
+
+
+def test_edits_mark_dirty_and_update_counts(qapp):
+    document = _document("one two\nthree")
+    stats = DocumentStats(document)
+
+    cursor = QTextCursor(document)
+    cursor.setPosition(3)
+    cursor.insertText(" and a half\n# New heading\n")
+
+    assert stats.is_dirty
+    assert stats.headings_changed
+    assert (stats.word_count, stats.headings()) == _full_scan(document.toPlainText())
+    assert not stats.headings_changed
+
+    stats.mark_clean()
+    assert not stats.is_dirty
+
+
+def test_random_edits_match_full_scan(qapp):
+    rng = random.Random(7)
+    pieces = ["word ", "two words ", "\n", "# Heading\n", "## Sub\n", "  ", "x"]
+    document = _document("# Start\nsome text here\n")
+    stats = DocumentStats(document)
+
+    for _ in range(300):
+        cursor = QTextCursor(document)
+        length = document.characterCount() - 1
+        start = rng.randint(0, length)
+        cursor.setPosition(start)
+        if rng.random() < 0.4 and length:
+            cursor.setPosition(min(length, start + rng.randint(1, 12)), QTextCursor.KeepAnchor)
+        cursor.insertText("".join(rng.choice(pieces) for _ in range(rng.randint(0, 3))))
+
+        assert (stats.word_count, stats.headings()) == _full_scan(document.toPlainText())
+
+
+def test_set_plain_text_replaces_everything(qapp):
+    document = _document("# A\nalpha beta")
+    stats = DocumentStats(document)
+
+    document.setPlainText("gamma")
+
+    assert stats.word_count == 1
+    assert stats.headings() == []
@@ -0,0 +1,83 @@
+"""Tests for the single-pass Storyweaver entity matcher."""
+
+import re
+
+from storymaster.view.storyweaver.entity_matcher import EntityMatcher
+
+
+def _regex_spans(names, text):
+    """Spans the old one-regex-per-name highlighter produced."""
+    spans = set()
+    for name in names:
+        pattern = re.compile(r"\b" + re.escape(name) + r"(?:'s)?\b", re.IGNORECASE)
+        spans.update((m.start(), m.end()) for m in pattern.finditer(text))
+    return spans
+
+
+def test_matches_the_per_name_regexes():
+    names = ["John", "John Smith", "Ann", "Anne", "Dr. Who", "O'Brien"]
+    text = "john's cousin John Smith met Anne, Ann's friend, and O'Brien; Joanne did not."
+    matcher = EntityMatcher(names)
+    assert {(m.start, m.end) for m in matcher.find_all(text)} == _regex_spans(names, text)
+
+
+def test_requires_word_boundaries():
+    matcher = EntityMatcher(["Ann"])
+    assert matcher.find_all("Joanne and Annabel") == []
+    assert [(m.start, m.end) for m in matcher.find_all("(Ann)")] == [(1, 4)]
+
+
+def test_possessive_is_optional():
+    matcher = EntityMatcher(["Mira"])
+    match = matcher.find_all("Mira's sword")[0]
+    assert (match.start, match.end, match.name_end) == (0, 6, 4)
+    assert match.possessive
+    assert [(m.start, m.end) for m in matcher.find_all("Mira's", possessive=False)] == [(0, 4)]
+
+
+def test_find_longest_prefers_longer_names():
+    matcher = EntityMatcher(["John", "John Smith"])
+    matches = matcher.find_longest("John Smith and John")
+    assert [(m.start, m.end, m.term) for m in matches] == [
+        (0, 10, "John Smith"),
+        (15, 19, "John"),
+    ]
+
+
+def test_min_length_skips_short_terms():
+    matcher = EntityMatcher(["Al", "Alba"])
+    assert [m.term for m in matcher.find_all("Al met Alba", min_length=3)] == ["Alba"]
+
+
+def test_from_entities_maps_names_and_aliases_to_entities():
+    mira = {"id": "1", "name": "Mira", "aliases": ["The Witch"]}
+    crow = {"id": "2", "name": "Crow", "aliases": ["the witch"]}
+    matcher = EntityMatcher.from_entities([mira, crow])
+
+    assert matcher.lookup("MIRA") == [mira]
+    assert matcher.lookup("The witch") == [mira, crow]
+    assert matcher.lookup("nobody") == []
+
+    match = matcher.find_all("Beware the witch.")[0]
+    assert match.values == (mira, crow)
+
+
+def test_match_at_returns_longest_name_covering_the_word():
+    matcher = EntityMatcher(["Smith", "John Smith"])
+    text = "Ask John Smith's brother"
+    match = matcher.match_at(text, 9, 14)  # "Smith"
+    assert text[match.start : match.name_end] == "John Smith"
+    assert matcher.match_at(text, 0, 3) is None
+
+
+def test_terms_added_after_a_search_are_found():
+    matcher = EntityMatcher(["Mira"])
+    assert matcher.find_all("Mira and Crow")
+    matcher.add("Crow")
+    assert [m.term for m in matcher.find_all("Mira and Crow")] == ["Mira", "Crow"]
+
+
+def test_empty_matcher():
+    matcher = EntityMatcher()
+    assert not matcher
+    assert matcher.find_all("anything") == []
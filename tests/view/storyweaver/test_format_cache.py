@@ -0,0 +1,87 @@
+"""Tests for the highlight cache persisted in .storyweaver files."""
+
+from unittest.mock import patch
+
+import pytest
+
+from storymaster.models.document import StoryDocument
+from tests.test_qt_utils import QT_AVAILABLE
+
+pytestmark = pytest.mark.skipif(
+    not QT_AVAILABLE, reason="PySide6 not available in headless environment"
+)
+
+if QT_AVAILABLE:
+    from storymaster.view.storyweaver import markdown_format
+    from storymaster.view.storyweaver.text_editor import FORMAT_CACHE_VERSION, EntityTextEditor
+
+TEXT = "# Chapter\nMira met **Crow** at the gate.\n\nMira's sword was `sharp`."
+ENTITIES = [
+    {"id": "1", "name": "Mira", "type": "actor"},
+    {"id": "2", "name": "Crow", "type": "actor"},
+]
+
+
+def _editor(text, cache=None):
+    editor = EntityTextEditor()
+    editor.set_text(text)
+    editor.load_format_cache(cache or {})
+    editor.trigger_deferred_highlight()
+    return editor
+
+
+def test_cache_round_trips_through_the_document(qapp, tmp_path):
+    editor = _editor(TEXT)
+    editor.set_entity_list(ENTITIES)
+    path = str(tmp_path / "story.storyweaver")
+
+    document = StoryDocument()
+    document.create_new(path)
+    document.set_content(TEXT)
+    document.format_cache = editor.export_format_cache()
+    assert document.save()
+
+    reopened = StoryDocument(path)
+    assert reopened.format_cache["version"] == FORMAT_CACHE_VERSION
+    assert reopened.format_cache == document.format_cache
+    assert len(reopened.format_cache["entity_spans"]) == 4  # distinct block texts
+
+
+def test_unchanged_blocks_skip_extraction(qapp):
+    cache = _editor(TEXT).export_format_cache()
+    edited = TEXT + "\nA *new* line."
+
+    with patch.object(
+        markdown_format,
+        "extract_format_instructions",
+        side_effect=markdown_format.extract_format_instructions,
+    ) as extract:
+        editor = _editor(edited, cache)
+
+    assert [call.args[0] for call in extract.call_args_list] == ["A *new* line."]
+    expected = _editor(edited)._highlighter._runs_by_hash
+    assert editor._highlighter._runs_by_hash == expected
+
+
+def test_entity_spans_wait_for_matching_entity_list(qapp):
+    first = _editor(TEXT)
+    first.set_entity_list(ENTITIES)
+    cache = first.export_format_cache()
+
+    editor = _editor(TEXT, cache)
+    assert editor._highlighter._entity_spans_by_hash == {}
+
+    editor.set_entity_list(ENTITIES)
+    spans = editor._highlighter._entity_spans_by_hash
+    assert sorted(spans.values()) == sorted(
+        [list(map(tuple, block)) for block in cache["entity_spans"].values()]
+    )
+
+
+def test_stale_cache_version_is_ignored(qapp):
+    cache = _editor(TEXT).export_format_cache()
+    cache["version"] = FORMAT_CACHE_VERSION + 1
+
+    editor = _editor(TEXT, cache)
+
+    assert editor._highlighter._runs_by_hash == _editor(TEXT)._highlighter._runs_by_hash
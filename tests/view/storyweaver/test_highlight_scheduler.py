@@ -0,0 +1,215 @@
+"""Tests for viewport-first background highlighting in the Storyweaver editor."""
+
+import time
+
+import pytest
+
+from storymaster.models.document import StoryDocument
+from tests.test_qt_utils import QT_AVAILABLE
+
+pytestmark = pytest.mark.skipif(
+    not QT_AVAILABLE, reason="PySide6 not available in headless environment"
+)
+
+if QT_AVAILABLE:
+    from PySide6.QtCore import QEvent
+    from PySide6.QtGui import QSyntaxHighlighter, QTextDocument
+    from PySide6.QtWidgets import QApplication, QPlainTextDocumentLayout, QPlainTextEdit
+
+    from storymaster.view.storyweaver.highlight_scheduler import HighlightScheduler
+    from storymaster.view.storyweaver.text_editor import EntityTextEditor
+
+TEXT = "\n".join(f"Line {i} has **bold** text." for i in range(200))
+
+
+def _editor(blocks_per_tick=20):
+    editor = EntityTextEditor()
+    editor.resize(400, 300)
+    editor.show()
+    editor._highlighter.scheduler.blocks_per_tick = blocks_per_tick
+    editor.set_text(TEXT)
+    return editor
+
+
+def _has_formats(editor, block_number):
+    block = editor.document().findBlockByNumber(block_number)
+    return bool(block.layout().formats())
+
+
+def _run_until_idle(scheduler, limit=1000):
+    for _ in range(limit):
+        if not scheduler.is_active:
+            return
+        QApplication.processEvents()
+    raise AssertionError("background highlighting did not finish")
+
+
+def test_visible_blocks_are_highlighted_before_the_rest(qapp):
+    editor = _editor()
+    editor.verticalScrollBar().setValue(editor.verticalScrollBar().maximum() // 2)
+    editor.trigger_deferred_highlight()
+    QApplication.processEvents()
+
+    scheduler = editor._highlighter.scheduler
+    first, last = scheduler._visible_range()
+    assert first > 0
+    assert all(_has_formats(editor, n) for n in range(first, last + 1))
+    assert not _has_formats(editor, 0)
+    assert not _has_formats(editor, editor.document().blockCount() - 1)
+    assert scheduler.progress() < 1.0
+
+    progress = []
+    editor.highlight_progress.connect(lambda done, total: progress.append((done, total)))
+    _run_until_idle(scheduler)
+
+    assert progress[-1] == (200, 200)
+    assert _has_formats(editor, 0)
+    assert _has_formats(editor, 199)
+
+
+def test_edits_during_background_pass_keep_blocks_aligned(qapp):
+    editor = _editor(blocks_per_tick=5)
+    editor.trigger_deferred_highlight()
+    QApplication.processEvents()
+    scheduler = editor._highlighter.scheduler
+
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.insertText("New **first** line\nAnother one\n")
+    assert len(scheduler._done) == editor.document().blockCount()
+
+    cursor.setPosition(0)
+    cursor.movePosition(cursor.MoveOperation.Down, cursor.MoveMode.KeepAnchor, 3)
+    cursor.removeSelectedText()
+    assert len(scheduler._done) == editor.document().blockCount()
+
+    _run_until_idle(scheduler)
+    block_count = editor.document().blockCount()
+    assert all(_has_formats(editor, n) for n in range(block_count))
+
+
+def test_view_state_is_restored_from_the_document(qapp, tmp_path):
+    editor = _editor()
+    editor.restore_view_state({"cursor_position": 500, "scroll_position": 300})
+    state = editor.get_view_state()
+    assert state["cursor_position"] == 500
+
+    path = str(tmp_path / "story.storyweaver")
+    document = StoryDocument()
+    document.create_new(path)
+    document.set_content(TEXT)
+    document.save()
+    assert document.set_view_state(state)
+    assert not document.set_view_state(state)
+    assert not document.is_modified
+    document.save()
+
+    reopened = _editor()
+    reopened.restore_view_state(StoryDocument(path).get_view_state())
+    assert reopened.get_view_state() == state
+
+    # Positions past the end of a shorter document are clamped
+    reopened.set_text("short")
+    reopened.restore_view_state(state)
+    assert reopened.textCursor().position() == len("short")
+
+
+def test_cached_blocks_are_spell_checked_in_the_background(qapp):
+    editor = EntityTextEditor()
+    editor.set_text("The zorp was **bold**.\nNothing wrong here.")
+    editor.trigger_deferred_highlight()
+    highlighter = editor._highlighter
+
+    def underlined():
+        return [
+            (fmt.start, fmt.length)
+            for fmt in editor.document().firstBlock().layout().formats()
+            if fmt.format.underlineStyle() == fmt.format.UnderlineStyle.SpellCheckUnderline
+        ]
+
+    for _ in range(200):
+        QApplication.processEvents()
+        if underlined() and not highlighter._spell_waiting:
+            break
+        time.sleep(0.01)
+
+    assert (4, 4) in underlined()
+    assert highlighter._spell_waiting == {}
+
+
+def test_rehighlighting_a_waiting_block_records_it_once(qapp):
+    editor = EntityTextEditor()
+    editor.set_text("The zorp was **bold**.\nNothing wrong here.")
+    editor.trigger_deferred_highlight()
+    QApplication.processEvents()
+    highlighter = editor._highlighter
+    highlighter._spell_spans_by_hash.clear()
+    highlighter._spell_waiting.clear()
+
+    first_block = editor.document().firstBlock()
+    highlighter.rehighlightBlock(first_block)
+    highlighter.rehighlightBlock(first_block)
+
+    assert list(highlighter._spell_waiting.values()) == [{0}]
+    editor.cleanup()
+
+
+def test_cleanup_stops_background_work(qapp):
+    editor = _editor()
+    editor.trigger_deferred_highlight()
+    QApplication.processEvents()
+    highlighter = editor._highlighter
+    executor = highlighter._spell_worker._executor
+    assert highlighter.scheduler.is_active and executor is not None
+
+    editor.cleanup()
+    assert not highlighter.scheduler.is_active
+    assert highlighter._spell_worker._executor is None
+    assert executor._shutdown
+
+
+def test_detaching_the_highlighter_stops_the_pass(qapp):
+    editor = _editor()
+    editor.trigger_deferred_highlight()
+    QApplication.processEvents()
+    scheduler = editor._highlighter.scheduler
+    assert scheduler.is_active
+
+    # set_text detaches the highlighter; the old pass must not follow the edit
+    editor.set_text("Replaced\ntext")
+    assert not scheduler.is_active
+    assert scheduler.document is None
+
+
+if QT_AVAILABLE:
+
+    class NoOpHighlighter(QSyntaxHighlighter):
+        def highlightBlock(self, text):
+            pass
+
+
+def _plain_document(text, parent=None):
+    document = QTextDocument(parent)
+    document.setDocumentLayout(QPlainTextDocumentLayout(document))
+    document.setPlainText(text)
+    return document
+
+
+def test_destroyed_document_is_dropped(qapp):
+    editor = QPlainTextEdit()
+    document = _plain_document(TEXT)
+    editor.setDocument(document)
+    scheduler = HighlightScheduler(NoOpHighlighter(editor), editor)
+    scheduler.start()
+    assert scheduler.document is document
+
+    editor.setDocument(_plain_document("Other text", editor))
+    document.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    assert not scheduler.is_active
+    assert scheduler.document is None
+    scheduler.stop()
+    scheduler.start()
+    assert scheduler.document is editor.document()
+    scheduler.stop()
@@ -0,0 +1,95 @@
+"""Tests for Qt-free block formatting and the block format pool."""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from storymaster.view.storyweaver.markdown_format import (
+    FORMAT_TYPES,
+    NO_RUNS,
+    BlockFormatPool,
+    FormatInstruction,
+    decode_instructions,
+    encode_instructions,
+    extract_format_instructions,
+    format_runs,
+)
+
+SAMPLE_LINES = [
+    "# Chapter One",
+    "The **storm** broke over _Rivertown_ at dawn, and `nobody` was ready.",
+    "- [x] Draft the ~~prologue~~ opening",
+    "> A quote from [the archive](https://example.com) and ![a map](map.png)",
+    "1. First *numbered* item with __underline__",
+    "",
+    "---",
+    "Plain prose with no markup at all, just words and more words.",
+]
+
+
+def _document(blocks):
+    return [SAMPLE_LINES[i % len(SAMPLE_LINES)] + f" {i}" for i in range(blocks)]
+
+
+def _thread_path(texts):
+    """The previous approach: 4 threads, a fresh executor per 50-block chunk."""
+    results = [None] * len(texts)
+    for chunk_start in range(0, len(texts), 50):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                executor.submit(extract_format_instructions, texts[i]): i
+                for i in range(chunk_start, min(chunk_start + 50, len(texts)))
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    return results
+
+
+def test_encoding_round_trips():
+    instructions = extract_format_instructions(SAMPLE_LINES[1])
+    encoded = encode_instructions(instructions)
+
+    assert len(encoded) == 3 * len(instructions)
+    assert decode_instructions(encoded) == instructions
+
+
+def test_every_produced_type_is_registered():
+    for line in SAMPLE_LINES + ["###### Six", "## Two", "- [ ] todo", "***"]:
+        for instruction in extract_format_instructions(line):
+            assert instruction.format_type in FORMAT_TYPES
+
+
+def test_format_runs_share_the_empty_array():
+    assert format_runs("Plain prose") is NO_RUNS
+    assert decode_instructions(format_runs(SAMPLE_LINES[1])) == extract_format_instructions(
+        SAMPLE_LINES[1]
+    )
+
+
+def test_small_jobs_run_inline():
+    pool = BlockFormatPool(max_workers=4, inline_threshold=100)
+    results = pool.format_blocks(SAMPLE_LINES)
+
+    assert pool._executor is None
+    assert results == [extract_format_instructions(line) for line in SAMPLE_LINES]
+    assert results[0] == [
+        FormatInstruction(0, 2, "heading_syntax"),
+        FormatInstruction(2, 11, "heading1"),
+    ]
+
+
+def test_pool_matches_inline_results():
+    texts = _document(300)
+    pool = BlockFormatPool(max_workers=2, batch_size=64, inline_threshold=0)
+    try:
+        assert pool.format_blocks(texts) == [extract_format_instructions(t) for t in texts]
+    finally:
+        pool.shutdown()
+
+
+def test_pool_matches_the_thread_path():
+    texts = _document(2_000)
+    pool = BlockFormatPool(max_workers=2)
+    try:
+        pool.start()
+        assert pool.format_blocks(texts) == _thread_path(texts)
+    finally:
+        pool.shutdown()